@@ -0,0 +1,220 @@
+"""Serial execution of player commands on a worker thread."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Optional
+
+from .commands.base_command import Command
+from .commands.track_finished_command import TrackFinishedCommand
+from .player_service import PlayerService
+
+logger = logging.getLogger(__name__)
+
+
+class _Barrier(Command):
+    """Command that does nothing; its future completes once everything before it ran."""
+
+    def execute(self) -> None:
+        pass
+
+
+class _Pending:
+    """A queued command and the futures of every command merged into it."""
+
+    def __init__(self, command: Command, future: Future[None]) -> None:
+        self.command = command
+        self.futures = [future]
+
+
+class CommandBus:
+    """
+    Runs commands one at a time, in the order submitted, on a thread of its own.
+
+    PlayerService is not thread-safe: the CLI loop, the GUI's API threads
+    and the audio player's end-of-track reports would otherwise call it
+    concurrently and race on the current song. With every change going
+    through one bus they run strictly one after another.
+
+    submit returns at once with a future. UI threads can drop it and never
+    block on slow audio work such as stopping a player process; callers
+    that need the outcome wait on it (execute does both). Observers are
+    notified on the bus thread.
+
+    Bursts of THROTTLED commands (skips, seeks, volume changes) cost work in
+    proportion to the user's intent rather than the event rate: a command
+    submitted while an equal one is still queued is merged into it (Command.merge),
+    and a throttled command runs at once, or, if one of its kind ran less
+    than coalesce_secs ago, at the end of that window, collecting what
+    arrives meanwhile. Holding "next" thus makes one jump of N tracks per
+    window, and scrubbing seeks at most once per window, to the latest target.
+    """
+
+    # Default minimum seconds between runs of a throttled kind of command
+    COALESCE_SECS = 0.1
+
+    def __init__(
+        self,
+        player_service: Optional[PlayerService] = None,
+        coalesce_secs: float = COALESCE_SECS,
+    ) -> None:
+        """
+        Initialize the bus; its thread starts with the first command.
+
+        Args:
+            player_service: Service whose end-of-track reports to run on
+                the bus too (default: none)
+            coalesce_secs: Minimum seconds between runs of each kind of
+                throttled command (0 only merges commands that queue up)
+        """
+        self._pending: deque[_Pending] = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self._coalesce_secs = coalesce_secs
+        # When each kind of throttled command last ran (bus thread only)
+        self._last_run: dict[type[Command], float] = {}
+        if player_service is not None:
+            service = player_service
+            service.set_track_finished_handler(
+                lambda file_path: self.post(TrackFinishedCommand(service, file_path))
+            )
+
+    def submit(self, command: Command) -> Future[None]:
+        """
+        Queue a command to run after those submitted before it; returns immediately.
+
+        Args:
+            command: The command
+
+        Returns:
+            Future completed when the command ran, holding any exception it raised
+
+        Raises:
+            RuntimeError: If the bus is closed
+        """
+        future: Future[None] = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Command bus is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="playt-commands", daemon=True
+                )
+                self._thread.start()
+            last = self._pending[-1] if self._pending else None
+            merged = last.command.merge(command) if last is not None else None
+            if last is not None and merged is not None:
+                last.command = merged
+                last.futures.append(future)
+            else:
+                self._pending.append(_Pending(command, future))
+            self._cond.notify()
+        return future
+
+    def post(self, command: Command) -> None:
+        """
+        Submit a command nobody waits for; failures are logged.
+
+        Commands posted after the bus closed are dropped.
+
+        Args:
+            command: The command
+        """
+        try:
+            future = self.submit(command)
+        except RuntimeError:
+            return
+
+        def log_failure(done: Future[None]) -> None:
+            error = done.exception()
+            if error is not None:
+                logger.error("%s failed", type(command).__name__, exc_info=error)
+
+        future.add_done_callback(log_failure)
+
+    def execute(self, command: Command, timeout: Optional[float] = None) -> None:
+        """
+        Run a command on the bus and wait for it.
+
+        Called from the bus thread itself (e.g. by an observer), the command
+        runs at once instead of waiting for itself.
+
+        Args:
+            command: The command
+            timeout: Maximum seconds to wait (default: no limit)
+
+        Raises:
+            Exception: Whatever the command raised
+            TimeoutError: If the command did not finish in time
+        """
+        if threading.current_thread() is self._thread:
+            command.execute()
+            return
+        self.submit(command).result(timeout)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until every command submitted so far has run.
+
+        Args:
+            timeout: Maximum seconds to wait (default: no limit)
+
+        Raises:
+            TimeoutError: If the commands did not finish in time
+        """
+        self.execute(_Barrier(), timeout)
+
+    def close(self) -> None:
+        """Run the commands already submitted, then stop the thread; later submits fail."""
+        with self._cond:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            self._cond.notify()
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _next_pending(self) -> Optional[_Pending]:
+        """Wait for the next command that is due; None once closed and drained."""
+        with self._cond:
+            while True:
+                if not self._pending:
+                    if self._closed:
+                        return None
+                    self._cond.wait()
+                    continue
+                command = self._pending[0].command
+                due = self._last_run.get(type(command), -self._coalesce_secs)
+                due += self._coalesce_secs
+                now = time.monotonic()
+                # Wait out the window while later commands could still merge into it;
+                # anything queued behind it (or closing) ends the wait
+                if command.THROTTLED and now < due and len(self._pending) == 1:
+                    if not self._closed:
+                        self._cond.wait(due - now)
+                        continue
+                return self._pending.popleft()
+
+    def _run(self) -> None:
+        while True:
+            pending = self._next_pending()
+            if pending is None:
+                return
+            futures = [f for f in pending.futures if f.set_running_or_notify_cancel()]
+            if not futures:
+                continue
+            command = pending.command
+            if command.THROTTLED:
+                self._last_run[type(command)] = time.monotonic()
+            try:
+                command.execute()
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future in futures:
+                    future.set_result(None)
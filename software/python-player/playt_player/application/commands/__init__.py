@@ -1,23 +1,31 @@
 """Command pattern implementations for user actions."""
 
 from .base_command import Command
+from .check_playback_status_command import CheckPlaybackStatusCommand
+from .load_album_command import LoadAlbumCommand
 from .next_command import NextCommand
 from .pause_command import PauseCommand
 from .play_command import PlayCommand
 from .prev_command import PrevCommand
+from .seek_command import SeekCommand
+from .set_volume_command import SetVolumeCommand
+from .shuffle_command import ShuffleCommand
 from .stop_command import StopCommand
+from .toggle_play_command import TogglePlayCommand
+from .track_finished_command import TrackFinishedCommand
 
 __all__ = [
+    "CheckPlaybackStatusCommand",
     "Command",
+    "LoadAlbumCommand",
     "NextCommand",
     "PauseCommand",
     "PlayCommand",
     "PrevCommand",
+    "SeekCommand",
+    "SetVolumeCommand",
+    "ShuffleCommand",
     "StopCommand",
+    "TogglePlayCommand",
+    "TrackFinishedCommand",
 ]
-
-
-
-
-
-
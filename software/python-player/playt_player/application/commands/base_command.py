@@ -1,6 +1,7 @@
 """Base command interface following the Command pattern."""
 
 from abc import ABC, abstractmethod
+from typing import Optional
 
 
 class Command(ABC):
@@ -11,7 +12,24 @@ class Command(ABC):
     queuing, logging, and macro operations.
     """
 
+    # Whether a burst of these commands runs at most once per coalescing
+    # window of the CommandBus, with the burst merged (see merge)
+    THROTTLED = False
+
     @abstractmethod
     def execute(self) -> None:
         """Execute the command."""
         pass
+
+    def merge(self, newer: "Command") -> Optional["Command"]:
+        """
+        Combine with a command submitted right after this one, before either ran.
+
+        Args:
+            newer: The later command
+
+        Returns:
+            A command with the effect of running both, or None if they
+            cannot be combined
+        """
+        return None
@@ -0,0 +1,27 @@
+"""Check playback status command implementation."""
+
+from .base_command import Command
+
+
+class CheckPlaybackStatusCommand(Command):
+    """Command to advance past a finished track for audio players that must be polled."""
+
+    def __init__(self, player_service: "PlayerService") -> None:
+        """
+        Initialize the check playback status command.
+
+        Args:
+            player_service: The player service to execute the command on
+        """
+        self._player_service = player_service
+
+    def execute(self) -> None:
+        """Execute the check playback status command."""
+        self._player_service.check_playback_status()
+
+
+# Forward reference type hint
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..player_service import PlayerService
@@ -0,0 +1,40 @@
+"""Load album command implementation."""
+
+from typing import Optional
+
+from ...domain.entities.album import Album
+from ...domain.interfaces.track_source import TrackSourceInterface
+from .base_command import Command
+
+
+class LoadAlbumCommand(Command):
+    """Command to load an album into the playback queue."""
+
+    def __init__(
+        self,
+        player_service: "PlayerService",
+        album: Album,
+        track_source: Optional[TrackSourceInterface] = None,
+    ) -> None:
+        """
+        Initialize the load album command.
+
+        Args:
+            player_service: The player service to execute the command on
+            album: The album to load
+            track_source: Source to wait on for tracks that are not on disk yet
+        """
+        self._player_service = player_service
+        self._album = album
+        self._track_source = track_source
+
+    def execute(self) -> None:
+        """Execute the load album command."""
+        self._player_service.load_album(self._album, self._track_source)
+
+
+# Forward reference type hint
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..player_service import PlayerService
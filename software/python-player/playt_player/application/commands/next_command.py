@@ -1,23 +1,35 @@
 """Next track command implementation."""
 
+from typing import Optional
+
 from .base_command import Command
 
 
 class NextCommand(Command):
-    """Command to skip to the next track."""
+    """Command to skip to the next track; consecutive skips merge into one jump."""
+
+    THROTTLED = True
 
-    def __init__(self, player_service: "PlayerService") -> None:
+    def __init__(self, player_service: "PlayerService", count: int = 1) -> None:
         """
         Initialize the next command.
 
         Args:
             player_service: The player service to execute the command on
+            count: Number of tracks to skip
         """
         self._player_service = player_service
+        self.count = count
 
     def execute(self) -> None:
         """Execute the next command."""
-        self._player_service.next()
+        self._player_service.next(self.count)
+
+    def merge(self, newer: Command) -> Optional[Command]:
+        """Merge a following skip into a jump over both."""
+        if isinstance(newer, NextCommand) and newer._player_service is self._player_service:
+            return NextCommand(self._player_service, self.count + newer.count)
+        return None
 
 
 # Forward reference type hint
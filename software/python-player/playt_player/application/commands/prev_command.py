@@ -1,23 +1,35 @@
 """Previous track command implementation."""
 
+from typing import Optional
+
 from .base_command import Command
 
 
 class PrevCommand(Command):
-    """Command to go to the previous track."""
+    """Command to go to the previous track; consecutive ones merge into one jump."""
+
+    THROTTLED = True
 
-    def __init__(self, player_service: "PlayerService") -> None:
+    def __init__(self, player_service: "PlayerService", count: int = 1) -> None:
         """
         Initialize the previous command.
 
         Args:
             player_service: The player service to execute the command on
+            count: Number of tracks to go back
         """
         self._player_service = player_service
+        self.count = count
 
     def execute(self) -> None:
         """Execute the previous command."""
-        self._player_service.previous()
+        self._player_service.previous(self.count)
+
+    def merge(self, newer: Command) -> Optional[Command]:
+        """Merge a following previous command into a jump over both."""
+        if isinstance(newer, PrevCommand) and newer._player_service is self._player_service:
+            return PrevCommand(self._player_service, self.count + newer.count)
+        return None
 
 
 # Forward reference type hint
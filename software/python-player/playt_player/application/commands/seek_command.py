@@ -0,0 +1,39 @@
+"""Seek command implementation."""
+
+from typing import Optional
+
+from .base_command import Command
+
+
+class SeekCommand(Command):
+    """Command to seek within the current track; in a burst only the last target counts."""
+
+    THROTTLED = True
+
+    def __init__(self, player_service: "PlayerService", position_secs: float) -> None:
+        """
+        Initialize the seek command.
+
+        Args:
+            player_service: The player service to execute the command on
+            position_secs: Position to seek to in seconds
+        """
+        self._player_service = player_service
+        self.position_secs = position_secs
+
+    def execute(self) -> None:
+        """Execute the seek command."""
+        self._player_service.seek(self.position_secs)
+
+    def merge(self, newer: Command) -> Optional[Command]:
+        """Keep only the later of two seeks."""
+        if isinstance(newer, SeekCommand) and newer._player_service is self._player_service:
+            return newer
+        return None
+
+
+# Forward reference type hint
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..player_service import PlayerService
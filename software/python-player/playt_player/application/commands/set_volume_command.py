@@ -0,0 +1,39 @@
+"""Set volume command implementation."""
+
+from typing import Optional
+
+from .base_command import Command
+
+
+class SetVolumeCommand(Command):
+    """Command to set the playback volume; in a burst only the last level counts."""
+
+    THROTTLED = True
+
+    def __init__(self, player_service: "PlayerService", volume: float) -> None:
+        """
+        Initialize the set volume command.
+
+        Args:
+            player_service: The player service to execute the command on
+            volume: Volume level from 0.0 to 1.0
+        """
+        self._player_service = player_service
+        self.volume = volume
+
+    def execute(self) -> None:
+        """Execute the set volume command."""
+        self._player_service.set_volume(self.volume)
+
+    def merge(self, newer: Command) -> Optional[Command]:
+        """Keep only the later of two volume changes."""
+        if isinstance(newer, SetVolumeCommand) and newer._player_service is self._player_service:
+            return newer
+        return None
+
+
+# Forward reference type hint
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..player_service import PlayerService
@@ -0,0 +1,41 @@
+"""Shuffle command implementation."""
+
+from typing import Optional
+
+from .base_command import Command
+
+
+class ShuffleCommand(Command):
+    """Command to turn shuffle on or off."""
+
+    def __init__(
+        self,
+        player_service: "PlayerService",
+        enabled: Optional[bool] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the shuffle command.
+
+        Args:
+            player_service: The player service to execute the command on
+            enabled: Whether to shuffle (default: toggle)
+            seed: Seed of the shuffled order (default: random)
+        """
+        self._player_service = player_service
+        self._enabled = enabled
+        self._seed = seed
+
+    def execute(self) -> None:
+        """Execute the shuffle command."""
+        enabled = self._enabled
+        if enabled is None:
+            enabled = self._player_service.get_shuffle() is None
+        self._player_service.set_shuffle(enabled, self._seed)
+
+
+# Forward reference type hint
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..player_service import PlayerService
@@ -0,0 +1,30 @@
+"""Toggle play command implementation."""
+
+from .base_command import Command
+
+
+class TogglePlayCommand(Command):
+    """Command to pause if playing, and to start or resume playback otherwise."""
+
+    def __init__(self, player_service: "PlayerService") -> None:
+        """
+        Initialize the toggle play command.
+
+        Args:
+            player_service: The player service to execute the command on
+        """
+        self._player_service = player_service
+
+    def execute(self) -> None:
+        """Execute the toggle play command."""
+        if self._player_service.get_state() == "playing":
+            self._player_service.pause()
+        else:
+            self._player_service.play()
+
+
+# Forward reference type hint
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..player_service import PlayerService
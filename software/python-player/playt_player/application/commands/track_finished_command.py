@@ -0,0 +1,29 @@
+"""Track finished command implementation."""
+
+from .base_command import Command
+
+
+class TrackFinishedCommand(Command):
+    """Command reporting that the audio player played a file to its end."""
+
+    def __init__(self, player_service: "PlayerService", file_path: str) -> None:
+        """
+        Initialize the track finished command.
+
+        Args:
+            player_service: The player service to execute the command on
+            file_path: Path of the file that finished
+        """
+        self._player_service = player_service
+        self._file_path = file_path
+
+    def execute(self) -> None:
+        """Execute the track finished command."""
+        self._player_service.on_track_finished(self._file_path)
+
+
+# Forward reference type hint
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..player_service import PlayerService
@@ -0,0 +1,59 @@
+"""Immutable view of the player's state for frontends."""
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from ..domain.entities.song import Song
+
+
+@dataclass(frozen=True)
+class PlaybackSnapshot:
+    """
+    The player's state at one point, published by PlayerService.
+
+    PlayerService builds a new snapshot after every change and swaps it in
+    with a single reference assignment, so readers on any thread get a
+    consistent view without locks and without calling into the audio
+    player. The position is kept as an anchor to extrapolate from.
+
+    Attributes:
+        version: Number of the snapshot; increases with every change
+        state: Playback state ("playing", "paused", "stopped" or "idle")
+        song: Current song, or None
+        index: Queue index of the current song, or -1
+        position_anchor: (position in seconds, time.monotonic() it was
+            sampled at) when the change happened, or None without a track
+        volume: Volume level from 0.0 to 1.0
+        queue_length: Number of songs in the queue
+        queue_version: Version of the queue (see PlayQueue.version)
+    """
+
+    version: int = 0
+    state: str = "idle"
+    song: Optional[Song] = None
+    index: int = -1
+    position_anchor: Optional[tuple[float, float]] = None
+    volume: float = 1.0
+    queue_length: int = 0
+    queue_version: int = 0
+
+    def position(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Get the playback position, extrapolated from the anchor while playing.
+
+        Args:
+            now: time.monotonic() value to extrapolate to (default: now)
+
+        Returns:
+            Position in seconds (at most the song's duration), or None
+        """
+        if self.position_anchor is None:
+            return None
+        position, sampled_at = self.position_anchor
+        if self.state == "playing":
+            now = time.monotonic() if now is None else now
+            position += max(0.0, now - sampled_at)
+            if self.song is not None and self.song.duration_secs:
+                position = min(position, self.song.duration_secs)
+        return position
@@ -1,11 +1,22 @@
 """Player service coordinating audio playback and state management."""
 
-from typing import Optional
+import itertools
+import random
+import time
+from typing import Any, Optional
 
 from ..domain.entities.album import Album
+from ..domain.entities.play_queue import PlayQueue
 from ..domain.entities.song import Song
-from ..domain.interfaces.audio_player import AudioPlayerInterface
+from ..domain.interfaces.audio_player import (
+    AudioPlayerInterface,
+    BufferStats,
+    TrackFinishedCallback,
+)
 from ..domain.interfaces.observer import Subject
+from ..domain.interfaces.track_source import TrackSourceInterface
+from ..domain.services.shuffle_order import ShuffleOrder
+from .playback_snapshot import PlaybackSnapshot
 
 
 class PlayerService(Subject):
@@ -16,29 +27,56 @@ class PlayerService(Subject):
     between the audio player, queue management, and observer notifications.
     """
 
-    def __init__(self, audio_player: AudioPlayerInterface) -> None:
+    # Maximum seconds to wait for a track that is still being materialized. The
+    # track is made ready ahead of all others, and the wait holds up the command bus
+    TRACK_READY_TIMEOUT = 15.0
+
+    def __init__(self, audio_player: AudioPlayerInterface, gapless: bool = True) -> None:
         """
         Initialize the player service.
 
         Args:
             audio_player: The audio player implementation to use
+            gapless: Queue the following song on the audio player so players that
+                support it continue without a gap (see AudioPlayerInterface.queue_next)
         """
         super().__init__()
         self._audio_player = audio_player
         self._current_song: Optional[Song] = None
-        self._queue: list[Song] = []
+        self._queue: PlayQueue[Song] = PlayQueue()
         self._current_index: int = -1
-
-    def load_album(self, album: Album) -> None:
+        self._track_source: Optional[TrackSourceInterface] = None
+        self._gapless = gapless
+        # Play order while shuffling; None plays the queue in order
+        self._shuffle: Optional[ShuffleOrder] = None
+        self._volume = 1.0
+        # Replaced, never modified, on every change (see get_snapshot)
+        self._snapshot = PlaybackSnapshot()
+        self._snapshot_versions = itertools.count(1)
+        # File path last handed to the audio player as the next track
+        self._queued_path: Optional[str] = None
+        # The audio player pushes the end of each track instead of being polled
+        self._track_end_events = audio_player.set_track_finished_callback(
+            self.on_track_finished
+        )
+
+    def load_album(
+        self, album: Album, track_source: Optional[TrackSourceInterface] = None
+    ) -> None:
         """
         Load an album into the playback queue.
 
         Args:
             album: The album to load
+            track_source: Source to wait on for tracks that are not on disk yet
+                (see CartridgeReaderInterface.get_track_source)
         """
-        self._queue = album.ordered_songs()
+        self._track_source = track_source
+        self._queue.replace(album.ordered_songs())
         self._current_index = -1
         self._current_song = None
+        self._reshuffle()
+        self._prepare_first_song()
         self.notify("album_loaded", album)
 
     def load_queue(self, songs: list[Song]) -> None:
@@ -48,20 +86,178 @@ class PlayerService(Subject):
         Args:
             songs: List of songs to queue
         """
-        self._queue = songs
+        self._track_source = None
+        self._queue.replace(songs)
         self._current_index = -1
         self._current_song = None
+        self._reshuffle()
+        self._prepare_first_song()
         self.notify("queue_loaded", songs)
 
+    def enqueue(self, songs: list[Song]) -> None:
+        """
+        Add songs to the end of the queue.
+
+        Args:
+            songs: Songs to add, in order
+        """
+        self._queue.extend(songs)
+        self._queue_changed()
+
+    def insert_song(self, index: int, song: Song) -> None:
+        """
+        Insert a song into the queue before a position.
+
+        Args:
+            index: Position in the queue (clamped to the queue)
+            song: The song to insert
+        """
+        if index < 0:
+            index += len(self._queue)
+        index = max(0, min(index, len(self._queue)))
+        self._queue.insert(index, song)
+        if 0 <= index <= self._current_index:
+            self._current_index += 1
+        self._queue_changed()
+
+    def move_song(self, source: int, destination: int) -> None:
+        """
+        Move a song to another position in the queue; the current song keeps playing.
+
+        Args:
+            source: Current position of the song
+            destination: Position of the song once moved
+
+        Raises:
+            IndexError: If either position is out of range
+        """
+        self._queue.move(source, destination)
+        if source < 0:
+            source += len(self._queue)
+        if destination < 0:
+            destination += len(self._queue)
+        current = self._current_index
+        if source == current:
+            self._current_index = destination
+        elif source < current <= destination:
+            self._current_index -= 1
+        elif destination <= current < source:
+            self._current_index += 1
+        self._queue_changed()
+
+    def remove_song(self, index: int) -> Song:
+        """
+        Remove a song from the queue.
+
+        Args:
+            index: Position of the song
+
+        Returns:
+            The removed song
+
+        Raises:
+            IndexError: If the position is out of range
+            ValueError: If the song is the current one
+        """
+        if index < 0:
+            index += len(self._queue)
+        if index == self._current_index:
+            raise ValueError("Cannot remove the current song from the queue")
+        song = self._queue.pop(index)
+        if index < self._current_index:
+            self._current_index -= 1
+        self._queue_changed()
+        return song
+
+    def _queue_changed(self) -> None:
+        """Requeue the songs around the current one after an edit and tell observers."""
+        self._reshuffle()
+        self._requeue_neighbours()
+        self.notify("queue_changed", self._queue.version)
+
+    def set_shuffle(
+        self, enabled: bool, seed: Optional[int] = None, first: Optional[int] = None
+    ) -> None:
+        """
+        Turn shuffle on or off.
+
+        The shuffled order is computed song by song (see ShuffleOrder), so
+        turning shuffle on costs the same for any queue length. The current
+        song keeps playing and the rest of the queue follows in shuffled order.
+
+        Args:
+            enabled: Whether to shuffle
+            seed: Seed of the order, e.g. to restore one from get_shuffle
+                (default: a random seed)
+            first: Queue index the order starts at, e.g. to restore one from
+                get_shuffle (default: the current song)
+
+        Raises:
+            IndexError: If first is not an index of the queue
+        """
+        if enabled:
+            if seed is None:
+                seed = random.randrange(2**32)
+            self._shuffle = self._shuffle_order(seed, first)
+        else:
+            self._shuffle = None
+        self._requeue_neighbours()
+        self.notify("shuffle_changed", self._shuffle)
+
+    def get_shuffle(self) -> Optional[ShuffleOrder]:
+        """
+        Get the shuffled play order.
+
+        Returns:
+            The order, whose seed and first index restore it with set_shuffle,
+            or None if shuffle is off
+        """
+        return self._shuffle
+
+    def _shuffle_order(self, seed: int, first: Optional[int] = None) -> ShuffleOrder:
+        """Create a shuffled order of the queue starting at first or the current song."""
+        if first is None and self._current_index >= 0:
+            first = self._current_index
+        return ShuffleOrder(len(self._queue), seed, first)
+
+    def _reshuffle(self) -> None:
+        """Shuffle a changed queue again with the same seed, from the current song."""
+        if self._shuffle is not None:
+            self._shuffle = self._shuffle_order(self._shuffle.seed)
+
+    def _next_index(self) -> Optional[int]:
+        """Queue index of the song played after the current one (the first if none is)."""
+        return self._index_after(self._current_index)
+
+    def _previous_index(self) -> Optional[int]:
+        """Queue index of the song played before the current one."""
+        return self._index_before(self._current_index)
+
+    def _index_after(self, index: int) -> Optional[int]:
+        """Queue index of the song played after the one at index (the first for -1)."""
+        if index < 0:
+            if not self._queue:
+                return None
+            return self._shuffle.first if self._shuffle is not None else 0
+        if self._shuffle is not None:
+            return self._shuffle.next_index(index)
+        return index + 1 if index + 1 < len(self._queue) else None
+
+    def _index_before(self, index: int) -> Optional[int]:
+        """Queue index of the song played before the one at index."""
+        if index < 0:
+            return None
+        if self._shuffle is not None:
+            return self._shuffle.previous_index(index)
+        return index - 1 if index > 0 else None
+
     def play(self) -> None:
         """Start or resume playback."""
         if self._current_song is None and self._queue:
-            self._current_index = 0
-            self._current_song = self._queue[0]
+            self._current_index = self._shuffle.first if self._shuffle is not None else 0
+            self._current_song = self._queue[self._current_index]
 
-        if self._current_song:
-            self._audio_player.play(self._current_song.file_path)
-            self.notify("track_started", self._current_song)
+        self._start_current_song()
 
     def pause(self) -> None:
         """Pause playback."""
@@ -77,36 +273,141 @@ class PlayerService(Subject):
             self.notify("track_stopped", self._current_song)
         self._current_song = None
         self._current_index = -1
+        self._queued_path = None
+        self._publish()
+
+    def close(self) -> None:
+        """Stop playback and release the audio player; call once when exiting."""
+        self.stop()
+        self._audio_player.close()
+
+    def next(self, count: int = 1) -> None:
+        """
+        Skip to the next track in the queue.
 
-    def next(self) -> None:
-        """Skip to the next track in the queue."""
+        Args:
+            count: Number of tracks to skip, e.g. for a burst of skips coalesced
+                into one jump; only the track landed on is started
+        """
         if not self._queue:
             return
 
-        if self._current_index < len(self._queue) - 1:
-            self._current_index += 1
+        index = self._current_index
+        next_index: Optional[int] = None
+        for _ in range(max(1, count)):
+            next_index = self._index_after(index)
+            if next_index is None:
+                break
+            index = next_index
+        if next_index is not None:
+            self._current_index = next_index
             self._current_song = self._queue[self._current_index]
-            self._audio_player.play(self._current_song.file_path)
-            self.notify("track_started", self._current_song)
+            self._start_current_song()
         else:
             self.stop()
             self.notify("queue_ended", None)
 
-    def previous(self) -> None:
-        """Go to the previous track in the queue."""
+    def previous(self, count: int = 1) -> None:
+        """
+        Go to the previous track in the queue.
+
+        Args:
+            count: Number of tracks to go back, stopping at the first one;
+                only the track landed on is started
+        """
         if not self._queue:
             return
 
-        if self._current_index > 0:
-            self._current_index -= 1
+        index = self._current_index
+        for _ in range(max(1, count)):
+            previous_index = self._index_before(index)
+            if previous_index is None:
+                break
+            index = previous_index
+        if index != self._current_index:
+            self._current_index = index
             self._current_song = self._queue[self._current_index]
-            self._audio_player.play(self._current_song.file_path)
-            self.notify("track_started", self._current_song)
-        else:
-            # Restart current track
-            if self._current_song:
-                self._audio_player.play(self._current_song.file_path)
+        # Otherwise restart the current track
+        self._start_current_song()
+
+    def _start_current_song(self) -> None:
+        """
+        Play the current song, skipping songs whose file cannot be made ready.
+
+        A song whose file failed to materialize is skipped like a finished
+        one. If waiting for a file timed out, playback stops instead of
+        waiting again for each later song.
+        """
+        while self._current_song is not None:
+            started = time.monotonic()
+            if self._play_song(self._current_song):
                 self.notify("track_started", self._current_song)
+                return
+            self.notify("track_unavailable", self._current_song)
+            next_index = self._next_index()
+            if time.monotonic() - started >= self.TRACK_READY_TIMEOUT:
+                self.stop()
+            elif next_index is None:
+                self.stop()
+                self.notify("queue_ended", None)
+            else:
+                self._current_index = next_index
+                self._current_song = self._queue[next_index]
+
+    def _play_song(self, song: Song) -> bool:
+        """
+        Start playing a song, waiting until its file is ready if needed.
+
+        Args:
+            song: The song to play
+
+        Returns:
+            True if the song started, False if its file could not be made ready
+        """
+        if self._track_source is not None:
+            if not self._track_source.ensure_ready(song.file_path, self.TRACK_READY_TIMEOUT):
+                return False
+        self._audio_player.play(song.file_path)
+        # Starting a track clears whatever the player had queued after the old one
+        self._queued_path = None
+        self._queue_next_song()
+        self._prepare_neighbours()
+        return True
+
+    def _prepare_first_song(self) -> None:
+        """Let the audio player drop what it prepared for the old queue and ready the new one."""
+        first = self._next_index()
+        self._audio_player.prepare([self._queue[first].file_path] if first is not None else [])
+
+    def _prepare_neighbours(self) -> None:
+        """Let the audio player ready the songs a skip would play: next, then previous."""
+        neighbours = [self._next_index(), self._previous_index()]
+        self._audio_player.prepare(
+            [self._queue[index].file_path for index in neighbours if index is not None]
+        )
+
+    def _requeue_neighbours(self) -> None:
+        """Hand the audio player the songs around the current one again after a change."""
+        if self._current_song is not None:
+            self._queue_next_song()
+            self._prepare_neighbours()
+        else:
+            # The song play() would start may have changed
+            self._prepare_first_song()
+
+    def _queue_next_song(self) -> None:
+        """Hand the song after the current one to the audio player for gapless playback."""
+        if not self._gapless:
+            return
+        next_index = self._next_index()
+        path = self._queue[next_index].file_path if next_index is not None else None
+        # A track that is still being extracted is queued on a later status check
+        if path is not None and self._track_source is not None:
+            if not self._track_source.ensure_ready(path, 0):
+                path = None
+        if path != self._queued_path:
+            self._audio_player.queue_next(path)
+            self._queued_path = path
 
     def seek(self, position_secs: float) -> None:
         """
@@ -120,40 +421,145 @@ class PlayerService(Subject):
 
     def get_current_song(self) -> Optional[Song]:
         """
-        Get the currently playing song.
+        Get the currently playing song, from the latest snapshot.
 
         Returns:
             Current song or None if nothing is playing
         """
-        return self._current_song
+        return self._snapshot.song
 
     def get_queue(self) -> list[Song]:
         """
         Get the current playback queue.
 
+        This copies the whole queue; to show part of a long queue use
+        get_queue_window.
+
         Returns:
             List of songs in the queue
         """
-        return self._queue.copy()
+        return list(self._queue)
+
+    def get_queue_window(self, before: int = 5, after: int = 5) -> tuple[int, list[Song]]:
+        """
+        Get the songs around the current one (the song play() starts if none is current).
+
+        Args:
+            before: Maximum number of songs before it
+            after: Maximum number of songs after it
+
+        Returns:
+            Tuple of the queue position of the first song returned and the songs
+        """
+        index = self._current_index
+        if index < 0:
+            index = self._next_index() or 0
+        return self._queue.around(index, before, after)
+
+    def get_queue_length(self) -> int:
+        """
+        Get the number of songs in the queue.
+
+        Returns:
+            Number of songs
+        """
+        return len(self._queue)
+
+    def get_queue_version(self) -> int:
+        """
+        Get the number of changes made to the queue, to skip rereading an unchanged queue.
+
+        Returns:
+            Version that increases with every load or edit of the queue
+        """
+        return self._queue.version
 
     def get_state(self) -> str:
         """
-        Get the current playback state.
+        Get the playback state, from the latest snapshot.
 
         Returns:
-            State string from the audio player
+            State string: 'playing', 'paused', 'stopped', or 'idle'
         """
-        return self._audio_player.get_state()
+        return self._snapshot.state
 
     def get_position(self) -> Optional[float]:
         """
-        Get the current playback position.
+        Get the playback position from the audio player.
+
+        Unlike the snapshot's extrapolated position, this follows what is
+        actually heard through underruns, decoder restarts and pauses.
 
         Returns:
             Position in seconds or None
         """
         return self._audio_player.get_position()
 
+    def get_position_anchor(self) -> Optional[tuple[float, float]]:
+        """
+        Get the playback position together with the time it applies to.
+
+        Sampled from the audio player now; polling frontends extrapolate
+        from the anchor of get_snapshot() instead.
+
+        Returns:
+            (position in seconds, time.monotonic() value it was sampled at),
+            or None if not playing
+        """
+        return self._audio_player.get_position_anchor()
+
+    def get_snapshot(self) -> PlaybackSnapshot:
+        """
+        Get the latest published state of the player.
+
+        Cheap and safe from any thread: it returns the current immutable
+        snapshot without locking or asking the audio player, so frontends
+        can poll it as often as they like. Use snapshot.position() for the
+        playback position.
+
+        Returns:
+            The snapshot published with the latest change
+        """
+        return self._snapshot
+
+    def notify(self, event_type: str, data: Any) -> None:
+        """
+        Publish a new snapshot, then notify all registered observers.
+
+        Args:
+            event_type: Type of event
+            data: Event data
+        """
+        self._publish()
+        super().notify(event_type, data)
+
+    def _publish(self) -> None:
+        """Build a snapshot of the current state and swap it in."""
+        state = self._audio_player.get_state()
+        anchor = None
+        if self._current_song is not None and state in ("playing", "paused"):
+            anchor = self._audio_player.get_position_anchor()
+        # A single reference assignment, so readers see the old or the new snapshot
+        self._snapshot = PlaybackSnapshot(
+            version=next(self._snapshot_versions),
+            state=state,
+            song=self._current_song,
+            index=self._current_index,
+            position_anchor=anchor,
+            volume=self._volume,
+            queue_length=len(self._queue),
+            queue_version=self._queue.version,
+        )
+
+    def get_buffer_stats(self) -> Optional[BufferStats]:
+        """
+        Get live counters of the audio player's decode-ahead buffer.
+
+        Returns:
+            BufferStats, or None if the audio player does not buffer audio itself
+        """
+        return self._audio_player.get_buffer_stats()
+
     def set_volume(self, volume: float) -> None:
         """
         Set the playback volume.
@@ -162,20 +568,77 @@ class PlayerService(Subject):
             volume: Volume level from 0.0 to 1.0
         """
         self._audio_player.set_volume(volume)
-        self.notify("volume_changed", volume)
+        self._volume = max(0.0, min(1.0, volume))
+        self.notify("volume_changed", self._volume)
+
+    def set_track_finished_handler(self, handler: Optional[TrackFinishedCallback]) -> None:
+        """
+        Route the audio player's end-of-track reports to another handler.
+
+        The handler must end up calling on_track_finished, e.g. by running
+        a TrackFinishedCommand on a CommandBus so the report does not race
+        with other commands.
+
+        Args:
+            handler: The handler, or None to call on_track_finished directly
+        """
+        self._track_end_events = self._audio_player.set_track_finished_callback(
+            handler if handler is not None else self.on_track_finished
+        )
+
+    @property
+    def track_end_events(self) -> bool:
+        """Whether the audio player pushes track ends (no need to poll check_playback_status)."""
+        return bool(self._track_end_events)
+
+    def on_track_finished(self, file_path: str) -> None:
+        """
+        Handle the audio player reporting that a file played to its end.
+
+        Advances to the next song (or follows the audio player onto the
+        queued one). Reports for a song that is no longer current, because
+        the user skipped in the meantime, are ignored.
+
+        Args:
+            file_path: Path of the file that finished
+        """
+        if self._current_song is None or self._current_song.file_path != file_path:
+            return
+        self.notify("track_finished", self._current_song)
+        self.check_playback_status()
 
     def check_playback_status(self) -> None:
         """
         Check the status of playback and advance if necessary.
         
-        This method should be called periodically by the main loop.
-        If the audio player reports 'idle' but we have a current song,
-        it means the track finished naturally.
+        Called when the audio player reports the end of a track, and should
+        be polled by the main loop for players that do not (see
+        track_end_events). If the audio player reports 'idle' but we have a
+        current song, it means the track finished naturally.
         """
         state = self._audio_player.get_state()
-        
+        next_index = self._next_index()
+
+        # The player continued with the queued song on its own (gapless)
+        if (
+            self._current_song is not None
+            and next_index is not None
+            and self._queued_path is not None
+            and state == "playing"
+            and self._audio_player.get_current_file() == self._queued_path
+        ):
+            self._current_index = next_index
+            self._current_song = self._queue[self._current_index]
+            self._queued_path = None
+            self._queue_next_song()
+            self._prepare_neighbours()
+            self.notify("track_started", self._current_song)
+            return
+
         # If we think we are playing (current_song is set) but player is idle,
         # then the track finished.
         if self._current_song is not None and state == "idle":
             # Advance to next track
             self.next()
+        elif self._current_song is not None and self._queued_path is None:
+            self._queue_next_song()
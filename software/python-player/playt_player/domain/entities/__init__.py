@@ -3,9 +3,10 @@
 from .album import Album
 from .cartridge import Cartridge
 from .library import Library
+from .play_queue import PlayQueue
 from .song import Song
 
-__all__ = ["Album", "Cartridge", "Library", "Song"]
+__all__ = ["Album", "Cartridge", "Library", "PlayQueue", "Song"]
 
 
 
@@ -0,0 +1,303 @@
+"""Play queue entity that stays cheap to edit and read at library size."""
+
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Optional, TypeVar, Union, overload
+
+T = TypeVar("T")
+
+
+class PlayQueue(Sequence[T]):
+    """
+    Ordered queue of items (songs) for queues as long as a whole library.
+
+    Items are kept in chunks of about CHUNK_SIZE, with a Fenwick tree over the
+    chunk lengths to find the chunk holding a position. This gives:
+
+    - append and pop at the end in amortized O(1)
+    - indexing, insert, pop and move anywhere in O(log n + CHUNK_SIZE)
+    - windows of k items (window, around) in O(log n + k), without copying
+      the rest of the queue
+
+    Every change increments version, so consumers can tell whether the
+    queue changed since they last read it without comparing contents.
+
+    The queue does no locking; it is owned by PlayerService.
+    """
+
+    # Target number of items per chunk; chunks are split at twice this size
+    CHUNK_SIZE = 512
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            items: Initial items, in order
+        """
+        self._chunks: list[list[T]] = []
+        self._len = 0
+        # Fenwick tree over chunk lengths (1-based); None until a lookup needs it
+        self._tree: Optional[list[int]] = None
+        self._version = 0
+        self._fill(items)
+
+    @property
+    def version(self) -> int:
+        """Number of changes made to the queue so far."""
+        return self._version
+
+    def __len__(self) -> int:
+        return self._len
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, list[T]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                return self.window(start, stop - start)
+            return [self[i] for i in range(start, stop, step)]
+        chunk, offset = self._locate(self._normalize(index))
+        return self._chunks[chunk][offset]
+
+    def __iter__(self) -> Iterator[T]:
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __repr__(self) -> str:
+        return f"PlayQueue(items={self._len}, version={self._version})"
+
+    def append(self, item: T) -> None:
+        """
+        Add an item to the end of the queue.
+
+        Args:
+            item: The item
+        """
+        self._append(item)
+        self._version += 1
+
+    def extend(self, items: Iterable[T]) -> None:
+        """
+        Add items to the end of the queue.
+
+        Args:
+            items: The items, in order
+        """
+        for item in items:
+            self._append(item)
+        self._version += 1
+
+    def insert(self, index: int, item: T) -> None:
+        """
+        Insert an item before a position, like list.insert.
+
+        Args:
+            index: Position (negative counts from the end; clamped to the queue)
+            item: The item
+        """
+        if index < 0:
+            index = max(0, index + self._len)
+        self._insert(min(index, self._len), item)
+        self._version += 1
+
+    def pop(self, index: int = -1) -> T:
+        """
+        Remove and return the item at a position.
+
+        Args:
+            index: Position (default: the last item)
+
+        Returns:
+            The removed item
+
+        Raises:
+            IndexError: If the queue is empty or the position is out of range
+        """
+        item = self._pop(self._normalize(index))
+        self._version += 1
+        return item
+
+    def move(self, source: int, destination: int) -> None:
+        """
+        Move an item to another position.
+
+        Args:
+            source: Current position of the item
+            destination: Position of the item once moved
+
+        Raises:
+            IndexError: If either position is out of range
+        """
+        source = self._normalize(source)
+        destination = self._normalize(destination)
+        if source != destination:
+            self._insert(destination, self._pop(source))
+            self._version += 1
+
+    def replace(self, items: Iterable[T]) -> None:
+        """
+        Replace the whole contents of the queue.
+
+        Args:
+            items: The new items, in order
+        """
+        self._chunks = []
+        self._len = 0
+        self._tree = None
+        self._fill(items)
+        self._version += 1
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self.replace(())
+
+    def window(self, start: int, count: int) -> list[T]:
+        """
+        Get up to count items from a position on, without touching the rest.
+
+        Args:
+            start: Position of the first item (clamped to the queue)
+            count: Maximum number of items
+
+        Returns:
+            The items (fewer near the end of the queue)
+        """
+        start = max(0, start)
+        if count <= 0 or start >= self._len:
+            return []
+        chunk, offset = self._locate(start)
+        items: list[T] = []
+        while len(items) < count and chunk < len(self._chunks):
+            items.extend(self._chunks[chunk][offset : offset + count - len(items)])
+            chunk += 1
+            offset = 0
+        return items
+
+    def around(self, index: int, before: int, after: int) -> tuple[int, list[T]]:
+        """
+        Get the items around a position, e.g. to show the queue near the cursor.
+
+        Args:
+            index: Position in the middle of the window (clamped to the queue)
+            before: Maximum number of items before it
+            after: Maximum number of items after it
+
+        Returns:
+            Tuple of the position of the first item and the items
+        """
+        index = max(0, min(index, self._len - 1))
+        start = max(0, index - before)
+        return start, self.window(start, index - start + after + 1)
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("PlayQueue index out of range")
+        return index
+
+    def _fill(self, items: Iterable[T]) -> None:
+        chunk_size = self.CHUNK_SIZE
+        values = list(items)
+        self._chunks = [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
+        self._len = len(values)
+        self._tree = None
+
+    def _build_tree(self) -> list[int]:
+        """Build the Fenwick tree over the chunk lengths in O(chunks)."""
+        tree = [0] + [len(chunk) for chunk in self._chunks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+        return tree
+
+    def _prefix(self, tree: list[int], chunks: int) -> int:
+        """Number of items in the first chunks chunks."""
+        total = 0
+        while chunks > 0:
+            total += tree[chunks]
+            chunks -= chunks & -chunks
+        return total
+
+    def _add(self, chunk: int, delta: int) -> None:
+        """Record that a chunk grew or shrank by delta items."""
+        tree = self._tree
+        if tree is None:
+            return
+        # Only the chunk's own node for the last chunk, so appends stay O(1)
+        i = chunk + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Find the chunk holding a position and the offset within it."""
+        tree = self._tree if self._tree is not None else self._build_tree()
+        chunk = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            node = chunk + step
+            if node < len(tree) and tree[node] <= index:
+                chunk = node
+                index -= tree[node]
+            step >>= 1
+        return chunk, index
+
+    def _append(self, item: T) -> None:
+        if self._chunks and len(self._chunks[-1]) < self.CHUNK_SIZE:
+            self._chunks[-1].append(item)
+            self._add(len(self._chunks) - 1, 1)
+        else:
+            self._chunks.append([item])
+            tree = self._tree
+            if tree is not None:
+                # New last node covers its own chunk and the chunks before it it spans
+                node = len(tree)
+                low = node - (node & -node)
+                tree.append(1 + self._prefix(tree, node - 1) - self._prefix(tree, low))
+        self._len += 1
+
+    def _insert(self, index: int, item: T) -> None:
+        if index == self._len:
+            self._append(item)
+            return
+        chunk, offset = self._locate(index)
+        values = self._chunks[chunk]
+        values.insert(offset, item)
+        self._len += 1
+        if len(values) > 2 * self.CHUNK_SIZE:
+            half = len(values) // 2
+            self._chunks[chunk : chunk + 1] = [values[:half], values[half:]]
+            self._tree = None
+        else:
+            self._add(chunk, 1)
+
+    def _pop(self, index: int) -> T:
+        chunk, offset = self._locate(index)
+        values = self._chunks[chunk]
+        item = values.pop(offset)
+        self._len -= 1
+        last = chunk == len(self._chunks) - 1
+        if not values:
+            del self._chunks[chunk]
+            if last and self._tree is not None:
+                self._tree.pop()
+            else:
+                self._tree = None
+        elif not last and len(values) < self.CHUNK_SIZE // 2:
+            # Merge small chunks into the next one to keep lookups short
+            values.extend(self._chunks.pop(chunk + 1))
+            if len(values) > 2 * self.CHUNK_SIZE:
+                half = len(values) // 2
+                self._chunks[chunk : chunk + 1] = [values[:half], values[half:]]
+            self._tree = None
+        else:
+            self._add(chunk, -1)
+        return item
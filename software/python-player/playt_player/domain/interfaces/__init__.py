@@ -1,10 +1,19 @@
 """Domain interfaces defining contracts for implementations."""
 
-from .audio_player import AudioPlayerInterface
+from .audio_player import AudioPlayerInterface, BufferStats, TrackFinishedCallback
 from .cartridge_reader import CartridgeReaderInterface
 from .observer import Observer, Subject
-
-__all__ = ["AudioPlayerInterface", "CartridgeReaderInterface", "Observer", "Subject"]
+from .track_source import TrackSourceInterface
+
+__all__ = [
+    "AudioPlayerInterface",
+    "BufferStats",
+    "CartridgeReaderInterface",
+    "Observer",
+    "Subject",
+    "TrackFinishedCallback",
+    "TrackSourceInterface",
+]
 
 
 
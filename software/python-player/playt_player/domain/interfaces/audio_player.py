@@ -1,7 +1,34 @@
 """Audio player interface following the Strategy/Adapter pattern."""
 
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# Called with the path of a file that played to its end
+TrackFinishedCallback = Callable[[str], None]
+
+
+@dataclass(frozen=True)
+class BufferStats:
+    """
+    Snapshot of a player's decode-ahead buffer, for tuning buffer sizes per device.
+
+    Attributes:
+        capacity_ms: Audio the buffer holds when full
+        fill_ms: Audio currently buffered
+        underruns: Times the output ran dry in the middle of a track
+        decoder_stall_secs: Total time the output waited on the decoder after running dry
+        refill_latency_ms: Time from the last flush (play, seek) until audio was buffered again
+        slowest_read_ms: Longest single decoder read
+    """
+
+    capacity_ms: float
+    fill_ms: float
+    underruns: int
+    decoder_stall_secs: float
+    refill_latency_ms: float
+    slowest_read_ms: float
 
 
 class AudioPlayerInterface(ABC):
@@ -62,6 +89,34 @@ class AudioPlayerInterface(ABC):
         """
         pass
 
+    def get_position_anchor(self) -> Optional[tuple[float, float]]:
+        """
+        Get the playback position together with the time it applies to.
+
+        Callers that animate progress (progress bars, lyrics, visuals)
+        extrapolate from the anchor with time.monotonic() instead of
+        polling get_position. Players that know what has actually been
+        handed to the audio output report the audible position; the default
+        pairs get_position with the current time.
+
+        Returns:
+            (position in seconds, time.monotonic() value it was sampled at),
+            or None if not playing
+        """
+        position = self.get_position()
+        if position is None:
+            return None
+        return position, time.monotonic()
+
+    def get_buffer_stats(self) -> Optional[BufferStats]:
+        """
+        Get live counters of the decode-ahead buffer.
+
+        Returns:
+            BufferStats, or None if the player does not buffer audio itself
+        """
+        return None
+
     @abstractmethod
     def get_state(self) -> str:
         """
@@ -92,4 +147,66 @@ class AudioPlayerInterface(ABC):
         """
         pass
 
+    def queue_next(self, file_path: Optional[str]) -> None:  # noqa: B027
+        """
+        Announce the file to play once the current one ends.
+
+        Optional hook, a no-op by default. Players that support gapless
+        playback start decoding it ahead of time and continue with it
+        without a gap; others ignore the hint and rely on the caller to
+        start the next file.
+
+        Args:
+            file_path: Path to the next audio file, or None to clear it
+        """
+        pass
+
+    def set_track_finished_callback(self, callback: Optional[TrackFinishedCallback]) -> bool:
+        """
+        Register a function to call as soon as a file plays to its end.
+
+        The callback runs on a thread owned by the player and receives the
+        path of the finished file; with gapless playback the queued file is
+        already playing by then. Players that cannot detect the end of a
+        file leave the caller to poll get_state.
+
+        Args:
+            callback: The callback, or None to unregister it
+
+        Returns:
+            True if the player reports the end of files, False if it must be polled
+        """
+        return False
+
+    def prepare(self, file_paths: list[str]) -> None:  # noqa: B027
+        """
+        Announce the files most likely to be played next.
+
+        Optional hook, a no-op by default. Players that pay a startup cost
+        per file (e.g. spawning a process) open them ahead of time so that
+        playing one is immediate, and release whatever they prepared for
+        files not in the list; an empty list releases everything. Others
+        ignore the hint.
 
+        Args:
+            file_paths: Paths of audio files, most likely first
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Release everything the player holds (processes, threads, audio devices).
+
+        Called once when the application exits; the player is not used
+        afterwards. The default stops playback.
+        """
+        self.stop()
+
+    def get_current_file(self) -> Optional[str]:
+        """
+        Get the file currently being played.
+
+        Returns:
+            Path of the current file, or None if unknown or not playing
+        """
+        return None
@@ -5,6 +5,7 @@ from typing import Optional
 
 from ..entities.album import Album
 from ..entities.cartridge import Cartridge
+from .track_source import TrackSourceInterface
 
 
 class CartridgeReaderInterface(ABC):
@@ -54,4 +55,17 @@ class CartridgeReaderInterface(ABC):
         """
         pass
 
+    def get_track_source(self, cartridge: Cartridge) -> Optional[TrackSourceInterface]:
+        """
+        Get the source that materializes the tracks of a loaded cartridge.
+
+        Readers whose albums are fully playable as soon as they are loaded
+        do not need to override this.
+
+        Args:
+            cartridge: A cartridge previously passed to load_album_from_cartridge
 
+        Returns:
+            Track source to consult before playing, or None if not needed
+        """
+        return None
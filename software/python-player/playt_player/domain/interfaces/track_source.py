@@ -0,0 +1,28 @@
+"""Track source interface for media that becomes playable incrementally."""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class TrackSourceInterface(ABC):
+    """
+    Abstract interface for sources whose tracks are materialized over time.
+
+    A cartridge may hand out an album before every track file exists (for
+    example while its archive is still being extracted). The application
+    layer asks the source to make a track ready right before playing it.
+    """
+
+    @abstractmethod
+    def ensure_ready(self, file_path: str, timeout: Optional[float] = None) -> bool:
+        """
+        Make a track playable, waiting for it if necessary.
+
+        Args:
+            file_path: The song's file path
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the track can be played, False if it failed or timed out
+        """
+        pass
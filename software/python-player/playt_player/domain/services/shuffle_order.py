@@ -0,0 +1,172 @@
+"""Shuffled play order computed on demand from a seed."""
+
+from typing import Optional
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(value: int) -> int:
+    """SplitMix64 finalizer: a fast, well-distributed bijection on 64-bit integers."""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+class ShuffleOrder:
+    """
+    A random permutation of the positions of a queue, evaluated lazily.
+
+    Nothing is allocated per item: position p of the shuffled order is
+    mapped to a queue index by a small Feistel network keyed by the seed,
+    a bijection on the smallest power of four covering the queue. Values
+    that fall outside the queue are mapped again ("cycle walking"), fewer
+    than four times on average, so both directions are O(1) and the same
+    seed always gives the same order. (seed, first) is all that needs to
+    be stored to restore an order.
+    """
+
+    # Feistel rounds; four make a strong pseudo-random permutation
+    ROUNDS = 4
+
+    def __init__(self, length: int, seed: int, first: Optional[int] = None) -> None:
+        """
+        Initialize the order.
+
+        Args:
+            length: Number of items in the queue
+            seed: Seed selecting the permutation
+            first: Queue index to play first, e.g. the current song when
+                shuffle is turned on (default: wherever the seed puts it)
+
+        Raises:
+            ValueError: If length is negative
+            IndexError: If first is not an index of the queue
+        """
+        if length < 0:
+            raise ValueError("Queue length must not be negative")
+        self._length = length
+        self._seed = seed
+        # Split the smallest even number of bits covering every index into halves
+        self._half_bits = max(1, ((length - 1).bit_length() + 1) // 2) if length > 1 else 1
+        self._half_mask = (1 << self._half_bits) - 1
+        keys = []
+        state = seed & _MASK64
+        for _ in range(self.ROUNDS):
+            state = _mix64(state)
+            keys.append(state)
+        self._keys = keys
+        # Rotate the permutation so that position 0 is the requested first index
+        self._offset = 0
+        if first is not None:
+            self._offset = self._decrypt(self._check_index(first))
+
+    @property
+    def length(self) -> int:
+        """Number of items in the queue."""
+        return self._length
+
+    @property
+    def seed(self) -> int:
+        """Seed selecting the permutation."""
+        return self._seed
+
+    @property
+    def first(self) -> int:
+        """Queue index played first."""
+        return self.index_at(0)
+
+    def index_at(self, position: int) -> int:
+        """
+        Get the queue index at a position of the shuffled order.
+
+        Args:
+            position: Position in the shuffled order, from 0
+
+        Returns:
+            Queue index of the item played at that position
+
+        Raises:
+            IndexError: If position is out of range
+        """
+        position = self._check_index(position)
+        return self._encrypt((position + self._offset) % self._length)
+
+    def position_of(self, index: int) -> int:
+        """
+        Get the position of a queue index in the shuffled order.
+
+        Args:
+            index: Queue index
+
+        Returns:
+            Position in the shuffled order, from 0
+
+        Raises:
+            IndexError: If index is out of range
+        """
+        return (self._decrypt(self._check_index(index)) - self._offset) % self._length
+
+    def next_index(self, index: int) -> Optional[int]:
+        """
+        Get the queue index played after another one.
+
+        Args:
+            index: Queue index
+
+        Returns:
+            Queue index of the next item, or None after the last
+        """
+        position = self.position_of(index) + 1
+        return self.index_at(position) if position < self._length else None
+
+    def previous_index(self, index: int) -> Optional[int]:
+        """
+        Get the queue index played before another one.
+
+        Args:
+            index: Queue index
+
+        Returns:
+            Queue index of the previous item, or None before the first
+        """
+        position = self.position_of(index) - 1
+        return self.index_at(position) if position >= 0 else None
+
+    def __repr__(self) -> str:
+        # An empty order has no first index
+        first = self.first if self._length else None
+        return f"ShuffleOrder(length={self._length}, seed={self._seed}, first={first})"
+
+    def _check_index(self, index: int) -> int:
+        if not 0 <= index < self._length:
+            raise IndexError("Shuffle position out of range")
+        return index
+
+    def _round(self, key: int, half: int) -> int:
+        return _mix64(key ^ half) & self._half_mask
+
+    def _permute(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(key, right)
+        return (left << self._half_bits) | right
+
+    def _unpermute(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for key in reversed(self._keys):
+            left, right = right ^ self._round(key, left), left
+        return (left << self._half_bits) | right
+
+    def _encrypt(self, value: int) -> int:
+        # Walk the permutation's cycle until it lands back inside the queue
+        value = self._permute(value)
+        while value >= self._length:
+            value = self._permute(value)
+        return value
+
+    def _decrypt(self, value: int) -> int:
+        value = self._unpermute(value)
+        while value >= self._length:
+            value = self._unpermute(value)
+        return value
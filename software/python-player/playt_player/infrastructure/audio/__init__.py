@@ -1,8 +1,42 @@
 """Audio playback implementations."""
 
+from .crossfade import CROSSFADE_CURVES, Crossfade
 from .ffmpeg_audio_player import FFmpegAudioPlayer
-
-__all__ = ["FFmpegAudioPlayer"]
+from .gain_stage import GainStage
+from .output_sink import (
+    OUTPUT_SINKS,
+    FFplaySink,
+    NullSink,
+    OutputSink,
+    PacedNullSink,
+    SoundDeviceSink,
+    WavCaptureSink,
+    create_sink,
+)
+from .pcm_audio_player import PcmAudioPlayer
+from .pcm_decoder import PcmDecoder, open_decoder
+from .playback_supervisor import PlaybackSupervisor
+from .ring_buffer import PcmRingBuffer
+
+__all__ = [
+    "CROSSFADE_CURVES",
+    "OUTPUT_SINKS",
+    "Crossfade",
+    "FFmpegAudioPlayer",
+    "FFplaySink",
+    "GainStage",
+    "NullSink",
+    "OutputSink",
+    "PacedNullSink",
+    "PcmAudioPlayer",
+    "PcmDecoder",
+    "PcmRingBuffer",
+    "PlaybackSupervisor",
+    "SoundDeviceSink",
+    "WavCaptureSink",
+    "create_sink",
+    "open_decoder",
+]
 
 
 
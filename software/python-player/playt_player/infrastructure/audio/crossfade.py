@@ -0,0 +1,179 @@
+"""Crossfades between consecutive tracks, computed on whole blocks of PCM."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+# Maps fade progress in [0, 1] to the gain of the incoming track; the
+# outgoing track uses the mirrored curve, curve(1 - progress)
+CrossfadeCurve = Callable[[np.ndarray], np.ndarray]
+
+
+def equal_power(progress: np.ndarray) -> np.ndarray:
+    """Constant-power curve: the summed power stays flat for uncorrelated tracks."""
+    return np.sin(progress * (np.pi / 2))
+
+
+def linear(progress: np.ndarray) -> np.ndarray:
+    """Constant-gain curve: suited to correlated material such as continuous mixes."""
+    return progress
+
+
+CROSSFADE_CURVES: dict[str, CrossfadeCurve] = {
+    "equal-power": equal_power,
+    "linear": linear,
+}
+
+
+class Crossfade:
+    """
+    Overlaps the tail of one track with the head of the next.
+
+    The gain curves are computed once as float32 column vectors, so mixing a
+    block is two multiplications and an addition over the whole block.
+    """
+
+    def __init__(self, frames: int, curve: Union[str, CrossfadeCurve] = equal_power) -> None:
+        """
+        Precompute the fade.
+
+        Args:
+            frames: Length of the overlap in frames
+            curve: A name from CROSSFADE_CURVES or a custom curve
+
+        Raises:
+            ValueError: If the curve name is unknown
+        """
+        if isinstance(curve, str):
+            if curve not in CROSSFADE_CURVES:
+                raise ValueError(f"Unknown crossfade curve: {curve}")
+            curve = CROSSFADE_CURVES[curve]
+        self._curve = curve
+        self.frames = max(0, frames)
+
+        # Sample the curve at the middle of each frame so both ends are symmetric
+        progress = (np.arange(self.frames, dtype=np.float64) + 0.5) / max(1, self.frames)
+        self._fade_in = np.asarray(curve(progress), dtype=np.float32).reshape(-1, 1)
+        self._fade_out = np.asarray(curve(1.0 - progress), dtype=np.float32).reshape(-1, 1)
+
+    @classmethod
+    def from_seconds(
+        cls, seconds: float, sample_rate: int, curve: Union[str, CrossfadeCurve] = equal_power
+    ) -> Crossfade:
+        """
+        Create a crossfade of a given duration.
+
+        Args:
+            seconds: Length of the overlap
+            sample_rate: Sample rate of the PCM it will mix
+            curve: A name from CROSSFADE_CURVES or a custom curve
+
+        Returns:
+            The crossfade
+        """
+        return cls(int(round(seconds * sample_rate)), curve)
+
+    def shortened(self, frames: int) -> Crossfade:
+        """
+        Get the same fade squeezed into fewer frames (for tracks shorter than the fade).
+
+        Args:
+            frames: Length of the overlap in frames
+
+        Returns:
+            This crossfade if it is not longer than frames, otherwise a shorter one
+        """
+        if frames >= self.frames:
+            return self
+        return Crossfade(frames, self._curve)
+
+    def mix(
+        self,
+        tail: np.ndarray,
+        head: np.ndarray,
+        offset: int = 0,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Mix one block of the overlap.
+
+        Args:
+            tail: Block of the outgoing track, float32 of shape (frames, channels)
+            head: Block of the incoming track; zero-padded if shorter than tail
+            offset: Position of the block within the fade, in frames; the block
+                must end within the fade
+            out: Optional preallocated array of the same shape as tail
+
+        Returns:
+            The mixed block (out if given)
+        """
+        frames = len(tail)
+        fade_out = self._fade_out[offset : offset + frames]
+        fade_in = self._fade_in[offset : offset + frames]
+        if out is None:
+            out = np.empty_like(tail)
+        np.multiply(tail, fade_out, out=out)
+        overlap = min(len(head), frames)
+        out[:overlap] += head[:overlap] * fade_in[:overlap]
+        return out
+
+
+class TailBuffer:
+    """
+    Holds back the last frames of a track for the crossfade into the next one.
+
+    Decoded blocks are kept as they are and released whole once enough
+    later frames follow them, so holding back the tail costs no copy per
+    block; the tail is assembled once, when the tracks are spliced.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty buffer."""
+        self._blocks: deque[np.ndarray] = deque()
+        self.frames = 0
+
+    def push(self, block: np.ndarray, keep: int) -> list[np.ndarray]:
+        """
+        Add a block and release the blocks that are not needed for the last frames.
+
+        Args:
+            block: Next block of the track
+            keep: Number of frames to hold back (0 releases everything)
+
+        Returns:
+            Released blocks, oldest first
+        """
+        self._blocks.append(block)
+        self.frames += len(block)
+        released = []
+        while self._blocks and self.frames - len(self._blocks[0]) >= keep:
+            oldest = self._blocks.popleft()
+            self.frames -= len(oldest)
+            released.append(oldest)
+        return released
+
+    def take(self, keep: int) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Empty the buffer, splitting off its last frames.
+
+        Args:
+            keep: Number of frames to split off the end
+
+        Returns:
+            Tuple of the frames before the last keep frames and the last keep
+            frames; either is None if it would be empty
+        """
+        if not self._blocks:
+            return None, None
+        frames = self._blocks[0] if len(self._blocks) == 1 else np.concatenate(self._blocks)
+        self.clear()
+        cut = max(0, len(frames) - keep)
+        return (frames[:cut] if cut else None), (frames[cut:] if cut < len(frames) else None)
+
+    def clear(self) -> None:
+        """Drop everything held back."""
+        self._blocks.clear()
+        self.frames = 0
@@ -9,15 +9,47 @@ import subprocess
 import time
 from typing import Optional
 
-from ...domain.interfaces.audio_player import AudioPlayerInterface
+from ...domain.interfaces.audio_player import AudioPlayerInterface, TrackFinishedCallback
+from ..cartridge.archive_member import feed_member, feed_track, ffmpeg_input
+from .playback_supervisor import PlaybackSupervisor
 
 
 class FFmpegAudioPlayer(AudioPlayerInterface):
     """
     Audio player implementation that shells out to ffplay.
+
+    A waiter thread blocks on each ffplay process and reports the file
+    through a PlaybackSupervisor when it exits on its own.
+
+    Spawning ffplay dominates the cost of starting a track, so the files
+    announced with prepare (the next and previous tracks) get a pre-spawned
+    process that reads from an empty pipe: it has loaded and initialized,
+    and waits at position 0 for input. Playing such a file only starts
+    feeding the pipe. Each process remembers the volume it was started
+    with; after a volume change the stale ones are respawned lazily, on the
+    next prepare or when their file is played. close() ends every process.
     """
 
-    def __init__(self, ffplay_path: Optional[str] = None) -> None:
+    # Processes kept ready for upcoming files (the next and previous tracks)
+    DEFAULT_POOL_SIZE = 2
+    # Containers ffplay cannot open from a pipe (their index may follow the audio)
+    UNPOOLED_EXTENSIONS = frozenset({".m4a", ".m4b", ".mp4", ".mov"})
+    # Seconds to wait for a terminated process to exit before killing it
+    EXIT_TIMEOUT = 2.0
+
+    def __init__(
+        self, ffplay_path: Optional[str] = None, pool_size: int = DEFAULT_POOL_SIZE
+    ) -> None:
+        """
+        Initialize the player.
+
+        Args:
+            ffplay_path: Path to ffplay (default: found on PATH)
+            pool_size: Number of files to keep a pre-spawned process for (0 to disable)
+
+        Raises:
+            RuntimeError: If ffplay is not available
+        """
         self._ffplay_path = ffplay_path or shutil.which("ffplay")
         if not self._ffplay_path:
             raise RuntimeError(
@@ -28,12 +60,20 @@ class FFmpegAudioPlayer(AudioPlayerInterface):
         self._state: str = "idle"
         self._current_file: Optional[str] = None
         
-        # Time tracking for position
+        # Time tracking for position (monotonic, so clock adjustments don't move it)
         self._start_time: float = 0.0
         self._accumulated_time: float = 0.0
         
         # Volume (0.0 to 1.0), mapped to 0-100 for ffplay
         self._volume: float = 1.0
+        self._supervisor = PlaybackSupervisor()
+        # Process whose exit means its file played to the end (cleared when we end it)
+        self._watched: Optional[subprocess.Popen[bytes]] = None
+
+        self._pool_size = max(0, pool_size)
+        # Pre-spawned processes waiting on an empty stdin, with the ffplay volume
+        # they were started at, by the file they are kept for
+        self._pool: dict[str, tuple[subprocess.Popen[bytes], int]] = {}
 
     # --------------------------------------------------------------------- #
     # Internal helpers
@@ -47,15 +87,24 @@ class FFmpegAudioPlayer(AudioPlayerInterface):
             self._start_time = 0.0
 
     def _terminate_process(self) -> None:
-        if self._process and self._process.poll() is None:
-            self._process.terminate()
-            try:
-                self._process.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                self._process.kill()
-        self._process = None
+        # Unwatched first so its waiter thread does not report it as finished
+        self._watched = None
+        process, self._process = self._process, None
+        if process:
+            self._end(process)
         # Don't clear _current_file here as we might be seeking/pausing
 
+    @classmethod
+    def _end(cls, process: subprocess.Popen[bytes]) -> None:
+        """Terminate a process and reap it, killing it if it does not exit in time."""
+        if process.poll() is None:
+            process.terminate()
+        try:
+            process.wait(timeout=cls.EXIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
     def _supports_posix_signals(self) -> bool:
         return os.name == "posix"
 
@@ -67,11 +116,27 @@ class FFmpegAudioPlayer(AudioPlayerInterface):
         if not file_path or not isinstance(file_path, (str, bytes, os.PathLike)):
              raise ValueError(f"Invalid file path: {file_path}")
 
-        # Clamp volume between 0 and 100
-        ff_volume = max(0, min(100, int(self._volume * 100)))
+        # Members of a .playt archive are read in place (stored) or piped (compressed)
+        source, piped_member = ffmpeg_input(file_path)
+
+        cmd = self._ffplay_command(source, start_pos)
+        if piped_member is None:
+            process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL)
+        else:
+            process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+            if process.stdin is not None:
+                feed_member(piped_member, process.stdin)
+        self._activate(process, file_path, start_pos)
+
+    def _ffplay_volume(self) -> int:
+        """The current volume on ffplay's 0-100 scale."""
+        return max(0, min(100, int(self._volume * 100)))
 
-        cmd = [
-            self._ffplay_path,
+    def _ffplay_command(self, source: str, start_pos: float) -> list[str]:
+        """Build the ffplay command line for an input at the current volume."""
+        ff_volume = self._ffplay_volume()
+        return [
+            self._ffplay_path or "ffplay",
             "-nodisp",
             "-autoexit",
             "-loglevel",
@@ -80,12 +145,19 @@ class FFmpegAudioPlayer(AudioPlayerInterface):
             str(ff_volume),
             "-ss",
             str(start_pos),
-            file_path,
+            source,
         ]
-        self._process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL)
+
+    def _activate(
+        self, process: subprocess.Popen[bytes], file_path: str, start_pos: float
+    ) -> None:
+        """Make a started process the current one."""
+        self._process = process
+        self._watched = process
+        self._supervisor.watch(process, file_path, lambda: self._watched is process)
         self._current_file = file_path
         self._state = "playing"
-        self._start_time = time.time()
+        self._start_time = time.monotonic()
         self._accumulated_time = start_pos
 
     # --------------------------------------------------------------------- #
@@ -103,13 +175,18 @@ class FFmpegAudioPlayer(AudioPlayerInterface):
         ):
             os.kill(self._process.pid, signal.SIGCONT)
             self._state = "playing"
-            self._start_time = time.time()
+            self._start_time = time.monotonic()
             return
 
         # Stop existing if any
         self.stop()
 
-        self._start_playback(file_path, 0.0)
+        process = self._take_pooled(file_path)
+        if process is not None and process.stdin is not None:
+            feed_track(file_path, process.stdin)
+            self._activate(process, file_path, 0.0)
+        else:
+            self._start_playback(file_path, 0.0)
 
     def pause(self) -> None:
         self._refresh_state()
@@ -120,7 +197,7 @@ class FFmpegAudioPlayer(AudioPlayerInterface):
             os.kill(self._process.pid, signal.SIGSTOP)
             self._state = "paused"
             # Update accumulated time
-            self._accumulated_time += time.time() - self._start_time
+            self._accumulated_time += time.monotonic() - self._start_time
         else:
             # Best effort on non-POSIX: stop playback entirely.
             # We lose resume capability here unless we track it, 
@@ -161,7 +238,7 @@ class FFmpegAudioPlayer(AudioPlayerInterface):
     def get_position(self) -> Optional[float]:
         self._refresh_state()
         if self._state == "playing":
-            return self._accumulated_time + (time.time() - self._start_time)
+            return self._accumulated_time + (time.monotonic() - self._start_time)
         elif self._state == "paused":
             return self._accumulated_time
         return None
@@ -174,6 +251,54 @@ class FFmpegAudioPlayer(AudioPlayerInterface):
         self._refresh_state()
         return self._state == "playing"
 
+    def prepare(self, file_paths: list[str]) -> None:
+        wanted = [
+            path
+            for path in dict.fromkeys(file_paths)
+            if os.path.splitext(path)[1].lower() not in self.UNPOOLED_EXTENSIONS
+        ][: self._pool_size]
+        volume = self._ffplay_volume()
+        # Processes no longer wanted, or started before a volume change
+        stale = [
+            path
+            for path, (_, started_volume) in self._pool.items()
+            if path not in wanted or started_volume != volume
+        ]
+        for path in stale:
+            self._discard(self._pool.pop(path)[0])
+        for path in wanted:
+            if path not in self._pool and self._ffplay_path:
+                process = subprocess.Popen(
+                    self._ffplay_command("pipe:0", 0.0), stdin=subprocess.PIPE
+                )
+                self._pool[path] = (process, volume)
+
+    def _take_pooled(self, file_path: str) -> Optional[subprocess.Popen[bytes]]:
+        """Remove the pre-spawned process for a file from the pool if it is still usable."""
+        entry = self._pool.pop(file_path, None)
+        if entry is None:
+            return None
+        process, volume = entry
+        if process.poll() is not None or volume != self._ffplay_volume():
+            # Exited, or started before a volume change
+            self._discard(process)
+            return None
+        return process
+
+    @classmethod
+    def _discard(cls, process: subprocess.Popen[bytes]) -> None:
+        """End a pre-spawned process that will not be used."""
+        if process.stdin is not None:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+        cls._end(process)
+
+    def set_track_finished_callback(self, callback: Optional[TrackFinishedCallback]) -> bool:
+        self._supervisor.set_callback(callback)
+        return True
+
     def set_volume(self, volume: float) -> None:
         self._volume = max(0.0, min(1.0, volume))
         
@@ -187,4 +312,13 @@ class FFmpegAudioPlayer(AudioPlayerInterface):
             
             self._terminate_process()
             self._start_playback(current_file, pos)
+        # Pre-spawned processes at the old volume are replaced when next prepared or played
+
+    def close(self) -> None:
+        """Stop playback and end every pre-spawned process."""
+        self.stop()
+        for process, _ in self._pool.values():
+            self._discard(process)
+        self._pool.clear()
+        self._supervisor.close()
 
@@ -0,0 +1,83 @@
+"""Software volume applied to blocks of PCM, with short ramps between levels."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class GainStage:
+    """
+    Scales PCM blocks by a gain that can change at any time.
+
+    set_gain only stores the new target, so it is safe to call from any
+    thread and costs next to nothing. The thread processing the blocks
+    moves towards the target with a linear ramp of a few milliseconds
+    instead of jumping, which would be heard as a click ("zipper noise")
+    when the volume is changed in many small steps.
+    """
+
+    def __init__(self, gain: float = 1.0, ramp_frames: int = 0) -> None:
+        """
+        Initialize the stage at a fixed gain.
+
+        Args:
+            gain: Initial gain from 0.0 to 1.0
+            ramp_frames: Length of the ramp to a new gain in frames (0 to jump)
+        """
+        self._target = self._clamp(gain)
+        # Only touched by the thread calling process
+        self._gain = self._target
+        self._ramp_target = self._target
+        self._ramp_frames = max(0, ramp_frames)
+        self._ramp_left = 0
+
+    @staticmethod
+    def _clamp(gain: float) -> float:
+        return max(0.0, min(1.0, float(gain)))
+
+    @property
+    def gain(self) -> float:
+        """The gain the stage is at or ramping towards."""
+        return self._target
+
+    def set_gain(self, gain: float) -> None:
+        """
+        Set a new gain; it takes effect with the next processed block.
+
+        Args:
+            gain: Gain from 0.0 to 1.0
+        """
+        # A single attribute store, atomic with respect to the processing thread
+        self._target = self._clamp(gain)
+
+    def process(self, block: np.ndarray, ramp: bool = True) -> np.ndarray:
+        """
+        Apply the gain to one block.
+
+        Args:
+            block: float32 PCM of shape (frames, channels); not modified
+            ramp: Whether the block continues the previous one; if not (the
+                start of playback or a seek) a new gain applies at once
+
+        Returns:
+            The scaled block (block itself at unity gain)
+        """
+        target = self._target
+        if target != self._ramp_target:
+            # Start a new ramp from wherever the previous one got to
+            self._ramp_target = target
+            self._ramp_left = self._ramp_frames
+        if not ramp or self._ramp_left == 0 or self._gain == target:
+            self._gain = target
+            self._ramp_left = 0
+            if target == 1.0:
+                return block
+            return block * np.float32(target)
+
+        frames = min(len(block), self._ramp_left)
+        steps = np.arange(1, frames + 1, dtype=np.float32) / np.float32(self._ramp_left)
+        gains = np.full((len(block), 1), target, dtype=np.float32)
+        gains[:frames, 0] = self._gain + (target - self._gain) * steps
+        self._ramp_left -= frames
+        self._gain = target if self._ramp_left == 0 else float(gains[frames - 1, 0])
+        return block * gains
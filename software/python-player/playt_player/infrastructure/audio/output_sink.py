@@ -0,0 +1,446 @@
+"""Destinations for decoded PCM blocks."""
+
+from __future__ import annotations
+
+import shutil
+import struct
+import subprocess
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Optional, Union
+
+import numpy as np
+
+from ..parsing.wav_reader import WAVE_FORMAT_IEEE_FLOAT
+
+try:
+    import sounddevice
+except ImportError:  # sounddevice is optional; ffplay is used instead
+    sounddevice = None
+
+# Sinks selectable by name (see create_sink)
+OUTPUT_SINKS = ("auto", "ffplay", "sounddevice", "null", "paced-null")
+
+
+class OutputSink(ABC):
+    """
+    Destination of the float32 PCM produced by the playback engine.
+
+    A sink is opened once with the engine's format and then written to for
+    as long as the engine lives; writes block as long as the sink needs to
+    pace playback.
+    """
+
+    @abstractmethod
+    def open(self, sample_rate: int, channels: int) -> None:
+        """
+        Prepare the sink for writing.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            channels: Number of interleaved channels
+        """
+        pass
+
+    @abstractmethod
+    def write(self, block: np.ndarray) -> None:
+        """
+        Write a block, blocking until the sink has accepted it.
+
+        The caller may reuse the block once write returns; sinks that keep
+        it must copy it.
+
+        Args:
+            block: float32 array of shape (frames, channels)
+
+        Raises:
+            OSError: If the output device went away
+        """
+        pass
+
+    @property
+    def latency(self) -> float:
+        """Seconds between a block being written and being heard."""
+        return 0.0
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release the sink; it may be opened again."""
+        pass
+
+
+class NullSink(OutputSink):
+    """
+    Discards every block as fast as it is written.
+
+    Useful for tests and for measuring decoder throughput.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed sink."""
+        self.frames_written = 0
+        self.sample_rate: Optional[int] = None
+        self.channels: Optional[int] = None
+
+    def open(self, sample_rate: int, channels: int) -> None:
+        self.sample_rate = sample_rate
+        self.channels = channels
+
+    def write(self, block: np.ndarray) -> None:
+        self.frames_written += len(block)
+
+    def close(self) -> None:
+        self.sample_rate = None
+        self.channels = None
+
+
+class PacedNullSink(NullSink):
+    """
+    Discards every block at the rate a sound card would consume it.
+
+    Writes block until the audio written so far would have been played, so
+    the engine runs on real-time timing without audio hardware, e.g. to
+    measure underruns, seek latency or gapless joins on a headless box.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """
+        Initialize a closed sink.
+
+        Args:
+            latency: Output latency to report, in seconds
+        """
+        super().__init__()
+        self._latency = latency
+        # Monotonic time at which everything written so far has been played
+        self._played_at = 0.0
+
+    def open(self, sample_rate: int, channels: int) -> None:
+        super().open(sample_rate, channels)
+        self._played_at = time.monotonic()
+
+    def write(self, block: np.ndarray) -> None:
+        super().write(block)
+        # Paced against the total written, so sleep overshoot does not accumulate
+        now = time.monotonic()
+        self._played_at = max(self._played_at, now) + len(block) / (self.sample_rate or 1)
+        time.sleep(max(0.0, self._played_at - self._latency - now))
+
+    @property
+    def latency(self) -> float:
+        return self._latency
+
+
+class WavCaptureSink(OutputSink):
+    """
+    Records everything written to it as a float WAV file, timestamping each block.
+
+    Next to the WAV a CSV lists, for every block, the frame it starts at,
+    its length and the time.monotonic() value it was written at, so
+    latency, gapless joins and DSP output can be checked sample by sample.
+    Blocks can be forwarded to another sink to capture while playing, or
+    while pacing with PacedNullSink.
+    """
+
+    def __init__(self, path: Union[str, Path], forward_to: Optional[OutputSink] = None) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            path: WAV file to write; the CSV gets the same name with .csv
+            forward_to: Sink to also write every block to (default: none)
+        """
+        self.path = Path(path)
+        self.timestamps_path = self.path.with_suffix(".csv")
+        self._forward_to = forward_to
+        self._wav: Optional[IO[bytes]] = None
+        self._timestamps: Optional[IO[str]] = None
+        self._channels = 0
+        self.frames_written = 0
+
+    def open(self, sample_rate: int, channels: int) -> None:
+        self.close()
+        self._wav = open(self.path, "wb")
+        self._wav.write(_wav_header(sample_rate, channels))
+        self._timestamps = open(self.timestamps_path, "w", encoding="utf-8")
+        self._timestamps.write("frame,frames,monotonic\n")
+        self._channels = channels
+        self.frames_written = 0
+        if self._forward_to is not None:
+            self._forward_to.open(sample_rate, channels)
+
+    def write(self, block: np.ndarray) -> None:
+        if self._wav is None or self._timestamps is None:
+            raise OSError("Sink is not open")
+        self._timestamps.write(f"{self.frames_written},{len(block)},{time.monotonic():.6f}\n")
+        self._wav.write(np.ascontiguousarray(block, dtype="<f4").tobytes())
+        self.frames_written += len(block)
+        if self._forward_to is not None:
+            self._forward_to.write(block)
+
+    @property
+    def latency(self) -> float:
+        return self._forward_to.latency if self._forward_to is not None else 0.0
+
+    def close(self) -> None:
+        wav, self._wav = self._wav, None
+        timestamps, self._timestamps = self._timestamps, None
+        if timestamps is not None:
+            timestamps.close()
+        if wav is not None:
+            # Fill in the sizes now that the length is known
+            data_size = self.frames_written * self._channels * 4
+            wav.seek(4)
+            wav.write(struct.pack("<I", _WAV_HEADER_SIZE - 8 + data_size))
+            wav.seek(_WAV_HEADER_SIZE - 4)
+            wav.write(struct.pack("<I", data_size))
+            wav.close()
+        if self._forward_to is not None:
+            self._forward_to.close()
+
+
+class SoundDeviceSink(OutputSink):
+    """
+    Plays PCM straight to a sound card through PortAudio (the sounddevice package).
+
+    Writes block until the device has room, so playback is paced by the
+    hardware clock and the latency reported is the device's own.
+    """
+
+    def __init__(self, device: Optional[Union[int, str]] = None) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            device: PortAudio device index or name (default: the system default)
+
+        Raises:
+            RuntimeError: If the sounddevice package is not installed
+        """
+        if sounddevice is None:
+            raise RuntimeError(
+                "The sounddevice package is not installed. "
+                "Install it (pip install sounddevice) or use the ffplay sink."
+            )
+        self._device = device
+        self._stream: Optional[sounddevice.OutputStream] = None
+
+    def open(self, sample_rate: int, channels: int) -> None:
+        self.close()
+        self._stream = sounddevice.OutputStream(
+            samplerate=sample_rate, channels=channels, dtype="float32", device=self._device
+        )
+        self._stream.start()
+
+    def write(self, block: np.ndarray) -> None:
+        if self._stream is None:
+            raise OSError("Sink is not open")
+        try:
+            self._stream.write(np.ascontiguousarray(block, dtype=np.float32))
+        except sounddevice.PortAudioError as e:
+            raise OSError(str(e)) from e
+
+    @property
+    def latency(self) -> float:
+        return float(self._stream.latency) if self._stream is not None else 0.0
+
+    def close(self) -> None:
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.stop()
+            stream.close()
+
+
+class FFplaySink(OutputSink):
+    """
+    Plays PCM through one long-lived ffplay process reading from a pipe.
+
+    The PCM is framed as a streaming float WAV, which every ffplay version
+    accepts on stdin. The process is started when the sink is opened and
+    keeps the audio device open across tracks, seeks and volume changes.
+
+    Left to itself ffplay reads a second or more of packets ahead of what
+    it plays, which would delay every pause, seek, track change and volume
+    change by as much. Writes are therefore paced against the wall clock
+    and run at most WRITE_AHEAD seconds ahead of playback; audio still
+    sitting unread in the pipe, e.g. while ffplay starts up, counts as not
+    played yet. The latency reported is that lead plus ffplay's own output
+    buffering, an estimate: prefer SoundDeviceSink where the sounddevice
+    package is installed, as it reports the device's real latency.
+    """
+
+    # Audio written ahead of playback; bounds what ffplay buffers
+    WRITE_AHEAD = 0.1
+    # Output buffering inside ffplay past its packet queue (decoded frames, SDL buffer)
+    PLAYER_LATENCY = 0.1
+
+    def __init__(self, ffplay_path: Optional[str] = None) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            ffplay_path: Path to ffplay (default: found on PATH)
+
+        Raises:
+            RuntimeError: If ffplay is not available
+        """
+        self._ffplay_path = ffplay_path or shutil.which("ffplay")
+        if not self._ffplay_path:
+            raise RuntimeError(
+                "ffplay (part of ffmpeg) was not found on PATH. "
+                "Install ffmpeg and ensure ffplay is available."
+            )
+        self._process: Optional[subprocess.Popen[bytes]] = None
+        self._sample_rate = 0
+        self._bytes_per_second = 0
+        # Monotonic time at which everything written so far has been played
+        self._played_at = 0.0
+
+    def open(self, sample_rate: int, channels: int) -> None:
+        self.close()
+        self._process = subprocess.Popen(
+            [
+                self._ffplay_path or "ffplay",
+                "-nodisp",
+                "-autoexit",
+                "-loglevel",
+                "error",
+                # Start on the first packets instead of probing and buffering the stream
+                "-fflags",
+                "nobuffer",
+                "-probesize",
+                "32",
+                "-analyzeduration",
+                "0",
+                "-f",
+                "wav",
+                "-i",
+                "pipe:0",
+            ],
+            stdin=subprocess.PIPE,
+        )
+        self._sample_rate = sample_rate
+        self._bytes_per_second = sample_rate * channels * 4
+        self._played_at = time.monotonic()
+        assert self._process.stdin is not None
+        # Unknown (maximal) sizes for streaming
+        self._process.stdin.write(_wav_header(sample_rate, channels, 0xFFFFFFFF))
+        self._process.stdin.flush()
+
+    def write(self, block: np.ndarray) -> None:
+        if self._process is None or self._process.stdin is None:
+            raise OSError("Sink is not open")
+        stdin = self._process.stdin
+        now = time.monotonic()
+        # Whatever ffplay has not even read yet is still ahead of playback
+        unread = _pipe_backlog(stdin) / self._bytes_per_second
+        self._played_at = max(self._played_at, now + unread) + len(block) / self._sample_rate
+        stdin.write(np.ascontiguousarray(block, dtype="<f4").tobytes())
+        stdin.flush()
+        time.sleep(max(0.0, self._played_at - self.WRITE_AHEAD - time.monotonic()))
+
+    @property
+    def latency(self) -> float:
+        if not self._bytes_per_second:
+            return 0.0
+        return self.WRITE_AHEAD + self.PLAYER_LATENCY
+
+    def close(self) -> None:
+        process, self._process = self._process, None
+        self._bytes_per_second = 0
+        if process is None:
+            return
+        if process.stdin is not None:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+        # Closing stdin ends the stream; don't wait for ffplay to drain it
+        process.terminate()
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _pipe_backlog(pipe: IO[bytes]) -> int:
+    """Bytes written to a pipe that its reader has not read yet (0 where unknown)."""
+    try:
+        import fcntl
+        import termios
+    except ImportError:  # Not available on Windows
+        return 0
+    try:
+        count = fcntl.ioctl(pipe.fileno(), termios.FIONREAD, b"\0\0\0\0")
+    except (OSError, ValueError):
+        return 0
+    value: int = struct.unpack("i", count)[0]
+    return value
+
+
+def create_sink(
+    name: str = "auto", capture_path: Optional[Union[str, Path]] = None
+) -> OutputSink:
+    """
+    Create an output sink by name.
+
+    Args:
+        name: One of OUTPUT_SINKS: "ffplay" or "sounddevice" for a sound card,
+            "auto" for sounddevice if it is installed and ffplay otherwise,
+            "paced-null" to discard audio in real time, "null" to discard it
+            as fast as possible
+        capture_path: Also record everything played to this WAV file, with
+            block timestamps (see WavCaptureSink)
+
+    Returns:
+        The sink
+
+    Raises:
+        ValueError: If the name is unknown
+        RuntimeError: If the sink's player or package is not available
+    """
+    sink: OutputSink
+    if name == "auto":
+        name = "sounddevice" if sounddevice is not None else "ffplay"
+    if name == "ffplay":
+        sink = FFplaySink()
+    elif name == "sounddevice":
+        sink = SoundDeviceSink()
+    elif name == "paced-null":
+        sink = PacedNullSink()
+    elif name == "null":
+        sink = NullSink()
+    else:
+        raise ValueError(f"Unknown output sink: {name}")
+    if capture_path is not None:
+        sink = WavCaptureSink(capture_path, forward_to=sink)
+    return sink
+
+
+# Bytes before the sample data in headers built by _wav_header
+_WAV_HEADER_SIZE = 44
+
+
+def _wav_header(sample_rate: int, channels: int, data_size: int = 0) -> bytes:
+    """Build a float32 WAV header for a data chunk of data_size bytes."""
+    block_align = channels * 4
+    fmt = struct.pack(
+        "<HHIIHH",
+        WAVE_FORMAT_IEEE_FLOAT,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        32,
+    )
+    return (
+        b"RIFF"
+        + struct.pack("<I", min(0xFFFFFFFF, _WAV_HEADER_SIZE - 8 + data_size))
+        + b"WAVE"
+        + b"fmt "
+        + struct.pack("<I", len(fmt))
+        + fmt
+        + b"data"
+        + struct.pack("<I", data_size)
+    )
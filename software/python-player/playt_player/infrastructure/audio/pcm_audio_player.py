@@ -0,0 +1,612 @@
+"""In-process playback engine feeding decoded PCM to a long-lived output sink."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from ...domain.interfaces.audio_player import (
+    AudioPlayerInterface,
+    BufferStats,
+    TrackFinishedCallback,
+)
+from ..cartridge.handle_cache import CartridgeHandleCache
+from .crossfade import Crossfade, TailBuffer
+from .gain_stage import GainStage
+from .output_sink import OutputSink, create_sink
+from .pcm_decoder import PcmDecoder, open_decoder
+from .playback_supervisor import PlaybackSupervisor
+from .ring_buffer import PcmRingBuffer
+
+# Opens a decoder for (file path, start position in seconds)
+DecoderFactory = Callable[[str, float], PcmDecoder]
+
+
+@dataclass(frozen=True)
+class _TrackStart:
+    """Buffer marker: the frames after it belong to the next file."""
+
+    file_path: str
+
+
+# Event in the buffer: the start of the next track, or None for the end of playback
+_BufferEvent = Optional[_TrackStart]
+# Decoded frames or an event, in the order they are buffered
+_BufferItem = Union[np.ndarray, _BufferEvent]
+
+
+class PcmAudioPlayer(AudioPlayerInterface):
+    """
+    Audio player with one long-lived output and a PCM buffer under our control.
+
+    A decode thread pulls float32 blocks from the current decoder into a
+    preallocated ring buffer; an output thread applies the volume through a
+    GainStage and writes them to the sink. The sink stays open for the
+    lifetime of the player, so track changes, seeks and volume changes only
+    swap decoders or touch the buffer instead of restarting the audio output.
+    Events such as track boundaries are kept beside the ring, tied to the
+    frame position they occur at.
+
+    The position is counted in frames handed to the sink, less the sink's
+    latency, so it follows what is audible rather than the wall clock.
+
+    Play, seek and stop flush the buffer and bump the generation; the
+    decode thread checks the generation before buffering a block, so stale
+    audio is dropped instead of being heard. A decoder seeking in place
+    while a block is being read is sought again once the read returns, as
+    the block may come from either side of the seek. get_buffer_stats
+    reports the fill level, underruns and decoder timings.
+
+    When the output reaches the end of a file it reports the file through
+    a PlaybackSupervisor, so nobody has to poll for the end of a track.
+
+    For gapless playback the next file can be queued with queue_next: its
+    decoder is opened right away, and when the current decoder runs out the
+    decode thread continues with it in the same generation, so its first
+    sample follows the last sample of the current file in the buffer. With a crossfade set, the
+    last frames of the current file are held back and mixed with the head
+    of the queued file instead.
+    """
+
+    DEFAULT_SAMPLE_RATE = 44100
+    DEFAULT_CHANNELS = 2
+    # Frames per block handed from the decoder to the sink
+    BLOCK_FRAMES = 2048
+    # Audio decoded ahead of the output
+    BUFFER_MS = 750.0
+    # Length of the ramp to a new volume
+    VOLUME_RAMP_SECS = 0.005
+
+    def __init__(
+        self,
+        sink: Optional[OutputSink] = None,
+        decoder_factory: Optional[DecoderFactory] = None,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        channels: int = DEFAULT_CHANNELS,
+        block_frames: int = BLOCK_FRAMES,
+        buffer_ms: float = BUFFER_MS,
+        ffmpeg_path: Optional[str] = None,
+        crossfade: Optional[Crossfade] = None,
+        handles: Optional[CartridgeHandleCache] = None,
+    ) -> None:
+        """
+        Initialize the player; threads and the sink start on first playback.
+
+        Args:
+            sink: Output sink (default: sounddevice if installed, else ffplay)
+            decoder_factory: Opens decoders (default: open_decoder at the engine format)
+            sample_rate: Engine sample rate in Hz; every track is converted to it
+            channels: Engine channel count
+            block_frames: Frames per block
+            buffer_ms: Audio decoded ahead of the output, in milliseconds (at
+                least one block)
+            ffmpeg_path: Path to ffmpeg for the default decoder factory
+            crossfade: Crossfade between queued tracks (default: none, gapless)
+            handles: Cache holding archives open for the default decoder
+                factory; pass the cartridge reader's so ejecting closes them
+                (default: the global handle cache)
+        """
+        self._sink = sink if sink is not None else create_sink()
+
+        def default_factory(file_path: str, start_secs: float) -> PcmDecoder:
+            return open_decoder(
+                file_path, sample_rate, channels, start_secs, ffmpeg_path, handles=handles
+            )
+
+        self._decoder_factory = decoder_factory or default_factory
+        self._sample_rate = sample_rate
+        self._channels = channels
+        self._block_frames = block_frames
+        capacity = max(block_frames, int(sample_rate * buffer_ms / 1000))
+        # Block handed to the sink, reused by the output thread
+        self._out = np.zeros((block_frames, channels), dtype=np.float32)
+
+        # Guards everything below and wakes both threads
+        self._cond = threading.Condition()
+        self._ring = PcmRingBuffer(capacity, channels)
+        self._events: deque[tuple[int, _BufferEvent]] = deque()
+        self._generation = 0
+        self._decoder: Optional[PcmDecoder] = None
+        # File the current decoder belongs to (runs ahead of _current_file after a splice)
+        self._decoder_file: Optional[str] = None
+        # File queued to follow the current one, with its already opened decoder
+        self._next: Optional[tuple[str, PcmDecoder]] = None
+        # Decoder the decode thread is reading from outside the lock, and the
+        # target of an in-place seek made meanwhile, to be redone after the read
+        self._reading: Optional[PcmDecoder] = None
+        self._reseek: Optional[float] = None
+        self._crossfade = crossfade
+        self._state = "idle"
+        self._current_file: Optional[str] = None
+        self._start_secs = 0.0
+        # Frames of the current file handed to the sink, and when the last block went
+        self._frames_played = 0
+        self._written_at = 0.0
+        self._last_block_frames = 0
+        self._gain = GainStage(ramp_frames=int(sample_rate * self.VOLUME_RAMP_SECS))
+        self._sink_open = False
+        self._closed = False
+        self._threads: list[threading.Thread] = []
+        self._supervisor = PlaybackSupervisor()
+
+        # Buffer telemetry
+        self._underruns = 0
+        self._stall_secs = 0.0
+        self._refill_secs = 0.0
+        self._slowest_read_secs = 0.0
+        # When the buffer was last flushed, until it has audio again
+        self._flushed_at: Optional[float] = None
+
+    @property
+    def sample_rate(self) -> int:
+        """Engine sample rate in Hz."""
+        return self._sample_rate
+
+    @property
+    def channels(self) -> int:
+        """Engine channel count."""
+        return self._channels
+
+    # --------------------------------------------------------------------- #
+    # Internal helpers
+    # --------------------------------------------------------------------- #
+    def _ensure_running(self) -> None:
+        """Start the decode and output threads on first use."""
+        if self._threads:
+            return
+        self._threads = [
+            threading.Thread(target=self._decode_loop, name="playt-decode", daemon=True),
+            threading.Thread(target=self._output_loop, name="playt-output", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _swap_decoder(
+        self,
+        decoder: Optional[PcmDecoder],
+        file_path: Optional[str],
+        start_secs: float,
+        state: str,
+        keep_next: bool = False,
+    ) -> None:
+        """Replace the current decoder, dropping everything buffered for the old one."""
+        with self._cond:
+            old = self._decoder
+            queued = None if keep_next else self._next
+            if not keep_next:
+                self._next = None
+            self._flush(refill=decoder is not None)
+            self._decoder = decoder
+            self._decoder_file = file_path if decoder is not None else None
+            self._current_file = file_path
+            self._restart_clock(start_secs)
+            self._state = state
+            self._cond.notify_all()
+        if old is not None:
+            old.close()
+        if queued is not None and queued[1] is not decoder:
+            queued[1].close()
+
+    def _decode_loop(self) -> None:
+        """Keep the buffer filled from the current decoder."""
+        # Frames held back while a crossfade into the queued file is pending
+        held = TailBuffer()
+        held_generation = -1
+        while True:
+            with self._cond:
+                while not self._closed and (
+                    self._decoder is None or self._ring.free < self._block_frames
+                ):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                decoder = self._decoder
+                generation = self._generation
+                crossfade = self._crossfade if self._next is not None else None
+                self._reading = decoder
+            if generation != held_generation:
+                held.clear()
+                held_generation = generation
+
+            # Decoding happens outside the lock so control calls never wait on it
+            started = time.monotonic()
+            try:
+                block = decoder.read(self._block_frames) if decoder is not None else None
+            except (OSError, ValueError):
+                block = None
+            elapsed = time.monotonic() - started
+            if elapsed > self._slowest_read_secs:
+                self._slowest_read_secs = elapsed
+
+            with self._cond:
+                self._reading = None
+                reseek, self._reseek = self._reseek, None
+                if reseek is not None:
+                    # The seek may have moved the decoder before or after this read, so
+                    # the block's position is unknown: seek again and read from there
+                    if decoder is not None and decoder is self._decoder:
+                        decoder.seek(reseek)
+                    continue
+
+            keep = crossfade.frames if crossfade is not None else 0
+            if block is not None:
+                # Keep the last frames back to mix them with the queued file
+                released = held.push(block, keep)
+                if released:
+                    self._push(generation, list(released))
+                continue
+
+            with self._cond:
+                if generation != self._generation:
+                    # The decoder was replaced (and closed) while we were reading
+                    continue
+                queued = self._next
+                self._next = None
+                if queued is not None:
+                    self._decoder_file, self._decoder = queued
+                else:
+                    self._decoder = None
+                    self._decoder_file = None
+                self._cond.notify_all()
+            if decoder is not None:
+                decoder.close()
+            lead, tail = held.take(keep)
+            if lead is not None:
+                self._push(generation, [lead])
+            if queued is not None:
+                self._splice(generation, queued[0], queued[1], tail, crossfade)
+            else:
+                self._push(generation, [tail, None] if tail is not None else [None])
+
+    def _push(self, generation: int, items: list[_BufferItem]) -> None:
+        """
+        Append decoded frames and events to the buffer, waiting for room as needed.
+
+        Items are dropped as soon as the generation moves on.
+        """
+        with self._cond:
+            for item in items:
+                if not isinstance(item, np.ndarray):
+                    if generation != self._generation:
+                        return
+                    self._events.append((self._ring.write_position, item))
+                    self._cond.notify_all()
+                    continue
+                written = 0
+                while written < len(item):
+                    while (
+                        not self._closed
+                        and generation == self._generation
+                        and self._ring.free == 0
+                    ):
+                        self._cond.wait()
+                    if self._closed or generation != self._generation:
+                        return
+                    written += self._ring.write(item[written:])
+                    if self._flushed_at is not None:
+                        self._refill_secs = time.monotonic() - self._flushed_at
+                        self._flushed_at = None
+                    self._cond.notify_all()
+
+    def _splice(
+        self,
+        generation: int,
+        file_path: str,
+        decoder: PcmDecoder,
+        tail: Optional[np.ndarray],
+        crossfade: Optional[Crossfade],
+    ) -> None:
+        """
+        Continue the buffer with the queued file.
+
+        Without a crossfade the queued file's first sample directly follows
+        the last sample of the current one; with one, the held-back tail of
+        the current file is mixed with the head of the queued file.
+        """
+        items: list[_BufferItem] = [_TrackStart(file_path)]
+        if tail is not None and crossfade is not None:
+            fade = crossfade.shortened(len(tail))
+            head = self._read_frames(decoder, len(tail))
+            for offset in range(0, len(tail), self._block_frames):
+                end = offset + self._block_frames
+                items.append(fade.mix(tail[offset:end], head[offset:end], offset))
+        elif tail is not None:
+            items.insert(0, tail)
+        self._push(generation, items)
+
+    def _read_frames(self, decoder: PcmDecoder, frames: int) -> np.ndarray:
+        """Read up to frames frames from a decoder (fewer if it ends first)."""
+        blocks: list[np.ndarray] = []
+        remaining = frames
+        while remaining > 0:
+            try:
+                block = decoder.read(min(remaining, self._block_frames))
+            except (OSError, ValueError):
+                block = None
+            if block is None:
+                break
+            blocks.append(block)
+            remaining -= len(block)
+        if not blocks:
+            return np.zeros((0, self._channels), dtype=np.float32)
+        return np.concatenate(blocks)
+
+    def _output_loop(self) -> None:
+        """Write buffered blocks to the sink while playing."""
+        # Volume changes are ramped only within continuous audio
+        last_generation = -1
+        while True:
+            with self._cond:
+                starved_at: Optional[float] = None
+                while not self._closed and (
+                    self._state != "playing" or (not self._ring.available and not self._events)
+                ):
+                    if starved_at is None and self._is_starving(last_generation):
+                        starved_at = time.monotonic()
+                        self._underruns += 1
+                    self._cond.wait()
+                if self._closed:
+                    return
+                generation = self._generation
+                if starved_at is not None and generation == last_generation:
+                    self._stall_secs += time.monotonic() - starved_at
+
+                if self._events and self._events[0][0] == self._ring.read_position:
+                    _, event = self._events.popleft()
+                    if self._current_file is not None:
+                        self._supervisor.post(self._current_file)
+                    if event is not None:
+                        self._current_file = event.file_path
+                        self._restart_clock(0.0)
+                    else:
+                        # End of track: the player becomes idle like a finished ffplay
+                        self._state = "idle"
+                        self._current_file = None
+                    continue
+
+                # Stop at the next event so its frames are attributed correctly
+                frames = self._ring.available
+                if self._events:
+                    frames = min(frames, self._events[0][0] - self._ring.read_position)
+                block = self._out[: self._ring.read(self._out[:frames])]
+                self._cond.notify_all()
+
+            block = self._gain.process(block, ramp=generation == last_generation)
+            last_generation = generation
+            try:
+                self._sink.write(block)
+            except (OSError, ValueError):
+                # The output went away; reopen it on the next play
+                with self._cond:
+                    self._sink_open = False
+                    if generation == self._generation:
+                        self._state = "stopped"
+                continue
+
+            with self._cond:
+                if generation == self._generation:
+                    self._frames_played += len(block)
+                    self._written_at = time.monotonic()
+                    self._last_block_frames = len(block)
+
+    def _is_starving(self, last_generation: int) -> bool:
+        """Whether the output ran dry in the middle of a track; call with the lock held."""
+        return (
+            self._state == "playing"
+            and self._decoder is not None
+            and self._generation == last_generation
+        )
+
+    def _flush(self, refill: bool) -> None:
+        """
+        Drop everything buffered and start a new generation; call with the lock held.
+
+        Args:
+            refill: Whether a decoder will refill the buffer (timed as refill latency)
+        """
+        self._generation += 1
+        self._ring.clear()
+        self._events.clear()
+        self._flushed_at = time.monotonic() if refill else None
+
+    def _restart_clock(self, start_secs: float) -> None:
+        """Count the position from start_secs with nothing written yet; call with the lock held."""
+        self._start_secs = start_secs
+        self._frames_played = 0
+        self._last_block_frames = 0
+
+    def _audible_position(self, now: float) -> float:
+        """
+        Estimate the position heard at a monotonic time; call with the lock held.
+
+        Everything handed to the sink is heard sink.latency seconds later.
+        Since the last write the sink has kept playing, for at most the
+        length of that block (the next write happens once it has room) or,
+        while paused, until it has drained.
+        """
+        latency = self._sink.latency
+        written = self._frames_played / self._sample_rate
+        if self._last_block_frames:
+            limit = self._last_block_frames / self._sample_rate
+            if self._state == "paused":
+                limit = latency
+            written += min(max(0.0, now - self._written_at), limit)
+        return self._start_secs + max(0.0, written - latency)
+
+    def _open_sink(self) -> None:
+        """Open the sink unless it is already open."""
+        if not self._sink_open:
+            self._sink.open(self._sample_rate, self._channels)
+            self._sink_open = True
+
+    # --------------------------------------------------------------------- #
+    # AudioPlayerInterface implementation
+    # --------------------------------------------------------------------- #
+    def play(self, file_path: str) -> None:
+        with self._cond:
+            if self._state == "paused" and self._current_file == file_path:
+                self._state = "playing"
+                self._cond.notify_all()
+                return
+            # Skipping to the queued file reuses its decoder; taking it here, in the
+            # same locked section, keeps the decode thread from splicing it meanwhile
+            queued = self._next if self._next is not None and self._next[0] == file_path else None
+            if queued is not None:
+                self._next = None
+
+        decoder = queued[1] if queued is not None else self._decoder_factory(file_path, 0.0)
+        self._open_sink()
+        self._ensure_running()
+        self._swap_decoder(decoder, file_path, 0.0, "playing")
+
+    def pause(self) -> None:
+        with self._cond:
+            if self._state == "playing":
+                self._state = "paused"
+                self._cond.notify_all()
+
+    def stop(self) -> None:
+        self._swap_decoder(None, None, 0.0, "stopped")
+
+    def next(self) -> None:
+        """Playlist management is handled by PlayerService."""
+        pass
+
+    def previous(self) -> None:
+        """Playlist management is handled by PlayerService."""
+        pass
+
+    def seek(self, position_secs: float) -> None:
+        position_secs = max(0.0, position_secs)
+        with self._cond:
+            file_path = self._current_file
+            state = self._state
+            if file_path is None or state not in ("playing", "paused"):
+                return
+            # Decoders that can seek in place only need the buffer refilled
+            decoder = self._decoder
+            if (
+                decoder is not None
+                and self._decoder_file == file_path
+                and decoder.seek(position_secs)
+            ):
+                self._flush(refill=True)
+                self._restart_clock(position_secs)
+                if self._reading is decoder:
+                    self._reseek = position_secs
+                self._cond.notify_all()
+                return
+
+        decoder = self._decoder_factory(file_path, position_secs)
+        self._swap_decoder(decoder, file_path, position_secs, state, keep_next=True)
+
+    def get_position(self) -> Optional[float]:
+        anchor = self.get_position_anchor()
+        return anchor[0] if anchor is not None else None
+
+    def get_position_anchor(self) -> Optional[tuple[float, float]]:
+        with self._cond:
+            if self._state not in ("playing", "paused"):
+                return None
+            now = time.monotonic()
+            return self._audible_position(now), now
+
+    def get_buffer_stats(self) -> Optional[BufferStats]:
+        with self._cond:
+            return BufferStats(
+                capacity_ms=self._ring.capacity * 1000 / self._sample_rate,
+                fill_ms=self._ring.available * 1000 / self._sample_rate,
+                underruns=self._underruns,
+                decoder_stall_secs=self._stall_secs,
+                refill_latency_ms=self._refill_secs * 1000,
+                slowest_read_ms=self._slowest_read_secs * 1000,
+            )
+
+    def queue_next(self, file_path: Optional[str]) -> None:
+        with self._cond:
+            queued = self._next[0] if self._next is not None else None
+            if file_path == queued:
+                return
+
+        decoder = self._decoder_factory(file_path, 0.0) if file_path is not None else None
+        with self._cond:
+            old = self._next
+            if decoder is not None and file_path is not None and self._current_file is not None:
+                self._next = (file_path, decoder)
+                decoder = None
+            else:
+                self._next = None
+        # Either the replaced decoder or the new one if nothing is playing to follow
+        for unused in (old[1] if old is not None else None, decoder):
+            if unused is not None:
+                unused.close()
+
+    def set_crossfade(self, crossfade: Optional[Crossfade]) -> None:
+        """
+        Set the crossfade between queued tracks.
+
+        Args:
+            crossfade: Crossfade at the engine's sample rate, or None for gapless joins
+        """
+        with self._cond:
+            self._crossfade = crossfade
+
+    def set_track_finished_callback(self, callback: Optional[TrackFinishedCallback]) -> bool:
+        self._supervisor.set_callback(callback)
+        return True
+
+    def get_current_file(self) -> Optional[str]:
+        with self._cond:
+            return self._current_file
+
+    def get_state(self) -> str:
+        with self._cond:
+            return self._state
+
+    def is_playing(self) -> bool:
+        with self._cond:
+            return self._state == "playing"
+
+    def set_volume(self, volume: float) -> None:
+        # Picked up by the output thread with the next block; nothing is restarted.
+        # The gain is applied before the sink, so it is heard sink.latency later.
+        self._gain.set_gain(volume)
+
+    def close(self) -> None:
+        """Stop playback, end the engine threads and close the sink."""
+        self.stop()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+        if self._sink_open:
+            self._sink.close()
+            self._sink_open = False
+        self._supervisor.close()
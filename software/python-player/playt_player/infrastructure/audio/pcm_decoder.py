@@ -0,0 +1,405 @@
+"""Decoders turning audio files into float32 PCM blocks."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import PurePosixPath
+from typing import IO, Optional
+
+import numpy as np
+
+from ..cartridge.archive_member import (
+    feed_member,
+    ffmpeg_input,
+    open_track,
+    split_member_path,
+)
+from ..cartridge.handle_cache import CartridgeHandleCache
+from ..parsing.seek_index import SeekIndex, SeekPoint
+from ..parsing.wav_reader import (
+    WAVE_FORMAT_IEEE_FLOAT,
+    WAVE_FORMAT_PCM,
+    WavLayout,
+    read_wav_layout,
+)
+from .seek_index_cache import SeekIndexCache, get_seek_index_cache
+
+
+class PcmDecoder(ABC):
+    """
+    Source of interleaved float32 PCM at the engine's sample rate and channel count.
+    """
+
+    @abstractmethod
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        """
+        Decode the next block.
+
+        Args:
+            frames: Maximum number of frames to return
+
+        Returns:
+            float32 array of shape (frames, channels), or None at the end of the track
+        """
+        pass
+
+    def seek(self, position_secs: float) -> bool:
+        """
+        Continue decoding from another position, if the decoder can do so in place.
+
+        Args:
+            position_secs: Position in seconds
+
+        Returns:
+            True if the next read starts at the position, False if a new
+            decoder has to be opened instead
+        """
+        return False
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release the decoder; pending and later reads return None."""
+        pass
+
+
+class FFmpegDecoder(PcmDecoder):
+    """
+    Decodes any format ffmpeg understands into raw float32 PCM on a pipe.
+
+    Only decoding happens in the child process: no audio device is opened,
+    so starting and stopping one is cheap compared to ffplay.
+
+    With a seek index, a decoder starting mid-track is fed the codec headers
+    and the bytes from the nearest seek point through its stdin, so ffmpeg
+    neither probes the file nor searches it for the position.
+
+    It cannot seek in place: every seek in a compressed track ends this
+    process and starts a new one at the position. The seek index only
+    shortens that new process's startup.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        sample_rate: int,
+        channels: int,
+        start_secs: float = 0.0,
+        ffmpeg_path: Optional[str] = None,
+        seek_index: Optional[SeekIndex] = None,
+        handles: Optional[CartridgeHandleCache] = None,
+    ) -> None:
+        """
+        Start decoding a file.
+
+        Args:
+            file_path: A Song.file_path (regular file or archive member path)
+            sample_rate: Output sample rate in Hz
+            channels: Output channel count
+            start_secs: Position to start decoding at
+            ffmpeg_path: Path to ffmpeg (default: found on PATH)
+            seek_index: Seek index of the file, used when start_secs is not 0
+            handles: Cache holding archives open (default: the global handle cache)
+
+        Raises:
+            RuntimeError: If ffmpeg is not available
+        """
+        ffmpeg = ffmpeg_path or shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise RuntimeError(
+                "ffmpeg was not found on PATH. Install ffmpeg to play compressed formats."
+            )
+        self._channels = channels
+
+        point: Optional[SeekPoint] = None
+        if seek_index is not None and start_secs > 0:
+            point = seek_index.locate(max(0.0, start_secs - seek_index.preroll_secs))
+        if seek_index is not None and point is not None:
+            cmd = [ffmpeg, "-v", "error", "-f", seek_index.container, "-i", "pipe:0", "-vn"]
+            if seek_index.timestamped:
+                # Frames carry their own position: cut at the absolute target
+                cmd += ["-copyts", "-ss", f"{start_secs:.6f}"]
+            elif start_secs > point.position_secs:
+                cmd += ["-ss", f"{start_secs - point.position_secs:.6f}"]
+            if seek_index.duration_secs is not None:
+                cmd += ["-t", f"{max(0.0, seek_index.duration_secs - start_secs):.6f}"]
+            cmd += ["-f", "f32le", "-ac", str(channels), "-ar", str(sample_rate), "pipe:1"]
+            self._process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            if self._process.stdin is not None:
+                _feed_from(
+                    file_path,
+                    seek_index.header_size,
+                    point.byte_offset,
+                    self._process.stdin,
+                    handles,
+                )
+            return
+
+        # Members of a .playt archive are read in place (stored) or piped (compressed)
+        source, piped_member = ffmpeg_input(file_path, handles)
+        cmd = [ffmpeg, "-v", "error"]
+        if piped_member is None:
+            cmd.append("-nostdin")
+        if start_secs > 0:
+            cmd += ["-ss", f"{start_secs:.6f}"]
+        cmd += [
+            "-i",
+            source,
+            "-vn",
+            "-f",
+            "f32le",
+            "-ac",
+            str(channels),
+            "-ar",
+            str(sample_rate),
+            "pipe:1",
+        ]
+        self._process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL if piped_member is None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        if piped_member is not None and self._process.stdin is not None:
+            feed_member(piped_member, self._process.stdin, handles)
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        stdout = self._process.stdout
+        if stdout is None:
+            return None
+        frame_bytes = 4 * self._channels
+        try:
+            data = stdout.read(frames * frame_bytes)
+        except (OSError, ValueError):
+            return None
+        usable = len(data) - len(data) % frame_bytes
+        if usable == 0:
+            return None
+        return np.frombuffer(data[:usable], dtype="<f4").reshape(-1, self._channels)
+
+    def seek(self, position_secs: float) -> bool:
+        """
+        Refuse to seek in place, so the player opens a decoder at the position.
+
+        Input and output still in the pipes would mix PCM from before the seek
+        with PCM from after it, with no way to tell where one ends, so the
+        stream cannot be moved under a running process.
+
+        Args:
+            position_secs: Position in seconds
+
+        Returns:
+            Always False
+        """
+        return False
+
+    def close(self) -> None:
+        # A decoder holds no device, so it can be killed outright
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        if self._process.stdout is not None:
+            self._process.stdout.close()
+
+
+class WavDecoder(PcmDecoder):
+    """
+    Reads PCM straight out of a WAV file without a child process.
+
+    Only files already at the engine's sample rate are handled; mono is
+    duplicated to stereo. Everything else goes through FFmpegDecoder.
+    Seeking only moves the read position.
+    """
+
+    def __init__(
+        self, stream: IO[bytes], layout: WavLayout, channels: int, start_secs: float = 0.0
+    ) -> None:
+        """
+        Start reading a WAV stream.
+
+        Args:
+            stream: Seekable binary stream of the file (closed with the decoder)
+            layout: Layout of the file (see is_supported)
+            channels: Output channel count
+            start_secs: Position to start reading at
+        """
+        self._stream = stream
+        self._layout = layout
+        self._channels = channels
+        self._end = layout.data_offset + layout.data_size - layout.data_size % layout.block_align
+        self._position = layout.data_offset
+        # Reads run on the decode thread, seeks on the caller's
+        self._lock = threading.Lock()
+        self.seek(start_secs)
+
+    @staticmethod
+    def is_supported(layout: WavLayout, sample_rate: int, channels: int) -> bool:
+        """
+        Check whether a WAV file can be played without conversion by ffmpeg.
+
+        Args:
+            layout: Layout of the file
+            sample_rate: Engine sample rate in Hz
+            channels: Engine channel count
+
+        Returns:
+            True if the file can be read in process
+        """
+        if layout.sample_rate != sample_rate or layout.channels not in (1, channels):
+            return False
+        if layout.block_align != layout.channels * layout.bits_per_sample // 8:
+            return False
+        if layout.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+            return layout.bits_per_sample == 32
+        return layout.format_tag == WAVE_FORMAT_PCM and layout.bits_per_sample in (8, 16, 24, 32)
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        with self._lock:
+            remaining = (self._end - self._position) // self._layout.block_align
+            if remaining <= 0:
+                return None
+            try:
+                self._stream.seek(self._position)
+                data = self._stream.read(min(frames, remaining) * self._layout.block_align)
+            except (OSError, ValueError):
+                return None
+            usable = len(data) - len(data) % self._layout.block_align
+            if usable == 0:
+                return None
+            self._position += usable
+
+        samples = _to_float32(data[:usable], self._layout)
+        block = samples.reshape(-1, self._layout.channels)
+        if self._layout.channels != self._channels:
+            block = np.repeat(block, self._channels, axis=1)
+        return block
+
+    def seek(self, position_secs: float) -> bool:
+        frame = max(0, int(position_secs * self._layout.sample_rate))
+        with self._lock:
+            if self._stream.closed:
+                return False
+            self._position = min(
+                self._layout.data_offset + frame * self._layout.block_align, self._end
+            )
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._position = self._end
+            self._stream.close()
+
+
+def _to_float32(data: bytes, layout: WavLayout) -> np.ndarray:
+    """Convert interleaved WAV samples to float32 in [-1, 1)."""
+    if layout.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        return np.frombuffer(data, dtype="<f4").astype(np.float32, copy=False)
+    bits = layout.bits_per_sample
+    if bits == 8:
+        return (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if bits == 16:
+        return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+    if bits == 24:
+        # Widen each 3-byte sample into the top of an int32
+        packed = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        widened = np.zeros((len(packed), 4), dtype=np.uint8)
+        widened[:, 1:] = packed
+        return widened.view("<i4").reshape(-1).astype(np.float32) / 2147483648.0
+    return np.frombuffer(data, dtype="<i4").astype(np.float32) / 2147483648.0
+
+
+def _open_wav(
+    file_path: str,
+    sample_rate: int,
+    channels: int,
+    start_secs: float,
+    handles: Optional[CartridgeHandleCache],
+) -> Optional[WavDecoder]:
+    """Open a WAV file for in-process decoding, or None if ffmpeg is needed."""
+    try:
+        stream = open_track(file_path, handles)
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+    try:
+        layout = read_wav_layout(stream)
+    except (OSError, ValueError):
+        layout = None
+    if layout is None or not WavDecoder.is_supported(layout, sample_rate, channels):
+        stream.close()
+        return None
+    return WavDecoder(stream, layout, channels, start_secs)
+
+
+def _feed_from(
+    file_path: str,
+    header_size: int,
+    offset: int,
+    sink: IO[bytes],
+    handles: Optional[CartridgeHandleCache],
+) -> None:
+    """Stream a file's first header_size bytes, then the bytes from offset on, into a pipe."""
+
+    def _feed() -> None:
+        try:
+            with open_track(file_path, handles) as source:
+                sink.write(source.read(header_size))
+                source.seek(offset)
+                shutil.copyfileobj(source, sink)
+        except (ValueError, OSError, KeyError, zipfile.BadZipFile):
+            # The decoder was closed (stop, seek, track change) or the data is bad
+            pass
+        finally:
+            try:
+                sink.close()
+            except OSError:
+                pass
+
+    threading.Thread(target=_feed, daemon=True).start()
+
+
+def open_decoder(
+    file_path: str,
+    sample_rate: int,
+    channels: int,
+    start_secs: float = 0.0,
+    ffmpeg_path: Optional[str] = None,
+    seek_indexes: Optional[SeekIndexCache] = None,
+    handles: Optional[CartridgeHandleCache] = None,
+) -> PcmDecoder:
+    """
+    Open the cheapest decoder able to play a file.
+
+    WAV files at the engine's sample rate are read in process; everything
+    else is decoded by ffmpeg, starting from the track's seek index when
+    decoding does not start at the beginning.
+
+    Args:
+        file_path: A Song.file_path (regular file or archive member path)
+        sample_rate: Output sample rate in Hz
+        channels: Output channel count
+        start_secs: Position to start decoding at
+        ffmpeg_path: Path to ffmpeg (default: found on PATH)
+        seek_indexes: Seek index cache (default: the global one)
+        handles: Cache holding archives open (default: the global handle cache)
+
+    Returns:
+        A started decoder
+
+    Raises:
+        RuntimeError: If the file needs ffmpeg and ffmpeg is not available
+    """
+    parts = split_member_path(file_path)
+    name = parts[1] if parts is not None else file_path
+    if PurePosixPath(name).suffix.lower() == ".wav":
+        decoder = _open_wav(file_path, sample_rate, channels, start_secs, handles)
+        if decoder is not None:
+            return decoder
+    seek_index = None
+    if start_secs > 0:
+        cache = seek_indexes if seek_indexes is not None else get_seek_index_cache()
+        seek_index = cache.get(file_path, handles)
+    return FFmpegDecoder(
+        file_path, sample_rate, channels, start_secs, ffmpeg_path, seek_index, handles
+    )
@@ -0,0 +1,100 @@
+"""Delivery of end-of-track events from audio players."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import subprocess
+import threading
+from typing import Callable, Optional
+
+from ...domain.interfaces.audio_player import TrackFinishedCallback
+
+logger = logging.getLogger(__name__)
+
+
+class PlaybackSupervisor:
+    """
+    Reports files that played to their end, on a thread of its own.
+
+    Players post an event the moment a file ends: their decoder reached
+    the end of the stream, or a waiter thread saw their child process exit.
+    The callback runs on the supervisor thread rather than the audio path,
+    so it may block, e.g. to start the next track. Nothing runs while no
+    track is playing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the supervisor; its thread starts with the first event."""
+        self._callback: Optional[TrackFinishedCallback] = None
+        self._events: queue.Queue[Optional[str]] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def set_callback(self, callback: Optional[TrackFinishedCallback]) -> None:
+        """
+        Set the function called with the path of every file that played to its end.
+
+        Args:
+            callback: The callback, or None to drop events
+        """
+        self._callback = callback
+
+    def post(self, file_path: str) -> None:
+        """
+        Report that a file played to its end; returns immediately.
+
+        Args:
+            file_path: Path of the file
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="playt-supervisor", daemon=True
+                )
+                self._thread.start()
+        self._events.put(file_path)
+
+    def watch(
+        self,
+        process: subprocess.Popen[bytes],
+        file_path: str,
+        is_current: Callable[[], bool],
+    ) -> None:
+        """
+        Wait for a child process playing a file and report the file when it exits.
+
+        Args:
+            process: The child process
+            file_path: Path of the file it plays
+            is_current: Tells whether the process is still the player's own
+                (a process the player replaced or stopped did not end naturally)
+        """
+
+        def wait() -> None:
+            process.wait()
+            if is_current():
+                self.post(file_path)
+
+        threading.Thread(target=wait, name="playt-waiter", daemon=True).start()
+
+    def close(self) -> None:
+        """Stop the supervisor thread after the events already posted."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._events.put(None)
+            thread.join(timeout=2)
+
+    def _run(self) -> None:
+        while True:
+            file_path = self._events.get()
+            if file_path is None:
+                return
+            callback = self._callback
+            if callback is None:
+                continue
+            try:
+                callback(file_path)
+            except Exception:
+                logger.exception("Track finished callback failed for %s", file_path)
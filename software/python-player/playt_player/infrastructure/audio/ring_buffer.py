@@ -0,0 +1,97 @@
+"""Fixed-capacity FIFO of PCM frames, allocated once."""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class PcmRingBuffer:
+    """
+    Ring buffer of float32 frames of a fixed channel count.
+
+    The storage is allocated up front, so decoding ahead never allocates.
+    Read and write positions are absolute frame counts since the last
+    clear, which lets callers tie events such as track boundaries to a
+    point in the stream.
+
+    The buffer does no locking of its own: the playback engine calls it
+    with its lock held, and every call is at most two slice copies.
+    """
+
+    def __init__(self, capacity_frames: int, channels: int) -> None:
+        """
+        Allocate the buffer.
+
+        Args:
+            capacity_frames: Frames the buffer holds
+            channels: Channels per frame
+        """
+        self._data = np.zeros((max(1, capacity_frames), channels), dtype=np.float32)
+        self._read = 0
+        self._write = 0
+
+    @property
+    def capacity(self) -> int:
+        """Frames the buffer holds."""
+        return len(self._data)
+
+    @property
+    def read_position(self) -> int:
+        """Frames read since the last clear."""
+        return self._read
+
+    @property
+    def write_position(self) -> int:
+        """Frames written since the last clear."""
+        return self._write
+
+    @property
+    def available(self) -> int:
+        """Frames waiting to be read."""
+        return self._write - self._read
+
+    @property
+    def free(self) -> int:
+        """Frames that can be written without overwriting unread ones."""
+        return self.capacity - self.available
+
+    def write(self, block: np.ndarray) -> int:
+        """
+        Append as many frames of a block as fit.
+
+        Args:
+            block: float32 array of shape (frames, channels)
+
+        Returns:
+            Number of frames written
+        """
+        frames = min(len(block), self.free)
+        start = self._write % self.capacity
+        first = min(frames, self.capacity - start)
+        self._data[start : start + first] = block[:first]
+        self._data[: frames - first] = block[first:frames]
+        self._write += frames
+        return frames
+
+    def read(self, out: np.ndarray) -> int:
+        """
+        Move frames from the buffer into out.
+
+        Args:
+            out: float32 array of shape (frames, channels) to fill from the start
+
+        Returns:
+            Number of frames read (fewer than len(out) if the buffer ran low)
+        """
+        frames = min(len(out), self.available)
+        start = self._read % self.capacity
+        first = min(frames, self.capacity - start)
+        out[:first] = self._data[start : start + first]
+        out[first:frames] = self._data[: frames - first]
+        self._read += frames
+        return frames
+
+    def clear(self) -> None:
+        """Drop every unread frame and restart the positions at 0."""
+        self._read = 0
+        self._write = 0
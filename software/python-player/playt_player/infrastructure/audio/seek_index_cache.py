@@ -0,0 +1,124 @@
+"""Seek indexes of played tracks, cached by track identity."""
+
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import PurePosixPath
+from typing import Optional
+
+from ..cartridge.archive_member import open_track, split_member_path
+from ..cartridge.handle_cache import CartridgeHandleCache
+from ..parsing.seek_index import SeekIndex, build_seek_index
+
+# Identity of a track's content: (path, member name, size, modification time)
+TrackIdentity = tuple[str, str, int, int]
+
+
+def track_identity(file_path: str) -> Optional[TrackIdentity]:
+    """
+    Identify the content of a track without reading it.
+
+    Archive members are identified by the member name and the size and
+    modification time of the archive, regular files by their own.
+
+    Args:
+        file_path: A Song.file_path
+
+    Returns:
+        TrackIdentity, or None if the file does not exist
+    """
+    parts = split_member_path(file_path)
+    path, member = parts if parts is not None else (file_path, "")
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return os.path.abspath(path), member, stat.st_size, stat.st_mtime_ns
+
+
+class SeekIndexCache:
+    """
+    Builds seek indexes on first use and keeps the most recent ones.
+
+    An index is keyed by its track's identity, so a track that changed on
+    disk is indexed again. Files without an index (unsupported formats,
+    broken headers) are remembered too, so they are not parsed on every seek.
+    """
+
+    DEFAULT_MAX_ENTRIES = 256
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Number of tracks to keep indexes for
+        """
+        self._max_entries = max(1, max_entries)
+        self._indexes: OrderedDict[TrackIdentity, Optional[SeekIndex]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, file_path: str, handles: Optional[CartridgeHandleCache] = None
+    ) -> Optional[SeekIndex]:
+        """
+        Get the seek index of a track, building it if needed.
+
+        Args:
+            file_path: A Song.file_path
+            handles: Cache holding archives open (default: the global handle cache)
+
+        Returns:
+            SeekIndex, or None if the track cannot be indexed
+        """
+        identity = track_identity(file_path)
+        if identity is None:
+            return None
+        with self._lock:
+            if identity in self._indexes:
+                self._indexes.move_to_end(identity)
+                return self._indexes[identity]
+
+        # Built outside the lock; two threads indexing the same track is harmless
+        parts = split_member_path(file_path)
+        extension = PurePosixPath(parts[1] if parts is not None else file_path).suffix
+        try:
+            with open_track(file_path, handles) as stream:
+                index = build_seek_index(stream, extension)
+        except (OSError, KeyError, zipfile.BadZipFile):
+            return None
+
+        with self._lock:
+            self._indexes[identity] = index
+            self._indexes.move_to_end(identity)
+            while len(self._indexes) > self._max_entries:
+                self._indexes.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        """Forget every index."""
+        with self._lock:
+            self._indexes.clear()
+
+    def __len__(self) -> int:
+        """Number of cached tracks."""
+        with self._lock:
+            return len(self._indexes)
+
+
+# Global seek index cache instance
+_seek_index_cache: Optional[SeekIndexCache] = None
+
+
+def get_seek_index_cache() -> SeekIndexCache:
+    """
+    Get the global seek index cache instance.
+
+    Returns:
+        Global SeekIndexCache instance
+    """
+    global _seek_index_cache
+    if _seek_index_cache is None:
+        _seek_index_cache = SeekIndexCache()
+    return _seek_index_cache
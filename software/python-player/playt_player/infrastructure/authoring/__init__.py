@@ -0,0 +1,5 @@
+"""Tools for authoring .playt cartridges."""
+
+from .packer import PackOptions, PackResult, pack_album, pack_albums
+
+__all__ = ["PackOptions", "PackResult", "pack_album", "pack_albums"]
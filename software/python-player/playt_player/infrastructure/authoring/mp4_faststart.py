@@ -0,0 +1,135 @@
+"""Move the moov atom of MP4/M4A files in front of the media data ("faststart")."""
+
+import os
+import struct
+from typing import IO, Optional
+
+from ..parsing.mp4_reader import Mp4Atom, iter_atoms
+from ..parsing.stream_info import read_exactly, stream_size
+
+# Atoms on the way from moov to the chunk offset tables
+_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+# Largest moov atom that is rewritten in memory
+MAX_MOOV_SIZE = 64 * 1024 * 1024
+_COPY_CHUNK = 1024 * 1024
+
+
+def _shift_chunk_offsets(moov: bytearray, start: int, end: int, shift: int, after: int) -> bool:
+    """
+    Add `shift` to every chunk offset at or past `after` in stco/co64 tables.
+
+    Returns:
+        False if a 32-bit offset would overflow or the atoms are malformed
+    """
+    offset = start
+    while offset + 8 <= end:
+        size, atom_type = struct.unpack_from(">I4s", moov, offset)
+        header_size = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", moov, offset + 8)
+            header_size = 16
+        if size < header_size or offset + size > end:
+            return False
+
+        payload = offset + header_size
+        if atom_type in _CONTAINERS:
+            if not _shift_chunk_offsets(moov, payload, offset + size, shift, after):
+                return False
+        elif atom_type in (b"stco", b"co64"):
+            # Version/flags (4), entry count (4), then the offsets
+            (count,) = struct.unpack_from(">I", moov, payload + 4)
+            width, fmt, limit = (4, ">I", 0xFFFFFFFF) if atom_type == b"stco" else (8, ">Q", None)
+            if payload + 8 + count * width > offset + size:
+                return False
+            for index in range(count):
+                position = payload + 8 + index * width
+                (chunk_offset,) = struct.unpack_from(fmt, moov, position)
+                if chunk_offset >= after:
+                    chunk_offset += shift
+                    if limit is not None and chunk_offset > limit:
+                        return False
+                    struct.pack_into(fmt, moov, position, chunk_offset)
+        offset += size
+    return True
+
+
+def _copy_range(src: IO[bytes], dst: IO[bytes], start: int, length: int) -> None:
+    """Copy `length` bytes starting at `start` from src to dst."""
+    src.seek(start)
+    remaining = length
+    while remaining > 0:
+        chunk = src.read(min(_COPY_CHUNK, remaining))
+        if not chunk:
+            raise ValueError("Unexpected end of file")
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+
+def faststart(src: IO[bytes], dst: IO[bytes]) -> bool:
+    """
+    Rewrite an MP4 file so that its moov atom precedes the media data.
+
+    A player can then start decoding after reading the head of the file
+    instead of seeking to its end first. Nothing is written when the file is
+    already laid out that way or cannot be rewritten safely.
+
+    Args:
+        src: Seekable binary stream of the original file
+        dst: Binary stream receiving the rewritten file
+
+    Returns:
+        True if the rewritten file was written to dst
+    """
+    size = stream_size(src)
+    atoms = list(iter_atoms(src, 0, size))
+    if not atoms or atoms[-1].end != size:
+        # Trailing garbage or truncated atoms; leave the file alone
+        return False
+
+    moov: Optional[Mp4Atom] = next((a for a in atoms if a.atom_type == b"moov"), None)
+    first_mdat: Optional[Mp4Atom] = next((a for a in atoms if a.atom_type == b"mdat"), None)
+    if moov is None or first_mdat is None or moov.offset < first_mdat.offset:
+        return False
+    if moov.size > MAX_MOOV_SIZE:
+        return False
+
+    src.seek(moov.offset)
+    data = read_exactly(src, moov.size)
+    if data is None:
+        return False
+    moov_bytes = bytearray(data)
+    # Everything from the first mdat up to the old moov position moves up by moov.size
+    try:
+        shifted = _shift_chunk_offsets(
+            moov_bytes, moov.header_size, moov.size, moov.size, first_mdat.offset
+        )
+    except struct.error:
+        shifted = False
+    if not shifted:
+        return False
+
+    for atom in atoms:
+        if atom is first_mdat:
+            dst.write(moov_bytes)
+        if atom is not moov:
+            _copy_range(src, dst, atom.offset, atom.size)
+    return True
+
+
+def faststart_file(src_path: str, dst_path: str) -> bool:
+    """
+    Write a faststart copy of an MP4 file.
+
+    Args:
+        src_path: Original file
+        dst_path: Destination file (only created if a rewrite is needed)
+
+    Returns:
+        True if dst_path now holds the rewritten file
+    """
+    with open(src_path, "rb") as src:
+        with open(dst_path, "wb") as dst:
+            rewritten = faststart(src, dst)
+    if not rewritten:
+        os.remove(dst_path)
+    return rewritten
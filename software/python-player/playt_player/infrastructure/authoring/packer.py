@@ -0,0 +1,313 @@
+"""Build .playt archives laid out for fast playback."""
+
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import IO, Optional
+
+from ..cartridge.filename_metadata import parse_filename_metadata, select_cover_art
+from ..cartridge.manifest import MANIFEST_NAME, Manifest, ManifestTrack, dump_manifest
+from ..cartridge.playt_file_cartridge_reader import PlaytFileCartridgeReader
+from ..parsing.stream_info import read_stream_info
+from .mp4_faststart import faststart_file
+from .thumbnails import make_thumbnail
+
+AUDIO_EXTENSIONS = PlaytFileCartridgeReader.AUDIO_EXTENSIONS
+IMAGE_EXTENSIONS = PlaytFileCartridgeReader.IMAGE_EXTENSIONS
+# Formats that are already compressed; deflating them only costs decode time
+STORED_EXTENSIONS = {
+    ".mp3",
+    ".flac",
+    ".m4a",
+    ".aac",
+    ".ogg",
+    ".opus",
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".webp",
+}
+_MP4_EXTENSIONS = {".m4a", ".mp4"}
+
+# Stored member data starts on a multiple of this many bytes (a page)
+DEFAULT_ALIGNMENT = 4096
+# Largest cover thumbnail edge in pixels
+DEFAULT_THUMBNAIL_SIZE = 256
+# Member name of the thumbnail, next to the cover art
+THUMBNAIL_NAME = ".thumbnail.jpg"
+
+# Extra field ID used for alignment padding (same as Android's zipalign)
+_ALIGNMENT_EXTRA_ID = 0xD935
+# Size of the fixed part of a zip local file header
+_LOCAL_HEADER_SIZE = 30
+# Size of the zip64 extra field zipfile adds to large members
+_ZIP64_EXTRA_SIZE = 20
+_COPY_CHUNK = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class PackOptions:
+    """
+    Settings for packing an album.
+
+    Attributes:
+        alignment: Alignment of stored member data in bytes (1 disables padding)
+        thumbnail_size: Largest cover thumbnail edge in pixels (None for no thumbnail)
+        faststart: Move MP4 moov atoms in front of the media data
+    """
+
+    alignment: int = DEFAULT_ALIGNMENT
+    thumbnail_size: Optional[int] = DEFAULT_THUMBNAIL_SIZE
+    faststart: bool = True
+
+
+@dataclass(frozen=True)
+class PackResult:
+    """
+    Outcome of packing one album.
+
+    Attributes:
+        source_dir: Album directory that was packed
+        output_path: The .playt file (not written if error is set)
+        tracks: Number of tracks packed
+        error: Why packing failed (None on success)
+        warnings: Problems that did not stop packing
+    """
+
+    source_dir: Path
+    output_path: Path
+    tracks: int = 0
+    error: Optional[str] = None
+    warnings: list[str] = field(default_factory=list)
+
+
+def find_album_files(source_dir: Path) -> tuple[list[Path], list[Path]]:
+    """
+    Find the audio and image files of an album directory.
+
+    Args:
+        source_dir: Directory holding the album's files
+
+    Returns:
+        Tuple of (sorted audio files, sorted image files)
+    """
+    audio_files: list[Path] = []
+    images: list[Path] = []
+    for item in sorted(source_dir.iterdir()):
+        if not item.is_file() or item.name.startswith("."):
+            continue
+        suffix = item.suffix.lower()
+        if suffix in AUDIO_EXTENSIONS:
+            audio_files.append(item)
+        elif suffix in IMAGE_EXTENSIONS:
+            images.append(item)
+    return audio_files, images
+
+
+def _alignment_extra(offset: int, name: str, zip64: bool, alignment: int) -> bytes:
+    """
+    Build an extra field that pads a local header so the data is aligned.
+
+    Args:
+        offset: Offset the local header will be written at
+        name: Member name
+        zip64: Whether zipfile will append its zip64 extra field
+        alignment: Required alignment of the member data
+
+    Returns:
+        The padding extra field (empty if no alignment is required)
+    """
+    if alignment <= 1:
+        return b""
+    data_offset = _LOCAL_HEADER_SIZE + offset + len(name.encode("utf-8")) + 4
+    if zip64:
+        data_offset += _ZIP64_EXTRA_SIZE
+    padding = -data_offset % alignment
+    return struct.pack("<HH", _ALIGNMENT_EXTRA_ID, padding) + b"\x00" * padding
+
+
+def _write_member(
+    zip_ref: zipfile.ZipFile, fp: IO[bytes], source: Path, name: str, alignment: int
+) -> int:
+    """
+    Add a file to the archive, storing compressed formats aligned.
+
+    Args:
+        zip_ref: Archive being written
+        fp: The archive's underlying file (positioned at the next header)
+        source: File to add
+        name: Member name
+        alignment: Alignment of stored member data
+
+    Returns:
+        Offset of the member data within the archive
+    """
+    zinfo = zipfile.ZipInfo.from_file(source, name, strict_timestamps=False)
+    stored = PurePosixPath(name).suffix.lower() in STORED_EXTENSIONS
+    zinfo.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+    zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+
+    header_offset = fp.tell()
+    padding = _alignment_extra(header_offset, name, zip64, alignment if stored else 1)
+    zinfo.extra = padding
+    with open(source, "rb") as src, zip_ref.open(zinfo, "w", force_zip64=zip64) as dst:
+        shutil.copyfileobj(src, dst, _COPY_CHUNK)
+    # The padding only matters in the local header; keep the central directory lean
+    zinfo.extra = b""
+
+    data_offset = header_offset + _LOCAL_HEADER_SIZE + len(name.encode("utf-8")) + len(padding)
+    return data_offset + (_ZIP64_EXTRA_SIZE if zip64 else 0)
+
+
+def _prepare_audio(audio_file: Path, work_dir: Path, options: PackOptions) -> Path:
+    """Get the file to pack for a track, rewriting MP4 files for faststart."""
+    if not options.faststart or audio_file.suffix.lower() not in _MP4_EXTENSIONS:
+        return audio_file
+    rewritten = work_dir / audio_file.name
+    if not faststart_file(str(audio_file), str(rewritten)):
+        return audio_file
+    shutil.copystat(audio_file, rewritten)
+    return rewritten
+
+
+def _read_duration(audio_file: Path) -> Optional[float]:
+    """Read a track duration from its header."""
+    with open(audio_file, "rb") as stream:
+        info = read_stream_info(stream, audio_file.suffix)
+    return info.duration_secs if info is not None else None
+
+
+def pack_album(
+    source_dir: Path, output_path: Path, options: Optional[PackOptions] = None
+) -> PackResult:
+    """
+    Pack an album directory into a playback-optimized .playt file.
+
+    Tracks are sorted by file name and stored under a folder named after
+    the album directory. Already-compressed audio and images are stored
+    uncompressed with their data aligned, so players can read (or map) them
+    in place. A playt.json manifest with titles, durations and member data
+    offsets is written last, so loading the cartridge needs no scanning or
+    probing.
+
+    Args:
+        source_dir: Directory holding the album's audio and image files
+        output_path: The .playt file to write (replaced atomically)
+        options: Packing settings (default: PackOptions())
+
+    Returns:
+        PackResult describing the packed album
+    """
+    options = options if options is not None else PackOptions()
+    source_dir = Path(source_dir)
+    output_path = Path(output_path)
+    try:
+        audio_files, images = find_album_files(source_dir)
+    except OSError as e:
+        return PackResult(source_dir, output_path, error=f"Cannot read {source_dir}: {e}")
+    if not audio_files:
+        return PackResult(source_dir, output_path, error=f"No audio files in {source_dir}")
+
+    prefix = source_dir.resolve().name
+    warnings: list[str] = []
+    part_path = output_path.with_name(output_path.name + ".part")
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="playt_pack_") as work_dir:
+            with open(part_path, "wb") as fp, zipfile.ZipFile(fp, "w") as zip_ref:
+                tracks: list[ManifestTrack] = []
+                artists = set()
+                albums = set()
+                for number, audio_file in enumerate(audio_files, start=1):
+                    source = _prepare_audio(audio_file, Path(work_dir), options)
+                    member = f"{prefix}/{audio_file.name}"
+                    data_offset = _write_member(zip_ref, fp, source, member, options.alignment)
+
+                    duration = _read_duration(source)
+                    if duration is None:
+                        warnings.append(f"Unknown duration: {audio_file.name}")
+                    title, artist, album_name = parse_filename_metadata(audio_file.stem, prefix)
+                    if artist != "Unknown Artist":
+                        artists.add(artist)
+                    albums.add(album_name)
+                    tracks.append(
+                        ManifestTrack(
+                            member=member,
+                            title=title,
+                            artist=artist if artist != "Unknown Artist" else None,
+                            duration_secs=duration,
+                            track_number=number,
+                            data_offset=data_offset,
+                        )
+                    )
+
+                for image in images:
+                    _write_member(zip_ref, fp, image, f"{prefix}/{image.name}", options.alignment)
+
+                cover_art, slideshow = select_cover_art(images)
+                thumbnail: Optional[str] = None
+                if cover_art is not None and options.thumbnail_size:
+                    data = make_thumbnail(cover_art, options.thumbnail_size)
+                    if data is None:
+                        warnings.append(f"No thumbnail for {cover_art.name}")
+                    else:
+                        thumbnail_path = Path(work_dir) / THUMBNAIL_NAME
+                        thumbnail_path.write_bytes(data)
+                        thumbnail = f"{prefix}/{THUMBNAIL_NAME}"
+                        _write_member(zip_ref, fp, thumbnail_path, thumbnail, options.alignment)
+
+                album_artist: Optional[str] = None
+                if len(artists) == 1:
+                    album_artist = next(iter(artists))
+                elif len(artists) > 1:
+                    album_artist = "Various Artists"
+                manifest = Manifest(
+                    tracks=tracks,
+                    title=next(iter(albums)) if len(albums) == 1 else prefix,
+                    artist=album_artist,
+                    cover_art=f"{prefix}/{cover_art.name}" if cover_art is not None else None,
+                    slideshow=[f"{prefix}/{image.name}" for image in slideshow],
+                    thumbnail=thumbnail,
+                )
+                zip_ref.writestr(
+                    MANIFEST_NAME, dump_manifest(manifest), compress_type=zipfile.ZIP_DEFLATED
+                )
+        os.replace(part_path, output_path)
+    except (OSError, ValueError, zipfile.LargeZipFile) as e:
+        part_path.unlink(missing_ok=True)
+        return PackResult(source_dir, output_path, error=f"Failed to pack {source_dir}: {e}")
+
+    return PackResult(source_dir, output_path, tracks=len(tracks), warnings=warnings)
+
+
+def pack_albums(
+    jobs: list[tuple[Path, Path]],
+    options: Optional[PackOptions] = None,
+    workers: Optional[int] = None,
+) -> list[PackResult]:
+    """
+    Pack several albums on a process pool.
+
+    Packing is dominated by reading, copying and rewriting files, so albums
+    are packed in separate processes to keep every disk and core busy.
+
+    Args:
+        jobs: (album directory, output .playt path) pairs
+        options: Packing settings shared by all albums (default: PackOptions())
+        workers: Number of worker processes (default: one per CPU)
+
+    Returns:
+        One PackResult per job, in job order
+    """
+    if workers == 1 or len(jobs) <= 1:
+        return [pack_album(source, output, options) for source, output in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(pack_album, source, output, options) for source, output in jobs]
+        return [future.result() for future in futures]
@@ -0,0 +1,86 @@
+"""Downscaled cover thumbnails for cartridge browsers."""
+
+import io
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; ffmpeg is used instead
+    Image = None
+
+# Seconds to wait for ffmpeg to scale one image
+_FFMPEG_TIMEOUT = 30.0
+
+
+def _thumbnail_with_pillow(image_path: Path, size: int) -> Optional[bytes]:
+    """Scale an image with Pillow."""
+    try:
+        with Image.open(image_path) as image:
+            image.thumbnail((size, size))
+            buffer = io.BytesIO()
+            image.convert("RGB").save(buffer, "JPEG", quality=85, optimize=True)
+            return buffer.getvalue()
+    except (OSError, ValueError):
+        return None
+
+
+def _thumbnail_with_ffmpeg(image_path: Path, size: int, ffmpeg: str) -> Optional[bytes]:
+    """Scale an image with ffmpeg."""
+    scale = f"scale='min({size},iw)':'min({size},ih)':force_original_aspect_ratio=decrease"
+    try:
+        result = subprocess.run(
+            [
+                ffmpeg,
+                "-v",
+                "error",
+                "-i",
+                str(image_path),
+                "-vf",
+                scale,
+                "-frames:v",
+                "1",
+                "-f",
+                "image2pipe",
+                "-c:v",
+                "mjpeg",
+                "-q:v",
+                "4",
+                "pipe:1",
+            ],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            timeout=_FFMPEG_TIMEOUT,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0 or not result.stdout:
+        return None
+    return result.stdout
+
+
+def make_thumbnail(
+    image_path: Path, size: int, ffmpeg_path: Optional[str] = None
+) -> Optional[bytes]:
+    """
+    Scale an image down to fit a `size` x `size` box, as JPEG.
+
+    Pillow is used when installed, otherwise ffmpeg from PATH.
+
+    Args:
+        image_path: Source image
+        size: Largest width or height of the thumbnail in pixels
+        ffmpeg_path: Path to ffmpeg (default: found on PATH)
+
+    Returns:
+        JPEG data, or None if no image tool is available or the image is unreadable
+    """
+    if Image is not None:
+        return _thumbnail_with_pillow(image_path, size)
+    ffmpeg = ffmpeg_path or shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    return _thumbnail_with_ffmpeg(image_path, size, ffmpeg)
@@ -0,0 +1,324 @@
+"""Addressing and streaming audio members stored inside .playt archives."""
+
+import io
+import os
+import shutil
+import struct
+import threading
+import zipfile
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
+    from .handle_cache import CartridgeHandleCache
+
+# Separator between the archive path and the member name in a member path,
+# e.g. "/music/album.playt!/Album/01 - Intro.flac"
+MEMBER_SEPARATOR = "!/"
+
+# Size of the fixed part of a zip local file header
+_LOCAL_HEADER_SIZE = 30
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """
+    Location of a single member inside a .playt archive.
+
+    Attributes:
+        archive_path: Absolute path to the .playt file
+        name: Member name inside the archive
+        data_offset: Byte offset of the member data within the archive
+        compress_size: Size of the (possibly compressed) member data
+        file_size: Uncompressed size of the member
+        compress_type: Zip compression method (ZIP_STORED, ZIP_DEFLATED, ...)
+    """
+
+    archive_path: str
+    name: str
+    data_offset: int
+    compress_size: int
+    file_size: int
+    compress_type: int
+
+    @property
+    def is_stored(self) -> bool:
+        """Whether the member data is stored uncompressed in the archive."""
+        return self.compress_type == zipfile.ZIP_STORED
+
+
+def member_path(archive_path: str, member_name: str) -> str:
+    """
+    Build a member path addressing a file inside a .playt archive.
+
+    Args:
+        archive_path: Absolute path to the .playt file
+        member_name: Member name inside the archive
+
+    Returns:
+        Member path usable as a Song.file_path
+    """
+    return f"{archive_path}{MEMBER_SEPARATOR}{member_name}"
+
+
+def split_member_path(file_path: str) -> Optional[tuple[str, str]]:
+    """
+    Split a member path into its archive path and member name.
+
+    Args:
+        file_path: A Song.file_path
+
+    Returns:
+        Tuple of (archive_path, member_name), or None for regular file paths
+    """
+    archive_path, separator, member_name = file_path.partition(MEMBER_SEPARATOR)
+    if not separator or not member_name or not archive_path.lower().endswith(".playt"):
+        return None
+    return archive_path, member_name
+
+
+def locate_member(fp: IO[bytes], archive_path: str, info: zipfile.ZipInfo) -> ArchiveMember:
+    """
+    Locate the data of a member by reading its local file header.
+
+    Args:
+        fp: Binary file open on the archive (its position is changed)
+        archive_path: Absolute path to the .playt file
+        info: Central directory entry of the member
+
+    Returns:
+        ArchiveMember describing where the member data lives
+
+    Raises:
+        zipfile.BadZipFile: If the local file header is invalid
+    """
+    fp.seek(info.header_offset)
+    header = fp.read(_LOCAL_HEADER_SIZE)
+    if len(header) != _LOCAL_HEADER_SIZE or header[:4] != _LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    return ArchiveMember(
+        archive_path=archive_path,
+        name=info.filename,
+        data_offset=info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length,
+        compress_size=info.compress_size,
+        file_size=info.file_size,
+        compress_type=info.compress_type,
+    )
+
+
+def _handle_cache(handles: Optional["CartridgeHandleCache"]) -> "CartridgeHandleCache":
+    """The given handle cache, or the global one."""
+    if handles is not None:
+        return handles
+    # Imported here because handle_cache builds on this module
+    from .handle_cache import get_handle_cache
+
+    return get_handle_cache()
+
+
+def resolve_member(
+    file_path: str, handles: Optional["CartridgeHandleCache"] = None
+) -> Optional[ArchiveMember]:
+    """
+    Resolve a member path to the location of its data.
+
+    The archive is opened through the handle cache, so resolving many
+    members of one cartridge parses its central directory only once.
+
+    Args:
+        file_path: A Song.file_path
+        handles: Cache holding the archive open (default: the global handle cache)
+
+    Returns:
+        ArchiveMember for member paths, None for regular file paths or
+        members that cannot be streamed (missing or encrypted)
+    """
+    parts = split_member_path(file_path)
+    if parts is None:
+        return None
+    archive_path, member_name = parts
+    try:
+        return _handle_cache(handles).open(archive_path).member(member_name)
+    except (zipfile.BadZipFile, OSError):
+        return None
+
+
+class _StoredMemberFile(io.RawIOBase):
+    """Seekable read-only window over the bytes of a stored member."""
+
+    def __init__(self, member: ArchiveMember) -> None:
+        super().__init__()
+        self._file = open(member.archive_path, "rb")
+        self._start = member.data_offset
+        self._size = member.file_size
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: "WriteableBuffer") -> int:
+        remaining = self._size - self._position
+        if remaining <= 0:
+            return 0
+        view = memoryview(buffer).cast("B")
+        view = view[: min(len(view), remaining)]
+        self._file.seek(self._start + self._position)
+        count = self._file.readinto(view)
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._position = max(0, min(position, self._size))
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def open_member(
+    member: ArchiveMember, handles: Optional["CartridgeHandleCache"] = None
+) -> IO[bytes]:
+    """
+    Open a member for reading its uncompressed bytes.
+
+    Stored members are read straight from the archive, so seeking is cheap;
+    compressed members are decompressed on the fly from the shared archive
+    handle and seeking backwards restarts decompression.
+
+    Args:
+        member: The member to open
+        handles: Cache holding the archive open (default: the global handle cache)
+
+    Returns:
+        Seekable binary file object yielding the member contents
+    """
+    if member.is_stored:
+        return io.BufferedReader(_StoredMemberFile(member))
+
+    return _handle_cache(handles).open(member.archive_path).open(member.name)
+
+
+def open_track(file_path: str, handles: Optional["CartridgeHandleCache"] = None) -> IO[bytes]:
+    """
+    Open a Song.file_path for reading, whether a regular file or an archive member.
+
+    Args:
+        file_path: A Song.file_path
+        handles: Cache holding archives open (default: the global handle cache)
+
+    Returns:
+        Seekable binary file object yielding the track's bytes
+
+    Raises:
+        OSError: If the file or archive cannot be read
+        KeyError: If the member does not exist
+    """
+    member = resolve_member(file_path, handles)
+    if member is not None:
+        return open_member(member, handles)
+    return open(file_path, "rb")
+
+
+def ffmpeg_input(
+    file_path: str, handles: Optional["CartridgeHandleCache"] = None
+) -> tuple[str, Optional[ArchiveMember]]:
+    """
+    Translate a Song.file_path into an ffmpeg/ffplay/ffprobe input.
+
+    Stored members are read in place through ffmpeg's subfile protocol using
+    their byte range; compressed members have to be piped in through stdin.
+
+    Args:
+        file_path: A Song.file_path
+        handles: Cache holding archives open (default: the global handle cache)
+
+    Returns:
+        Tuple of (input argument, member to pipe through stdin or None)
+    """
+    member = resolve_member(file_path, handles)
+    if member is None:
+        return file_path, None
+    if member.is_stored:
+        start = member.data_offset
+        end = member.data_offset + member.compress_size
+        return f"subfile,,start,{start},end,{end},,:file:{member.archive_path}", None
+    return "pipe:0", member
+
+
+def feed_member(
+    member: ArchiveMember, sink: IO[bytes], handles: Optional["CartridgeHandleCache"] = None
+) -> threading.Thread:
+    """
+    Stream the uncompressed member contents into a pipe on a background thread.
+
+    The pipe is closed once the member has been written or the reader went away.
+
+    Args:
+        member: The member to stream
+        sink: Writable end of the pipe (e.g. a subprocess stdin)
+        handles: Cache holding the archive open (default: the global handle cache)
+
+    Returns:
+        The started feeder thread
+    """
+    return _start_feeder(lambda: open_member(member, handles), sink)
+
+
+def feed_track(
+    file_path: str, sink: IO[bytes], handles: Optional["CartridgeHandleCache"] = None
+) -> threading.Thread:
+    """
+    Stream a Song.file_path, file or archive member, into a pipe on a background thread.
+
+    The pipe is closed once the track has been written or the reader went away.
+
+    Args:
+        file_path: A Song.file_path
+        sink: Writable end of the pipe (e.g. a subprocess stdin)
+        handles: Cache holding archives open (default: the global handle cache)
+
+    Returns:
+        The started feeder thread
+    """
+    return _start_feeder(lambda: open_track(file_path, handles), sink)
+
+
+def _start_feeder(open_source: Callable[[], IO[bytes]], sink: IO[bytes]) -> threading.Thread:
+    """Copy a source into a pipe on a background thread, closing the pipe at the end."""
+
+    def _feed() -> None:
+        try:
+            with open_source() as source:
+                shutil.copyfileobj(source, sink)
+        except (BrokenPipeError, ValueError, OSError, KeyError, zipfile.BadZipFile):
+            # The consumer exited (stop, seek, track change) or the data is bad
+            pass
+        finally:
+            try:
+                sink.close()
+            except OSError:
+                pass
+
+    thread = threading.Thread(target=_feed, daemon=True)
+    thread.start()
+    return thread
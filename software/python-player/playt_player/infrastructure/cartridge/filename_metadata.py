@@ -0,0 +1,103 @@
+"""Album metadata conventions shared by cartridge readers and authoring tools."""
+
+import re
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+# Image names preferred as cover art, in order of priority
+COVER_ART_NAMES = ["cover", "folder", "front", "album"]
+
+
+def clean_title(title: str) -> str:
+    """Remove leading track numbers from title and normalize."""
+    # Remove leading digits and separators
+    title = re.sub(r"^\d+[\s\.\-_]+", "", title)
+    # Normalize unicode characters to NFC (composed) form
+    return unicodedata.normalize("NFC", title)
+
+
+def parse_filename_metadata(filename: str, default_album: str) -> tuple[str, str, str]:
+    """
+    Parse metadata from filename.
+
+    Convention: Artist - Album - Song
+
+    Args:
+        filename: Filename without extension
+        default_album: Default album name to use if not parsed
+
+    Returns:
+        Tuple of (title, artist, album)
+    """
+    parts = filename.split(" - ")
+
+    if len(parts) >= 3:
+        artist = parts[0]
+        album = parts[1]
+        title = " - ".join(parts[2:])
+        return (
+            clean_title(title),
+            unicodedata.normalize("NFC", artist),
+            unicodedata.normalize("NFC", album),
+        )
+    elif len(parts) == 2:
+        # Assuming Artist - Song
+        artist = parts[0]
+        title = parts[1]
+        return (
+            clean_title(title),
+            unicodedata.normalize("NFC", artist),
+            unicodedata.normalize("NFC", default_album),
+        )
+    else:
+        return (
+            clean_title(filename),
+            "Unknown Artist",
+            unicodedata.normalize("NFC", default_album),
+        )
+
+
+def select_cover_art(images: list[Path]) -> tuple[Optional[Path], list[Path]]:
+    """
+    Pick the cover art and the slideshow images among an album's images.
+
+    Args:
+        images: Image files next to the album's audio
+
+    Returns:
+        Tuple of (cover art, sorted slideshow images)
+    """
+    if not images:
+        return None, []
+
+    cover_art: Optional[Path] = None
+
+    # Priority search for cover art
+    for name in COVER_ART_NAMES:
+        for img in images:
+            if img.stem.lower() == name:
+                cover_art = img
+                break
+        if cover_art:
+            break
+
+    # Fallback to first image found if no priority match
+    if not cover_art:
+        cover_art = images[0]
+
+    # Filter slideshow images
+    slideshow_images = []
+    for img in images:
+        # Skip the selected cover art
+        if img == cover_art:
+            continue
+
+        # Skip files containing 'cover' in the name (case insensitive)
+        # (slideshow images must not be named anything like "cover")
+        if "cover" in img.stem.lower():
+            continue
+
+        slideshow_images.append(img)
+
+    return cover_art, sorted(slideshow_images)
@@ -0,0 +1,39 @@
+"""Content identity of .playt cartridge files."""
+
+import hashlib
+import zipfile
+from pathlib import Path
+from typing import Optional
+
+
+def cartridge_fingerprint(playt_path: Path, zip_ref: Optional[zipfile.ZipFile] = None) -> str:
+    """
+    Compute a fingerprint identifying the content of a .playt file.
+
+    The fingerprint covers the file size and modification time plus the name,
+    size and CRC of every member in the central directory, so it changes
+    whenever the cartridge content does without hashing the audio itself.
+
+    Args:
+        playt_path: Path to the .playt file
+        zip_ref: Already open archive for playt_path, to avoid reopening it
+
+    Returns:
+        Hex digest identifying the cartridge content
+
+    Raises:
+        OSError: If the file cannot be read
+        zipfile.BadZipFile: If the file is not a valid zip archive
+    """
+    stat = playt_path.stat()
+    digest = hashlib.sha256(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    if zip_ref is None:
+        with zipfile.ZipFile(playt_path, "r") as own_ref:
+            infos = own_ref.infolist()
+    else:
+        infos = zip_ref.infolist()
+
+    for info in sorted(infos, key=lambda info: info.filename):
+        digest.update(f"\0{info.filename}\0{info.file_size}\0{info.CRC:08x}".encode())
+    return digest.hexdigest()
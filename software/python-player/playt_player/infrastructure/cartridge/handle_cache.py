@@ -0,0 +1,266 @@
+"""Shared open handles on .playt archives."""
+
+import threading
+import zipfile
+from pathlib import Path
+from typing import IO, Optional, Union
+
+from .archive_member import ArchiveMember, locate_member
+from .fingerprint import cartridge_fingerprint
+
+# Size of the fixed part of a zip local file header
+_LOCAL_HEADER_SIZE = 30
+
+
+class CartridgeHandle:
+    """
+    An open .playt archive with its parsed central directory.
+
+    The central directory is read once when the handle is opened; member
+    lookups, data offsets and the content fingerprint are served from memory
+    afterwards. Handles are safe to share between threads.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open an archive.
+
+        Args:
+            path: Absolute path to the .playt file
+
+        Raises:
+            OSError: If the file cannot be read
+            zipfile.BadZipFile: If the file is not a valid zip archive
+        """
+        self._path = path
+        stat = path.stat()
+        self._signature = (stat.st_size, stat.st_mtime_ns)
+        self._zip_file = zipfile.ZipFile(path, "r")
+        self._infos = {info.filename: info for info in self._zip_file.infolist()}
+        self._names = [info.filename for info in self._zip_file.infolist() if not info.is_dir()]
+        self._members: dict[str, Optional[ArchiveMember]] = {}
+        self._fingerprint: Optional[str] = None
+        # Guards the lazily filled fields and the raw header reads
+        self._lock = threading.Lock()
+        self._raw: Optional[IO[bytes]] = None
+
+    @property
+    def path(self) -> Path:
+        """Absolute path to the .playt file."""
+        return self._path
+
+    @property
+    def zip_file(self) -> zipfile.ZipFile:
+        """The open archive (reads from several threads are safe)."""
+        return self._zip_file
+
+    @property
+    def names(self) -> list[str]:
+        """Names of all file members, in central directory order."""
+        return self._names
+
+    @property
+    def fingerprint(self) -> str:
+        """Content fingerprint of the archive (see cartridge_fingerprint)."""
+        with self._lock:
+            if self._fingerprint is None:
+                self._fingerprint = cartridge_fingerprint(self._path, self._zip_file)
+            return self._fingerprint
+
+    def is_current(self) -> bool:
+        """
+        Check whether the file on disk is still the one that was opened.
+
+        Returns:
+            False if the file was replaced, modified or removed
+        """
+        try:
+            stat = self._path.stat()
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == self._signature
+
+    def getinfo(self, name: str) -> Optional[zipfile.ZipInfo]:
+        """
+        Get the central directory entry of a member.
+
+        Args:
+            name: Member name
+
+        Returns:
+            The entry, or None if the archive has no such member
+        """
+        return self._infos.get(name)
+
+    def member(self, name: str) -> Optional[ArchiveMember]:
+        """
+        Locate the data of a member; the result is remembered.
+
+        Args:
+            name: Member name
+
+        Returns:
+            ArchiveMember, or None if the member is missing, encrypted or corrupt
+        """
+        with self._lock:
+            if name in self._members:
+                return self._members[name]
+
+            info = self._infos.get(name)
+            member: Optional[ArchiveMember] = None
+            if info is not None and not info.flag_bits & 0x1:
+                try:
+                    if self._raw is None:
+                        self._raw = open(self._path, "rb")
+                    member = locate_member(self._raw, str(self._path), info)
+                except (OSError, zipfile.BadZipFile):
+                    member = None
+            self._members[name] = member
+            return member
+
+    def seed_member(self, name: str, data_offset: int) -> bool:
+        """
+        Record a member data offset known in advance (e.g. from a manifest).
+
+        The offset is only accepted if it is consistent with the central
+        directory, so a stale manifest cannot point playback at the wrong bytes.
+
+        Args:
+            name: Member name
+            data_offset: Byte offset of the member data within the archive
+
+        Returns:
+            True if the offset was accepted
+        """
+        info = self._infos.get(name)
+        if info is None or info.flag_bits & 0x1:
+            return False
+        # The data follows the local header, the name and an extra field of at most 64 KiB
+        encoding = "utf-8" if info.flag_bits & 0x800 else "cp437"
+        try:
+            name_length = len(info.orig_filename.encode(encoding))
+        except UnicodeEncodeError:
+            return False
+        earliest = info.header_offset + _LOCAL_HEADER_SIZE + name_length
+        if not earliest <= data_offset <= earliest + 0xFFFF:
+            return False
+        with self._lock:
+            self._members.setdefault(
+                name,
+                ArchiveMember(
+                    archive_path=str(self._path),
+                    name=name,
+                    data_offset=data_offset,
+                    compress_size=info.compress_size,
+                    file_size=info.file_size,
+                    compress_type=info.compress_type,
+                ),
+            )
+        return True
+
+    def open(self, name: str) -> IO[bytes]:
+        """
+        Open a member for reading its uncompressed bytes.
+
+        Args:
+            name: Member name
+
+        Returns:
+            Binary file object; it stays usable after the handle is closed
+
+        Raises:
+            KeyError: If the archive has no such member
+        """
+        return self._zip_file.open(name, "r")
+
+    def close(self) -> None:
+        """Close the archive; members opened earlier stay readable until closed."""
+        with self._lock:
+            if self._raw is not None:
+                self._raw.close()
+                self._raw = None
+        self._zip_file.close()
+
+
+class CartridgeHandleCache:
+    """
+    Keeps one open handle per cartridge until it is ejected.
+
+    Every reader call and every member lookup for the same .playt file shares
+    the handle, so the central directory is parsed only once per insertion.
+    A handle whose file changed on disk is reopened transparently.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty handle cache."""
+        self._handles: dict[str, CartridgeHandle] = {}
+        self._lock = threading.Lock()
+
+    def open(self, path: Union[str, Path]) -> CartridgeHandle:
+        """
+        Get the handle of an archive, opening it on first use.
+
+        Args:
+            path: Path to the .playt file
+
+        Returns:
+            The shared handle
+
+        Raises:
+            OSError: If the file cannot be read
+            zipfile.BadZipFile: If the file is not a valid zip archive
+        """
+        absolute = Path(path).absolute()
+        key = str(absolute)
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is not None and handle.is_current():
+                return handle
+            if handle is not None:
+                del self._handles[key]
+                handle.close()
+            handle = CartridgeHandle(absolute)
+            self._handles[key] = handle
+            return handle
+
+    def close(self, path: Union[str, Path]) -> None:
+        """
+        Close the handle of an ejected cartridge.
+
+        Args:
+            path: Path to the .playt file
+        """
+        with self._lock:
+            handle = self._handles.pop(str(Path(path).absolute()), None)
+        if handle is not None:
+            handle.close()
+
+    def clear(self) -> None:
+        """Close every handle."""
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+        for handle in handles:
+            handle.close()
+
+    def __len__(self) -> int:
+        """Number of open handles."""
+        with self._lock:
+            return len(self._handles)
+
+
+# Global handle cache instance
+_handle_cache: Optional[CartridgeHandleCache] = None
+
+
+def get_handle_cache() -> CartridgeHandleCache:
+    """
+    Get the global cartridge handle cache instance.
+
+    Returns:
+        Global CartridgeHandleCache instance
+    """
+    global _handle_cache
+    if _handle_cache is None:
+        _handle_cache = CartridgeHandleCache()
+    return _handle_cache
@@ -0,0 +1,235 @@
+"""Background extraction of cartridge members in playback order."""
+
+import os
+import threading
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import IO, Callable, Iterable, Optional
+
+from ...domain.interfaces.track_source import TrackSourceInterface
+from .archive_member import member_path
+from .handle_cache import CartridgeHandle
+
+# Suffix of members that are still being written
+PART_SUFFIX = ".part"
+
+# Chunk size used when copying a member out of the archive; cancel() waits
+# for at most one chunk
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def safe_target(target_dir: Path, name: str) -> Optional[Path]:
+    """
+    Get the extraction path of an archive member.
+
+    Args:
+        target_dir: Directory the archive is extracted into
+        name: Member name
+
+    Returns:
+        Path below target_dir, or None if the name would escape it
+    """
+    parts = PurePosixPath(name).parts
+    if not parts or PurePosixPath(name).is_absolute() or ".." in parts:
+        return None
+    return target_dir.joinpath(*parts)
+
+
+class LazyExtraction(TrackSourceInterface):
+    """
+    Extracts the members of a .playt file one by one on a worker thread.
+
+    Members are extracted in the given order, so tracks become ready in
+    playback order. A track that is needed before the worker reaches it is
+    moved to the front of the queue. Every member is written to a ".part"
+    file first and renamed once complete, so a file at its final path is
+    always whole.
+    """
+
+    def __init__(
+        self,
+        handle: CartridgeHandle,
+        target_dir: Path,
+        names: list[str],
+        on_complete: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Initialize the extraction (call start() to begin).
+
+        Args:
+            handle: Open handle on the .playt file
+            target_dir: Directory to extract into
+            names: Member names in the order they should be extracted
+            on_complete: Called on the worker thread once every member is extracted
+        """
+        self._handle = handle
+        self._target_dir = target_dir
+        self._on_complete = on_complete
+        self._pending: list[str] = list(dict.fromkeys(names))
+        self._by_path: dict[str, str] = {}
+        for name in self._pending:
+            target = safe_target(target_dir, name)
+            if target is not None:
+                self._by_path[str(target)] = name
+        self._done: set[str] = set()
+        self._failed: set[str] = set()
+        self._cancelled = False
+        self._finished = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, first: Iterable[str] = ()) -> None:
+        """
+        Start extracting.
+
+        Args:
+            first: Members extracted on the calling thread before returning,
+                so they are ready as soon as start() returns
+        """
+        first = [name for name in first if name in self._pending]
+        if first:
+            with self._condition:
+                for name in first:
+                    self._pending.remove(name)
+            for name in first:
+                self._extract(name)
+
+        self._thread = threading.Thread(
+            target=self._run, name="playt-extract", daemon=True
+        )
+        self._thread.start()
+
+    def ensure_ready(self, file_path: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a track is extracted, moving it to the front of the queue.
+
+        Args:
+            file_path: Extraction path of the track
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the track is extracted, False if it failed or timed out
+        """
+        name = self._by_path.get(file_path)
+        if name is None:
+            # Not one of ours; nothing to wait for
+            return True
+
+        with self._condition:
+            if name in self._pending:
+                self._pending.remove(name)
+                self._pending.insert(0, name)
+            self._condition.wait_for(
+                lambda: name in self._done or name in self._failed or self._finished,
+                timeout=timeout,
+            )
+            return name in self._done
+
+    def source_path(self, file_path: str) -> str:
+        """
+        Get a path the content of a track can be read from right now.
+
+        Args:
+            file_path: Extraction path of the track
+
+        Returns:
+            file_path once extracted, otherwise the track's archive member path
+        """
+        name = self._by_path.get(file_path)
+        with self._condition:
+            if name is None or name in self._done:
+                return file_path
+        return member_path(str(self._handle.path), name)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every member has been extracted.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the extraction finished, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._finished, timeout=timeout)
+
+    def is_complete(self) -> bool:
+        """
+        Check whether every member was extracted successfully.
+
+        Returns:
+            True if the extraction finished without failures
+        """
+        with self._condition:
+            return self._finished and not self._failed and not self._cancelled
+
+    def cancel(self) -> None:
+        """Stop extracting and wait for the member in progress to stop at its next chunk."""
+        with self._condition:
+            self._cancelled = True
+            self._pending.clear()
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Worker loop: extract pending members until none are left."""
+        while True:
+            with self._condition:
+                if self._cancelled or not self._pending:
+                    break
+                name = self._pending.pop(0)
+            self._extract(name)
+
+        with self._condition:
+            self._finished = True
+            self._condition.notify_all()
+
+        if self._on_complete is not None and self.is_complete():
+            self._on_complete()
+
+    def _extract(self, name: str) -> None:
+        """Extract a single member through a .part file."""
+        target = safe_target(self._target_dir, name)
+        info = self._handle.getinfo(name)
+        ok = False
+        try:
+            if info is None:
+                raise KeyError(name)
+            if target is None:
+                # Unsafe names are skipped, like extractall would sanitize them away
+                ok = True
+            elif target.is_file() and target.stat().st_size == info.file_size:
+                # Already extracted by an earlier, interrupted run
+                ok = True
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                part = target.with_name(target.name + PART_SUFFIX)
+                with self._handle.open(name) as source, open(part, "wb") as sink:
+                    copied = self._copy(source, sink)
+                if copied:
+                    os.replace(part, target)
+                else:
+                    part.unlink(missing_ok=True)
+                ok = copied
+        except (KeyError, ValueError, zipfile.BadZipFile, OSError):
+            # ValueError: the handle was closed because the cartridge changed
+            ok = False
+
+        with self._condition:
+            (self._done if ok else self._failed).add(name)
+            self._condition.notify_all()
+
+    def _copy(self, source: IO[bytes], sink: IO[bytes]) -> bool:
+        """
+        Copy a member chunk by chunk, stopping early once cancelled.
+
+        Returns:
+            True if the whole member was copied, False if cancelled
+        """
+        while chunk := source.read(_COPY_CHUNK_SIZE):
+            if self._cancelled:
+                return False
+            sink.write(chunk)
+        return True
@@ -0,0 +1,220 @@
+"""Optional playt.json manifest describing the album inside a .playt file.
+
+A manifest lets a reader build the album without scanning the archive,
+guessing metadata from file names or probing durations:
+
+    {
+      "format": "playt",
+      "version": 1,
+      "album": {"title": "...", "artist": "...", "year": 1999, "genre": "..."},
+      "cover_art": "Album/cover.jpg",
+      "thumbnail": "Album/.thumbnail.jpg",
+      "slideshow": ["Album/photo1.jpg"],
+      "tracks": [
+        {
+          "member": "Album/01 Intro.flac",
+          "title": "Intro",
+          "artist": "...",
+          "duration_secs": 61.5,
+          "track_number": 1,
+          "data_offset": 1234,
+          "metadata": {}
+        }
+      ]
+    }
+
+Only "tracks" with their "member" names are required; everything else is
+optional. Track order is the order of the list, whatever the track numbers
+say, so numbers may restart on every disc of a multi-disc album.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+# Name of the manifest member at the archive root
+MANIFEST_NAME = "playt.json"
+# Manifest format version written by this implementation
+MANIFEST_VERSION = 1
+
+
+class ManifestError(ValueError):
+    """Raised when a manifest is malformed."""
+
+
+@dataclass(frozen=True)
+class ManifestTrack:
+    """
+    A single track entry of a manifest.
+
+    Attributes:
+        member: Member name of the audio file inside the archive
+        title: Track title (None to derive it from the member name)
+        artist: Track artist (None for the album artist)
+        duration_secs: Duration in seconds (None if unknown)
+        track_number: Track number, e.g. on its disc (None for the position in
+            the manifest); playback follows the manifest's order regardless
+        data_offset: Byte offset of the member data within the archive
+        metadata: Additional metadata
+    """
+
+    member: str
+    title: Optional[str] = None
+    artist: Optional[str] = None
+    duration_secs: Optional[float] = None
+    track_number: Optional[int] = None
+    data_offset: Optional[int] = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Manifest:
+    """
+    Album description stored in a .playt file.
+
+    Attributes:
+        tracks: Tracks in playback order
+        title: Album title (None if unknown)
+        artist: Album artist (None if unknown)
+        year: Release year (None if unknown)
+        genre: Genre (None if unknown)
+        cover_art: Member name of the cover image (None if none)
+        slideshow: Member names of the slideshow images
+        thumbnail: Member name of a downscaled cover for cartridge browsers (None if none)
+    """
+
+    tracks: list[ManifestTrack]
+    title: Optional[str] = None
+    artist: Optional[str] = None
+    year: Optional[int] = None
+    genre: Optional[str] = None
+    cover_art: Optional[str] = None
+    slideshow: list[str] = field(default_factory=list)
+    thumbnail: Optional[str] = None
+
+
+def _optional(value: Any, expected: Union[type, tuple[type, ...]], key: str) -> Any:
+    """Check the type of an optional manifest value."""
+    if value is None:
+        return None
+    # bool is an int subclass but never a valid number here
+    if isinstance(value, bool) or not isinstance(value, expected):
+        raise ManifestError(f"{key} has the wrong type")
+    return value
+
+
+def parse_manifest(data: bytes) -> Manifest:
+    """
+    Parse a manifest.
+
+    Args:
+        data: Contents of the manifest member
+
+    Returns:
+        The parsed manifest
+
+    Raises:
+        ManifestError: If the manifest is not valid JSON or has the wrong shape
+    """
+    try:
+        document = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ManifestError(f"Invalid manifest: {e}") from e
+    if not isinstance(document, dict):
+        raise ManifestError("Manifest must be an object")
+
+    version = document.get("version", MANIFEST_VERSION)
+    if not isinstance(version, int) or version > MANIFEST_VERSION:
+        raise ManifestError(f"Unsupported manifest version: {version}")
+
+    album = document.get("album") or {}
+    if not isinstance(album, dict):
+        raise ManifestError("album must be an object")
+
+    raw_tracks = document.get("tracks")
+    if not isinstance(raw_tracks, list) or not raw_tracks:
+        raise ManifestError("tracks must be a non-empty list")
+
+    tracks: list[ManifestTrack] = []
+    for entry in raw_tracks:
+        if not isinstance(entry, dict) or not isinstance(entry.get("member"), str):
+            raise ManifestError("Every track needs a member name")
+        metadata = entry.get("metadata") or {}
+        if not isinstance(metadata, dict):
+            raise ManifestError("metadata must be an object")
+        duration = _optional(entry.get("duration_secs"), (int, float), "duration_secs")
+        tracks.append(
+            ManifestTrack(
+                member=entry["member"],
+                title=_optional(entry.get("title"), str, "title"),
+                artist=_optional(entry.get("artist"), str, "artist"),
+                duration_secs=float(duration) if duration is not None else None,
+                track_number=_optional(entry.get("track_number"), int, "track_number"),
+                data_offset=_optional(entry.get("data_offset"), int, "data_offset"),
+                metadata=metadata,
+            )
+        )
+
+    slideshow = document.get("slideshow") or []
+    if not isinstance(slideshow, list) or not all(isinstance(name, str) for name in slideshow):
+        raise ManifestError("slideshow must be a list of member names")
+
+    return Manifest(
+        tracks=tracks,
+        title=_optional(album.get("title"), str, "album.title"),
+        artist=_optional(album.get("artist"), str, "album.artist"),
+        year=_optional(album.get("year"), int, "album.year"),
+        genre=_optional(album.get("genre"), str, "album.genre"),
+        cover_art=_optional(document.get("cover_art"), str, "cover_art"),
+        slideshow=slideshow,
+        thumbnail=_optional(document.get("thumbnail"), str, "thumbnail"),
+    )
+
+
+def dump_manifest(manifest: Manifest) -> bytes:
+    """
+    Serialize a manifest.
+
+    Args:
+        manifest: The manifest to write
+
+    Returns:
+        UTF-8 encoded JSON suitable for the manifest member
+    """
+    album = {
+        key: value
+        for key, value in (
+            ("title", manifest.title),
+            ("artist", manifest.artist),
+            ("year", manifest.year),
+            ("genre", manifest.genre),
+        )
+        if value is not None
+    }
+    tracks = []
+    for track in manifest.tracks:
+        entry: dict[str, Any] = {"member": track.member}
+        for key, value in (
+            ("title", track.title),
+            ("artist", track.artist),
+            ("duration_secs", track.duration_secs),
+            ("track_number", track.track_number),
+            ("data_offset", track.data_offset),
+        ):
+            if value is not None:
+                entry[key] = value
+        if track.metadata:
+            entry["metadata"] = track.metadata
+        tracks.append(entry)
+
+    document: dict[str, Any] = {"format": "playt", "version": MANIFEST_VERSION}
+    if album:
+        document["album"] = album
+    if manifest.cover_art is not None:
+        document["cover_art"] = manifest.cover_art
+    if manifest.thumbnail is not None:
+        document["thumbnail"] = manifest.thumbnail
+    if manifest.slideshow:
+        document["slideshow"] = manifest.slideshow
+    document["tracks"] = tracks
+    return json.dumps(document, indent=2, ensure_ascii=False).encode("utf-8")
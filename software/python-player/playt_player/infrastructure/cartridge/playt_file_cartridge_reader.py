@@ -1,18 +1,37 @@
 """Playt file cartridge reader implementation for .playt zip files."""
 
+import os
 import shutil
+import sqlite3
 import subprocess
 import tempfile
 import zipfile
-import re
-import unicodedata
-from pathlib import Path
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import IO, Callable, Optional
 
 from ...domain.entities.album import Album
 from ...domain.entities.cartridge import Cartridge
 from ...domain.entities.song import Song
 from ...domain.interfaces.cartridge_reader import CartridgeReaderInterface
+from ...domain.interfaces.track_source import TrackSourceInterface
+from ..parsing.stream_info import read_stream_info
+from ..storage.extraction_cache import ExtractionCache
+from ..storage.index_repository import IndexRepository
+from .archive_member import (
+    feed_member,
+    ffmpeg_input,
+    member_path,
+    open_member,
+    resolve_member,
+    split_member_path,
+)
+from .filename_metadata import clean_title, parse_filename_metadata, select_cover_art
+from .handle_cache import CartridgeHandle, CartridgeHandleCache, get_handle_cache
+from .lazy_extraction import LazyExtraction, safe_target
+from .manifest import MANIFEST_NAME, Manifest, ManifestError, parse_manifest
 
 
 class PlaytFileCartridgeReader(CartridgeReaderInterface):
@@ -20,9 +39,18 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
     Cartridge reader implementation for .playt zip files.
 
     This implementation:
-    1. Extracts .playt zip files to a temporary directory
-    2. Finds all audio files in the top-level folder
+    1. Finds all audio files in the top-level folder of a .playt zip file
+    2. Extracts the first track, then the rest on a background worker
     3. Creates an album with those songs
+
+    The album is returned as soon as the first track is extracted; the
+    track source from get_track_source() waits for later tracks on demand.
+    Cartridges with a playt.json manifest (see manifest) skip steps 1 and 3:
+    the manifest lists the tracks and their metadata.
+
+    In streaming mode nothing but the images is extracted: each song's
+    file_path addresses its member inside the archive (see archive_member)
+    and the audio backend reads it from there.
     """
 
     # Supported audio file extensions
@@ -30,10 +58,47 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
     # Supported image file extensions
     IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
 
-    def __init__(self) -> None:
-        """Initialize the playt file cartridge reader."""
+    # Default upper bound for a single ffprobe run, in seconds
+    DEFAULT_PROBE_TIMEOUT = 10.0
+
+    def __init__(
+        self,
+        streaming: bool = False,
+        probe_workers: Optional[int] = None,
+        probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+        cache: Optional[ExtractionCache] = None,
+        index: Optional[IndexRepository] = None,
+        handles: Optional[CartridgeHandleCache] = None,
+    ) -> None:
+        """
+        Initialize the playt file cartridge reader.
+
+        Args:
+            streaming: If True, play audio straight out of the archive instead
+                of extracting the whole cartridge first
+            probe_workers: Number of durations probed concurrently
+                (defaults to the CPU count)
+            probe_timeout: Seconds after which probing a single track is
+                abandoned and its duration left unknown
+            cache: Persistent extraction cache; when set, cartridges are
+                extracted once into the cache instead of a temp dir per load
+            index: Metadata index; when set, known cartridges load their
+                album metadata from it instead of parsing and probing again
+            handles: Cache of open archives shared by all calls until a
+                cartridge is cleaned up (default: the global handle cache)
+        """
         self._temp_dirs: dict[str, Path] = {}  # Track temp dirs for cleanup
         self._file_paths: dict[str, str] = {}  # Map cartridge IDs to file paths
+        self._cache_keys: dict[str, str] = {}  # Map cartridge IDs to pinned cache keys
+        self._extractions: dict[str, LazyExtraction] = {}  # Extractions in progress
+        self._cache = cache
+        self._index = index
+        self._handles = handles if handles is not None else get_handle_cache()
+        if probe_workers is not None and probe_workers < 1:
+            raise ValueError(f"probe_workers must be at least 1, got {probe_workers}")
+        self._streaming = streaming
+        self._probe_workers = probe_workers or os.cpu_count() or 1
+        self._probe_timeout = probe_timeout
 
     def read_cartridge(self, cartridge_id: str) -> Optional[Cartridge]:
         """
@@ -50,11 +115,9 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
             return None
 
         try:
-            # Verify it's a valid zip file
-            with zipfile.ZipFile(playt_path, "r") as zip_ref:
-                # Get the first entry to determine structure
-                if not zip_ref.namelist():
-                    return None
+            # Verify it's a valid zip file; the handle stays open for loading
+            if not self._handles.open(playt_path).zip_file.namelist():
+                return None
 
             # Use file name as cartridge ID
             cid = playt_path.stem
@@ -70,27 +133,96 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
 
     def _clean_title(self, title: str) -> str:
         """Remove leading track numbers from title and normalize."""
-        # Remove leading digits and separators
-        title = re.sub(r"^\d+[\s\.\-_]+", "", title)
-        # Normalize unicode characters to NFC (composed) form
-        return unicodedata.normalize("NFC", title)
+        return clean_title(title)
+
+    def _get_duration(self, file_path: str) -> Optional[float]:
+        """
+        Get the duration of an audio file or archive member.
+
+        The file header is parsed first; ffprobe is only spawned for formats
+        the header parsers do not understand.
+        """
+        duration = self._read_header_duration(file_path)
+        if duration is not None:
+            return duration
+        return self._probe_duration(file_path)
+
+    def _read_header_duration(self, file_path: str) -> Optional[float]:
+        """Get the duration from the file header without spawning a process."""
+        parts = split_member_path(file_path)
+        extension = PurePosixPath(parts[1] if parts else file_path).suffix
+        stream: IO[bytes]
+        try:
+            if parts is None:
+                stream = open(file_path, "rb")
+            else:
+                member = resolve_member(file_path, self._handles)
+                if member is None:
+                    return None
+                stream = open_member(member, self._handles)
+            with stream:
+                info = read_stream_info(stream, extension)
+        except (OSError, zipfile.BadZipFile):
+            return None
+        return info.duration_secs if info is not None else None
 
-    def _get_duration(self, file_path: Path) -> Optional[float]:
-        """Get duration of audio file using ffprobe."""
+    def _probe_duration(self, file_path: str) -> Optional[float]:
+        """Get the duration of an audio file or archive member using ffprobe."""
         try:
+            source, piped_member = ffmpeg_input(file_path, self._handles)
             # ffprobe -v error -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 input.mp3
             cmd = [
                 "ffprobe",
                 "-v", "error",
                 "-show_entries", "format=duration",
                 "-of", "default=noprint_wrappers=1:nokey=1",
-                str(file_path)
+                source,
             ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return float(result.stdout.strip())
-        except (subprocess.SubprocessError, ValueError):
+            if piped_member is None:
+                result = subprocess.run(
+                    cmd, capture_output=True, text=True, check=True, timeout=self._probe_timeout
+                )
+                return float(result.stdout.strip())
+
+            # Compressed archive members are piped through stdin
+            process = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+            if process.stdin is not None:
+                feed_member(piped_member, process.stdin, self._handles)
+            try:
+                # ffprobe prints a single line, so waiting before reading cannot deadlock
+                returncode = process.wait(timeout=self._probe_timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                return None
+            output = process.stdout.read() if process.stdout is not None else b""
+            if returncode != 0:
+                return None
+            return float(output.decode().strip())
+        except (subprocess.SubprocessError, ValueError, OSError):
             return None
 
+    def _probe_durations(self, file_paths: list[str]) -> list[Optional[float]]:
+        """
+        Probe the durations of several tracks concurrently.
+
+        Header parsing is cheap, but an ffprobe fallback is an external
+        process, so a small thread pool keeps several of them running at once.
+
+        Args:
+            file_paths: Audio file or member paths
+
+        Returns:
+            Durations in the same order as file_paths (None where unknown)
+        """
+        workers = min(self._probe_workers, len(file_paths))
+        if workers <= 1:
+            return [self._get_duration(file_path) for file_path in file_paths]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="playt-probe") as pool:
+            return list(pool.map(self._get_duration, file_paths))
+
     def _parse_metadata(
         self, filename: str, default_album: str
     ) -> tuple[str, str, str]:
@@ -106,32 +238,7 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
         Returns:
             Tuple of (title, artist, album)
         """
-        parts = filename.split(" - ")
-        
-        if len(parts) >= 3:
-            artist = parts[0]
-            album = parts[1]
-            title = " - ".join(parts[2:])
-            return (
-                self._clean_title(title),
-                unicodedata.normalize("NFC", artist),
-                unicodedata.normalize("NFC", album),
-            )
-        elif len(parts) == 2:
-            # Assuming Artist - Song
-            artist = parts[0]
-            title = parts[1]
-            return (
-                self._clean_title(title),
-                unicodedata.normalize("NFC", artist),
-                unicodedata.normalize("NFC", default_album),
-            )
-        else:
-            return (
-                self._clean_title(filename),
-                "Unknown Artist",
-                unicodedata.normalize("NFC", default_album),
-            )
+        return parse_filename_metadata(filename, default_album)
 
     def _find_cover_art(self, directory: Path) -> tuple[Optional[str], list[str]]:
         """
@@ -147,49 +254,24 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
         for item in directory.iterdir():
             if item.is_file() and item.suffix.lower() in self.IMAGE_EXTENSIONS:
                 images.append(item)
-                
-        if not images:
-            return None, []
-            
-        cover_art_path = None
-        
-        # Priority search for cover art
-        priority_names = ["cover", "folder", "front", "album"]
-        for name in priority_names:
-            for img in images:
-                if img.stem.lower() == name:
-                    cover_art_path = str(img)
-                    break
-            if cover_art_path:
-                break
-                    
-        # Fallback to first image found if no priority match
-        if not cover_art_path and images:
-            cover_art_path = str(images[0])
-            
-        # Filter slideshow images
-        slideshow_images = []
-        excluded_terms = ["cover"] # User said "not named anything like 'cover'"
-        
-        for img in images:
-            img_path = str(img)
-            # Skip the selected cover art
-            if img_path == cover_art_path:
-                continue
-                
-            # Skip files containing 'cover' in the name (case insensitive)
-            if "cover" in img.stem.lower():
-                continue
-                
-            slideshow_images.append(img_path)
-            
-        return cover_art_path, sorted(slideshow_images)
+
+        cover_art, slideshow_images = select_cover_art(images)
+        return (
+            str(cover_art) if cover_art is not None else None,
+            [str(image) for image in slideshow_images],
+        )
 
     def load_album_from_cartridge(self, cartridge: Cartridge) -> Optional[Album]:
         """
         Load album data from a .playt file.
 
-        Extracts the zip file and finds all audio files in the top-level folder.
+        If the archive carries a playt.json manifest, the album is built from
+        it alone. Otherwise all audio files in the top-level folder are found
+        and their metadata is derived from file names and headers.
+
+        Only the first track is extracted before returning; the others are
+        extracted in the background (see get_track_source). In streaming mode
+        the audio members are referenced in place instead.
 
         Args:
             cartridge: The cartridge object (cartridge.cid is the cartridge ID)
@@ -205,41 +287,51 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
         if not playt_path.exists() or playt_path.suffix.lower() != ".playt":
             return None
 
+        # Reloading a cartridge replaces its previous extraction
+        self._release_extraction(cartridge.cid)
+
         try:
-            # Extract to temporary directory
-            temp_dir = tempfile.mkdtemp(prefix="playt_")
-            self._temp_dirs[cartridge.cid] = Path(temp_dir)
-
-            with zipfile.ZipFile(playt_path, "r") as zip_ref:
-                zip_ref.extractall(temp_dir)
-
-            # Find all audio files in the top-level folder
-            # Check if there's a single subdirectory (common zip pattern)
-            top_level_dir = Path(temp_dir)
-            audio_files = self._find_audio_files(top_level_dir)
-            content_dir = top_level_dir
-
-            # If no files found at root, look through subdirectories
-            if not audio_files:
-                subdirs = [d for d in top_level_dir.iterdir() if d.is_dir()]
-                for subdir in subdirs:
-                    # Ignore macOS resource directories
-                    if subdir.name.startswith("__MACOSX"):
-                        continue
-                    candidate_files = self._find_audio_files(subdir)
-                    if candidate_files:
-                        audio_files = candidate_files
-                        content_dir = subdir
-                        break
-
-            if not audio_files:
+            handle = self._handles.open(playt_path)
+            manifest = self._read_manifest(handle)
+            if manifest is not None:
+                return self._load_from_manifest(cartridge.cid, handle, manifest)
+
+            key: Optional[str] = None
+            if self._cache is not None or self._index is not None:
+                key = handle.fingerprint
+
+            if self._streaming:
+                temp_dir = Path(tempfile.mkdtemp(prefix="playt_"))
+                self._temp_dirs[cartridge.cid] = temp_dir
+                tracks, content_dir = self._stream_cartridge(handle, temp_dir)
+            else:
+                tracks, content_dir = self._extract_cartridge(cartridge.cid, handle)
+
+            if not tracks:
                 # Clean up temp directory if no audio files found
-                shutil.rmtree(temp_dir)
+                self._release_extraction(cartridge.cid)
                 return None
 
+            # A known cartridge skips parsing, probing and the cover art scan
+            root = self._extraction_root(cartridge.cid)
+            if key is not None and root is not None:
+                indexed = self._load_indexed(key, root, playt_path)
+                if indexed is not None:
+                    return indexed
+
             # Find cover art and slideshow images in the same directory as content
             cover_art_path, slideshow_images = self._find_cover_art(content_dir)
 
+            # Probe all track durations up front, in parallel; tracks that are
+            # not extracted yet are read from the archive
+            extraction = self._extractions.get(cartridge.cid)
+            durations = self._probe_durations(
+                [
+                    extraction.source_path(file_path) if extraction else file_path
+                    for _, file_path in tracks
+                ]
+            )
+
             # Create songs from audio files
             songs: list[Song] = []
             
@@ -247,10 +339,9 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
             artists = set()
             albums = set()
             
-            for idx, audio_file in enumerate(sorted(audio_files), start=1):
-                # Get filename without extension for title
-                filename_stem = audio_file.stem
-                
+            for idx, ((filename_stem, file_path), duration) in enumerate(
+                zip(tracks, durations, strict=True), start=1
+            ):
                 title, artist, album_name = self._parse_metadata(
                     filename_stem, cartridge.cid
                 )
@@ -259,13 +350,13 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
                     artists.add(artist)
                 albums.add(album_name)
 
-                # Create song - file_path will be absolute path to extracted file
+                # file_path is the extracted file, or the archive member when streaming
                 song = Song(
                     title=title,
                     artist=artist,
                     album=album_name,
-                    duration_secs=self._get_duration(audio_file),
-                    file_path=str(audio_file),
+                    duration_secs=duration,
+                    file_path=file_path,
                     track_number=idx,
                     cover_art_path=cover_art_path,
                     slideshow_images=slideshow_images,
@@ -295,15 +386,421 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
                 songs=songs,
             )
 
+            if key is not None and root is not None:
+                self._save_indexed(key, album, root)
             return album
-        except (zipfile.BadZipFile, IOError, OSError) as e:
+        except (zipfile.BadZipFile, IOError, OSError):
             # Clean up on error
-            if cartridge.cid in self._temp_dirs:
-                temp_path = self._temp_dirs[cartridge.cid]
-                if temp_path.exists():
-                    shutil.rmtree(temp_path)
-                del self._temp_dirs[cartridge.cid]
+            self._release_extraction(cartridge.cid)
+            return None
+
+    def _extract_cartridge(
+        self, cartridge_id: str, handle: CartridgeHandle
+    ) -> tuple[list[tuple[str, str]], Path]:
+        """
+        Start extracting a cartridge, or reuse its extraction from the cache.
+
+        Only the images and the first track are extracted before returning;
+        a LazyExtraction worker takes care of the remaining members.
+
+        Args:
+            cartridge_id: ID of the cartridge being loaded
+            handle: Open handle on the .playt file
+
+        Returns:
+            Tuple of (sorted (filename stem, file path) pairs, content directory)
+        """
+        target_dir, cached = self._extraction_target(cartridge_id, handle)
+        if cached:
+            return self._find_tracks(target_dir)
+
+        names = handle.names
+        content_prefix, audio_names = self._find_audio_members(names)
+        audio_names = [name for name in audio_names if safe_target(target_dir, name)]
+        if not audio_names:
+            return [], target_dir
+
+        # Images next to the audio are needed right away for cover art
+        images = [
+            name
+            for name in names
+            if str(PurePosixPath(name).parent) == (content_prefix or ".")
+            and PurePosixPath(name).suffix.lower() in self.IMAGE_EXTENSIONS
+        ]
+        self._start_extraction(cartridge_id, handle, target_dir, audio_names, images)
+
+        tracks = [
+            (PurePosixPath(name).stem, str(safe_target(target_dir, name)))
+            for name in audio_names
+        ]
+        return tracks, target_dir / content_prefix
+
+    def _extraction_target(self, cartridge_id: str, handle: CartridgeHandle) -> tuple[Path, bool]:
+        """
+        Choose the directory a cartridge is extracted into.
+
+        Args:
+            cartridge_id: ID of the cartridge being loaded
+            handle: Open handle on the .playt file
+
+        Returns:
+            Tuple of (directory, whether the cache already holds the whole extraction)
+        """
+        if self._cache is None:
+            temp_dir = Path(tempfile.mkdtemp(prefix="playt_"))
+            self._temp_dirs[cartridge_id] = temp_dir
+            return temp_dir, False
+
+        key = handle.fingerprint
+        # Pin first so a concurrent eviction cannot remove the entry under us
+        self._cache.pin(key)
+        self._cache_keys[cartridge_id] = key
+
+        entry_dir = self._cache.lookup(key)
+        if entry_dir is not None:
+            return entry_dir, True
+        return self._cache.open_entry(key), False
+
+    def _start_extraction(
+        self,
+        cartridge_id: str,
+        handle: CartridgeHandle,
+        target_dir: Path,
+        audio_names: list[str],
+        images: list[str],
+    ) -> None:
+        """
+        Extract the images and the first track, then the rest in the background.
+
+        Args:
+            cartridge_id: ID of the cartridge being loaded
+            handle: Open handle on the .playt file
+            target_dir: Directory to extract into
+            audio_names: Audio members in playback order
+            images: Image members needed right away
+        """
+        # Tracks in playback order, then everything else so the cache entry is whole
+        audio_set = set(audio_names)
+        order = audio_names + [name for name in handle.names if name not in audio_set]
+
+        on_complete = None
+        key = self._cache_keys.get(cartridge_id)
+        if self._cache is not None and key is not None:
+            on_complete = partial(self._cache.mark_complete, key)
+
+        extraction = LazyExtraction(handle, target_dir, order, on_complete)
+        self._extractions[cartridge_id] = extraction
+        extraction.start(first=images + audio_names[:1])
+
+    def _read_manifest(self, handle: CartridgeHandle) -> Optional[Manifest]:
+        """
+        Read the playt.json manifest of a cartridge.
+
+        Args:
+            handle: Open handle on the .playt file
+
+        Returns:
+            The manifest, or None if the archive has none or it is unusable
+        """
+        if handle.getinfo(MANIFEST_NAME) is None:
+            return None
+        try:
+            with handle.open(MANIFEST_NAME) as stream:
+                manifest = parse_manifest(stream.read())
+        except (ManifestError, KeyError, zipfile.BadZipFile, OSError):
+            return None
+
+        # Every referenced member must exist and extract below the target dir
+        names = [track.member for track in manifest.tracks] + manifest.slideshow
+        if manifest.cover_art is not None:
+            names.append(manifest.cover_art)
+        for name in names:
+            if handle.getinfo(name) is None or safe_target(Path("."), name) is None:
+                return None
+        return manifest
+
+    def _load_from_manifest(
+        self, cartridge_id: str, handle: CartridgeHandle, manifest: Manifest
+    ) -> Album:
+        """
+        Build an album from a manifest without scanning or probing.
+
+        Args:
+            cartridge_id: ID of the cartridge being loaded
+            handle: Open handle on the .playt file
+            manifest: The cartridge's manifest
+
+        Returns:
+            The album described by the manifest
+        """
+        audio_names = [track.member for track in manifest.tracks]
+        images = [manifest.cover_art] if manifest.cover_art is not None else []
+        images += [name for name in manifest.slideshow if name not in images]
+        for track in manifest.tracks:
+            if track.data_offset is not None:
+                handle.seed_member(track.member, track.data_offset)
+
+        archive_path = str(handle.path)
+        if self._streaming:
+            root = Path(tempfile.mkdtemp(prefix="playt_"))
+            self._temp_dirs[cartridge_id] = root
+            for name in images:
+                handle.zip_file.extract(name, root)
+        else:
+            root, cached = self._extraction_target(cartridge_id, handle)
+            if not cached:
+                self._start_extraction(cartridge_id, handle, root, audio_names, images)
+
+        def locate(name: str) -> str:
+            return str(safe_target(root, name))
+
+        def locate_audio(name: str) -> str:
+            return member_path(archive_path, name) if self._streaming else locate(name)
+
+        cover_art_path = locate(manifest.cover_art) if manifest.cover_art is not None else None
+        slideshow_images = [locate(name) for name in manifest.slideshow]
+        album_title = manifest.title or cartridge_id
+        album_artist = manifest.artist or "Unknown Artist"
+
+        songs = []
+        for idx, track in enumerate(manifest.tracks, start=1):
+            metadata = dict(track.metadata)
+            # Songs are numbered by list position so the album plays in manifest order
+            # (numbers may restart on every disc); a differing number is kept here
+            if track.track_number is not None and track.track_number != idx:
+                metadata.setdefault("track_number", track.track_number)
+            songs.append(
+                Song(
+                    title=track.title or self._clean_title(PurePosixPath(track.member).stem),
+                    artist=track.artist or album_artist,
+                    album=album_title,
+                    duration_secs=track.duration_secs,
+                    file_path=locate_audio(track.member),
+                    track_number=idx,
+                    cover_art_path=cover_art_path,
+                    slideshow_images=slideshow_images,
+                    metadata=metadata,
+                )
+            )
+        return Album(
+            title=album_title,
+            artist=album_artist,
+            year=manifest.year,
+            genre=manifest.genre,
+            cover_art_path=cover_art_path,
+            slideshow_images=slideshow_images,
+            songs=songs,
+        )
+
+    def _extraction_root(self, cartridge_id: str) -> Optional[Path]:
+        """Get the directory a loaded cartridge is extracted (or streamed) into."""
+        if cartridge_id in self._temp_dirs:
+            return self._temp_dirs[cartridge_id]
+        if cartridge_id in self._cache_keys and self._cache is not None:
+            return self._cache.entry_dir(self._cache_keys[cartridge_id])
+        return None
+
+    def _load_indexed(self, key: str, root: Path, playt_path: Path) -> Optional[Album]:
+        """
+        Load an album from the metadata index.
+
+        The index stores archive member names instead of paths; they are
+        resolved against the current extraction (or the archive when streaming).
+
+        Args:
+            key: Cartridge fingerprint
+            root: Directory the cartridge is extracted into
+            playt_path: Path to the .playt file
+
+        Returns:
+            The indexed album with resolved paths, or None if not indexed
+        """
+        if self._index is None:
+            return None
+        try:
+            album = self._index.load_album(key)
+        except (sqlite3.Error, OSError):
             return None
+        if album is None:
+            return None
+
+        archive_path = str(playt_path.absolute())
+
+        def locate(name: str) -> str:
+            if self._streaming and PurePosixPath(name).suffix.lower() in self.AUDIO_EXTENSIONS:
+                return member_path(archive_path, name)
+            return str(root.joinpath(*PurePosixPath(name).parts))
+
+        return self._relocate_album(album, locate)
+
+    def _save_indexed(self, key: str, album: Album, root: Path) -> None:
+        """
+        Store an album in the metadata index under archive member names.
+
+        Args:
+            key: Cartridge fingerprint
+            album: The freshly loaded album
+            root: Directory the cartridge is extracted into
+        """
+        if self._index is None:
+            return
+
+        def name_of(file_path: str) -> str:
+            parts = split_member_path(file_path)
+            if parts is not None:
+                return parts[1]
+            return Path(file_path).relative_to(root).as_posix()
+
+        try:
+            self._index.save_album(key, self._relocate_album(album, name_of))
+        except (sqlite3.Error, OSError, ValueError):
+            # The index is an optimization; loading works without it
+            pass
+
+    @staticmethod
+    def _relocate_album(album: Album, locate: Callable[[str], str]) -> Album:
+        """
+        Copy an album with every file path mapped through locate.
+
+        Args:
+            album: The album to copy
+            locate: Maps an old path to a new one
+
+        Returns:
+            The album with mapped song, cover art and slideshow paths
+        """
+
+        def locate_optional(path: Optional[str]) -> Optional[str]:
+            return locate(path) if path is not None else None
+
+        songs = [
+            replace(
+                song,
+                file_path=locate(song.file_path),
+                cover_art_path=locate_optional(song.cover_art_path),
+                slideshow_images=[locate(path) for path in song.slideshow_images],
+            )
+            for song in album.songs
+        ]
+        return replace(
+            album,
+            cover_art_path=locate_optional(album.cover_art_path),
+            slideshow_images=[locate(path) for path in album.slideshow_images],
+            songs=songs,
+        )
+
+    def _find_tracks(self, extract_dir: Path) -> tuple[list[tuple[str, str]], Path]:
+        """
+        Find the audio files of an extracted cartridge.
+
+        Args:
+            extract_dir: Directory holding the extracted cartridge
+
+        Returns:
+            Tuple of (sorted (filename stem, file path) pairs, content directory)
+        """
+        # Find all audio files in the top-level folder
+        # Check if there's a single subdirectory (common zip pattern)
+        audio_files = self._find_audio_files(extract_dir)
+        content_dir = extract_dir
+
+        # If no files found at root, look through subdirectories
+        if not audio_files:
+            # Sorted like the member names, so a cached load picks the same folder
+            subdirs = sorted(d for d in extract_dir.iterdir() if d.is_dir())
+            for subdir in subdirs:
+                # Ignore macOS resource directories
+                if subdir.name.startswith("__MACOSX"):
+                    continue
+                candidate_files = self._find_audio_files(subdir)
+                if candidate_files:
+                    audio_files = candidate_files
+                    content_dir = subdir
+                    break
+
+        tracks = [(audio_file.stem, str(audio_file)) for audio_file in sorted(audio_files)]
+        return tracks, content_dir
+
+    def _stream_cartridge(
+        self, handle: CartridgeHandle, temp_dir: Path
+    ) -> tuple[list[tuple[str, str]], Path]:
+        """
+        Find the audio members of a cartridge without extracting them.
+
+        Only the images next to the audio are extracted, since the UI needs
+        real files for cover art and slideshows.
+
+        Args:
+            handle: Open handle on the .playt file
+            temp_dir: Directory to extract images into
+
+        Returns:
+            Tuple of (sorted (filename stem, member path) pairs, content directory)
+        """
+        archive_path = str(handle.path)
+        names = handle.names
+        content_prefix, audio_names = self._find_audio_members(names)
+        if not audio_names:
+            return [], temp_dir
+
+        for name in names:
+            path = PurePosixPath(name)
+            if (
+                str(path.parent) == (content_prefix or ".")
+                and path.suffix.lower() in self.IMAGE_EXTENSIONS
+            ):
+                handle.zip_file.extract(name, temp_dir)
+
+        tracks = [
+            (PurePosixPath(name).stem, member_path(archive_path, name))
+            for name in sorted(audio_names)
+        ]
+        return tracks, temp_dir / content_prefix
+
+    def _find_audio_members(self, names: list[str]) -> tuple[str, list[str]]:
+        """
+        Find the audio members in the top-level folder of an archive.
+
+        Mirrors _find_audio_files: audio at the archive root wins, otherwise
+        the first subdirectory directly containing audio is used.
+
+        Args:
+            names: Member names of all files in the archive
+
+        Returns:
+            Tuple of (content directory prefix, audio member names)
+        """
+        by_directory: dict[str, list[str]] = {}
+        for name in names:
+            path = PurePosixPath(name)
+            if path.suffix.lower() not in self.AUDIO_EXTENSIONS:
+                continue
+            parent = "" if str(path.parent) == "." else str(path.parent)
+            by_directory.setdefault(parent, []).append(name)
+
+        if "" in by_directory:
+            return "", sorted(by_directory[""])
+
+        for directory in sorted(by_directory):
+            # Only direct children of a top-level folder count
+            if "/" in directory or directory.startswith("__MACOSX"):
+                continue
+            return directory, sorted(by_directory[directory])
+
+        return "", []
+
+    def get_track_source(self, cartridge: Cartridge) -> Optional[TrackSourceInterface]:
+        """
+        Get the background extraction of a loaded cartridge.
+
+        Args:
+            cartridge: A cartridge previously passed to load_album_from_cartridge
+
+        Returns:
+            The extraction still filling in tracks, or None if every track
+            was already on disk (cached or streamed)
+        """
+        return self._extractions.get(cartridge.cid)
 
     def is_cartridge_available(self, cartridge_id: str) -> bool:
         """
@@ -323,9 +820,9 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
             return False
 
         try:
-            # Verify it's a valid zip file
-            with zipfile.ZipFile(playt_path, "r"):
-                return True
+            # Verify it's a valid zip file; the handle stays open for reading
+            self._handles.open(playt_path)
+            return True
         except (zipfile.BadZipFile, IOError):
             return False
 
@@ -353,27 +850,42 @@ class PlaytFileCartridgeReader(CartridgeReaderInterface):
 
         return sorted(audio_files)
 
+    def _release_extraction(self, cartridge_id: str) -> None:
+        """
+        Stop extracting a cartridge and delete its temp dir or unpin its cache entry.
+
+        Cached extractions stay on disk for the next time the cartridge is
+        inserted; the cache evicts them when it runs out of budget.
+
+        Args:
+            cartridge_id: Cartridge whose extraction is no longer needed
+        """
+        if cartridge_id in self._extractions:
+            self._extractions.pop(cartridge_id).cancel()
+        if cartridge_id in self._temp_dirs:
+            temp_dir = self._temp_dirs.pop(cartridge_id)
+            if temp_dir.exists():
+                shutil.rmtree(temp_dir)
+        if cartridge_id in self._cache_keys and self._cache is not None:
+            self._cache.unpin(self._cache_keys.pop(cartridge_id))
+
     def cleanup(self, cartridge_id: Optional[str] = None) -> None:
         """
-        Clean up temporary directories.
+        Clean up temporary directories and close archives (eject).
 
         Args:
             cartridge_id: Specific cartridge to clean up, or None to clean all
         """
         if cartridge_id:
-            if cartridge_id in self._temp_dirs:
-                temp_dir = self._temp_dirs[cartridge_id]
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir)
-                del self._temp_dirs[cartridge_id]
+            self._release_extraction(cartridge_id)
             if cartridge_id in self._file_paths:
-                del self._file_paths[cartridge_id]
+                self._handles.close(self._file_paths.pop(cartridge_id))
         else:
-            # Clean up all temp directories
-            for temp_dir in self._temp_dirs.values():
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir)
-            self._temp_dirs.clear()
+            # Clean up all temp directories and cache pins
+            for known_id in set(self._temp_dirs) | set(self._cache_keys) | set(self._extractions):
+                self._release_extraction(known_id)
+            for file_path in self._file_paths.values():
+                self._handles.close(file_path)
             self._file_paths.clear()
 
     def __del__(self) -> None:
@@ -0,0 +1,288 @@
+"""Integrity verification of .playt cartridges."""
+
+import hashlib
+import os
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from ..storage.index_repository import IndexRepository
+from .handle_cache import CartridgeHandle
+
+# Bytes hashed per read; large enough for zlib and hashlib to release the GIL
+CHUNK_SIZE = 1024 * 1024
+# Members verified at the same time per cartridge
+DEFAULT_MEMBER_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class MemberCheck:
+    """
+    Result of checking one archive member.
+
+    Attributes:
+        name: Member name
+        sha256: SHA-256 hex digest of the uncompressed contents (None if unreadable)
+        error: What is wrong with the member (None if it is intact)
+    """
+
+    name: str
+    sha256: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the member is intact."""
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class VerificationReport:
+    """
+    Result of verifying a cartridge.
+
+    Attributes:
+        path: The .playt file
+        fingerprint: Cartridge fingerprint (None if the archive is unreadable)
+        members: Per-member results, sorted by name
+        error: Why the archive as a whole could not be checked (None if it could)
+        cached: Whether the results came from the index instead of reading the file
+    """
+
+    path: Path
+    fingerprint: Optional[str] = None
+    members: list[MemberCheck] = field(default_factory=list)
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Whether the archive and every member are intact."""
+        return self.error is None and all(check.ok for check in self.members)
+
+    @property
+    def bad_members(self) -> list[MemberCheck]:
+        """Members that failed verification."""
+        return [check for check in self.members if not check.ok]
+
+
+def _hash_stream(chunks: Iterator[bytes]) -> tuple[int, str, int]:
+    """Compute (CRC-32, SHA-256 hex digest, length) of a chunk stream."""
+    crc = 0
+    digest = hashlib.sha256()
+    length = 0
+    for chunk in chunks:
+        crc = zlib.crc32(chunk, crc)
+        digest.update(chunk)
+        length += len(chunk)
+    return crc, digest.hexdigest(), length
+
+
+def _stored_chunks(path: Path, offset: int, size: int) -> Iterator[bytes]:
+    """Read a byte range of a file in chunks with positional reads."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        position = offset
+        end = offset + size
+        while position < end:
+            chunk = os.pread(fd, min(CHUNK_SIZE, end - position), position)
+            if not chunk:
+                raise EOFError("Member data is truncated")
+            yield chunk
+            position += len(chunk)
+    finally:
+        os.close(fd)
+
+
+def _member_chunks(handle: CartridgeHandle, name: str) -> Iterator[bytes]:
+    """Read the uncompressed contents of a compressed member in chunks."""
+    with handle.open(name) as stream:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+class CartridgeVerifier:
+    """
+    Checks every member of a cartridge against its CRC-32 and hashes it.
+
+    Members are streamed in chunks on a small thread pool; zlib and hashlib
+    release the GIL on large buffers, so members are checked in parallel.
+    Stored members are read with positional reads straight from the file.
+    With an index, results are cached by cartridge fingerprint, so an
+    unchanged cartridge is only read once.
+    """
+
+    def __init__(
+        self,
+        index: Optional[IndexRepository] = None,
+        member_workers: int = DEFAULT_MEMBER_WORKERS,
+    ) -> None:
+        """
+        Initialize the verifier.
+
+        Args:
+            index: Index caching results by fingerprint (None to always re-read)
+            member_workers: Members checked at the same time per cartridge
+        """
+        self._index = index
+        self._member_workers = max(1, member_workers)
+
+    def verify(self, playt_path: Path, use_cache: bool = True) -> VerificationReport:
+        """
+        Verify a cartridge.
+
+        Args:
+            playt_path: Path to the .playt file
+            use_cache: Return cached results for an unchanged cartridge
+
+        Returns:
+            VerificationReport listing every member
+        """
+        playt_path = Path(playt_path)
+        try:
+            handle = CartridgeHandle(playt_path.absolute())
+        except (OSError, zipfile.BadZipFile) as e:
+            return VerificationReport(playt_path, error=f"Cannot open archive: {e}")
+
+        try:
+            fingerprint = handle.fingerprint
+            if use_cache and self._index is not None:
+                cached = self._index.load_member_checks(fingerprint)
+                if cached is not None:
+                    return VerificationReport(
+                        playt_path,
+                        fingerprint,
+                        [MemberCheck(name, sha256, error) for name, sha256, error in cached],
+                        cached=True,
+                    )
+
+            names = sorted(handle.names)
+            if self._member_workers == 1 or len(names) <= 1:
+                checks = [self._check_member(handle, name) for name in names]
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=self._member_workers, thread_name_prefix="playt-verify"
+                ) as pool:
+                    checks = list(pool.map(lambda name: self._check_member(handle, name), names))
+        finally:
+            handle.close()
+
+        if self._index is not None and checks:
+            self._index.save_member_checks(
+                fingerprint, [(check.name, check.sha256, check.error) for check in checks]
+            )
+        return VerificationReport(playt_path, fingerprint, checks)
+
+    @staticmethod
+    def _check_member(handle: CartridgeHandle, name: str) -> MemberCheck:
+        """Stream one member and compare it with its central directory entry."""
+        info = handle.getinfo(name)
+        if info is None:
+            return MemberCheck(name, error="Missing from the central directory")
+        if info.flag_bits & 0x1:
+            return MemberCheck(name, error="Encrypted members are not supported")
+
+        member = handle.member(name)
+        if member is None:
+            return MemberCheck(name, error="Bad local file header")
+
+        try:
+            if member.is_stored:
+                chunks = _stored_chunks(handle.path, member.data_offset, member.compress_size)
+            else:
+                chunks = _member_chunks(handle, name)
+            crc, sha256, length = _hash_stream(chunks)
+        except (OSError, EOFError, zipfile.BadZipFile, zlib.error, NotImplementedError) as e:
+            return MemberCheck(name, error=f"Unreadable: {e}")
+
+        if length != info.file_size:
+            return MemberCheck(
+                name, sha256, f"Size mismatch: expected {info.file_size}, read {length}"
+            )
+        if crc != info.CRC:
+            return MemberCheck(
+                name, sha256, f"CRC mismatch: expected {info.CRC:08x}, got {crc:08x}"
+            )
+        return MemberCheck(name, sha256)
+
+
+def find_cartridges(paths: Iterable[Path]) -> list[Path]:
+    """
+    Collect .playt files from files and directories (searched recursively).
+
+    Args:
+        paths: Files and directories
+
+    Returns:
+        Sorted, de-duplicated .playt file paths
+    """
+    found: set[Path] = set()
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            found.update(
+                child
+                for child in path.rglob("*")
+                if child.suffix.lower() == ".playt" and child.is_file()
+            )
+        else:
+            found.add(path)
+    return sorted(found)
+
+
+# Verifier of the current pool worker process
+_worker_verifier: Optional[CartridgeVerifier] = None
+
+
+def _init_worker(index_path: Optional[Path], member_workers: int) -> None:
+    """Create the verifier of a pool worker process."""
+    global _worker_verifier
+    index = IndexRepository(index_path) if index_path is not None else None
+    _worker_verifier = CartridgeVerifier(index, member_workers)
+
+
+def _verify_in_worker(playt_path: Path) -> VerificationReport:
+    """Verify one cartridge in a pool worker process."""
+    assert _worker_verifier is not None
+    return _worker_verifier.verify(playt_path)
+
+
+def verify_cartridges(
+    paths: list[Path],
+    index_path: Optional[Path] = None,
+    workers: Optional[int] = None,
+    member_workers: int = 1,
+) -> Iterator[VerificationReport]:
+    """
+    Verify many cartridges on a process pool.
+
+    Each worker process opens its own connection to the index; the index
+    runs in WAL mode, so workers record their results concurrently.
+
+    Args:
+        paths: .playt files to verify
+        index_path: Index database caching results (None to disable caching)
+        workers: Number of worker processes (default: one per CPU)
+        member_workers: Members checked at the same time within each cartridge
+
+    Yields:
+        One VerificationReport per path, in input order
+    """
+    if workers == 1 or len(paths) <= 1:
+        index = IndexRepository(index_path) if index_path is not None else None
+        verifier = CartridgeVerifier(index, member_workers)
+        for path in paths:
+            yield verifier.verify(path)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(index_path, member_workers)
+    ) as pool:
+        # Small batches keep the pool busy without flooding it with thousands of futures
+        yield from pool.map(_verify_in_worker, paths, chunksize=8)
@@ -0,0 +1,5 @@
+"""Pure-Python audio header parsers."""
+
+from .stream_info import StreamInfo, read_stream_info
+
+__all__ = ["StreamInfo", "read_stream_info"]
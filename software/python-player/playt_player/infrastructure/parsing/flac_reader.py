@@ -0,0 +1,63 @@
+"""FLAC header reader (STREAMINFO metadata block)."""
+
+import struct
+from typing import IO, Optional
+
+from .stream_info import StreamInfo, read_exactly, skip_id3v2
+
+FLAC_SIGNATURE = b"fLaC"
+
+# Metadata block type of STREAMINFO
+BLOCK_STREAMINFO = 0
+
+
+def parse_streaminfo(payload: bytes) -> tuple[int, int, int, int]:
+    """
+    Parse a STREAMINFO payload.
+
+    Args:
+        payload: The 34-byte STREAMINFO block payload
+
+    Returns:
+        Tuple of (sample_rate, channels, bits_per_sample, total_samples)
+    """
+    # Bytes 10-17: sample rate (20 bits), channels - 1 (3), bps - 1 (5), total samples (36)
+    (packed,) = struct.unpack(">Q", payload[10:18])
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    bits_per_sample = ((packed >> 36) & 0x1F) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    return sample_rate, channels, bits_per_sample, total_samples
+
+
+def read_flac_info(stream: IO[bytes]) -> Optional[StreamInfo]:
+    """
+    Read stream information from the STREAMINFO block of a FLAC file.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        StreamInfo, or None if the file is not a valid FLAC file or its
+        sample count is unknown
+    """
+    skip_id3v2(stream)
+    if stream.read(4) != FLAC_SIGNATURE:
+        return None
+
+    # STREAMINFO is always the first metadata block
+    header = read_exactly(stream, 4)
+    if header is None or header[0] & 0x7F != BLOCK_STREAMINFO:
+        return None
+    payload = read_exactly(stream, 34)
+    if payload is None:
+        return None
+
+    sample_rate, channels, _, total_samples = parse_streaminfo(payload)
+    if sample_rate == 0 or total_samples == 0:
+        return None
+    return StreamInfo(
+        duration_secs=total_samples / sample_rate,
+        sample_rate=sample_rate,
+        channels=channels,
+    )
@@ -0,0 +1,192 @@
+"""MP3 header reader (Xing/Info, VBRI, or constant bitrate estimate)."""
+
+import os
+import struct
+from dataclasses import dataclass
+from typing import IO, Optional
+
+from .stream_info import StreamInfo, read_exactly, skip_id3v2, stream_size
+
+# How far past the ID3 tag to look for the first frame
+_SYNC_SEARCH_BYTES = 64 * 1024
+
+# Bitrates in kbit/s indexed by [MPEG-1?][layer][bitrate index]
+_BITRATES = {
+    True: {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    False: {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+
+# Sample rates in Hz indexed by [version bits][sample rate index]
+_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],  # MPEG-2.5
+}
+
+
+@dataclass(frozen=True)
+class Mp3FrameHeader:
+    """
+    A decoded MPEG audio frame header.
+
+    Attributes:
+        mpeg1: Whether this is an MPEG-1 frame (otherwise MPEG-2 or 2.5)
+        layer: Layer (1, 2 or 3)
+        bitrate: Bitrate in bit/s
+        sample_rate: Sample rate in Hz
+        channels: Number of channels
+        samples_per_frame: Decoded samples per channel in the frame
+        frame_size: Frame size in bytes including the header
+    """
+
+    mpeg1: bool
+    layer: int
+    bitrate: int
+    sample_rate: int
+    channels: int
+    samples_per_frame: int
+    frame_size: int
+
+
+def parse_frame_header(header: bytes) -> Optional[Mp3FrameHeader]:
+    """
+    Decode a 4-byte MPEG audio frame header.
+
+    Args:
+        header: The four header bytes
+
+    Returns:
+        Mp3FrameHeader, or None if the bytes are not a valid frame header
+    """
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version_bits = (header[1] >> 3) & 0x3
+    layer_bits = (header[1] >> 1) & 0x3
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x3
+    padding = (header[2] >> 1) & 0x1
+    channel_mode = header[3] >> 6
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    mpeg1 = version_bits == 3
+    layer = 4 - layer_bits
+    bitrate = _BITRATES[mpeg1][layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+
+    if layer == 1:
+        samples_per_frame = 384
+        frame_size = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples_per_frame = 1152 if (layer == 2 or mpeg1) else 576
+        frame_size = samples_per_frame // 8 * bitrate // sample_rate + padding
+
+    return Mp3FrameHeader(
+        mpeg1=mpeg1,
+        layer=layer,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        channels=1 if channel_mode == 3 else 2,
+        samples_per_frame=samples_per_frame,
+        frame_size=frame_size,
+    )
+
+
+def find_first_frame(stream: IO[bytes]) -> Optional[tuple[int, Mp3FrameHeader]]:
+    """
+    Find the first MPEG audio frame after any ID3v2 tag.
+
+    A candidate only counts if another valid header follows right after it,
+    which rules out most false syncs inside garbage or album art.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        Tuple of (frame offset, frame header), or None if no frame was found
+    """
+    audio_start = skip_id3v2(stream)
+    data = stream.read(_SYNC_SEARCH_BYTES)
+    position = data.find(b"\xff")
+    while 0 <= position <= len(data) - 4:
+        frame = parse_frame_header(data[position : position + 4])
+        if frame is not None and frame.frame_size > 4:
+            following = position + frame.frame_size
+            if following + 4 > len(data) or parse_frame_header(data[following : following + 4]):
+                return audio_start + position, frame
+        position = data.find(b"\xff", position + 1)
+    return None
+
+
+def info_tag_offset(frame: Mp3FrameHeader) -> int:
+    """
+    Get where a Xing/Info tag would start inside a frame.
+
+    Args:
+        frame: Header of the frame
+
+    Returns:
+        Offset from the start of the frame (the tag sits right after the side information)
+    """
+    if frame.mpeg1:
+        side_info = 17 if frame.channels == 1 else 32
+    else:
+        side_info = 9 if frame.channels == 1 else 17
+    return 4 + side_info
+
+
+def read_mp3_info(stream: IO[bytes]) -> Optional[StreamInfo]:
+    """
+    Read stream information from an MP3 file.
+
+    Uses the frame count from a Xing/Info or VBRI header when present, and
+    otherwise estimates the duration from the first frame's bitrate.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        StreamInfo, or None if no MPEG audio frame was found
+    """
+    first = find_first_frame(stream)
+    if first is None:
+        return None
+    offset, frame = first
+
+    stream.seek(offset)
+    data = stream.read(frame.frame_size)
+
+    xing = info_tag_offset(frame)
+    frames: Optional[int] = None
+    if data[xing : xing + 4] in (b"Xing", b"Info") and len(data) >= xing + 12:
+        (flags,) = struct.unpack(">I", data[xing + 4 : xing + 8])
+        if flags & 0x1:
+            (frames,) = struct.unpack(">I", data[xing + 8 : xing + 12])
+    elif data[36:40] == b"VBRI" and len(data) >= 54:
+        # VBRI header is always 32 bytes after the frame header
+        (frames,) = struct.unpack(">I", data[50:54])
+
+    if frames:
+        duration = frames * frame.samples_per_frame / frame.sample_rate
+    else:
+        # Constant bitrate: audio bytes divided by byte rate, minus any ID3v1 tag
+        end = stream_size(stream)
+        if end >= 128:
+            stream.seek(-128, os.SEEK_END)
+            if read_exactly(stream, 3) == b"TAG":
+                end -= 128
+        duration = max(0, end - offset) * 8 / frame.bitrate
+
+    return StreamInfo(
+        duration_secs=duration,
+        sample_rate=frame.sample_rate,
+        channels=frame.channels,
+    )
@@ -0,0 +1,178 @@
+"""MP4/M4A header reader (mvhd duration, audio sample entry)."""
+
+import struct
+from dataclasses import dataclass
+from typing import IO, Iterator, Optional
+
+from .stream_info import StreamInfo, read_exactly, stream_size
+
+# Containers walked on the way to the audio sample description
+_TRACK_PATH = (b"mdia", b"minf", b"stbl", b"stsd")
+
+
+@dataclass(frozen=True)
+class Mp4Atom:
+    """
+    An MP4 atom (box) header.
+
+    Attributes:
+        atom_type: Four-character atom type
+        offset: Offset of the atom header in the file
+        header_size: Size of the atom header (8 or 16 bytes)
+        size: Total atom size including the header
+    """
+
+    atom_type: bytes
+    offset: int
+    header_size: int
+    size: int
+
+    @property
+    def payload_offset(self) -> int:
+        """Offset of the first byte after the header."""
+        return self.offset + self.header_size
+
+    @property
+    def end(self) -> int:
+        """Offset of the first byte after the atom."""
+        return self.offset + self.size
+
+
+def iter_atoms(stream: IO[bytes], start: int, end: int) -> Iterator[Mp4Atom]:
+    """
+    Iterate over the atoms between `start` and `end` without reading payloads.
+
+    Args:
+        stream: Seekable binary stream
+        start: Offset of the first atom
+        end: Offset where the enclosing atom (or file) ends
+
+    Yields:
+        Atom headers in file order
+    """
+    offset = start
+    while offset + 8 <= end:
+        stream.seek(offset)
+        header = read_exactly(stream, 8)
+        if header is None:
+            return
+        (size,) = struct.unpack(">I", header[:4])
+        atom_type = header[4:8]
+        header_size = 8
+        if size == 1:
+            large = read_exactly(stream, 8)
+            if large is None:
+                return
+            (size,) = struct.unpack(">Q", large)
+            header_size = 16
+        elif size == 0:
+            # Atom extends to the end of the enclosing container
+            size = end - offset
+        if size < header_size or offset + size > end:
+            return
+        yield Mp4Atom(atom_type, offset, header_size, size)
+        offset += size
+
+
+def find_atom(stream: IO[bytes], start: int, end: int, atom_type: bytes) -> Optional[Mp4Atom]:
+    """
+    Find the first atom of a given type between `start` and `end`.
+
+    Args:
+        stream: Seekable binary stream
+        start: Offset of the first atom
+        end: Offset where the enclosing atom (or file) ends
+        atom_type: Four-character atom type to look for
+
+    Returns:
+        The atom header, or None if there is no such atom
+    """
+    for atom in iter_atoms(stream, start, end):
+        if atom.atom_type == atom_type:
+            return atom
+    return None
+
+
+def _read_mvhd_duration(stream: IO[bytes], mvhd: Mp4Atom) -> Optional[float]:
+    """Read the movie duration in seconds from an mvhd atom."""
+    stream.seek(mvhd.payload_offset)
+    payload = read_exactly(stream, min(mvhd.size - mvhd.header_size, 32))
+    if payload is None:
+        return None
+    timescale: int
+    duration: int
+    if payload[0] == 1:
+        timescale, duration = struct.unpack(">IQ", payload[20:32])
+    else:
+        timescale, duration = struct.unpack(">II", payload[12:20])
+    if timescale == 0:
+        return None
+    return float(duration) / timescale
+
+
+def _read_audio_entry(stream: IO[bytes], moov: Mp4Atom) -> Optional[tuple[int, int]]:
+    """Read (sample_rate, channels) from the first sound track's sample entry."""
+    for trak in iter_atoms(stream, moov.payload_offset, moov.end):
+        if trak.atom_type != b"trak":
+            continue
+
+        mdia = find_atom(stream, trak.payload_offset, trak.end, b"mdia")
+        if mdia is None:
+            continue
+        hdlr = find_atom(stream, mdia.payload_offset, mdia.end, b"hdlr")
+        if hdlr is None:
+            continue
+        # Version/flags (4), pre-defined (4), handler type (4)
+        stream.seek(hdlr.payload_offset + 8)
+        if stream.read(4) != b"soun":
+            continue
+
+        container: Optional[Mp4Atom] = trak
+        for atom_type in _TRACK_PATH:
+            if container is None:
+                break
+            container = find_atom(stream, container.payload_offset, container.end, atom_type)
+        if container is None:
+            continue
+
+        # stsd: version/flags (4), entry count (4), then the first sample entry:
+        # size (4), format (4), reserved (6), data ref (2), version (2),
+        # revision (2), vendor (4), channels (2), sample size (2),
+        # compression id (2), packet size (2), sample rate (16.16 fixed)
+        stream.seek(container.payload_offset + 8)
+        entry = read_exactly(stream, 36)
+        if entry is None:
+            continue
+        (channels,) = struct.unpack(">H", entry[24:26])
+        (sample_rate_fixed,) = struct.unpack(">I", entry[32:36])
+        return sample_rate_fixed >> 16, channels
+    return None
+
+
+def read_mp4_info(stream: IO[bytes]) -> Optional[StreamInfo]:
+    """
+    Read stream information from an MP4/M4A file.
+
+    Only atom headers are read on the way to moov/mvhd and the sample
+    description, so this stays cheap even when moov sits at the end.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        StreamInfo, or None if the file has no usable moov atom
+    """
+    size = stream_size(stream)
+    moov = find_atom(stream, 0, size, b"moov")
+    if moov is None:
+        return None
+    mvhd = find_atom(stream, moov.payload_offset, moov.end, b"mvhd")
+    if mvhd is None:
+        return None
+    duration = _read_mvhd_duration(stream, mvhd)
+    if duration is None:
+        return None
+
+    audio = _read_audio_entry(stream, moov)
+    sample_rate, channels = audio if audio is not None else (None, None)
+    return StreamInfo(duration_secs=duration, sample_rate=sample_rate, channels=channels)
@@ -0,0 +1,142 @@
+"""Ogg header reader (Vorbis, Opus and FLAC streams, last-granule duration)."""
+
+import struct
+from dataclasses import dataclass
+from typing import IO, Optional
+
+from .flac_reader import parse_streaminfo
+from .stream_info import StreamInfo, stream_size
+
+OGG_CAPTURE = b"OggS"
+PAGE_HEADER_SIZE = 27
+
+# Opus always decodes at 48 kHz; its granule positions count 48 kHz samples
+OPUS_SAMPLE_RATE = 48000
+
+# Tail sizes tried when looking for the last page, smallest first
+_TAIL_SIZES = (16 * 1024, 256 * 1024)
+
+
+@dataclass(frozen=True)
+class OggPageHeader:
+    """
+    A decoded Ogg page header.
+
+    Attributes:
+        header_type: Flags (0x1 continued, 0x2 first page, 0x4 last page)
+        granule_position: Codec-defined position at the end of the page (-1 if none)
+        serial: Logical bitstream serial number
+        sequence: Page sequence number
+        header_size: Size of the page header including the segment table
+        body_size: Size of the page body
+    """
+
+    header_type: int
+    granule_position: int
+    serial: int
+    sequence: int
+    header_size: int
+    body_size: int
+
+
+def parse_page_header(data: bytes, offset: int = 0) -> Optional[OggPageHeader]:
+    """
+    Decode the Ogg page header starting at `offset` in `data`.
+
+    Args:
+        data: Buffer containing the page header
+        offset: Offset of the "OggS" capture pattern
+
+    Returns:
+        OggPageHeader, or None if the header is invalid or truncated
+    """
+    end = offset + PAGE_HEADER_SIZE
+    if end > len(data) or data[offset : offset + 4] != OGG_CAPTURE or data[offset + 4] != 0:
+        return None
+    header_type, granule, serial, sequence = struct.unpack("<BqII", data[offset + 5 : offset + 22])
+    segment_count = data[offset + 26]
+    if end + segment_count > len(data):
+        return None
+    body_size = sum(data[end : end + segment_count])
+    return OggPageHeader(
+        header_type=header_type,
+        granule_position=granule,
+        serial=serial,
+        sequence=sequence,
+        header_size=PAGE_HEADER_SIZE + segment_count,
+        body_size=body_size,
+    )
+
+
+def identify_stream(packet: bytes) -> Optional[tuple[int, int, int]]:
+    """
+    Decode the identification header on the first page of an Ogg stream.
+
+    Args:
+        packet: Body of the first page
+
+    Returns:
+        Tuple of (sample_rate, channels, pre_skip), or None for unsupported codecs;
+        granule positions count samples at sample_rate, pre_skip of them not played
+    """
+    if packet[:7] == b"\x01vorbis" and len(packet) >= 16:
+        (sample_rate,) = struct.unpack("<I", packet[12:16])
+        return sample_rate, packet[11], 0
+    if packet[:8] == b"OpusHead" and len(packet) >= 19:
+        (pre_skip,) = struct.unpack("<H", packet[10:12])
+        return OPUS_SAMPLE_RATE, packet[9], pre_skip
+    if packet[:5] == b"\x7fFLAC" and len(packet) >= 51:
+        # Mapping header (9 bytes), "fLaC", metadata block header, STREAMINFO
+        sample_rate, channels, _, _ = parse_streaminfo(packet[17:51])
+        return sample_rate, channels, 0
+    return None
+
+
+def _last_granule(stream: IO[bytes], serial: int) -> Optional[int]:
+    """Find the granule position of the last page of a logical stream."""
+    size = stream_size(stream)
+    for tail_size in (*_TAIL_SIZES, size):
+        start = max(0, size - tail_size)
+        stream.seek(start)
+        data = stream.read(size - start)
+        position = data.rfind(OGG_CAPTURE)
+        while position >= 0:
+            page = parse_page_header(data, position)
+            if page is not None and page.serial == serial and page.granule_position >= 0:
+                return page.granule_position
+            position = data.rfind(OGG_CAPTURE, 0, position)
+        if start == 0:
+            break
+    return None
+
+
+def read_ogg_info(stream: IO[bytes]) -> Optional[StreamInfo]:
+    """
+    Read stream information from an Ogg Vorbis, Opus or FLAC file.
+
+    The identification header on the first page gives the sample rate and
+    channels; the granule position of the last page gives the length.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        StreamInfo, or None if the file is not a supported Ogg stream
+    """
+    data = stream.read(4096)
+    first = parse_page_header(data)
+    if first is None:
+        return None
+    identity = identify_stream(data[first.header_size : first.header_size + first.body_size])
+    if identity is None:
+        return None
+    sample_rate, channels, pre_skip = identity
+
+    granule = _last_granule(stream, first.serial)
+    if granule is None or sample_rate == 0:
+        return None
+    return StreamInfo(
+        duration_secs=max(0, granule - pre_skip) / sample_rate,
+        sample_rate=sample_rate,
+        channels=channels,
+    )
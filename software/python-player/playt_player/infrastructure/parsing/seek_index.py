@@ -0,0 +1,433 @@
+"""Seek indexes mapping playback positions to byte offsets in audio files."""
+
+import bisect
+import struct
+from dataclasses import dataclass
+from typing import IO, Callable, Optional
+
+from .flac_reader import BLOCK_STREAMINFO, FLAC_SIGNATURE, parse_streaminfo
+from .mp3_reader import find_first_frame, info_tag_offset, parse_frame_header
+from .ogg_reader import identify_stream, parse_page_header
+from .stream_info import read_exactly, skip_id3v2
+from .wav_reader import read_wav_layout
+
+# Metadata block type of the FLAC SEEKTABLE
+BLOCK_SEEKTABLE = 3
+# Sample number marking an unused FLAC seek point
+_PLACEHOLDER_SAMPLE = 0xFFFFFFFFFFFFFFFF
+
+# Spacing of the points recorded by walking MP3 or FLAC frames, in seconds
+POINT_INTERVAL = 0.25
+
+# Samples of delay added by MP3 decoders, trimmed together with the encoder delay
+MP3_DECODER_DELAY = 529
+
+# Opus needs 80 ms of audio before a seek target to converge (RFC 7845)
+OPUS_PREROLL_SECS = 0.08
+
+# Bytes read at a time while walking MP3 frames and Ogg pages
+_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SeekPoint:
+    """
+    A position decoding can start from.
+
+    Attributes:
+        position_secs: Playback position of the first sample decoded from here
+        byte_offset: Offset of the frame or page holding that sample
+    """
+
+    position_secs: float
+    byte_offset: int
+
+
+@dataclass(frozen=True)
+class SeekIndex:
+    """
+    Byte offsets to start decoding a track from, for any position.
+
+    Decoding from a seek point needs the codec headers first: a decoder is
+    fed the first header_size bytes of the file followed by the bytes from
+    the seek point on.
+
+    Attributes:
+        container: ffmpeg demuxer name for the file ("flac", "mp3", "ogg" or "wav")
+        header_size: Size of the headers at the start of the file
+        points: Seek points ordered by position
+        sample_rate: Sample rate of WAV files (positions are computed, not stored)
+        block_align: Bytes per frame of WAV files
+        timestamped: Whether the frames or pages carry their own position, so a
+            demuxer reading from a seek point knows the absolute time
+        preroll_secs: Audio to decode before the target for the decoder to settle
+        duration_secs: Playable length where the end of the last frame is padding
+            that only a decoder starting at the beginning would know to trim
+    """
+
+    container: str
+    header_size: int
+    points: tuple[SeekPoint, ...] = ()
+    sample_rate: int = 0
+    block_align: int = 0
+    timestamped: bool = False
+    preroll_secs: float = 0.0
+    duration_secs: Optional[float] = None
+
+    def locate(self, position_secs: float) -> Optional[SeekPoint]:
+        """
+        Find where to start decoding to reach a position.
+
+        Args:
+            position_secs: Target position in seconds
+
+        Returns:
+            The last seek point at or before the position, or None if there is none
+        """
+        if self.block_align and self.sample_rate:
+            frame = max(0, int(position_secs * self.sample_rate))
+            return SeekPoint(frame / self.sample_rate, self.header_size + frame * self.block_align)
+        index = bisect.bisect_right([point.position_secs for point in self.points], position_secs)
+        return self.points[index - 1] if index else None
+
+
+def build_flac_index(stream: IO[bytes]) -> Optional[SeekIndex]:
+    """
+    Build a seek index from the SEEKTABLE metadata block of a FLAC file.
+
+    Files without a seek table (ffmpeg does not write one) are indexed by
+    walking their frame headers instead.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        SeekIndex, or None if the file is not a valid FLAC file
+    """
+    skip_id3v2(stream)
+    if stream.read(4) != FLAC_SIGNATURE:
+        return None
+
+    sample_rate = 0
+    block_size = 0
+    table: list[tuple[int, int]] = []
+    last = False
+    while not last:
+        header = read_exactly(stream, 4)
+        if header is None:
+            return None
+        last = bool(header[0] & 0x80)
+        block_type = header[0] & 0x7F
+        length = int.from_bytes(header[1:4], "big")
+        payload = read_exactly(stream, length)
+        if payload is None:
+            return None
+        if block_type == BLOCK_STREAMINFO and length >= 34:
+            sample_rate = parse_streaminfo(payload)[0]
+            # Minimum block size; every frame but the last has it with fixed blocking
+            block_size = int.from_bytes(payload[0:2], "big")
+        elif block_type == BLOCK_SEEKTABLE:
+            for start in range(0, length - length % 18, 18):
+                sample, offset, _ = struct.unpack(">QQH", payload[start : start + 18])
+                if sample != _PLACEHOLDER_SAMPLE:
+                    table.append((sample, offset))
+    if sample_rate == 0:
+        return None
+
+    # Seek table offsets are relative to the first frame, right after the metadata
+    first_frame = stream.tell()
+    if not table:
+        table = _scan_flac_frames(stream, first_frame, sample_rate, block_size)
+    points = {0: SeekPoint(0.0, first_frame)}
+    for sample, offset in table:
+        points.setdefault(sample, SeekPoint(sample / sample_rate, first_frame + offset))
+    return SeekIndex(
+        container="flac",
+        header_size=first_frame,
+        points=tuple(points[sample] for sample in sorted(points)),
+        timestamped=True,
+    )
+
+
+def _crc8(data: bytes) -> int:
+    """CRC-8 (polynomial 0x07) protecting FLAC frame headers."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+def _parse_flac_frame_header(data: bytes, position: int) -> Optional[tuple[int, int, bool]]:
+    """
+    Decode a FLAC frame header.
+
+    Returns:
+        Tuple of (coded number, block size, variable blocking), or None if
+        the bytes at position are not a frame header with a valid CRC
+    """
+    if position + 6 > len(data) or data[position] != 0xFF or data[position + 1] & 0xFE != 0xF8:
+        return None
+    variable = bool(data[position + 1] & 0x1)
+    size_code = data[position + 2] >> 4
+    rate_code = data[position + 2] & 0xF
+    if size_code == 0 or rate_code == 15 or data[position + 3] & 0x1:
+        return None
+
+    # Frame or sample number, coded like UTF-8 (up to 7 bytes)
+    cursor = position + 4
+    lead = data[cursor]
+    extra = 0
+    while extra < 7 and lead & (0x80 >> extra):
+        extra += 1
+    if extra == 1 or extra == 7:
+        return None
+    number = lead & (0x7F >> extra) if extra else lead
+    length = max(1, extra)
+    if cursor + length > len(data):
+        return None
+    for byte in data[cursor + 1 : cursor + length]:
+        if byte & 0xC0 != 0x80:
+            return None
+        number = (number << 6) | (byte & 0x3F)
+    cursor += length
+
+    if size_code == 1:
+        block_size = 192
+    elif size_code <= 5:
+        block_size = 576 << (size_code - 2)
+    elif size_code <= 7:
+        width = size_code - 5
+        if cursor + width > len(data):
+            return None
+        block_size = int.from_bytes(data[cursor : cursor + width], "big") + 1
+        cursor += width
+    else:
+        block_size = 256 << (size_code - 8)
+    cursor += {12: 1, 13: 2, 14: 2}.get(rate_code, 0)
+
+    if cursor >= len(data) or _crc8(data[position:cursor]) != data[cursor]:
+        return None
+    return number, block_size, variable
+
+
+def _scan_flac_frames(
+    stream: IO[bytes], first_frame: int, sample_rate: int, block_size: int
+) -> list[tuple[int, int]]:
+    """
+    Find frame offsets by walking the frame headers of a FLAC file.
+
+    Only a header starting exactly at the next expected sample counts, which
+    rules out sync codes that happen to occur inside frame data.
+
+    Returns:
+        (sample number, offset relative to the first frame) about every POINT_INTERVAL seconds
+    """
+    table: list[tuple[int, int]] = []
+    every = POINT_INTERVAL * sample_rate
+    expected = 0
+    last_recorded = -every
+    stream.seek(first_frame)
+    data = stream.read(_CHUNK_SIZE)
+    base = first_frame
+    position = 0
+    while True:
+        position = data.find(b"\xff", position)
+        if position < 0 or position + 32 > len(data):
+            more = stream.read(_CHUNK_SIZE)
+            if not more:
+                break
+            keep = len(data) - 32 if position < 0 else position
+            base += keep
+            data = data[keep:] + more
+            position = 0
+            continue
+        header = _parse_flac_frame_header(data, position)
+        if header is not None:
+            number, frame_size, variable = header
+            sample = number if variable else number * block_size
+            if sample == expected:
+                if sample - last_recorded >= every:
+                    table.append((sample, base + position - first_frame))
+                    last_recorded = sample
+                expected = sample + frame_size
+        position += 1
+    return table
+
+
+def build_mp3_index(stream: IO[bytes]) -> Optional[SeekIndex]:
+    """
+    Build a seek index by walking the frame headers of an MP3 file.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        SeekIndex with a frame offset about every POINT_INTERVAL seconds,
+        or None if no MPEG audio frame was found
+    """
+    first = find_first_frame(stream)
+    if first is None:
+        return None
+    offset, frame = first
+    samples = frame.samples_per_frame
+    every = max(1, round(POINT_INTERVAL * frame.sample_rate / samples))
+
+    # A Xing/Info frame decodes to nothing, and its LAME extension gives the
+    # encoder delay that decoders trim from the start of the file
+    stream.seek(offset)
+    data = stream.read(_CHUNK_SIZE)
+    tag = info_tag_offset(frame)
+    tag_frames = 0
+    start_skip = 0
+    padding: Optional[int] = None
+    if data[tag : tag + 4] in (b"Xing", b"Info"):
+        tag_frames = 1
+        lame = tag + 120
+        if data[lame : lame + 1] == b"L" and len(data) >= lame + 24:
+            delay = (data[lame + 21] << 4) | (data[lame + 22] >> 4)
+            start_skip = delay + MP3_DECODER_DELAY
+            padding = ((data[lame + 22] & 0x0F) << 8) | data[lame + 23]
+
+    points = [SeekPoint(0.0, offset)]
+    count = 0
+    base = offset
+    position = 0
+    while True:
+        if position + 4 > len(data):
+            # Keep the unread tail and continue with the next chunk
+            more = stream.read(_CHUNK_SIZE)
+            if not more:
+                break
+            base += position
+            data = data[position:] + more
+            position = 0
+            continue
+        header = parse_frame_header(data[position : position + 4])
+        if header is None or header.frame_size <= 4:
+            # End of the audio (ID3v1 tag, trailing garbage)
+            break
+        if count % every == 0:
+            sample = (count - tag_frames) * samples - start_skip
+            if sample > 0:
+                points.append(SeekPoint(sample / frame.sample_rate, base + position))
+        count += 1
+        position += header.frame_size
+
+    duration_secs = None
+    if padding is not None:
+        total = (count - tag_frames) * samples - start_skip - padding + MP3_DECODER_DELAY
+        duration_secs = max(0, total) / frame.sample_rate
+    return SeekIndex(
+        container="mp3", header_size=0, points=tuple(points), duration_secs=duration_secs
+    )
+
+
+def build_ogg_index(stream: IO[bytes]) -> Optional[SeekIndex]:
+    """
+    Build a seek index from the page granule positions of an Ogg file.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        SeekIndex with one point per audio page, or None if the file is not
+        a supported Ogg stream
+    """
+    data = stream.read(_CHUNK_SIZE)
+    first = parse_page_header(data)
+    if first is None:
+        return None
+    identity = identify_stream(data[first.header_size : first.header_size + first.body_size])
+    if identity is None:
+        return None
+    sample_rate, _, pre_skip = identity
+    if sample_rate == 0:
+        return None
+    opus = data[first.header_size : first.header_size + 8] == b"OpusHead"
+
+    points: list[SeekPoint] = []
+    header_size: Optional[int] = None
+    # Granule position at the end of the previous page, i.e. the start of this one
+    granule = 0
+    base = 0
+    position = 0
+    while True:
+        page = parse_page_header(data, position)
+        if page is None:
+            more = stream.read(_CHUNK_SIZE)
+            if not more or len(data) - position > _CHUNK_SIZE:
+                break
+            base += position
+            data = data[position:] + more
+            position = 0
+            continue
+        if page.serial == first.serial and page.granule_position > 0:
+            if header_size is None:
+                # Codec headers live on the pages before the first audio page
+                header_size = base + position
+            points.append(
+                SeekPoint(max(0, granule - pre_skip) / sample_rate, base + position)
+            )
+            granule = page.granule_position
+        position += page.header_size + page.body_size
+
+    if header_size is None:
+        return None
+    return SeekIndex(
+        container="ogg",
+        header_size=header_size,
+        points=tuple(points),
+        timestamped=True,
+        preroll_secs=OPUS_PREROLL_SECS if opus else 0.0,
+    )
+
+
+def build_wav_index(stream: IO[bytes]) -> Optional[SeekIndex]:
+    """
+    Build a seek index for a WAV file (byte offsets follow from the frame size).
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        SeekIndex, or None if the file is not a valid WAV file
+    """
+    layout = read_wav_layout(stream)
+    if layout is None or layout.block_align == 0 or layout.sample_rate == 0:
+        return None
+    return SeekIndex(
+        container="wav",
+        header_size=layout.data_offset,
+        sample_rate=layout.sample_rate,
+        block_align=layout.block_align,
+    )
+
+
+def build_seek_index(stream: IO[bytes], extension: str) -> Optional[SeekIndex]:
+    """
+    Build the seek index of an audio file.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+        extension: File extension including the dot (e.g. ".flac")
+
+    Returns:
+        SeekIndex, or None if the format has no index builder or the file is invalid
+    """
+    builders: dict[str, Callable[[IO[bytes]], Optional[SeekIndex]]] = {
+        ".flac": build_flac_index,
+        ".mp3": build_mp3_index,
+        ".ogg": build_ogg_index,
+        ".opus": build_ogg_index,
+        ".wav": build_wav_index,
+    }
+    builder = builders.get(extension.lower())
+    if builder is None:
+        return None
+
+    try:
+        return builder(stream)
+    except (OSError, ValueError, OverflowError, struct.error):
+        return None
@@ -0,0 +1,119 @@
+"""Stream information read from audio file headers."""
+
+import os
+from dataclasses import dataclass
+from typing import IO, Callable, Optional
+
+
+@dataclass(frozen=True)
+class StreamInfo:
+    """
+    Basic properties of an audio stream.
+
+    Attributes:
+        duration_secs: Playback duration in seconds
+        sample_rate: Decoded sample rate in Hz (None if unknown)
+        channels: Number of channels (None if unknown)
+    """
+
+    duration_secs: float
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+
+
+def stream_size(stream: IO[bytes]) -> int:
+    """
+    Get the total size of a seekable stream, keeping its position.
+
+    Args:
+        stream: Seekable binary stream
+
+    Returns:
+        Size in bytes
+    """
+    position = stream.tell()
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(position)
+    return size
+
+
+def read_exactly(stream: IO[bytes], size: int) -> Optional[bytes]:
+    """
+    Read exactly `size` bytes from a stream.
+
+    Args:
+        stream: Binary stream
+        size: Number of bytes to read
+
+    Returns:
+        The bytes read, or None if the stream ended early
+    """
+    data = stream.read(size)
+    if len(data) != size:
+        return None
+    return data
+
+
+def skip_id3v2(stream: IO[bytes]) -> int:
+    """
+    Skip an ID3v2 tag at the current position, if there is one.
+
+    Some encoders put ID3v2 tags in front of MP3 and even FLAC files.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        Offset of the first byte after the tag (the audio start)
+    """
+    start = stream.tell()
+    header = stream.read(10)
+    if len(header) == 10 and header[:3] == b"ID3":
+        # Tag size is a 28-bit "syncsafe" integer (7 bits per byte)
+        size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        footer = 10 if header[5] & 0x10 else 0
+        offset = start + 10 + size + footer
+    else:
+        offset = start
+    stream.seek(offset)
+    return offset
+
+
+def read_stream_info(stream: IO[bytes], extension: str) -> Optional[StreamInfo]:
+    """
+    Read stream information from the header of an audio file.
+
+    Only a few kilobytes are read (plus the tail for Ogg). No external
+    processes are involved.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+        extension: File extension including the dot (e.g. ".flac")
+
+    Returns:
+        StreamInfo, or None if the format is unknown or the header is invalid
+    """
+    # Imported here to keep the per-format modules free to import helpers above
+    from .flac_reader import read_flac_info
+    from .mp3_reader import read_mp3_info
+    from .mp4_reader import read_mp4_info
+    from .ogg_reader import read_ogg_info
+    from .wav_reader import read_wav_info
+
+    readers: dict[str, Callable[[IO[bytes]], Optional[StreamInfo]]] = {
+        ".flac": read_flac_info,
+        ".wav": read_wav_info,
+        ".mp3": read_mp3_info,
+        ".ogg": read_ogg_info,
+        ".opus": read_ogg_info,
+        ".m4a": read_mp4_info,
+        ".mp4": read_mp4_info,
+    }
+    reader = readers.get(extension.lower())
+    if reader is None:
+        return None
+
+    try:
+        return reader(stream)
+    except (OSError, ValueError, OverflowError):
+        return None
@@ -0,0 +1,129 @@
+"""WAV header reader (RIFF/RF64 fmt and data chunks)."""
+
+import struct
+from dataclasses import dataclass
+from typing import IO, Optional
+
+from .stream_info import StreamInfo, read_exactly, stream_size
+
+# Placeholder size used by RF64 files and by writers that never patch the header
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+# fmt chunk format tags
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+@dataclass(frozen=True)
+class WavLayout:
+    """
+    Layout of a WAV file.
+
+    Attributes:
+        sample_rate: Sample rate in Hz
+        channels: Number of channels
+        bits_per_sample: Bits per sample
+        block_align: Bytes per frame (all channels)
+        data_offset: Offset of the first PCM byte
+        data_size: Size of the PCM data in bytes
+        format_tag: Sample format (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT, ...);
+            the sub-format for WAVE_FORMAT_EXTENSIBLE files
+    """
+
+    sample_rate: int
+    channels: int
+    bits_per_sample: int
+    block_align: int
+    data_offset: int
+    data_size: int
+    format_tag: int = WAVE_FORMAT_PCM
+
+
+def read_wav_layout(stream: IO[bytes]) -> Optional[WavLayout]:
+    """
+    Walk the chunks of a WAV file up to the data chunk.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        WavLayout, or None if the file is not a valid WAV file
+    """
+    riff = read_exactly(stream, 12)
+    if riff is None or riff[:4] not in (b"RIFF", b"RF64") or riff[8:12] != b"WAVE":
+        return None
+
+    file_size = stream_size(stream)
+    fmt: Optional[tuple[int, int, int, int, int]] = None
+    ds64_data_size: Optional[int] = None
+
+    while True:
+        chunk_header = read_exactly(stream, 8)
+        if chunk_header is None:
+            return None
+        chunk_id = chunk_header[:4]
+        (chunk_size,) = struct.unpack("<I", chunk_header[4:8])
+        chunk_start = stream.tell()
+
+        if chunk_id == b"fmt ":
+            payload = read_exactly(stream, 16)
+            if payload is None:
+                return None
+            format_tag, channels, sample_rate, _, block_align, bits = struct.unpack(
+                "<HHIIHH", payload
+            )
+            if format_tag == _WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                # cbSize (2), valid bits (2), channel mask (4), then the sub-format GUID
+                extension = read_exactly(stream, 10)
+                if extension is None:
+                    return None
+                (format_tag,) = struct.unpack("<H", extension[8:10])
+            fmt = (sample_rate, channels, block_align, bits, format_tag)
+        elif chunk_id == b"ds64":
+            payload = read_exactly(stream, 24)
+            if payload is None:
+                return None
+            # RIFF size (8), data size (8), sample count (8)
+            (ds64_data_size,) = struct.unpack("<Q", payload[8:16])
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            sample_rate, channels, block_align, bits, format_tag = fmt
+            if chunk_size == _UNKNOWN_SIZE and ds64_data_size is not None:
+                chunk_size = ds64_data_size
+            # Streamed or truncated files may claim more data than there is
+            data_size = min(chunk_size, file_size - chunk_start)
+            return WavLayout(
+                sample_rate=sample_rate,
+                channels=channels,
+                bits_per_sample=bits,
+                block_align=block_align,
+                data_offset=chunk_start,
+                data_size=data_size,
+                format_tag=format_tag,
+            )
+
+        # Chunks are padded to an even size
+        stream.seek(chunk_start + chunk_size + (chunk_size & 1))
+
+
+def read_wav_info(stream: IO[bytes]) -> Optional[StreamInfo]:
+    """
+    Read stream information from a WAV file.
+
+    Args:
+        stream: Seekable binary stream positioned at the start of the file
+
+    Returns:
+        StreamInfo, or None if the file is not a valid WAV file
+    """
+    layout = read_wav_layout(stream)
+    if layout is None or layout.sample_rate == 0 or layout.block_align == 0:
+        return None
+    frames = layout.data_size // layout.block_align
+    return StreamInfo(
+        duration_secs=frames / layout.sample_rate,
+        sample_rate=layout.sample_rate,
+        channels=layout.channels,
+    )
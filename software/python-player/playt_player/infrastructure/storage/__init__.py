@@ -0,0 +1,6 @@
+"""Persistent storage implementations."""
+
+from .extraction_cache import ExtractionCache
+from .index_repository import IndexRepository
+
+__all__ = ["ExtractionCache", "IndexRepository"]
@@ -0,0 +1,221 @@
+"""Persistent, size-bounded cache of extracted cartridges."""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Marker written once an entry is fully extracted; holds the entry size in bytes
+_COMPLETE_MARKER = ".complete"
+# Marker whose modification time records when an entry was last used
+_USED_MARKER = ".last_used"
+
+# Keys pinned by readers in this process; pinned entries are never evicted
+_pinned_keys: dict[str, int] = {}
+_pinned_lock = threading.Lock()
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the default cache directory.
+
+    Returns:
+        $XDG_CACHE_HOME/playt/cartridges, or ~/.cache/playt/cartridges
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "playt" / "cartridges"
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted cartridges keyed by content fingerprint.
+
+    Each entry is a directory named after the cartridge fingerprint. Entries
+    are shared by every reader and every run that uses the same cache
+    directory. When the cache grows beyond its byte budget, the least
+    recently used entries are deleted.
+    """
+
+    # Default byte budget for all entries together
+    DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initialize the extraction cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries (default: default_cache_dir())
+            max_bytes: Byte budget; least recently used entries are evicted beyond it
+        """
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must not be negative, got {max_bytes}")
+        self._cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self._max_bytes = max_bytes
+
+    @property
+    def cache_dir(self) -> Path:
+        """Directory holding the cache entries."""
+        return self._cache_dir
+
+    def entry_dir(self, key: str) -> Path:
+        """
+        Get the directory of an entry (which may not exist yet).
+
+        Args:
+            key: Cartridge fingerprint
+
+        Returns:
+            Path of the entry directory
+        """
+        return self._cache_dir / key
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """
+        Look up a fully extracted entry and mark it as recently used.
+
+        Args:
+            key: Cartridge fingerprint
+
+        Returns:
+            Entry directory, or None if the cartridge is not cached
+        """
+        entry = self.entry_dir(key)
+        if not (entry / _COMPLETE_MARKER).is_file():
+            return None
+        self.touch(key)
+        return entry
+
+    def open_entry(self, key: str) -> Path:
+        """
+        Create (or reuse) the directory of an entry that is being filled.
+
+        Args:
+            key: Cartridge fingerprint
+
+        Returns:
+            Entry directory
+        """
+        entry = self.entry_dir(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        self.touch(key)
+        return entry
+
+    def mark_complete(self, key: str) -> None:
+        """
+        Record that an entry is fully extracted and enforce the byte budget.
+
+        Args:
+            key: Cartridge fingerprint
+        """
+        entry = self.entry_dir(key)
+        size = self._directory_size(entry)
+        (entry / _COMPLETE_MARKER).write_text(str(size))
+        self.touch(key)
+        self.evict(protect=[key])
+
+    def touch(self, key: str) -> None:
+        """
+        Mark an entry as used now.
+
+        Args:
+            key: Cartridge fingerprint
+        """
+        marker = self.entry_dir(key) / _USED_MARKER
+        try:
+            marker.touch()
+        except FileNotFoundError:
+            pass
+
+    def pin(self, key: str) -> None:
+        """
+        Protect an entry from eviction while it is in use in this process.
+
+        Args:
+            key: Cartridge fingerprint
+        """
+        with _pinned_lock:
+            _pinned_keys[key] = _pinned_keys.get(key, 0) + 1
+
+    def unpin(self, key: str) -> None:
+        """
+        Release a pin taken with pin().
+
+        Args:
+            key: Cartridge fingerprint
+        """
+        with _pinned_lock:
+            count = _pinned_keys.get(key, 0) - 1
+            if count > 0:
+                _pinned_keys[key] = count
+            else:
+                _pinned_keys.pop(key, None)
+
+    def total_size(self) -> int:
+        """
+        Get the size of all entries together.
+
+        Returns:
+            Size in bytes
+        """
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self, protect: Iterable[str] = ()) -> list[str]:
+        """
+        Delete least recently used entries until the cache fits its budget.
+
+        Args:
+            protect: Keys that must not be evicted (pinned keys never are)
+
+        Returns:
+            Keys of the evicted entries
+        """
+        with _pinned_lock:
+            protected = set(protect) | set(_pinned_keys)
+
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        evicted: list[str] = []
+        # Oldest first
+        for key, _, size in sorted(entries, key=lambda entry: entry[1]):
+            if total <= self._max_bytes:
+                break
+            if key in protected:
+                continue
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+            total -= size
+            evicted.append(key)
+        return evicted
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        """List (key, last used time, size) for every entry on disk."""
+        if not self._cache_dir.is_dir():
+            return []
+
+        entries: list[tuple[str, float, int]] = []
+        for entry in self._cache_dir.iterdir():
+            if not entry.is_dir():
+                continue
+            try:
+                last_used = (entry / _USED_MARKER).stat().st_mtime
+            except FileNotFoundError:
+                last_used = 0.0
+            try:
+                size = int((entry / _COMPLETE_MARKER).read_text())
+            except (FileNotFoundError, ValueError):
+                # Incomplete entry (still being filled or abandoned)
+                size = self._directory_size(entry)
+            entries.append((entry.name, last_used, size))
+        return entries
+
+    @staticmethod
+    def _directory_size(directory: Path) -> int:
+        """Sum the sizes of all files below a directory."""
+        total = 0
+        for root, _, files in os.walk(directory):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
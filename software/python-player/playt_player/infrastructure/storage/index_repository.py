@@ -0,0 +1,295 @@
+"""SQLite index of parsed album metadata and integrity checks, keyed by cartridge fingerprint."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from ...domain.entities.album import Album
+from ...domain.entities.song import Song
+
+# Bumped whenever the schema changes; older indexes are rebuilt from scratch
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS albums (
+    fingerprint TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    artist TEXT NOT NULL,
+    year INTEGER,
+    genre TEXT,
+    cover_art_path TEXT,
+    slideshow_images TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS songs (
+    fingerprint TEXT NOT NULL REFERENCES albums(fingerprint) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    artist TEXT NOT NULL,
+    album TEXT NOT NULL,
+    duration_secs REAL,
+    file_path TEXT NOT NULL,
+    track_number INTEGER,
+    cover_art_path TEXT,
+    slideshow_images TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    PRIMARY KEY (fingerprint, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS member_checks (
+    fingerprint TEXT NOT NULL,
+    name TEXT NOT NULL,
+    sha256 TEXT,
+    error TEXT,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (fingerprint, name)
+) WITHOUT ROWID;
+"""
+
+
+def default_index_path() -> Path:
+    """
+    Get the default index database path.
+
+    Returns:
+        $XDG_CACHE_HOME/playt/index.db, or ~/.cache/playt/index.db
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "playt" / "index.db"
+
+
+class IndexRepository:
+    """
+    Persistent index of fully parsed albums.
+
+    Albums are stored per cartridge fingerprint exactly as given, including
+    their file paths; callers that need location independent entries store
+    archive member names and resolve them after loading. The database runs
+    in WAL mode, so readers (the UI) and a writer (a background scanner) can
+    use it at the same time. Each thread gets its own connection.
+    """
+
+    # Seconds a connection waits for a lock held by another writer
+    BUSY_TIMEOUT = 5.0
+
+    def __init__(self, db_path: Optional[Path] = None) -> None:
+        """
+        Initialize the index; the database is created on first use.
+
+        Args:
+            db_path: SQLite database file (default: default_index_path())
+        """
+        self._db_path = Path(db_path) if db_path is not None else default_index_path()
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._schema_ready = False
+
+    @property
+    def db_path(self) -> Path:
+        """SQLite database file."""
+        return self._db_path
+
+    def load_album(self, fingerprint: str) -> Optional[Album]:
+        """
+        Load an indexed album.
+
+        Args:
+            fingerprint: Cartridge fingerprint
+
+        Returns:
+            The album with its songs, or None if the cartridge is not indexed
+        """
+        connection = self._connection()
+        album_row = connection.execute(
+            "SELECT title, artist, year, genre, cover_art_path, slideshow_images"
+            " FROM albums WHERE fingerprint = ?",
+            (fingerprint,),
+        ).fetchone()
+        if album_row is None:
+            return None
+
+        song_rows = connection.execute(
+            "SELECT title, artist, album, duration_secs, file_path, track_number,"
+            " cover_art_path, slideshow_images, metadata"
+            " FROM songs WHERE fingerprint = ? ORDER BY position",
+            (fingerprint,),
+        ).fetchall()
+        songs = [
+            Song(
+                title=row[0],
+                artist=row[1],
+                album=row[2],
+                duration_secs=row[3],
+                file_path=row[4],
+                track_number=row[5],
+                cover_art_path=row[6],
+                slideshow_images=json.loads(row[7]),
+                metadata=json.loads(row[8]),
+            )
+            for row in song_rows
+        ]
+        return Album(
+            title=album_row[0],
+            artist=album_row[1],
+            year=album_row[2],
+            genre=album_row[3],
+            cover_art_path=album_row[4],
+            slideshow_images=json.loads(album_row[5]),
+            songs=songs,
+        )
+
+    def save_album(self, fingerprint: str, album: Album) -> None:
+        """
+        Store an album, replacing any previous entry for the cartridge.
+
+        Args:
+            fingerprint: Cartridge fingerprint
+            album: The album to store
+        """
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM albums WHERE fingerprint = ?", (fingerprint,))
+            connection.execute(
+                "INSERT INTO albums VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    fingerprint,
+                    album.title,
+                    album.artist,
+                    album.year,
+                    album.genre,
+                    album.cover_art_path,
+                    json.dumps(album.slideshow_images),
+                    time.time(),
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO songs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        fingerprint,
+                        position,
+                        song.title,
+                        song.artist,
+                        song.album,
+                        song.duration_secs,
+                        song.file_path,
+                        song.track_number,
+                        song.cover_art_path,
+                        json.dumps(song.slideshow_images),
+                        json.dumps(song.metadata),
+                    )
+                    for position, song in enumerate(album.songs)
+                ],
+            )
+
+    def has_album(self, fingerprint: str) -> bool:
+        """
+        Check whether a cartridge is indexed.
+
+        Args:
+            fingerprint: Cartridge fingerprint
+
+        Returns:
+            True if the cartridge has an index entry
+        """
+        row = self._connection().execute(
+            "SELECT 1 FROM albums WHERE fingerprint = ?", (fingerprint,)
+        ).fetchone()
+        return row is not None
+
+    def remove_album(self, fingerprint: str) -> None:
+        """
+        Remove a cartridge from the index.
+
+        Args:
+            fingerprint: Cartridge fingerprint
+        """
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM albums WHERE fingerprint = ?", (fingerprint,))
+
+    def load_member_checks(
+        self, fingerprint: str
+    ) -> Optional[list[tuple[str, Optional[str], Optional[str]]]]:
+        """
+        Load the stored integrity check results of a cartridge.
+
+        Args:
+            fingerprint: Cartridge fingerprint
+
+        Returns:
+            (member name, SHA-256 hex digest, error) tuples, or None if the
+            cartridge was never checked
+        """
+        rows = self._connection().execute(
+            "SELECT name, sha256, error FROM member_checks WHERE fingerprint = ? ORDER BY name",
+            (fingerprint,),
+        ).fetchall()
+        if not rows:
+            return None
+        return [(row[0], row[1], row[2]) for row in rows]
+
+    def save_member_checks(
+        self, fingerprint: str, checks: list[tuple[str, Optional[str], Optional[str]]]
+    ) -> None:
+        """
+        Store the integrity check results of a cartridge, replacing older ones.
+
+        Args:
+            fingerprint: Cartridge fingerprint
+            checks: (member name, SHA-256 hex digest, error) tuples
+        """
+        connection = self._connection()
+        checked_at = time.time()
+        with connection:
+            connection.execute("DELETE FROM member_checks WHERE fingerprint = ?", (fingerprint,))
+            connection.executemany(
+                "INSERT INTO member_checks VALUES (?, ?, ?, ?, ?)",
+                [(fingerprint, name, sha256, error, checked_at) for name, sha256, error in checks],
+            )
+
+    def close(self) -> None:
+        """Close the connections of all threads."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        connection: Optional[sqlite3.Connection] = getattr(self._local, "connection", None)
+        if connection is None:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self._db_path, timeout=self.BUSY_TIMEOUT, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            # WAL makes NORMAL durable across application crashes
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+                if not self._schema_ready:
+                    self._create_schema(connection)
+                    self._schema_ready = True
+        return connection
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> None:
+        """Create the tables, rebuilding them if the schema version changed."""
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        with connection:
+            if version != SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS member_checks")
+                connection.execute("DROP TABLE IF EXISTS songs")
+                connection.execute("DROP TABLE IF EXISTS albums")
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    connection.execute(statement)
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
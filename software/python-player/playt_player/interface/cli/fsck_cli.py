@@ -0,0 +1,83 @@
+"""Command-line interface for verifying the integrity of .playt files."""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+from ...infrastructure.cartridge.verifier import find_cartridges, verify_cartridges
+from ...infrastructure.logging.cli_logger import CLIOutputObserver, get_cli_logger
+from ...infrastructure.storage.index_repository import default_index_path
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Entry point for `playt fsck`.
+
+    Args:
+        argv: Arguments after "fsck" (default: sys.argv[2:])
+
+    Returns:
+        Exit status: 0 if every cartridge is intact, 1 otherwise
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="playt fsck",
+        description="Check every member of .playt files against its CRC and report bad ones",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        type=Path,
+        help=".playt files, or directories searched recursively for them",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of cartridges checked in parallel (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-read every cartridge instead of trusting earlier results",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Also list intact cartridges",
+    )
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    logger = get_cli_logger()
+    if not logger.has_observers():
+        logger.attach(CLIOutputObserver(sys.stdout, sys.stderr))
+
+    cartridges = find_cartridges(args.paths)
+    if not cartridges:
+        logger.error("No .playt files found")
+        return 1
+
+    index_path = None if args.no_cache else default_index_path()
+    bad = 0
+    for report in verify_cartridges(cartridges, index_path, workers=args.workers):
+        if report.ok:
+            if args.verbose:
+                suffix = " (cached)" if report.cached else ""
+                logger.info(f"OK {report.path}{suffix}")
+            continue
+        bad += 1
+        if report.error is not None:
+            logger.error(f"BAD {report.path}: {report.error}")
+        for check in report.bad_members:
+            logger.error(f"BAD {report.path}: {check.name}: {check.error}")
+
+    logger.info(f"Checked {len(cartridges)} cartridges, {bad} with errors")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
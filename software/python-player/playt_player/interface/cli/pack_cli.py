@@ -0,0 +1,105 @@
+"""Command-line interface for packing album directories into .playt files."""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+from ...infrastructure.authoring.packer import (
+    DEFAULT_ALIGNMENT,
+    DEFAULT_THUMBNAIL_SIZE,
+    PackOptions,
+    pack_albums,
+)
+from ...infrastructure.logging.cli_logger import CLIOutputObserver, get_cli_logger
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Entry point for `playt pack`.
+
+    Args:
+        argv: Arguments after "pack" (default: sys.argv[2:])
+
+    Returns:
+        Exit status: 0 if every album was packed, 1 otherwise
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="playt pack",
+        description="Pack album directories into playback-optimized .playt files",
+    )
+    parser.add_argument(
+        "albums",
+        nargs="+",
+        type=Path,
+        help="Album directories holding audio files (and optional cover art)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=Path("."),
+        help="Directory for the .playt files (default: current directory)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of albums packed in parallel (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--align",
+        type=int,
+        default=DEFAULT_ALIGNMENT,
+        metavar="BYTES",
+        help="Alignment of stored member data (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--thumbnail-size",
+        type=int,
+        default=DEFAULT_THUMBNAIL_SIZE,
+        metavar="PIXELS",
+        help="Largest edge of the cover thumbnail (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-thumbnail",
+        action="store_true",
+        help="Do not generate a cover thumbnail",
+    )
+    parser.add_argument(
+        "--no-faststart",
+        action="store_true",
+        help="Keep MP4/M4A files as they are instead of moving their index to the front",
+    )
+    args = parser.parse_args(sys.argv[2:] if argv is None else argv)
+    if args.align < 1:
+        parser.error("--align must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    logger = get_cli_logger()
+    if not logger.has_observers():
+        logger.attach(CLIOutputObserver(sys.stdout, sys.stderr))
+
+    options = PackOptions(
+        alignment=args.align,
+        thumbnail_size=None if args.no_thumbnail else args.thumbnail_size,
+        faststart=not args.no_faststart,
+    )
+    jobs = [(album, args.output_dir / f"{album.resolve().name}.playt") for album in args.albums]
+
+    failed = 0
+    for result in pack_albums(jobs, options, workers=args.workers):
+        for warning in result.warnings:
+            logger.warning(f"{result.source_dir.name}: {warning}")
+        if result.error is not None:
+            failed += 1
+            logger.error(result.error)
+        else:
+            logger.info(f"Packed {result.tracks} tracks into {result.output_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
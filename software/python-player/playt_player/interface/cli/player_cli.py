@@ -4,21 +4,29 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+from ...application.command_bus import CommandBus
+from ...application.commands.load_album_command import LoadAlbumCommand
 from ...application.commands.next_command import NextCommand
 from ...application.commands.pause_command import PauseCommand
 from ...application.commands.play_command import PlayCommand
 from ...application.commands.prev_command import PrevCommand
+from ...application.commands.shuffle_command import ShuffleCommand
 from ...application.commands.stop_command import StopCommand
 from ...application.player_service import PlayerService
 from ...domain.interfaces.audio_player import AudioPlayerInterface
 from ...domain.interfaces.cartridge_reader import CartridgeReaderInterface
+from ...infrastructure.audio.crossfade import CROSSFADE_CURVES, Crossfade
 from ...infrastructure.audio.ffmpeg_audio_player import FFmpegAudioPlayer
+from ...infrastructure.audio.output_sink import OUTPUT_SINKS, create_sink
+from ...infrastructure.audio.pcm_audio_player import PcmAudioPlayer
 from ...infrastructure.cartridge.playt_file_cartridge_reader import PlaytFileCartridgeReader
 from ...infrastructure.logging.cli_logger import (
     CLIOutputObserver,
     get_cli_logger,
 )
 from ...infrastructure.observers.logging_observer import LoggingObserver
+from ...infrastructure.storage.extraction_cache import ExtractionCache
+from ...infrastructure.storage.index_repository import IndexRepository
 
 
 class PlayerCLI:
@@ -28,6 +36,7 @@ class PlayerCLI:
         self,
         player_service: PlayerService,
         cartridge_reader: Optional[CartridgeReaderInterface] = None,
+        command_bus: Optional[CommandBus] = None,
     ) -> None:
         """
         Initialize the CLI.
@@ -35,9 +44,12 @@ class PlayerCLI:
         Args:
             player_service: The player service to control
             cartridge_reader: Optional cartridge reader for loading albums
+            command_bus: Bus running the commands, shared with other frontends
+                (default: a bus of its own)
         """
         self._player_service = player_service
         self._cartridge_reader = cartridge_reader
+        self._command_bus = command_bus or CommandBus(player_service)
         self._logger = get_cli_logger()
         self._setup_observers()
         self._setup_logger_observers()
@@ -72,15 +84,17 @@ class PlayerCLI:
                 if command == "quit" or command == "q":
                     break
                 elif command == "play":
-                    PlayCommand(self._player_service).execute()
+                    self._command_bus.execute(PlayCommand(self._player_service))
                 elif command == "pause":
-                    PauseCommand(self._player_service).execute()
+                    self._command_bus.execute(PauseCommand(self._player_service))
                 elif command == "stop":
-                    StopCommand(self._player_service).execute()
+                    self._command_bus.execute(StopCommand(self._player_service))
                 elif command == "next":
-                    NextCommand(self._player_service).execute()
+                    self._command_bus.execute(NextCommand(self._player_service))
                 elif command == "prev":
-                    PrevCommand(self._player_service).execute()
+                    self._command_bus.execute(PrevCommand(self._player_service))
+                elif command == "shuffle" or command.startswith("shuffle "):
+                    self._shuffle(command[7:].strip())
                 elif command.startswith("load "):
                     cartridge_id = command[5:].strip()
                     self._load_cartridge(cartridge_id)
@@ -104,12 +118,9 @@ class PlayerCLI:
 
         # If it looks like a .playt file and we don't have a reader, create one
         # We'll let the reader itself check if the file actually exists
-        if is_playt_file_by_extension and not self._cartridge_reader:
-            from ...infrastructure.cartridge.playt_file_cartridge_reader import (
-                PlaytFileCartridgeReader,
-            )
-
-            self._cartridge_reader = PlaytFileCartridgeReader()
+        if is_playt_file_by_extension:
+            if not self._cartridge_reader:
+                self._cartridge_reader = create_cartridge_reader()
 
             # Try to resolve the path - handle both absolute and relative paths
             if not cartridge_path.is_absolute():
@@ -136,17 +147,47 @@ class PlayerCLI:
             self._logger.error(f"Failed to load album from cartridge: {cartridge_id}")
             return
 
-        self._player_service.load_album(album)
+        track_source = self._cartridge_reader.get_track_source(cartridge)
+        self._command_bus.execute(LoadAlbumCommand(self._player_service, album, track_source))
         self._logger.info(f"Loaded album: {album.title} by {album.artist}")
         self._logger.info(f"  {len(album.songs)} songs loaded")
         for idx, song in enumerate(album.ordered_songs(), start=1):
             self._logger.info(f"  {idx}. {song.title}")
 
+    def _shuffle(self, argument: str) -> None:
+        """Toggle shuffle, or turn it on or off, or on with a given seed."""
+        if argument in ("on", "off"):
+            self._command_bus.execute(ShuffleCommand(self._player_service, argument == "on"))
+        elif argument.isdigit():
+            self._command_bus.execute(ShuffleCommand(self._player_service, True, int(argument)))
+        elif argument:
+            self._logger.warning("Usage: shuffle [on|off|<seed>]")
+            return
+        else:
+            self._command_bus.execute(ShuffleCommand(self._player_service))
+
+        order = self._player_service.get_shuffle()
+        if order is None:
+            self._logger.info("Shuffle off")
+        else:
+            self._logger.info(f"Shuffle on (seed {order.seed})")
+
     def _show_status(self) -> None:
         """Show current player status."""
-        song = self._player_service.get_current_song()
-        state = self._player_service.get_state()
-        position = self._player_service.get_position()
+        snapshot = self._player_service.get_snapshot()
+        song = snapshot.song
+        state = snapshot.state
+        position = snapshot.position()
+
+        stats = self._player_service.get_buffer_stats()
+        if stats is not None:
+            self._logger.info(
+                f"Buffer: {stats.fill_ms:.0f}/{stats.capacity_ms:.0f} ms, "
+                f"underruns: {stats.underruns}, "
+                f"decoder stalls: {stats.decoder_stall_secs:.2f}s, "
+                f"refill: {stats.refill_latency_ms:.0f} ms, "
+                f"slowest read: {stats.slowest_read_ms:.0f} ms"
+            )
 
         if song:
             pos_str = f"{position:.1f}s" if position else "?"
@@ -162,31 +203,113 @@ class PlayerCLI:
         self._logger.info("  stop          - Stop playback")
         self._logger.info("  next          - Skip to next track")
         self._logger.info("  prev          - Go to previous track")
+        self._logger.info("  shuffle [on|off|<seed>] - Toggle shuffle, or shuffle with a seed")
         self._logger.info("  load <path>   - Load album from cartridge or .playt file")
         self._logger.info("  status        - Show current status")
         self._logger.info("  help          - Show this help")
         self._logger.info("  quit / q      - Exit the player")
 
 
-def create_player_service(audio_player: Optional[AudioPlayerInterface] = None) -> PlayerService:
+# Audio backends selectable with --backend
+AUDIO_BACKENDS = ("ffplay", "pcm")
+
+
+def create_audio_player(
+    backend: str = "ffplay",
+    crossfade_secs: float = 0.0,
+    crossfade_curve: str = "equal-power",
+    buffer_ms: float = PcmAudioPlayer.BUFFER_MS,
+    pool_size: int = FFmpegAudioPlayer.DEFAULT_POOL_SIZE,
+    sink: str = "auto",
+    capture_path: Optional[Path] = None,
+) -> AudioPlayerInterface:
+    """
+    Create the audio player for a backend.
+
+    Args:
+        backend: "ffplay" for one ffplay process per track, "pcm" for the
+            in-process engine with a long-lived output
+        crossfade_secs: Overlap between consecutive tracks (pcm backend only)
+        crossfade_curve: Name of the crossfade curve (see CROSSFADE_CURVES)
+        buffer_ms: Audio decoded ahead of the output (pcm backend only)
+        pool_size: Tracks to keep a pre-spawned ffplay ready for (ffplay backend only)
+        sink: Name of the output sink, see OUTPUT_SINKS (pcm backend only)
+        capture_path: Also record the output to this WAV file (pcm backend only)
+
+    Returns:
+        The audio player
+    """
+    if backend == "pcm":
+        crossfade = None
+        if crossfade_secs > 0:
+            crossfade = Crossfade.from_seconds(
+                crossfade_secs, PcmAudioPlayer.DEFAULT_SAMPLE_RATE, crossfade_curve
+            )
+        return PcmAudioPlayer(
+            sink=create_sink(sink, capture_path), buffer_ms=buffer_ms, crossfade=crossfade
+        )
+    return FFmpegAudioPlayer(pool_size=pool_size)
+
+
+def create_cartridge_reader(
+    streaming: bool = False,
+    cache_dir: Optional[Path] = None,
+    cache_size_mb: int = ExtractionCache.DEFAULT_MAX_BYTES // (1024 * 1024),
+    use_cache: bool = True,
+) -> PlaytFileCartridgeReader:
+    """
+    Create the reader for .playt files.
+
+    Args:
+        streaming: Play tracks straight out of the archive instead of extracting it
+        cache_dir: Directory for extracted cartridges (default: the cache's default)
+        cache_size_mb: Disk budget for extracted cartridges in MB
+        use_cache: Extract into the persistent cache and index album metadata;
+            if False, extract into temporary directories and index nothing
+
+    Returns:
+        The cartridge reader
+    """
+    cache: Optional[ExtractionCache] = None
+    index: Optional[IndexRepository] = None
+    if use_cache:
+        cache = ExtractionCache(cache_dir, cache_size_mb * 1024 * 1024)
+        index = IndexRepository()
+    return PlaytFileCartridgeReader(streaming=streaming, cache=cache, index=index)
+
+
+def create_player_service(
+    audio_player: Optional[AudioPlayerInterface] = None, gapless: bool = True
+) -> PlayerService:
     """
     Factory function to create a player service with default dependencies.
 
     Args:
         audio_player: Optional audio player (defaults to FFmpegAudioPlayer)
+        gapless: Queue the next song on the audio player for gapless playback
 
     Returns:
         Configured PlayerService instance
     """
     if audio_player is None:
         audio_player = FFmpegAudioPlayer()
-    return PlayerService(audio_player)
+    return PlayerService(audio_player, gapless)
 
 
 def main() -> None:
     """Main entry point for the CLI."""
     import argparse
 
+    # Imported here so playback does not load the authoring and maintenance tools
+    if sys.argv[1:2] == ["pack"]:
+        from .pack_cli import main as pack_main
+
+        sys.exit(pack_main(sys.argv[2:]))
+    if sys.argv[1:2] == ["fsck"]:
+        from .fsck_cli import main as fsck_main
+
+        sys.exit(fsck_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         description="Playt Player - Audio player for .playt cartridge files"
     )
@@ -200,19 +323,120 @@ def main() -> None:
         action="store_true",
         help="Automatically start playing after loading the album",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Play tracks straight out of the .playt file instead of extracting it first",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory for extracted cartridges (default: ~/.cache/playt/cartridges)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=ExtractionCache.DEFAULT_MAX_BYTES // (1024 * 1024),
+        metavar="MB",
+        help="Disk budget for extracted cartridges in MB (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Extract into a temporary directory that is deleted on exit and do not "
+        "index album metadata",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=AUDIO_BACKENDS,
+        default="ffplay",
+        help="Audio backend: one ffplay process per track, or the in-process PCM engine "
+        "that keeps the output open (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-gapless",
+        action="store_true",
+        help="Do not decode the next track ahead of time to join tracks without a gap "
+        "(pcm backend only)",
+    )
+    parser.add_argument(
+        "--crossfade",
+        type=float,
+        default=0.0,
+        metavar="SECS",
+        help="Overlap consecutive tracks by this many seconds (pcm backend only)",
+    )
+    parser.add_argument(
+        "--crossfade-curve",
+        choices=sorted(CROSSFADE_CURVES),
+        default="equal-power",
+        help="Shape of the crossfade (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--buffer-ms",
+        type=float,
+        default=PcmAudioPlayer.BUFFER_MS,
+        metavar="MS",
+        help="Audio decoded ahead of the output; raise it if 'status' reports underruns "
+        "(pcm backend only, default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=FFmpegAudioPlayer.DEFAULT_POOL_SIZE,
+        metavar="N",
+        help="Keep ffplay pre-spawned for this many upcoming tracks so skips start instantly; "
+        "0 disables it (ffplay backend only, default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--sink",
+        choices=OUTPUT_SINKS,
+        default="auto",
+        help="Audio output: a sound card through ffplay or sounddevice (auto: sounddevice if "
+        "it is installed), or discard the audio "
+        "in real time or as fast as possible for benchmarks (pcm backend only, "
+        "default: %(default)s)",
+    )
+    parser.add_argument(
+        "--capture",
+        type=Path,
+        default=None,
+        metavar="WAV",
+        help="Also record the output to a WAV file, with the time every block was written "
+        "in a .csv next to it (pcm backend only)",
+    )
 
     args = parser.parse_args()
+    if args.backend != "pcm" and (args.sink != "auto" or args.capture is not None):
+        parser.error("--sink and --capture need --backend pcm")
 
     try:
-        player_service = create_player_service()
+        player_service = create_player_service(
+            create_audio_player(
+                args.backend,
+                args.crossfade,
+                args.crossfade_curve,
+                args.buffer_ms,
+                args.pool_size,
+                args.sink,
+                args.capture,
+            ),
+            gapless=not args.no_gapless,
+        )
 
         # Set up logger with stdout/stderr observers before any logging
         logger = get_cli_logger()
         stdout_observer = CLIOutputObserver(sys.stdout, sys.stderr)
         logger.attach(stdout_observer)
 
-        # If a .playt file is provided, use PlaytFileCartridgeReader
-        cartridge_reader: Optional[CartridgeReaderInterface] = None
+        # One reader for the file given here and any loaded interactively later
+        cartridge_reader = create_cartridge_reader(
+            args.stream, args.cache_dir, args.cache_size, not args.no_cache
+        )
         if args.playt_file:
             playt_path = Path(args.playt_file)
             if not playt_path.exists():
@@ -225,19 +449,20 @@ def main() -> None:
                 )
                 sys.exit(1)
 
-            cartridge_reader = PlaytFileCartridgeReader()
-
-        cli = PlayerCLI(player_service, cartridge_reader)
+        command_bus = CommandBus(player_service)
+        cli = PlayerCLI(player_service, cartridge_reader, command_bus)
 
         # If a .playt file was provided, load it automatically
-        if args.playt_file and cartridge_reader:
+        if args.playt_file:
             logger.info(f"Loading .playt file: {args.playt_file}")
             cli._load_cartridge(str(playt_path.absolute()))
             if args.auto_play:
                 logger.info("Starting playback...")
-                PlayCommand(player_service).execute()
+                command_bus.execute(PlayCommand(player_service))
 
         cli.run_interactive(auto_play=args.auto_play)
+        command_bus.close()
+        player_service.close()
     except Exception as e:
         logger = get_cli_logger()
         if not logger.has_observers():  # If no observers yet, set up quickly
@@ -5,22 +5,68 @@ WebView-based UI implementation using pywebview.
 import json
 import os
 import threading
-from typing import Any, List, Optional, Dict
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Dict
 
 import webview  # type: ignore
 
+from ...application.command_bus import CommandBus
+from ...application.commands import (
+    CheckPlaybackStatusCommand,
+    Command,
+    LoadAlbumCommand,
+    NextCommand,
+    PauseCommand,
+    PlayCommand,
+    PrevCommand,
+    SeekCommand,
+    SetVolumeCommand,
+    StopCommand,
+    TogglePlayCommand,
+)
 from ...application.player_service import PlayerService
+from ...domain.interfaces.cartridge_reader import CartridgeReaderInterface
 from ...domain.interfaces.observer import Observer
 from ...infrastructure.audio.visualization_stub import VisualizationStub
 from ...infrastructure.logging.cli_logger import get_cli_logger
 
 
 class PlaytJSApi:
-    """API exposed to JavaScript."""
+    """
+    API exposed to JavaScript.
+
+    Commands are handed to the command bus without waiting for them, so the
+    page never stalls on audio work such as restarting a player process.
+    """
     
-    def __init__(self, player_service: PlayerService, logger: Any) -> None:
+    def __init__(
+        self,
+        player_service: PlayerService,
+        logger: Any,
+        command_bus: Optional[CommandBus] = None,
+        cartridge_reader_factory: Optional[Callable[[], CartridgeReaderInterface]] = None,
+    ) -> None:
         self._player_service = player_service
         self._logger = logger
+        self._command_bus = command_bus or CommandBus(player_service)
+        # Creates the reader for each file picked, configured like the player
+        self._cartridge_reader_factory = cartridge_reader_factory
+        self._current_reader: Optional[CartridgeReaderInterface] = None
+
+    def _dispatch(self, command: Command) -> None:
+        """Run a command on the bus and log it if it fails."""
+
+        def report(future: "Future[None]") -> None:
+            error = future.exception()
+            if isinstance(error, NotImplementedError):
+                self._logger.warning(
+                    f"[UI] {type(command).__name__} not implemented in current audio backend"
+                )
+            elif error is not None:
+                self._logger.error(f"[UI] {type(command).__name__} failed: {error}")
+
+        self._command_bus.submit(command).add_done_callback(report)
 
     def log(self, message: str) -> None:
         """Log message from JS."""
@@ -29,44 +75,37 @@ class PlaytJSApi:
     def play(self) -> None:
         """Start playback."""
         self._logger.info("[UI] Play command received")
-        self._player_service.play()
+        self._dispatch(PlayCommand(self._player_service))
         
     def pause(self) -> None:
         """Pause playback."""
         self._logger.info("[UI] Pause command received")
-        self._player_service.pause()
+        self._dispatch(PauseCommand(self._player_service))
         
     def togglePlay(self) -> None:
         """Toggle playback state."""
         self._logger.info("[UI] Toggle Play command received")
-        state = self._player_service.get_state()
-        if state == "playing":
-            self._player_service.pause()
-        else:
-            self._player_service.play()
+        self._dispatch(TogglePlayCommand(self._player_service))
             
     def next(self) -> None:
         """Skip to next track."""
         self._logger.info("[UI] Next command received")
-        self._player_service.next()
+        self._dispatch(NextCommand(self._player_service))
         
     def previous(self) -> None:
         """Skip to previous track."""
         self._logger.info("[UI] Previous command received")
-        self._player_service.previous()
+        self._dispatch(PrevCommand(self._player_service))
         
     def seek(self, seconds: float) -> None:
         """Seek to position."""
         self._logger.info(f"[UI] Seek to {seconds}s command received")
-        try:
-            self._player_service.seek(float(seconds))
-        except NotImplementedError:
-            self._logger.warning("[UI] Seek not implemented in current audio backend")
+        self._dispatch(SeekCommand(self._player_service, float(seconds)))
             
     def setVolume(self, value: float) -> None:
         """Set volume (0.0-1.0)."""
         self._logger.info(f"[UI] Set volume to {value}")
-        self._player_service.set_volume(float(value))
+        self._dispatch(SetVolumeCommand(self._player_service, float(value)))
 
     def pickFile(self) -> None:
         """Open a file picker dialog and load the selected .playt file."""
@@ -91,7 +130,6 @@ class PlaytJSApi:
     def _load_file(self, file_path: str) -> None:
         """Internal method to load a file."""
         from pathlib import Path
-        from ...infrastructure.cartridge.playt_file_cartridge_reader import PlaytFileCartridgeReader
         
         path = Path(file_path)
         if not path.exists() or path.suffix.lower() != ".playt":
@@ -102,19 +140,27 @@ class PlaytJSApi:
         
         # Create new reader (this will be attached to the API instance to keep alive)
         # Note: we should probably clean up the old one if it exists
-        if hasattr(self, '_current_reader') and self._current_reader:
-            self._current_reader.cleanup()
-            
-        reader = PlaytFileCartridgeReader()
+        if self._current_reader is not None:
+            cleanup = getattr(self._current_reader, "cleanup", None)
+            if cleanup is not None:
+                cleanup()
+
+        factory = self._cartridge_reader_factory
+        if factory is None:
+            from ..cli.player_cli import create_cartridge_reader
+
+            factory = create_cartridge_reader
+        reader = factory()
         self._current_reader = reader # Keep alive
         
         cartridge = reader.read_cartridge(str(path))
         if cartridge:
             album = reader.load_album_from_cartridge(cartridge)
             if album:
-                self._player_service.stop()
-                self._player_service.load_album(album)
-                self._player_service.play()
+                track_source = reader.get_track_source(cartridge)
+                self._dispatch(StopCommand(self._player_service))
+                self._dispatch(LoadAlbumCommand(self._player_service, album, track_source))
+                self._dispatch(PlayCommand(self._player_service))
 
 
 class WebViewUI(Observer):
@@ -122,20 +168,30 @@ class WebViewUI(Observer):
     Manages the WebView window and communication between Python and JS.
     """
 
+    # Seconds between progress updates sent to the page while playing
+    PROGRESS_INTERVAL = 0.5
+
     def __init__(
         self, 
         player_service: PlayerService, 
         html_path: str,
-        visualization_stub: Optional[VisualizationStub] = None
+        visualization_stub: Optional[VisualizationStub] = None,
+        command_bus: Optional[CommandBus] = None,
+        cartridge_reader_factory: Optional[Callable[[], CartridgeReaderInterface]] = None
     ) -> None:
         self._player_service = player_service
         self._html_path = html_path
         self._visualization_stub = visualization_stub
         self._logger = get_cli_logger()
         self._window: Optional[webview.Window] = None
-        self._js_api = PlaytJSApi(self._player_service, self._logger)
+        self._command_bus = command_bus or CommandBus(player_service)
+        self._js_api = PlaytJSApi(
+            self._player_service, self._logger, self._command_bus, cartridge_reader_factory
+        )
         self._progress_thread: Optional[threading.Thread] = None
         self._running = False
+        # Set while a track plays; the progress thread sleeps otherwise
+        self._playing = threading.Event()
 
     def run(self) -> None:
         """Create and run the WebView window."""
@@ -165,6 +221,11 @@ class WebViewUI(Observer):
 
     def update(self, event_type: str, data: Any) -> None:
         """Receive updates from PlayerService."""
+        if event_type == "track_started":
+            self._playing.set()
+        elif event_type in ("track_paused", "track_stopped", "queue_ended"):
+            self._playing.clear()
+
         if not self._window:
             return
             
@@ -193,7 +254,7 @@ class WebViewUI(Observer):
             elif event_type == "album_loaded":
                 # Album loaded but not necessarily playing
                 # We might want to send the first track info if available
-                queue = self._player_service.get_queue()
+                _, queue = self._player_service.get_queue_window(0, 0)
                 if queue:
                     song = queue[0]
                     song_data = {
@@ -290,11 +351,12 @@ class WebViewUI(Observer):
         self._progress_thread = threading.Thread(target=self._poll_progress, daemon=True)
         self._progress_thread.start()
         
-        # Initial state sync
-        current_song = self._player_service.get_current_song()
+        # Initial state sync, from one snapshot so the song and state agree
+        snapshot = self._player_service.get_snapshot()
+        current_song = snapshot.song
         # If no current song but queue has items, show the first one
         if not current_song:
-            queue = self._player_service.get_queue()
+            _, queue = self._player_service.get_queue_window(0, 0)
             if queue:
                 current_song = queue[0]
 
@@ -312,24 +374,32 @@ class WebViewUI(Observer):
             json_str = json.dumps(song_data, ensure_ascii=False)
             self._window.evaluate_js(f"window.playt._emitTrackChange({json_str})")
             
-        state = self._player_service.get_state()
+        state = snapshot.state
         self._window.evaluate_js(f"window.playt._emitPlaybackState('{state}')")
+        if state == "playing":
+            self._playing.set()
 
     def _poll_progress(self) -> None:
-        """Poll for playback progress."""
-        import time
+        """Send the playback position to the page while a track plays."""
         while self._running:
-            # Check if track finished and auto-advance
-            self._player_service.check_playback_status()
-            
-            if self._window and self._player_service.get_state() == "playing":
-                pos = self._player_service.get_position()
+            # An idle player costs no wakeups; track ends arrive as events
+            self._playing.wait()
+            if not self._running:
+                break
+            if not self._player_service.track_end_events:
+                # This audio player must be polled to advance past the end of a track
+                self._command_bus.post(CheckPlaybackStatusCommand(self._player_service))
+
+            # The published snapshot: no locking and no calls into the audio player
+            snapshot = self._player_service.get_snapshot()
+            if self._window and snapshot.state == "playing":
+                pos = snapshot.position()
                 if pos is not None:
                     try:
                         self._window.evaluate_js(f"window.playt._emitProgress({pos})")
                     except Exception:
                         pass
-            time.sleep(0.5)
+            time.sleep(self.PROGRESS_INTERVAL)
 
     def _on_spectrum(self, data: List[float]) -> None:
         """Handle spectrum data from stub."""
@@ -366,6 +436,7 @@ class WebViewUI(Observer):
     def stop(self) -> None:
         """Stop the UI."""
         self._running = False
+        self._playing.set()
         if self._visualization_stub:
             self._visualization_stub.stop()
         if self._window:
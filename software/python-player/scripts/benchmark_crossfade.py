@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark the crossfade mixer and the decode loop's hold-back of the outgoing tail."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playt_player.infrastructure.audio.crossfade import (  # noqa: E402
+    CROSSFADE_CURVES,
+    Crossfade,
+    TailBuffer,
+)
+
+
+def time_blocks(fade: Crossfade, tail: np.ndarray, head: np.ndarray, block: int) -> list[float]:
+    """Mix the whole overlap block by block, returning the time spent on each block."""
+    out = np.empty((block, tail.shape[1]), dtype=np.float32)
+    timings = []
+    for offset in range(0, fade.frames - block + 1, block):
+        start = time.perf_counter()
+        fade.mix(tail[offset : offset + block], head[offset : offset + block], offset, out)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def time_hold_back(fade: Crossfade, block: np.ndarray, blocks: int) -> list[float]:
+    """Hold back the tail of a track as the decode loop does, timing each decoded block."""
+    held = TailBuffer()
+    timings = []
+    for _ in range(blocks):
+        start = time.perf_counter()
+        held.push(block, fade.frames)
+        timings.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    held.take(fade.frames)
+    timings.append(time.perf_counter() - start)
+    return timings
+
+
+def time_concatenated_hold_back(fade: Crossfade, block: np.ndarray, blocks: int) -> list[float]:
+    """Hold back the tail by concatenating it with every block, for comparison."""
+    held = np.zeros((0, block.shape[1]), dtype=np.float32)
+    timings = []
+    for _ in range(blocks):
+        start = time.perf_counter()
+        joined = np.concatenate((held, block))
+        held = joined[max(0, len(joined) - fade.frames) :]
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def time_per_sample(fade_frames: int, tail: np.ndarray, head: np.ndarray, frames: int) -> float:
+    """Time a per-sample Python loop over `frames` frames, for comparison."""
+    fade_in = [np.sin((i + 0.5) / fade_frames * np.pi / 2) for i in range(frames)]
+    fade_out = [np.cos((i + 0.5) / fade_frames * np.pi / 2) for i in range(frames)]
+    tail_list = tail[:frames].tolist()
+    head_list = head[:frames].tolist()
+    start = time.perf_counter()
+    for i in range(frames):
+        for channel in range(tail.shape[1]):
+            tail_list[i][channel] = (
+                tail_list[i][channel] * fade_out[i] + head_list[i][channel] * fade_in[i]
+            )
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=int, default=48000, help="Sample rate (default: 48000)")
+    parser.add_argument("--channels", type=int, default=2, help="Channels (default: 2)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Fade length (default: 10)")
+    parser.add_argument("--block", type=int, default=2048, help="Frames per block (default: 2048)")
+    parser.add_argument(
+        "--curve",
+        choices=sorted(CROSSFADE_CURVES),
+        default="equal-power",
+        help="Fade curve (default: equal-power)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Runs (default: 5)")
+    args = parser.parse_args()
+
+    fade = Crossfade.from_seconds(args.seconds, args.rate, args.curve)
+    rng = np.random.default_rng(0)
+    tail = rng.uniform(-1, 1, (fade.frames, args.channels)).astype(np.float32)
+    head = rng.uniform(-1, 1, (fade.frames, args.channels)).astype(np.float32)
+
+    timings: list[float] = []
+    for _ in range(args.runs):
+        timings += time_blocks(fade, tail, head, args.block)
+    block_secs = args.block / args.rate
+    mean = sum(timings) / len(timings)
+    worst = max(timings)
+
+    print(f"Crossfade: {args.seconds:g} s, {args.curve}, {args.rate} Hz, {args.channels} ch")
+    print(f"Block: {args.block} frames ({block_secs * 1000:.1f} ms of audio)")
+    print(f"Mean time per block:   {mean * 1e6:10.1f} µs")
+    print(f"Worst time per block:  {worst * 1e6:10.1f} µs")
+    print(f"Real-time factor:      {block_secs / mean:10.0f}x (mean)")
+    print(f"                       {block_secs / worst:10.0f}x (worst block)")
+    print(f"CPU used by the mixer: {mean / block_secs * 100:10.3f} % of one core")
+
+    frames = min(fade.frames, args.rate // 10)
+    loop = time_per_sample(fade.frames, tail, head, frames)
+    print(f"Per-sample Python loop real-time factor: {frames / args.rate / loop:.1f}x")
+
+    # The decode loop holds the tail back for every block of a track once the next is queued
+    block = tail[: args.block]
+    blocks = 2 * fade.frames // args.block + 1
+    hold: list[float] = []
+    concatenated: list[float] = []
+    for _ in range(args.runs):
+        hold += time_hold_back(fade, block, blocks)
+        concatenated += time_concatenated_hold_back(fade, block, blocks)
+    hold_mean = sum(hold) / len(hold)
+    hold_worst = max(hold)
+    print(f"Hold-back per block:   {hold_mean * 1e6:10.1f} µs mean")
+    print(f"                       {hold_worst * 1e6:10.1f} µs worst (includes the splice)")
+    print(f"Copying hold-back:     {sum(concatenated) / len(concatenated) * 1e6:10.1f} µs mean")
+
+    # Fail if even the slowest block could not keep up with playback
+    return 0 if worst + hold_worst < block_secs else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
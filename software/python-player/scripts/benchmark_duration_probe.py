@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark sequential vs parallel duration probing on a synthetic cartridge."""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import wave
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playt_player.infrastructure.cartridge.playt_file_cartridge_reader import (  # noqa: E402
+    PlaytFileCartridgeReader,
+)
+
+
+def build_cartridge(directory: Path, tracks: int, seconds: float) -> Path:
+    """Write a .playt file with `tracks` silent WAV files."""
+    sample_rate = 8000
+    frames = b"\x00\x00" * int(sample_rate * seconds)
+    playt_path = directory / "Benchmark Artist - Synthetic.playt"
+
+    with zipfile.ZipFile(playt_path, "w", compression=zipfile.ZIP_STORED) as zip_ref:
+        for number in range(1, tracks + 1):
+            track_path = directory / f"{number:02d} Benchmark Artist - Synthetic - Track {number}.wav"
+            with wave.open(str(track_path), "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(sample_rate)
+                wav.writeframes(frames)
+            zip_ref.write(track_path, f"Synthetic/{track_path.name}")
+            track_path.unlink()
+
+    return playt_path
+
+
+def time_probing(playt_path: Path, workers: int, runs: int, ffprobe_only: bool) -> float:
+    """Return the best probing time over `runs` runs with the given worker count."""
+    reader = PlaytFileCartridgeReader(probe_workers=workers)
+    if ffprobe_only:
+        # Bypass the header parsers to measure the ffprobe fallback itself
+        reader._get_duration = reader._probe_duration  # type: ignore[method-assign]
+    cartridge = reader.read_cartridge(str(playt_path))
+    if cartridge is None:
+        raise RuntimeError(f"Could not read {playt_path}")
+    album = reader.load_album_from_cartridge(cartridge)
+    if album is None:
+        raise RuntimeError(f"Could not load {playt_path}")
+    file_paths = [song.file_path for song in album.ordered_songs()]
+
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        durations = reader._probe_durations(file_paths)
+        best = min(best, time.perf_counter() - start)
+        if any(duration is None for duration in durations):
+            raise RuntimeError("Some durations could not be probed")
+
+    reader.cleanup()
+    return best
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tracks", type=int, default=30, help="Number of tracks (default: 30)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Seconds per track (default: 5)")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel workers (default: 8)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per configuration (default: 3)")
+    args = parser.parse_args()
+
+    if not shutil.which("ffprobe"):
+        print("✗ ffprobe (part of ffmpeg) was not found on PATH.")
+        return 1
+
+    with tempfile.TemporaryDirectory(prefix="playt_bench_") as temp_dir:
+        playt_path = build_cartridge(Path(temp_dir), args.tracks, args.seconds)
+        print(f"Synthetic cartridge: {args.tracks} tracks, {playt_path.stat().st_size} bytes")
+
+        sequential = time_probing(playt_path, 1, args.runs, ffprobe_only=True)
+        parallel = time_probing(playt_path, args.workers, args.runs, ffprobe_only=True)
+        headers = time_probing(playt_path, 1, args.runs, ffprobe_only=False)
+
+    print(f"ffprobe, sequential (1 worker):  {sequential * 1000:8.1f} ms")
+    print(f"ffprobe, parallel ({args.workers} workers): {parallel * 1000:8.1f} ms")
+    print(f"Speedup: {sequential / parallel:.2f}x")
+    print(f"Header parsing (no ffprobe):     {headers * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Builders for the audio files and .playt archives the tests work on."""
+
+from __future__ import annotations
+
+import io
+import wave
+import zipfile
+from collections.abc import Collection, Iterable, Mapping
+from pathlib import Path
+
+# Member name of the numbered dummy tracks, formatted with the track number
+TRACK_NAME = "Album/{number:02d} Artist - Album - Song {number}.mp3"
+# Content of a dummy track; never decoded
+DUMMY_AUDIO = b"\xff" * 64
+
+
+def make_wav(
+    seconds: float = 0.1,
+    sample_rate: int = 8000,
+    channels: int = 1,
+    width: int = 2,
+    step: int = 0,
+) -> bytes:
+    """
+    Build a WAV file, silent unless its samples count up.
+
+    Args:
+        seconds: Duration
+        sample_rate: Frames per second
+        channels: Number of channels
+        width: Bytes per sample (2 or 3)
+        step: Difference between consecutive samples, counted across channels
+
+    Returns:
+        The file's content
+    """
+    count = channels * int(seconds * sample_rate)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(sample_rate)
+        wav.writeframes(
+            b"".join((i * step).to_bytes(width, "little", signed=True) for i in range(count))
+        )
+    return buffer.getvalue()
+
+
+def make_playt(
+    path: Path,
+    tracks: int = 3,
+    track_name: str = TRACK_NAME,
+    track_data: bytes = DUMMY_AUDIO,
+    images: Iterable[str] = ("Album/cover.png",),
+    members: Mapping[str, bytes] | None = None,
+    deflated: Collection[str] = (),
+) -> Path:
+    """
+    Write a .playt archive: numbered tracks, then images, then any other members.
+
+    Members are stored uncompressed unless named in deflated.
+
+    Args:
+        path: Archive to write (replaced if it exists)
+        tracks: Number of numbered tracks
+        track_name: Member name of a track, formatted with its number
+        track_data: Content of every numbered track
+        images: Member names of images; their content is their extension
+        members: Further members by name, written in order
+        deflated: Names of members to compress
+
+    Returns:
+        path
+    """
+
+    def compression(name: str) -> int:
+        return zipfile.ZIP_DEFLATED if name in deflated else zipfile.ZIP_STORED
+
+    with zipfile.ZipFile(path, "w") as zip_ref:
+        for number in range(1, tracks + 1):
+            name = track_name.format(number=number)
+            zip_ref.writestr(name, track_data, compress_type=compression(name))
+        for name in images:
+            zip_ref.writestr(name, name.rsplit(".", 1)[-1].encode(), compress_type=compression(name))
+        for name, data in (members or {}).items():
+            zip_ref.writestr(name, data, compress_type=compression(name))
+    return path
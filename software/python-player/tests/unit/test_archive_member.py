@@ -0,0 +1,135 @@
+"""Unit tests for streaming audio members out of .playt archives."""
+
+from __future__ import annotations
+
+import subprocess
+import zipfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from playt_player.infrastructure.audio.ffmpeg_audio_player import FFmpegAudioPlayer
+from playt_player.infrastructure.cartridge.archive_member import (
+    ffmpeg_input,
+    member_path,
+    open_member,
+    resolve_member,
+    split_member_path,
+)
+from playt_player.infrastructure.cartridge.playt_file_cartridge_reader import (
+    PlaytFileCartridgeReader,
+)
+
+STORED_AUDIO = b"fLaC" + bytes(range(256)) * 8
+DEFLATED_AUDIO = b"RIFF" + b"\x00" * 4096
+
+
+@pytest.fixture
+def playt_file(tmp_path: Path) -> Path:
+    """Create a small .playt archive with stored and deflated members."""
+    path = tmp_path / "album.playt"
+    with zipfile.ZipFile(path, "w") as zip_ref:
+        zip_ref.writestr("Album/cover.jpg", b"jpeg", compress_type=zipfile.ZIP_STORED)
+        zip_ref.writestr(
+            "Album/01 Artist - Album - Intro.flac", STORED_AUDIO, compress_type=zipfile.ZIP_STORED
+        )
+        zip_ref.writestr(
+            "Album/02 Artist - Album - Outro.wav", DEFLATED_AUDIO, compress_type=zipfile.ZIP_DEFLATED
+        )
+        zip_ref.writestr("__MACOSX/Album/._01.flac", b"junk")
+    return path
+
+
+class TestMemberPaths:
+    """Tests for building and parsing member paths."""
+
+    def test_round_trip(self) -> None:
+        """A member path splits back into archive and member name."""
+        path = member_path("/music/album.playt", "Album/01 Intro.flac")
+        assert split_member_path(path) == ("/music/album.playt", "Album/01 Intro.flac")
+
+    def test_regular_paths_are_not_members(self) -> None:
+        """Plain file paths are left alone."""
+        assert split_member_path("/music/01 Intro.flac") is None
+        assert split_member_path("/music/odd!/name.flac") is None
+
+    def test_resolve_stored_member_points_at_raw_bytes(self, playt_file: Path) -> None:
+        """The data offset of a stored member addresses its bytes in the archive."""
+        member = resolve_member(member_path(str(playt_file), "Album/01 Artist - Album - Intro.flac"))
+        assert member is not None
+        assert member.is_stored
+
+        data = playt_file.read_bytes()
+        assert data[member.data_offset : member.data_offset + member.compress_size] == STORED_AUDIO
+
+    def test_resolve_missing_member(self, playt_file: Path) -> None:
+        """Unknown members do not resolve."""
+        assert resolve_member(member_path(str(playt_file), "Album/missing.flac")) is None
+
+    def test_open_deflated_member(self, playt_file: Path) -> None:
+        """Compressed members are decompressed while reading."""
+        member = resolve_member(member_path(str(playt_file), "Album/02 Artist - Album - Outro.wav"))
+        assert member is not None
+        assert not member.is_stored
+        with open_member(member) as stream:
+            assert stream.read() == DEFLATED_AUDIO
+
+    def test_ffmpeg_input(self, playt_file: Path) -> None:
+        """Stored members use the subfile protocol, compressed ones a pipe."""
+        stored = member_path(str(playt_file), "Album/01 Artist - Album - Intro.flac")
+        source, piped = ffmpeg_input(stored)
+        assert source.startswith("subfile,,start,")
+        assert source.endswith(f",,:file:{playt_file}")
+        assert piped is None
+
+        deflated = member_path(str(playt_file), "Album/02 Artist - Album - Outro.wav")
+        source, piped = ffmpeg_input(deflated)
+        assert source == "pipe:0"
+        assert piped is not None
+
+        assert ffmpeg_input("/tmp/song.mp3") == ("/tmp/song.mp3", None)
+
+
+class TestStreamingReader:
+    """Tests for PlaytFileCartridgeReader in streaming mode."""
+
+    def test_songs_reference_archive_members(self, playt_file: Path) -> None:
+        """Streaming mode references members instead of extracting audio."""
+        reader = PlaytFileCartridgeReader(streaming=True)
+        cartridge = reader.read_cartridge(str(playt_file))
+        assert cartridge is not None
+
+        with patch.object(reader, "_get_duration", return_value=12.5):
+            album = reader.load_album_from_cartridge(cartridge)
+
+        assert album is not None
+        assert [song.title for song in album.ordered_songs()] == ["Intro", "Outro"]
+        assert all(split_member_path(song.file_path) for song in album.songs)
+        assert album.songs[0].duration_secs == 12.5
+
+        # Only the cover art was extracted
+        assert album.cover_art_path is not None
+        temp_dir = reader._temp_dirs[cartridge.cid]
+        extracted = [p.name for p in temp_dir.rglob("*") if p.is_file()]
+        assert extracted == ["cover.jpg"]
+
+        reader.cleanup()
+        assert not temp_dir.exists()
+
+
+@patch("playt_player.infrastructure.audio.ffmpeg_audio_player.shutil.which", return_value="/usr/bin/ffplay")
+def test_ffplay_reads_stored_member_in_place(mock_which: MagicMock, playt_file: Path) -> None:
+    """Stored members are handed to ffplay as a byte range of the archive."""
+    dummy_process = MagicMock()
+    dummy_process.poll.return_value = None
+    with patch(
+        "playt_player.infrastructure.audio.ffmpeg_audio_player.subprocess.Popen",
+        return_value=dummy_process,
+    ) as mock_popen:
+        player = FFmpegAudioPlayer()
+        player.play(member_path(str(playt_file), "Album/01 Artist - Album - Intro.flac"))
+
+    cmd = mock_popen.call_args[0][0]
+    assert cmd[-1].startswith("subfile,,start,")
+    assert mock_popen.call_args[1]["stdin"] == subprocess.DEVNULL
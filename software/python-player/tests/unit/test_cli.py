@@ -10,10 +10,11 @@ from playt_player.application.player_service import PlayerService
 from playt_player.domain.entities.album import Album
 from playt_player.domain.entities.cartridge import Cartridge
 from playt_player.domain.entities.song import Song
+from playt_player.domain.interfaces.audio_player import BufferStats
 from playt_player.infrastructure.cartridge.local_file_cartridge_reader import (
     LocalFileCartridgeReader,
 )
-from playt_player.interface.cli.player_cli import PlayerCLI
+from playt_player.interface.cli.player_cli import PlayerCLI, create_cartridge_reader
 
 
 class TestPlayerCLI:
@@ -26,6 +27,7 @@ class TestPlayerCLI:
         player.is_playing.return_value = False
         player.get_state.return_value = "idle"
         player.get_position.return_value = None
+        player.get_buffer_stats.return_value = None
         return player
 
     @pytest.fixture
@@ -87,9 +89,9 @@ class TestPlayerCLI:
             zf.writestr("song1.mp3", b"fake audio data")
 
         # Mock the PlaytFileCartridgeReader to avoid actual file operations
-        # Patch it where it's imported (inside the method)
+        # Patch it where the player CLI looks it up
         with patch(
-            "playt_player.infrastructure.cartridge.playt_file_cartridge_reader.PlaytFileCartridgeReader"
+            "playt_player.interface.cli.player_cli.PlaytFileCartridgeReader"
         ) as mock_reader_class:
             mock_reader = MagicMock()
             mock_reader_class.return_value = mock_reader
@@ -124,6 +126,34 @@ class TestPlayerCLI:
             assert mock_reader.is_cartridge_available.called
             assert mock_reader.read_cartridge.called
 
+    def test_load_playt_file_uses_given_reader(
+        self, player_service: PlayerService, tmp_path: Path
+    ) -> None:
+        """A .playt file is loaded with the reader the CLI was given, not a new one."""
+        playt_file = tmp_path / "test_album.playt"
+        playt_file.write_bytes(b"")
+        mock_reader = MagicMock()
+        mock_reader.is_cartridge_available.return_value = False
+
+        with patch(
+            "playt_player.interface.cli.player_cli.PlaytFileCartridgeReader"
+        ) as mock_reader_class:
+            cli = PlayerCLI(player_service, mock_reader)
+            cli._load_cartridge(str(playt_file))
+
+        mock_reader_class.assert_not_called()
+        mock_reader.is_cartridge_available.assert_called_once_with(str(playt_file))
+
+    def test_create_cartridge_reader_options(self, tmp_path: Path) -> None:
+        """The reader follows the cache and streaming options."""
+        reader = create_cartridge_reader(streaming=True, use_cache=False)
+        assert reader._cache is None and reader._index is None
+        assert reader._streaming
+
+        reader = create_cartridge_reader(cache_dir=tmp_path / "cache", cache_size_mb=5)
+        assert reader._cache is not None and reader._index is not None
+        assert not reader._streaming
+
     def test_load_cartridge_not_found(
         self, player_service: PlayerService
     ) -> None:
@@ -194,6 +224,24 @@ class TestPlayerCLI:
             call_args = str(mock_info.call_args)
             assert "State:" in call_args or "Song:" in call_args
 
+    def test_show_status_with_buffer_stats(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """Test that status reports the playback buffer counters."""
+        mock_audio_player.get_buffer_stats.return_value = BufferStats(
+            capacity_ms=750,
+            fill_ms=500,
+            underruns=3,
+            decoder_stall_secs=0.25,
+            refill_latency_ms=12,
+            slowest_read_ms=40,
+        )
+        cli = PlayerCLI(player_service)
+        with patch.object(cli._logger, "info") as mock_info:
+            cli._show_status()
+        lines = [str(call.args[0]) for call in mock_info.call_args_list]
+        assert any("500/750 ms" in line and "underruns: 3" in line for line in lines)
+
     def test_show_status_without_song(self, player_service: PlayerService) -> None:
         """Test showing status when no song is loaded."""
         cli = PlayerCLI(player_service)
@@ -219,7 +267,7 @@ class TestPlayerCLI:
 
         # Mock the PlaytFileCartridgeReader
         with patch(
-            "playt_player.infrastructure.cartridge.playt_file_cartridge_reader.PlaytFileCartridgeReader"
+            "playt_player.interface.cli.player_cli.PlaytFileCartridgeReader"
         ) as mock_reader_class:
             mock_reader = MagicMock()
             mock_reader_class.return_value = mock_reader
@@ -0,0 +1,230 @@
+"""Unit tests for the command bus."""
+
+import threading
+import time
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from playt_player.application.command_bus import CommandBus
+from playt_player.application.commands import (
+    Command,
+    NextCommand,
+    PauseCommand,
+    PlayCommand,
+    PrevCommand,
+    SeekCommand,
+    SetVolumeCommand,
+)
+from playt_player.application.player_service import PlayerService
+from playt_player.domain.entities.album import Album
+from playt_player.domain.entities.song import Song
+
+
+class RecordingCommand(Command):
+    """Command recording its name and the thread it ran on."""
+
+    def __init__(self, log: list[tuple[str, int]], name: str) -> None:
+        self._log = log
+        self._name = name
+
+    def execute(self) -> None:
+        self._log.append((self._name, threading.get_ident()))
+
+
+class FailingCommand(Command):
+    """Command that raises."""
+
+    def execute(self) -> None:
+        raise ValueError("boom")
+
+
+class BlockingCommand(Command):
+    """Command that holds the bus until released."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def execute(self) -> None:
+        self.started.set()
+        self.release.wait(2)
+
+
+@pytest.fixture
+def bus():
+    command_bus = CommandBus(coalesce_secs=0)
+    yield command_bus
+    command_bus.close()
+
+
+def make_service(songs: int) -> tuple[PlayerService, MagicMock]:
+    """A player service with a mock audio player and an album of songs."""
+    audio_player = MagicMock()
+    audio_player.get_state.return_value = "playing"
+    service = PlayerService(audio_player)
+    service.load_album(
+        Album(
+            title="Album",
+            artist="Artist",
+            songs=[
+                Song(
+                    title=f"Song {number}",
+                    artist="Artist",
+                    album="Album",
+                    duration_secs=100.0,
+                    file_path=f"/path/to/song{number}.mp3",
+                )
+                for number in range(songs)
+            ],
+        )
+    )
+    return service, audio_player
+
+
+class TestCommandBus:
+    """Tests for CommandBus."""
+
+    def test_runs_commands_in_order_on_one_thread(self, bus: CommandBus) -> None:
+        """Commands run in submission order, on a single thread other than the caller's."""
+        log: list[tuple[str, int]] = []
+        futures = [bus.submit(RecordingCommand(log, str(i))) for i in range(20)]
+        for future in futures:
+            future.result(timeout=2)
+        assert [name for name, _ in log] == [str(i) for i in range(20)]
+        threads = {thread for _, thread in log}
+        assert len(threads) == 1
+        assert threading.get_ident() not in threads
+
+    def test_failures_reach_the_caller(self, bus: CommandBus) -> None:
+        """A command's exception is set on its future and raised by execute."""
+        assert isinstance(bus.submit(FailingCommand()).exception(timeout=2), ValueError)
+        with pytest.raises(ValueError):
+            bus.execute(FailingCommand())
+        bus.join(timeout=2)
+
+    def test_posted_failures_are_logged(
+        self, bus: CommandBus, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """A posted command that fails is logged instead of lost."""
+        bus.post(FailingCommand())
+        bus.join(timeout=2)
+        assert "FailingCommand failed" in caplog.text
+
+    def test_execute_from_the_bus_thread(self, bus: CommandBus) -> None:
+        """A command executing another one on the bus does not wait for itself."""
+        log: list[tuple[str, int]] = []
+
+        class Outer(Command):
+            def execute(self) -> None:
+                bus.execute(RecordingCommand(log, "inner"))
+
+        bus.execute(Outer(), timeout=2)
+        assert [name for name, _ in log] == ["inner"]
+
+    def test_concurrent_callers_are_serialized(self) -> None:
+        """Skips from many threads at once each advance exactly one song."""
+        service, _ = make_service(500)
+        command_bus = CommandBus(service)
+        command_bus.execute(PlayCommand(service))
+
+        def skip() -> None:
+            for _ in range(50):
+                command_bus.submit(NextCommand(service))
+
+        threads = [threading.Thread(target=skip) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        command_bus.join(timeout=5)
+        command_bus.close()
+
+        assert service.get_current_song() == service.get_queue()[400]
+
+    def test_track_end_reports_run_on_the_bus(self) -> None:
+        """End-of-track reports from the audio player are handled on the bus thread."""
+        service, audio_player = make_service(3)
+        command_bus = CommandBus(service)
+        command_bus.execute(PlayCommand(service))
+        report = audio_player.set_track_finished_callback.call_args[0][0]
+        assert report != service.on_track_finished
+
+        handled_on: list[int] = []
+        service.attach(MagicMock(update=lambda *_: handled_on.append(threading.get_ident())))
+        audio_player.get_state.return_value = "idle"
+        report("/path/to/song0.mp3")
+        command_bus.join(timeout=2)
+        command_bus.close()
+
+        assert service.get_current_song() == service.get_queue()[1]
+        assert handled_on and threading.get_ident() not in handled_on
+
+    def test_closed_bus_rejects_commands(self) -> None:
+        """Commands submitted after close fail; posted ones are dropped."""
+        command_bus = CommandBus()
+        log: list[tuple[str, int]] = []
+        future = command_bus.submit(RecordingCommand(log, "before"))
+        command_bus.close()
+        assert future.done() and log
+        with pytest.raises(RuntimeError):
+            command_bus.submit(RecordingCommand(log, "after"))
+        command_bus.post(RecordingCommand(log, "after"))
+        assert len(log) == 1
+
+
+class TestCoalescing:
+    """Tests for merging and throttling bursts of commands."""
+
+    @pytest.fixture
+    def service(self) -> MagicMock:
+        return MagicMock(spec=PlayerService)
+
+    def test_queued_skips_become_one_jump(self, service: MagicMock) -> None:
+        """Skips that queue up behind a busy bus run as one jump, all futures completing."""
+        command_bus = CommandBus(coalesce_secs=0)
+        blocker = BlockingCommand()
+        command_bus.submit(blocker)
+        assert blocker.started.wait(2)
+        futures = [command_bus.submit(NextCommand(service)) for _ in range(10)]
+        futures += [command_bus.submit(PrevCommand(service)) for _ in range(3)]
+        futures += [command_bus.submit(NextCommand(service)) for _ in range(2)]
+        blocker.release.set()
+        command_bus.join(timeout=2)
+        command_bus.close()
+
+        assert all(future.done() for future in futures)
+        assert service.method_calls == [call.next(10), call.previous(3), call.next(2)]
+
+    def test_burst_runs_first_and_latest(self, service: MagicMock) -> None:
+        """A seek burst runs the first seek at once and the latest one after the window."""
+        command_bus = CommandBus(coalesce_secs=0.2)
+        started = time.monotonic()
+        for position in range(1, 11):
+            last = command_bus.submit(SeekCommand(service, float(position)))
+            time.sleep(0.005)
+        # (join would end the window early, like any command queued behind it)
+        last.result(timeout=2)
+        elapsed = time.monotonic() - started
+        command_bus.close()
+
+        assert service.seek.call_args_list == [call(1.0), call(10.0)]
+        assert 0.15 <= elapsed < 1.0
+
+    def test_other_commands_are_not_held_back(self, service: MagicMock) -> None:
+        """A command queued behind a throttled one ends its wait, keeping the order."""
+        command_bus = CommandBus(coalesce_secs=1.0)
+        command_bus.execute(SetVolumeCommand(service, 0.1))
+        started = time.monotonic()
+        command_bus.submit(SetVolumeCommand(service, 0.2))
+        command_bus.submit(SetVolumeCommand(service, 0.3))
+        command_bus.execute(PauseCommand(service), timeout=2)
+        elapsed = time.monotonic() - started
+        command_bus.close()
+
+        assert service.method_calls == [
+            call.set_volume(0.1),
+            call.set_volume(0.3),
+            call.pause(),
+        ]
+        assert elapsed < 0.5
@@ -8,6 +8,7 @@ from playt_player.application.commands.next_command import NextCommand
 from playt_player.application.commands.pause_command import PauseCommand
 from playt_player.application.commands.play_command import PlayCommand
 from playt_player.application.commands.prev_command import PrevCommand
+from playt_player.application.commands.shuffle_command import ShuffleCommand
 from playt_player.application.commands.stop_command import StopCommand
 from playt_player.application.player_service import PlayerService
 
@@ -133,3 +134,12 @@ class TestCommands:
 
 
 
+
+    def test_shuffle_command(self, player_service: PlayerService) -> None:
+        """Test shuffle command toggles shuffle and passes the seed."""
+        ShuffleCommand(player_service, seed=9).execute()
+        order = player_service.get_shuffle()
+        assert order is not None and order.seed == 9
+
+        ShuffleCommand(player_service).execute()
+        assert player_service.get_shuffle() is None
@@ -0,0 +1,94 @@
+"""Unit tests for crossfade mixing."""
+
+import numpy as np
+import pytest
+
+from playt_player.infrastructure.audio.crossfade import Crossfade, TailBuffer
+
+
+class TestCrossfade:
+    """Tests for Crossfade."""
+
+    def test_equal_power_keeps_power_constant(self) -> None:
+        """Squared gains of the two tracks sum to one across the fade."""
+        fade = Crossfade(1000, "equal-power")
+        ones = np.ones((1000, 1), dtype=np.float32)
+        out_gain = fade.mix(ones, np.zeros_like(ones))
+        in_gain = fade.mix(np.zeros_like(ones), ones)
+        np.testing.assert_allclose(out_gain**2 + in_gain**2, 1.0, atol=1e-6)
+
+    def test_linear_keeps_gain_constant(self) -> None:
+        """Identical material passes through a linear fade unchanged."""
+        fade = Crossfade(500, "linear")
+        block = np.full((500, 2), 0.5, dtype=np.float32)
+        np.testing.assert_allclose(fade.mix(block, block), 0.5, atol=1e-6)
+
+    def test_blocks_match_whole_fade(self) -> None:
+        """Mixing block by block with offsets equals mixing in one go."""
+        rng = np.random.default_rng(1)
+        tail = rng.standard_normal((3000, 2)).astype(np.float32)
+        head = rng.standard_normal((3000, 2)).astype(np.float32)
+        fade = Crossfade(3000)
+        whole = fade.mix(tail, head)
+        blocks = np.concatenate(
+            [fade.mix(tail[i : i + 1024], head[i : i + 1024], i) for i in range(0, 3000, 1024)]
+        )
+        np.testing.assert_allclose(blocks, whole, rtol=1e-6)
+
+    def test_custom_curve_and_short_head(self) -> None:
+        """A custom curve is used, and a missing head is treated as silence."""
+        fade = Crossfade(4, lambda progress: progress**2)
+        tail = np.ones((4, 1), dtype=np.float32)
+        head = np.ones((2, 1), dtype=np.float32)
+        mixed = fade.mix(tail, head)
+        progress = (np.arange(4) + 0.5) / 4
+        expected = (1 - progress) ** 2
+        expected[:2] += progress[:2] ** 2
+        np.testing.assert_allclose(mixed[:, 0], expected, rtol=1e-6)
+
+    def test_shortened_fade_spans_whole_overlap(self) -> None:
+        """A fade squeezed into fewer frames still runs from one track to the other."""
+        fade = Crossfade.from_seconds(1.0, 1000, "linear").shortened(10)
+        assert fade.frames == 10
+        ones = np.ones((10, 1), dtype=np.float32)
+        gains = fade.mix(np.zeros_like(ones), ones)[:, 0]
+        assert gains[0] < 0.1 and gains[-1] > 0.9
+
+    def test_unknown_curve(self) -> None:
+        """Unknown curve names are rejected."""
+        with pytest.raises(ValueError):
+            Crossfade(10, "cubic")
+
+
+class TestTailBuffer:
+    """Tests for TailBuffer."""
+
+    def test_releases_whole_blocks_beyond_the_tail(self) -> None:
+        """Blocks are released unchanged once later frames cover the tail."""
+        held = TailBuffer()
+        blocks = [np.full((4, 2), i, dtype=np.float32) for i in range(5)]
+        released: list[np.ndarray] = []
+        for block in blocks:
+            released += held.push(block, 6)
+        assert all(any(block is original for original in blocks) for block in released)
+        assert held.frames >= 6
+        lead, tail = held.take(6)
+        assert tail is not None and len(tail) == 6
+        pieces = released + ([lead] if lead is not None else []) + [tail]
+        assert np.array_equal(np.concatenate(pieces), np.concatenate(blocks))
+        assert held.take(6) == (None, None)
+
+    def test_nothing_held_without_tail(self) -> None:
+        """Keeping 0 frames releases every block as it arrives."""
+        held = TailBuffer()
+        block = np.ones((4, 2), dtype=np.float32)
+        released = held.push(block, 0)
+        assert len(released) == 1 and released[0] is block
+        assert held.frames == 0
+
+    def test_short_track_is_all_tail(self) -> None:
+        """A track shorter than the tail is held back entirely."""
+        held = TailBuffer()
+        assert held.push(np.ones((3, 2), dtype=np.float32), 10) == []
+        lead, tail = held.take(10)
+        assert lead is None and tail is not None and len(tail) == 3
@@ -0,0 +1,152 @@
+"""Unit tests for the persistent extraction cache."""
+
+from __future__ import annotations
+
+import os
+from functools import partial
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from playt_player.infrastructure.cartridge.fingerprint import cartridge_fingerprint
+from playt_player.infrastructure.cartridge.playt_file_cartridge_reader import (
+    PlaytFileCartridgeReader,
+)
+from playt_player.infrastructure.storage import ExtractionCache
+from tests import factories
+from tests.factories import make_wav
+
+# .playt files with silent WAV tracks
+make_playt = partial(
+    factories.make_playt,
+    tracks=2,
+    track_name="Album/{number:02d} Track {number}.wav",
+    track_data=make_wav(),
+    images=(),
+)
+
+
+def fill_entry(cache: ExtractionCache, key: str, size: int, last_used: float) -> None:
+    """Create a complete entry of `size` bytes last used at `last_used`."""
+    entry = cache.open_entry(key)
+    (entry / "data.bin").write_bytes(b"\x00" * size)
+    cache.mark_complete(key)
+    os.utime(entry / ".last_used", (last_used, last_used))
+
+
+class TestFingerprint:
+    """Tests for cartridge content fingerprints."""
+
+    def test_stable_for_same_file(self, tmp_path: Path) -> None:
+        """The same file always has the same fingerprint."""
+        playt_path = make_playt(tmp_path / "album.playt")
+        assert cartridge_fingerprint(playt_path) == cartridge_fingerprint(playt_path)
+
+    def test_changes_with_content(self, tmp_path: Path) -> None:
+        """Rewriting the cartridge with different tracks changes the fingerprint."""
+        playt_path = make_playt(tmp_path / "album.playt", tracks=2)
+        before = cartridge_fingerprint(playt_path)
+        make_playt(playt_path, tracks=3)
+        assert cartridge_fingerprint(playt_path) != before
+
+
+class TestExtractionCache:
+    """Tests for ExtractionCache."""
+
+    def test_lookup_only_finds_complete_entries(self, tmp_path: Path) -> None:
+        """Entries being filled are not returned by lookup."""
+        cache = ExtractionCache(tmp_path)
+        entry = cache.open_entry("abc")
+        assert cache.lookup("abc") is None
+
+        cache.mark_complete("abc")
+        assert cache.lookup("abc") == entry
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """Completing an entry evicts the oldest ones until the cache fits its budget."""
+        cache = ExtractionCache(tmp_path, max_bytes=10_000)
+        fill_entry(cache, "old", 4000, last_used=1000)
+        fill_entry(cache, "mid", 4000, last_used=2000)
+        fill_entry(cache, "new", 4000, last_used=3000)
+
+        assert cache.lookup("old") is None
+        assert cache.lookup("mid") is not None
+        assert cache.total_size() <= 10_000
+
+    def test_pinned_entries_survive_eviction(self, tmp_path: Path) -> None:
+        """Entries in use are never evicted, even when over budget."""
+        cache = ExtractionCache(tmp_path, max_bytes=0)
+        fill_entry(cache, "playing", 1000, last_used=1000)
+        cache.pin("playing")
+        try:
+            assert cache.evict() == []
+        finally:
+            cache.unpin("playing")
+        assert cache.evict() == ["playing"]
+
+    def test_negative_budget_rejected(self, tmp_path: Path) -> None:
+        """A negative byte budget is invalid."""
+        with pytest.raises(ValueError):
+            ExtractionCache(tmp_path, max_bytes=-1)
+
+
+class TestReaderWithCache:
+    """Tests for cartridge loading through the extraction cache."""
+
+    def test_reinsert_reuses_extraction(self, tmp_path: Path) -> None:
+        """A second reader loads the cached extraction without extracting again."""
+        playt_path = make_playt(tmp_path / "Artist - Album.playt")
+        cache = ExtractionCache(tmp_path / "cache")
+
+        first = PlaytFileCartridgeReader(cache=cache)
+        cartridge = first.read_cartridge(str(playt_path))
+        assert cartridge is not None
+        album = first.load_album_from_cartridge(cartridge)
+        assert album is not None
+        source = first.get_track_source(cartridge)
+        assert source is not None and source.wait(timeout=5)
+        first.cleanup()
+        # Cleanup keeps the cached extraction on disk
+        assert Path(album.ordered_songs()[0].file_path).exists()
+
+        second = PlaytFileCartridgeReader(cache=cache)
+        cartridge = second.read_cartridge(str(playt_path))
+        assert cartridge is not None
+        reloaded = second.load_album_from_cartridge(cartridge)
+        assert reloaded is not None
+        # Nothing left to extract
+        assert second.get_track_source(cartridge) is None
+        assert [song.file_path for song in reloaded.ordered_songs()] == [
+            song.file_path for song in album.ordered_songs()
+        ]
+        second.cleanup()
+
+    def test_without_cache_uses_temp_dir(self, tmp_path: Path) -> None:
+        """Without a cache the extraction is deleted on cleanup."""
+        playt_path = make_playt(tmp_path / "Artist - Album.playt")
+        reader = PlaytFileCartridgeReader()
+        cartridge = reader.read_cartridge(str(playt_path))
+        assert cartridge is not None
+        album = reader.load_album_from_cartridge(cartridge)
+        assert album is not None
+
+        track = Path(album.ordered_songs()[0].file_path)
+        assert track.exists()
+        reader.cleanup()
+        assert not track.exists()
+
+    def test_cached_load_picks_first_folder_in_member_order(self, tmp_path: Path) -> None:
+        """With audio in several folders, an extraction uses the first one by name."""
+        extract_dir = tmp_path / "extracted"
+        for folder in ("A Side", "B Side"):
+            (extract_dir / folder).mkdir(parents=True)
+            (extract_dir / folder / "01 Track.wav").write_bytes(make_wav())
+
+        # Directory listings come in no particular order
+        iterdir = Path.iterdir
+        with patch.object(
+            Path, "iterdir", lambda path: iter(sorted(iterdir(path), reverse=True))
+        ):
+            _, content_dir = PlaytFileCartridgeReader()._find_tracks(extract_dir)
+        assert content_dir == extract_dir / "A Side"
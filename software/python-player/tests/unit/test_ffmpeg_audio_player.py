@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import subprocess
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -85,3 +87,181 @@ def test_pause_sends_sigstop_on_posix(mock_which: MagicMock, monkeypatch: pytest
     mock_kill.assert_called_once()
     assert player.get_state() in {"paused", "stopped", "idle"}
 
+
+
+@patch("playt_player.infrastructure.audio.ffmpeg_audio_player.shutil.which", return_value="/usr/bin/ffplay")
+def test_position_ignores_wall_clock_changes(mock_which: MagicMock) -> None:
+    """Ensure the position follows the monotonic clock, not the adjustable wall clock."""
+    module = "playt_player.infrastructure.audio.ffmpeg_audio_player"
+    with patch(f"{module}.subprocess.Popen", return_value=DummyProcess()), patch(
+        f"{module}.time"
+    ) as mock_time:
+        mock_time.monotonic.return_value = 100.0
+        mock_time.time.return_value = 1_000_000.0
+        player = FFmpegAudioPlayer()
+        player.play("/tmp/song.mp3")
+
+        # NTP steps the wall clock back an hour while 2.5 s of audio play
+        mock_time.monotonic.return_value = 102.5
+        mock_time.time.return_value = 1_000_000.0 - 3600
+        assert player.get_position() == pytest.approx(2.5)
+
+
+@patch("playt_player.infrastructure.audio.ffmpeg_audio_player.shutil.which", return_value="/usr/bin/ffplay")
+def test_reports_natural_end_of_track(mock_which: MagicMock) -> None:
+    """Ensure an ffplay process exiting on its own is reported, and a stopped one is not."""
+    finished = threading.Event()
+    running = threading.Event()
+    reported: list[str] = []
+
+    class ExitingProcess(DummyProcess):
+        def wait(self, timeout: float | None = None) -> None:
+            if not self._terminated:
+                running.wait(timeout=2)
+
+    def on_finished(file_path: str) -> None:
+        reported.append(file_path)
+        finished.set()
+
+    module = "playt_player.infrastructure.audio.ffmpeg_audio_player"
+    with patch(f"{module}.subprocess.Popen", side_effect=[ExitingProcess(), ExitingProcess()]):
+        player = FFmpegAudioPlayer()
+        assert player.set_track_finished_callback(on_finished)
+        player.play("/tmp/stopped.mp3")
+        player.stop()
+        player.play("/tmp/song.mp3")
+        running.set()
+
+    assert finished.wait(timeout=2)
+    time.sleep(0.05)
+    assert reported == ["/tmp/song.mp3"]
+
+
+class PooledProcess(DummyProcess):
+    """Pre-spawned process with a pipe for stdin."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stdin = MagicMock()
+
+
+@patch("playt_player.infrastructure.audio.ffmpeg_audio_player.shutil.which", return_value="/usr/bin/ffplay")
+def test_prepare_spawns_processes_waiting_on_stdin(mock_which: MagicMock) -> None:
+    """Ensure prepared files get an ffplay reading from an empty pipe, up to the pool size."""
+    module = "playt_player.infrastructure.audio.ffmpeg_audio_player"
+    with patch(f"{module}.subprocess.Popen", side_effect=lambda *a, **k: PooledProcess()) as popen:
+        player = FFmpegAudioPlayer(pool_size=2)
+        player.prepare(["/tmp/next.mp3", "/tmp/prev.flac", "/tmp/other.mp3"])
+
+    assert popen.call_count == 2
+    for call in popen.call_args_list:
+        assert call.args[0][-1] == "pipe:0"
+        assert call.kwargs["stdin"] == subprocess.PIPE
+
+
+@patch("playt_player.infrastructure.audio.ffmpeg_audio_player.shutil.which", return_value="/usr/bin/ffplay")
+def test_play_uses_prepared_process(mock_which: MagicMock) -> None:
+    """Ensure playing a prepared file feeds its waiting process instead of spawning one."""
+    module = "playt_player.infrastructure.audio.ffmpeg_audio_player"
+    pooled = PooledProcess()
+    with patch(f"{module}.subprocess.Popen", return_value=pooled) as popen, patch(
+        f"{module}.feed_track"
+    ) as feed:
+        player = FFmpegAudioPlayer()
+        player.prepare(["/tmp/next.mp3"])
+        player.play("/tmp/next.mp3")
+
+    popen.assert_called_once()
+    feed.assert_called_once_with("/tmp/next.mp3", pooled.stdin)
+    assert player.is_playing()
+
+
+@patch("playt_player.infrastructure.audio.ffmpeg_audio_player.shutil.which", return_value="/usr/bin/ffplay")
+def test_prepare_drains_unlisted_processes(mock_which: MagicMock) -> None:
+    """Ensure processes for files no longer announced are ended, e.g. on album change."""
+    module = "playt_player.infrastructure.audio.ffmpeg_audio_player"
+    processes = [PooledProcess(), PooledProcess()]
+    with patch(f"{module}.subprocess.Popen", side_effect=processes):
+        player = FFmpegAudioPlayer()
+        player.prepare(["/tmp/a.mp3", "/tmp/b.mp3"])
+        player.prepare([])
+
+    assert all(process._terminated for process in processes)
+    processes[0].stdin.close.assert_called_once()
+
+
+@patch("playt_player.infrastructure.audio.ffmpeg_audio_player.shutil.which", return_value="/usr/bin/ffplay")
+def test_prepare_skips_unpipeable_containers(mock_which: MagicMock) -> None:
+    """Ensure MP4-family files and a pool size of 0 spawn nothing ahead of time."""
+    module = "playt_player.infrastructure.audio.ffmpeg_audio_player"
+    with patch(f"{module}.subprocess.Popen") as popen:
+        FFmpegAudioPlayer().prepare(["/tmp/song.m4a"])
+        FFmpegAudioPlayer(pool_size=0).prepare(["/tmp/song.mp3"])
+    popen.assert_not_called()
+
+
+@patch("playt_player.infrastructure.audio.ffmpeg_audio_player.shutil.which", return_value="/usr/bin/ffplay")
+def test_discarded_processes_are_reaped(mock_which: MagicMock) -> None:
+    """Ensure ended processes are waited on, and killed if they ignore SIGTERM."""
+
+    class StubbornProcess(PooledProcess):
+        def __init__(self) -> None:
+            super().__init__()
+            self.waits: list[float | None] = []
+
+        def wait(self, timeout: float | None = None) -> None:
+            self.waits.append(timeout)
+            if timeout is not None and not self._killed:
+                raise subprocess.TimeoutExpired("ffplay", timeout)
+
+    module = "playt_player.infrastructure.audio.ffmpeg_audio_player"
+    stubborn = StubbornProcess()
+    with patch(f"{module}.subprocess.Popen", return_value=stubborn):
+        player = FFmpegAudioPlayer()
+        player.prepare(["/tmp/a.mp3"])
+        player.prepare([])
+
+    assert stubborn._terminated and stubborn._killed
+    assert stubborn.waits == [FFmpegAudioPlayer.EXIT_TIMEOUT, None]
+
+
+@patch("playt_player.infrastructure.audio.ffmpeg_audio_player.shutil.which", return_value="/usr/bin/ffplay")
+def test_volume_change_refreshes_pool_lazily(mock_which: MagicMock) -> None:
+    """Ensure set_volume spawns nothing; stale processes are replaced on prepare or play."""
+    module = "playt_player.infrastructure.audio.ffmpeg_audio_player"
+    with patch(
+        f"{module}.subprocess.Popen", side_effect=lambda *a, **k: PooledProcess()
+    ) as popen, patch(f"{module}.feed_track"):
+        player = FFmpegAudioPlayer()
+        player.prepare(["/tmp/a.mp3", "/tmp/b.mp3"])
+        old_a, old_b = (process for process, _ in player._pool.values())
+        player.set_volume(0.5)
+        assert popen.call_count == 2
+        assert not old_a._terminated and not old_b._terminated
+
+        # Playing a stale file spawns it at the new volume instead of using the old process
+        player.play("/tmp/a.mp3")
+        assert old_a._terminated
+        assert popen.call_args.args[0][-1] == "/tmp/a.mp3"
+        assert "50" in popen.call_args.args[0]
+
+        # The next prepare replaces only the entry that still has the old volume
+        player.prepare(["/tmp/b.mp3"])
+        assert old_b._terminated
+        assert popen.call_count == 4
+        assert "50" in popen.call_args.args[0]
+
+
+@patch("playt_player.infrastructure.audio.ffmpeg_audio_player.shutil.which", return_value="/usr/bin/ffplay")
+def test_close_ends_pooled_processes(mock_which: MagicMock) -> None:
+    """Ensure close() stops playback and ends every pre-spawned process."""
+    module = "playt_player.infrastructure.audio.ffmpeg_audio_player"
+    processes = [DummyProcess(), PooledProcess(), PooledProcess()]
+    with patch(f"{module}.subprocess.Popen", side_effect=processes):
+        player = FFmpegAudioPlayer()
+        player.play("/tmp/song.mp3")
+        player.prepare(["/tmp/a.mp3", "/tmp/b.mp3"])
+        player.close()
+
+    assert all(process._terminated for process in processes)
+    assert player.get_state() == "stopped"
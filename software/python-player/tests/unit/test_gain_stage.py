@@ -0,0 +1,67 @@
+"""Unit tests for the software gain stage."""
+
+import numpy as np
+import pytest
+
+from playt_player.infrastructure.audio.gain_stage import GainStage
+
+
+def ones(frames: int) -> np.ndarray:
+    """A stereo block of full-scale samples."""
+    return np.ones((frames, 2), dtype=np.float32)
+
+
+class TestGainStage:
+    """Tests for GainStage."""
+
+    def test_unity_passes_blocks_through(self) -> None:
+        """At unity gain blocks are not copied."""
+        block = ones(16)
+        assert GainStage().process(block) is block
+
+    def test_constant_gain(self) -> None:
+        """A settled gain scales every sample."""
+        stage = GainStage(0.25, ramp_frames=64)
+        np.testing.assert_allclose(stage.process(ones(16)), 0.25)
+
+    def test_gain_is_clamped(self) -> None:
+        """Gains outside 0-1 are clamped."""
+        stage = GainStage()
+        stage.set_gain(3.0)
+        assert stage.gain == 1.0
+        stage.set_gain(-1.0)
+        assert stage.gain == 0.0
+
+    def test_ramps_to_new_gain(self) -> None:
+        """A new gain is reached over the ramp without jumps, then held."""
+        stage = GainStage(1.0, ramp_frames=100)
+        stage.set_gain(0.0)
+        out = stage.process(ones(150))[:, 0]
+        assert np.all(np.diff(out) <= 0)
+        assert np.max(np.abs(np.diff(out))) == pytest.approx(0.01, abs=1e-6)
+        assert out[99] == pytest.approx(0.0)
+        np.testing.assert_allclose(out[100:], 0.0)
+
+    def test_ramp_spans_blocks(self) -> None:
+        """A ramp longer than a block continues smoothly into the next block."""
+        stage = GainStage(0.0, ramp_frames=100)
+        stage.set_gain(1.0)
+        out = np.concatenate([stage.process(ones(30)) for _ in range(5)])[:, 0]
+        np.testing.assert_allclose(out[:100], np.arange(1, 101) / 100, atol=1e-6)
+        np.testing.assert_allclose(out[100:], 1.0)
+
+    def test_changed_target_restarts_ramp_from_current_gain(self) -> None:
+        """Changing the gain mid-ramp starts a new ramp from where the old one got to."""
+        stage = GainStage(1.0, ramp_frames=100)
+        stage.set_gain(0.0)
+        first = stage.process(ones(50))[:, 0]
+        stage.set_gain(1.0)
+        second = stage.process(ones(100))[:, 0]
+        assert second[0] == pytest.approx(first[-1] + (1.0 - first[-1]) / 100, abs=1e-6)
+        assert second[-1] == pytest.approx(1.0)
+
+    def test_no_ramp_at_discontinuity(self) -> None:
+        """Blocks that do not continue the previous one get the new gain at once."""
+        stage = GainStage(1.0, ramp_frames=100)
+        stage.set_gain(0.5)
+        np.testing.assert_allclose(stage.process(ones(10), ramp=False), 0.5)
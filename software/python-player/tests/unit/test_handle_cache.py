@@ -0,0 +1,114 @@
+"""Unit tests for the shared cartridge handle cache."""
+
+from __future__ import annotations
+
+import os
+import zipfile
+from collections.abc import Collection
+from pathlib import Path
+from unittest.mock import patch
+
+from playt_player.infrastructure.cartridge.archive_member import member_path, resolve_member
+from playt_player.infrastructure.cartridge.handle_cache import CartridgeHandleCache
+from playt_player.infrastructure.cartridge.playt_file_cartridge_reader import (
+    PlaytFileCartridgeReader,
+)
+from tests import factories
+
+
+def make_playt(path: Path, tracks: int = 3, deflated: Collection[str] = ()) -> Path:
+    """Create a .playt archive with dummy tracks and a slideshow image per track."""
+    images = [f"Album/photo{number}.jpg" for number in range(1, tracks + 1)]
+    return factories.make_playt(path, tracks, images=images, deflated=deflated)
+
+
+class TestCartridgeHandleCache:
+    """Tests for CartridgeHandleCache."""
+
+    def test_same_handle_until_closed(self, tmp_path: Path) -> None:
+        """A cartridge is opened once and shared until it is closed."""
+        playt_path = make_playt(tmp_path / "album.playt")
+        handles = CartridgeHandleCache()
+
+        handle = handles.open(playt_path)
+        assert handles.open(str(playt_path)) is handle
+        assert len(handle.names) == 6
+
+        handles.close(playt_path)
+        assert len(handles) == 0
+        assert handles.open(playt_path) is not handle
+        handles.clear()
+
+    def test_changed_file_is_reopened(self, tmp_path: Path) -> None:
+        """Replacing the file on disk invalidates its handle."""
+        playt_path = make_playt(tmp_path / "album.playt", tracks=2)
+        handles = CartridgeHandleCache()
+        handle = handles.open(playt_path)
+
+        make_playt(playt_path, tracks=4)
+        stat = playt_path.stat()
+        os.utime(playt_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        reopened = handles.open(playt_path)
+        assert reopened is not handle
+        assert len(reopened.names) == 8
+        handles.clear()
+
+    def test_member_offsets_are_remembered(self, tmp_path: Path) -> None:
+        """Member lookups are served from the handle after the first one."""
+        playt_path = make_playt(tmp_path / "album.playt")
+        handles = CartridgeHandleCache()
+        handle = handles.open(playt_path)
+        name = "Album/01 Artist - Album - Song 1.mp3"
+
+        first = handle.member(name)
+        assert first is not None
+        with patch(
+            "playt_player.infrastructure.cartridge.handle_cache.locate_member"
+        ) as locate:
+            assert handle.member(name) == first
+        locate.assert_not_called()
+        assert handle.member("Album/missing.mp3") is None
+        handles.clear()
+
+
+class TestReaderSharesHandles:
+    """Tests for the reader's use of shared handles."""
+
+    def test_central_directory_parsed_once(self, tmp_path: Path) -> None:
+        """Availability check, read, load and member lookups share one parse."""
+        playt_path = make_playt(tmp_path / "album.playt")
+        handles = CartridgeHandleCache()
+        reader = PlaytFileCartridgeReader(streaming=True, handles=handles)
+        with patch(
+            "playt_player.infrastructure.cartridge.handle_cache.zipfile.ZipFile",
+            wraps=zipfile.ZipFile,
+        ) as zip_file:
+            assert reader.is_cartridge_available(str(playt_path))
+            cartridge = reader.read_cartridge(str(playt_path))
+            assert cartridge is not None
+            album = reader.load_album_from_cartridge(cartridge)
+            assert album is not None
+            for song in album.ordered_songs():
+                assert resolve_member(song.file_path, handles) is not None
+            photo = member_path(str(playt_path), "Album/photo1.jpg")
+            assert resolve_member(photo, handles) is not None
+        assert zip_file.call_count == 1
+
+        reader.cleanup()
+        assert len(handles) == 0
+
+    def test_own_handles_leave_global_cache_alone(self, tmp_path: Path) -> None:
+        """A reader with its own handle cache probes tracks without opening global handles."""
+        first_track = factories.TRACK_NAME.format(number=1)
+        playt_path = make_playt(tmp_path / "album.playt", deflated=[first_track])
+        global_handles = CartridgeHandleCache()
+        reader = PlaytFileCartridgeReader(streaming=True, handles=CartridgeHandleCache())
+        with patch(
+            "playt_player.infrastructure.cartridge.handle_cache._handle_cache", global_handles
+        ):
+            cartridge = reader.read_cartridge(str(playt_path))
+            assert cartridge is not None
+            assert reader.load_album_from_cartridge(cartridge) is not None
+            reader.cleanup()
+        assert len(global_handles) == 0
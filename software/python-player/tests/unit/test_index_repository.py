@@ -0,0 +1,149 @@
+"""Unit tests for the SQLite album metadata index."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from playt_player.domain.entities.album import Album
+from playt_player.domain.entities.song import Song
+from playt_player.infrastructure.cartridge.playt_file_cartridge_reader import (
+    PlaytFileCartridgeReader,
+)
+from playt_player.infrastructure.storage import IndexRepository
+from tests.factories import make_playt
+
+
+def make_album() -> Album:
+    """Build an album with two songs."""
+    songs = [
+        Song(
+            title=f"Song {number}",
+            artist="Artist",
+            album="Album",
+            duration_secs=None if number == 2 else 61.5,
+            file_path=f"Album/{number:02d} Song {number}.flac",
+            track_number=number,
+            cover_art_path="Album/cover.jpg",
+            slideshow_images=["Album/photo.jpg"],
+            metadata={"source": "test"},
+        )
+        for number in (1, 2)
+    ]
+    return Album(
+        title="Album",
+        artist="Artist",
+        year=1999,
+        cover_art_path="Album/cover.jpg",
+        slideshow_images=["Album/photo.jpg"],
+        songs=songs,
+    )
+
+
+class TestIndexRepository:
+    """Tests for IndexRepository."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """A saved album loads back with all its fields."""
+        index = IndexRepository(tmp_path / "index.db")
+        album = make_album()
+        index.save_album("abc", album)
+
+        loaded = index.load_album("abc")
+        assert loaded is not None
+        assert (loaded.title, loaded.artist, loaded.year) == ("Album", "Artist", 1999)
+        assert loaded.slideshow_images == ["Album/photo.jpg"]
+        assert [song.file_path for song in loaded.songs] == [
+            song.file_path for song in album.songs
+        ]
+        assert [song.duration_secs for song in loaded.songs] == [61.5, None]
+        assert loaded.songs[0].metadata == {"source": "test"}
+        index.close()
+
+    def test_unknown_and_removed(self, tmp_path: Path) -> None:
+        """Unknown or removed fingerprints are not found."""
+        index = IndexRepository(tmp_path / "index.db")
+        assert index.load_album("missing") is None
+
+        index.save_album("abc", make_album())
+        assert index.has_album("abc")
+        index.remove_album("abc")
+        assert not index.has_album("abc")
+        index.close()
+
+    def test_wal_mode(self, tmp_path: Path) -> None:
+        """The database uses write-ahead logging."""
+        index = IndexRepository(tmp_path / "index.db")
+        index.save_album("abc", make_album())
+        with sqlite3.connect(tmp_path / "index.db") as connection:
+            assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        index.close()
+
+    def test_readers_on_other_threads(self, tmp_path: Path) -> None:
+        """Other threads read through their own connections while one writes."""
+        index = IndexRepository(tmp_path / "index.db")
+        index.save_album("abc", make_album())
+        results: list[bool] = []
+
+        def read() -> None:
+            results.append(index.load_album("abc") is not None)
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        index.save_album("def", make_album())
+        for thread in threads:
+            thread.join()
+        assert results == [True] * 4
+        index.close()
+
+
+class TestReaderWithIndex:
+    """Tests for cartridge loading through the metadata index."""
+
+    def test_known_cartridge_skips_probing(self, tmp_path: Path) -> None:
+        """The second load of a cartridge takes its metadata from the index."""
+        playt_path = make_playt(tmp_path / "album.playt", tracks=2)
+        index = IndexRepository(tmp_path / "index.db")
+
+        first = PlaytFileCartridgeReader(index=index)
+        cartridge = first.read_cartridge(str(playt_path))
+        assert cartridge is not None
+        with patch.object(first, "_probe_durations", return_value=[1.0, 2.0]):
+            album = first.load_album_from_cartridge(cartridge)
+        assert album is not None
+        first.cleanup()
+
+        second = PlaytFileCartridgeReader(index=index)
+        cartridge = second.read_cartridge(str(playt_path))
+        assert cartridge is not None
+        with patch.object(second, "_probe_durations") as probe:
+            reloaded = second.load_album_from_cartridge(cartridge)
+        probe.assert_not_called()
+
+        assert reloaded is not None
+        assert [song.title for song in reloaded.ordered_songs()] == ["Song 1", "Song 2"]
+        assert [song.duration_secs for song in reloaded.ordered_songs()] == [1.0, 2.0]
+        # Paths point into the new extraction, not the old one
+        first_song = reloaded.ordered_songs()[0]
+        assert Path(first_song.file_path).is_file()
+        assert reloaded.cover_art_path is not None and Path(reloaded.cover_art_path).is_file()
+        second.cleanup()
+        index.close()
+
+    def test_streaming_resolves_members(self, tmp_path: Path) -> None:
+        """Indexed albums resolve to archive members in streaming mode."""
+        playt_path = make_playt(tmp_path / "album.playt", tracks=2)
+        index = IndexRepository(tmp_path / "index.db")
+
+        for _ in range(2):
+            reader = PlaytFileCartridgeReader(streaming=True, index=index)
+            cartridge = reader.read_cartridge(str(playt_path))
+            assert cartridge is not None
+            album = reader.load_album_from_cartridge(cartridge)
+            assert album is not None
+            assert "!/Album/01 " in album.ordered_songs()[0].file_path
+            reader.cleanup()
+        index.close()
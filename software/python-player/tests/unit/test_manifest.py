@@ -0,0 +1,169 @@
+"""Unit tests for the playt.json manifest."""
+
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from playt_player.domain.entities.album import Album
+from playt_player.infrastructure.cartridge.archive_member import resolve_member
+from playt_player.infrastructure.cartridge.handle_cache import CartridgeHandleCache
+from playt_player.infrastructure.cartridge.manifest import (
+    MANIFEST_NAME,
+    Manifest,
+    ManifestError,
+    ManifestTrack,
+    dump_manifest,
+    parse_manifest,
+)
+from playt_player.infrastructure.cartridge.playt_file_cartridge_reader import (
+    PlaytFileCartridgeReader,
+)
+from tests import factories
+from tests.factories import DUMMY_AUDIO
+
+TRACKS = ["Album/b-side.mp3", "Album/a-side.mp3"]
+
+
+def make_manifest() -> Manifest:
+    """Build a manifest whose track order differs from the name order."""
+    return Manifest(
+        title="Records",
+        artist="Band",
+        year=2001,
+        cover_art="Album/front.png",
+        slideshow=["Album/photo.png"],
+        tracks=[
+            ManifestTrack(member=TRACKS[0], title="First", duration_secs=12.5),
+            ManifestTrack(member=TRACKS[1], title="Second", artist="Guest", duration_secs=30.0),
+        ],
+    )
+
+
+def make_playt(path: Path, manifest: bytes | None) -> Path:
+    """Create a .playt archive with two tracks, two images and an optional manifest."""
+    members = dict.fromkeys(TRACKS, DUMMY_AUDIO)
+    if manifest is not None:
+        members[MANIFEST_NAME] = manifest
+    return factories.make_playt(
+        path, 0, images=("Album/front.png", "Album/photo.png"), members=members
+    )
+
+
+class TestManifestFormat:
+    """Tests for parsing and writing manifests."""
+
+    def test_round_trip(self) -> None:
+        """A dumped manifest parses back to the same manifest."""
+        manifest = make_manifest()
+        assert parse_manifest(dump_manifest(manifest)) == manifest
+
+    def test_minimal(self) -> None:
+        """Only the track member names are required."""
+        manifest = parse_manifest(b'{"tracks": [{"member": "01.flac"}]}')
+        assert manifest.tracks == [ManifestTrack(member="01.flac")]
+        assert manifest.title is None
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"not json",
+            b"[]",
+            b'{"tracks": []}',
+            b'{"tracks": [{"title": "no member"}]}',
+            b'{"tracks": [{"member": "a.mp3", "duration_secs": "long"}]}',
+            b'{"version": 99, "tracks": [{"member": "a.mp3"}]}',
+        ],
+    )
+    def test_invalid(self, data: bytes) -> None:
+        """Malformed manifests are rejected."""
+        with pytest.raises(ManifestError):
+            parse_manifest(data)
+
+
+class TestReaderWithManifest:
+    """Tests for building albums from a manifest."""
+
+    def load(
+        self, playt_path: Path, streaming: bool = False
+    ) -> tuple[PlaytFileCartridgeReader, Album | None]:
+        """Load a cartridge, failing the test if any heuristic runs."""
+        reader = PlaytFileCartridgeReader(streaming=streaming, handles=CartridgeHandleCache())
+        cartridge = reader.read_cartridge(str(playt_path))
+        assert cartridge is not None
+        with patch.object(reader, "_find_audio_members") as scan, patch.object(
+            reader, "_probe_durations"
+        ) as probe, patch.object(reader, "_find_cover_art") as cover:
+            album = reader.load_album_from_cartridge(cartridge)
+        scan.assert_not_called()
+        probe.assert_not_called()
+        cover.assert_not_called()
+        return reader, album
+
+    def test_album_from_manifest(self, tmp_path: Path) -> None:
+        """Track order, titles, durations and images come from the manifest."""
+        playt_path = make_playt(tmp_path / "album.playt", dump_manifest(make_manifest()))
+        reader, album = self.load(playt_path)
+
+        assert album is not None
+        assert (album.title, album.artist, album.year) == ("Records", "Band", 2001)
+        songs = album.ordered_songs()
+        assert [song.title for song in songs] == ["First", "Second"]
+        assert [song.artist for song in songs] == ["Band", "Guest"]
+        assert [song.duration_secs for song in songs] == [12.5, 30.0]
+        assert Path(songs[0].file_path).is_file()
+        assert album.cover_art_path is not None and Path(album.cover_art_path).is_file()
+        assert [Path(path).name for path in album.slideshow_images] == ["photo.png"]
+        reader.cleanup()
+
+    def test_list_order_wins_over_track_numbers(self, tmp_path: Path) -> None:
+        """Tracks play in manifest order even when numbers restart on every disc."""
+        manifest = Manifest(
+            tracks=[
+                ManifestTrack(member=TRACKS[0], title="Zebra", track_number=1),
+                ManifestTrack(member=TRACKS[1], title="Apple", track_number=1),
+            ]
+        )
+        playt_path = make_playt(tmp_path / "album.playt", dump_manifest(manifest))
+        reader, album = self.load(playt_path)
+
+        assert album is not None
+        songs = album.ordered_songs()
+        assert [song.title for song in songs] == ["Zebra", "Apple"]
+        assert [song.track_number for song in songs] == [1, 2]
+        assert "track_number" not in songs[0].metadata
+        assert songs[1].metadata["track_number"] == 1
+        reader.cleanup()
+
+    def test_streaming_uses_manifest_offsets(self, tmp_path: Path) -> None:
+        """Member offsets from the manifest are trusted when consistent."""
+        with zipfile.ZipFile(make_playt(tmp_path / "probe.playt", None)) as zip_ref:
+            info = zip_ref.getinfo(TRACKS[0])
+            offset = info.header_offset + 30 + len(TRACKS[0])
+        manifest = Manifest(tracks=[ManifestTrack(member=TRACKS[0], data_offset=offset)])
+        playt_path = make_playt(tmp_path / "album.playt", dump_manifest(manifest))
+
+        reader, album = self.load(playt_path, streaming=True)
+        assert album is not None
+        with patch("playt_player.infrastructure.cartridge.handle_cache.locate_member") as locate:
+            member = resolve_member(album.ordered_songs()[0].file_path, reader._handles)
+        locate.assert_not_called()
+        assert member is not None and member.data_offset == offset
+        reader.cleanup()
+
+    def test_broken_manifest_falls_back(self, tmp_path: Path) -> None:
+        """A manifest referencing missing members is ignored."""
+        manifest = Manifest(tracks=[ManifestTrack(member="Album/missing.mp3")])
+        playt_path = make_playt(tmp_path / "Band - Records.playt", dump_manifest(manifest))
+
+        reader = PlaytFileCartridgeReader(handles=CartridgeHandleCache())
+        cartridge = reader.read_cartridge(str(playt_path))
+        assert cartridge is not None
+        with patch.object(reader, "_probe_durations", return_value=[None, None]):
+            album = reader.load_album_from_cartridge(cartridge)
+        assert album is not None
+        assert [song.title for song in album.ordered_songs()] == ["a-side", "b-side"]
+        reader.cleanup()
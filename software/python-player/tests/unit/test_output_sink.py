@@ -0,0 +1,215 @@
+"""Unit tests for the output sinks."""
+
+import csv
+import os
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from playt_player.infrastructure.audio.output_sink import (
+    FFplaySink,
+    NullSink,
+    PacedNullSink,
+    SoundDeviceSink,
+    WavCaptureSink,
+    create_sink,
+    sounddevice,
+)
+from playt_player.infrastructure.parsing.wav_reader import (
+    WAVE_FORMAT_IEEE_FLOAT,
+    read_wav_layout,
+)
+
+
+def ramp(frames: int, start: int = 0) -> np.ndarray:
+    """A stereo block whose samples count frames from start."""
+    values = np.arange(start, start + frames, dtype=np.float32) / 1000
+    return np.stack([values, -values], axis=1)
+
+
+class TestPacedNullSink:
+    """Tests for PacedNullSink."""
+
+    def test_takes_real_time(self) -> None:
+        """Writing a quarter of a second of audio takes a quarter of a second."""
+        sink = PacedNullSink()
+        sink.open(8000, 2)
+        started = time.monotonic()
+        for i in range(10):
+            sink.write(ramp(200, i * 200))
+        elapsed = time.monotonic() - started
+        assert sink.frames_written == 2000
+        assert 0.2 <= elapsed < 0.5
+
+    def test_runs_ahead_by_latency(self) -> None:
+        """Writes return early by the latency, as a device buffer would accept them."""
+        sink = PacedNullSink(latency=1.0)
+        sink.open(8000, 2)
+        started = time.monotonic()
+        sink.write(ramp(4000))
+        assert time.monotonic() - started < 0.2
+        assert sink.latency == 1.0
+
+
+@pytest.fixture
+def ffplay_stdin() -> Iterator[tuple[IO[bytes], IO[bytes]]]:
+    """A real pipe standing in for ffplay's stdin, as (write end, read end)."""
+    read_fd, write_fd = os.pipe()
+    writer, reader = os.fdopen(write_fd, "wb"), os.fdopen(read_fd, "rb")
+    yield writer, reader
+    # Writer first, so a reader blocked on the pipe sees the end of it
+    writer.close()
+    reader.close()
+
+
+class TestFFplaySink:
+    """Tests for FFplaySink."""
+
+    def open_sink(self, stdin: IO[bytes]) -> tuple[FFplaySink, MagicMock]:
+        """Open a sink whose ffplay process writes to the given pipe."""
+        with patch("playt_player.infrastructure.audio.output_sink.subprocess.Popen") as popen:
+            popen.return_value.stdin = stdin
+            sink = FFplaySink(ffplay_path="ffplay")
+            sink.open(8000, 2)
+        return sink, popen
+
+    def test_starts_ffplay_without_buffering(
+        self, ffplay_stdin: tuple[IO[bytes], IO[bytes]]
+    ) -> None:
+        """ffplay is told to play the WAV stream on stdin without probing or buffering it."""
+        sink, popen = self.open_sink(ffplay_stdin[0])
+        args = popen.call_args[0][0]
+        assert args[-2:] == ["-i", "pipe:0"]
+        assert "nobuffer" in args and "wav" in args
+        assert sink.latency == FFplaySink.WRITE_AHEAD + FFplaySink.PLAYER_LATENCY
+
+    def test_writes_are_paced_to_the_write_ahead(
+        self, ffplay_stdin: tuple[IO[bytes], IO[bytes]]
+    ) -> None:
+        """Writes run at most WRITE_AHEAD seconds ahead instead of filling ffplay's queue."""
+        writer, reader = ffplay_stdin
+
+        def drain() -> None:
+            # ffplay reads everything it is given, a second or more ahead
+            while reader.read1(65536):
+                pass
+
+        threading.Thread(target=drain, daemon=True).start()
+        sink, _ = self.open_sink(writer)
+        started = time.monotonic()
+        for i in range(6):
+            sink.write(ramp(400, i * 400))
+        # 300 ms written, of which 100 ms may be ahead of playback
+        assert 0.18 <= time.monotonic() - started < 0.4
+
+    def test_unread_audio_holds_writes_back(
+        self, ffplay_stdin: tuple[IO[bytes], IO[bytes]]
+    ) -> None:
+        """Audio ffplay has not read from the pipe yet is not counted as played."""
+        sink, _ = self.open_sink(ffplay_stdin[0])
+        for i in range(4):
+            sink.write(ramp(400, i * 400))
+        # Long enough for 200 ms of audio to have played, had ffplay read it
+        time.sleep(0.3)
+        started = time.monotonic()
+        sink.write(ramp(400))
+        assert time.monotonic() - started >= 0.1
+
+
+class TestWavCaptureSink:
+    """Tests for WavCaptureSink."""
+
+    def test_records_float_wav(self, tmp_path: Path) -> None:
+        """Everything written ends up in a valid float WAV."""
+        path = tmp_path / "out.wav"
+        sink = WavCaptureSink(path)
+        sink.open(8000, 2)
+        sink.write(ramp(100))
+        sink.write(ramp(50, 100))
+        sink.close()
+
+        with open(path, "rb") as f:
+            layout = read_wav_layout(f)
+            assert layout is not None
+            assert layout.format_tag == WAVE_FORMAT_IEEE_FLOAT
+            assert (layout.sample_rate, layout.channels) == (8000, 2)
+            assert layout.data_size == 150 * 2 * 4
+            f.seek(layout.data_offset)
+            samples = np.frombuffer(f.read(), dtype="<f4").reshape(-1, 2)
+        np.testing.assert_array_equal(samples, ramp(150))
+
+    def test_timestamps_every_block(self, tmp_path: Path) -> None:
+        """The CSV lists each block's first frame, length and write time in order."""
+        sink = WavCaptureSink(tmp_path / "out.wav")
+        sink.open(8000, 2)
+        before = time.monotonic()
+        for frames in (100, 30, 70):
+            sink.write(ramp(frames))
+        sink.close()
+
+        with open(tmp_path / "out.csv", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert [(int(r["frame"]), int(r["frames"])) for r in rows] == [
+            (0, 100),
+            (100, 30),
+            (130, 70),
+        ]
+        times = [float(r["monotonic"]) for r in rows]
+        assert times == sorted(times)
+        assert times[0] >= before - 1e-6
+
+    def test_forwards_blocks(self, tmp_path: Path) -> None:
+        """Blocks are also written to the forwarded sink, which sets the latency."""
+        inner = PacedNullSink(latency=0.25)
+        sink = WavCaptureSink(tmp_path / "out.wav", forward_to=inner)
+        sink.open(8000, 2)
+        sink.write(ramp(80))
+        assert inner.frames_written == 80
+        assert sink.latency == 0.25
+        sink.close()
+        assert inner.sample_rate is None
+
+    def test_write_when_closed_raises(self, tmp_path: Path) -> None:
+        """Writing to a closed sink is an OSError, like a lost device."""
+        with pytest.raises(OSError):
+            WavCaptureSink(tmp_path / "out.wav").write(ramp(10))
+
+
+class TestCreateSink:
+    """Tests for create_sink."""
+
+    def test_by_name(self) -> None:
+        """Null sinks are created by name."""
+        assert type(create_sink("null")) is NullSink
+        assert type(create_sink("paced-null")) is PacedNullSink
+
+    def test_auto_prefers_sounddevice(self) -> None:
+        """The default sink is sounddevice when it is installed and ffplay otherwise."""
+        expected = "SoundDeviceSink" if sounddevice is not None else "FFplaySink"
+        with patch(
+            f"playt_player.infrastructure.audio.output_sink.{expected}"
+        ) as sink_class:
+            assert create_sink() is sink_class.return_value
+
+    def test_capture_wraps_sink(self, tmp_path: Path) -> None:
+        """A capture path wraps the named sink in a WavCaptureSink."""
+        sink = create_sink("null", tmp_path / "out.wav")
+        assert isinstance(sink, WavCaptureSink)
+        assert sink.path == tmp_path / "out.wav"
+
+    def test_unknown_name(self) -> None:
+        """Unknown names are rejected."""
+        with pytest.raises(ValueError):
+            create_sink("speakers")
+
+    @pytest.mark.skipif(sounddevice is not None, reason="sounddevice is installed")
+    def test_sounddevice_missing(self) -> None:
+        """Without the sounddevice package the sink says how to get it."""
+        with pytest.raises(RuntimeError, match="sounddevice"):
+            SoundDeviceSink()
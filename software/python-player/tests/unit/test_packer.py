@@ -0,0 +1,165 @@
+"""Unit tests for the .playt packer."""
+
+from __future__ import annotations
+
+import io
+import json
+import struct
+import zipfile
+from pathlib import Path
+
+from playt_player.infrastructure.authoring import PackOptions, pack_album, pack_albums
+from playt_player.infrastructure.authoring.mp4_faststart import faststart
+from playt_player.infrastructure.cartridge.handle_cache import CartridgeHandle
+from playt_player.infrastructure.cartridge.manifest import MANIFEST_NAME, parse_manifest
+from playt_player.infrastructure.cartridge.playt_file_cartridge_reader import (
+    PlaytFileCartridgeReader,
+)
+from playt_player.infrastructure.parsing.mp4_reader import iter_atoms
+from tests.factories import make_wav
+
+
+def atom(atom_type: bytes, payload: bytes) -> bytes:
+    """Build an MP4 atom."""
+    return struct.pack(">I", 8 + len(payload)) + atom_type + payload
+
+
+def make_m4a_moov_last(chunks: int = 3) -> bytes:
+    """Build an M4A file whose moov (with an stco table) follows the media data."""
+    ftyp = atom(b"ftyp", b"M4A \x00\x00\x00\x00")
+    mdat_offset = len(ftyp)
+    mdat = atom(b"mdat", bytes(range(200)) * chunks)
+    offsets = [mdat_offset + 8 + 200 * index for index in range(chunks)]
+    table = b"".join(struct.pack(">I", offset) for offset in offsets)
+    stco = atom(b"stco", struct.pack(">II", 0, chunks) + table)
+    mvhd = atom(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, 2500) + b"\x00" * 80)
+    trak = atom(b"trak", atom(b"mdia", atom(b"minf", atom(b"stbl", stco))))
+    moov = atom(b"moov", mvhd + trak)
+    return ftyp + mdat + moov
+
+
+def make_album(directory: Path, tracks: int = 2) -> Path:
+    """Create an album directory with tracks and images."""
+    directory.mkdir(parents=True)
+    for number in range(1, tracks + 1):
+        (directory / f"Artist - {number:02d} Song {number}.wav").write_bytes(make_wav(0.5))
+    (directory / "cover.jpg").write_bytes(b"\xff\xd8cover")
+    (directory / "photo.jpg").write_bytes(b"\xff\xd8photo")
+    return directory
+
+
+class TestFaststart:
+    """Tests for moving the moov atom to the front."""
+
+    def test_moves_moov_and_shifts_chunk_offsets(self) -> None:
+        """The rewritten file starts with moov and its offsets still point at the chunks."""
+        original = make_m4a_moov_last()
+        output = io.BytesIO()
+        assert faststart(io.BytesIO(original), output)
+
+        data = output.getvalue()
+        assert len(data) == len(original)
+        stream = io.BytesIO(data)
+        assert [a.atom_type for a in iter_atoms(stream, 0, len(data))] == [
+            b"ftyp",
+            b"moov",
+            b"mdat",
+        ]
+        stco = data.index(b"stco")
+        (count,) = struct.unpack_from(">I", data, stco + 8)
+        for index in range(count):
+            (offset,) = struct.unpack_from(">I", data, stco + 12 + 4 * index)
+            assert data[offset : offset + 200] == bytes(range(200))
+
+    def test_leaves_faststart_files_alone(self) -> None:
+        """A file whose moov already comes first is not rewritten."""
+        original = make_m4a_moov_last()
+        rewritten = io.BytesIO()
+        faststart(io.BytesIO(original), rewritten)
+
+        output = io.BytesIO()
+        assert not faststart(io.BytesIO(rewritten.getvalue()), output)
+        assert output.getvalue() == b""
+
+
+class TestPackAlbum:
+    """Tests for pack_album."""
+
+    def test_writes_manifest_with_durations_and_offsets(self, tmp_path: Path) -> None:
+        """The manifest lists every track with its duration and data offset."""
+        album_dir = make_album(tmp_path / "Album")
+        result = pack_album(album_dir, tmp_path / "out" / "Album.playt")
+        assert result.error is None and result.tracks == 2
+
+        handle = CartridgeHandle(result.output_path)
+        try:
+            manifest = parse_manifest(handle.zip_file.read(MANIFEST_NAME))
+            assert [track.title for track in manifest.tracks] == ["Song 1", "Song 2"]
+            assert manifest.artist == "Artist"
+            assert manifest.cover_art == "Album/cover.jpg"
+            assert manifest.slideshow == ["Album/photo.jpg"]
+            for track in manifest.tracks:
+                assert track.duration_secs is not None
+                assert abs(track.duration_secs - 0.5) < 0.01
+                member = handle.member(track.member)
+                assert member is not None and member.data_offset == track.data_offset
+        finally:
+            handle.close()
+
+    def test_stores_and_aligns_compressed_members(self, tmp_path: Path) -> None:
+        """Compressed formats are stored with page-aligned data; WAV is deflated."""
+        album_dir = make_album(tmp_path / "Album")
+        (album_dir / "Artist - 03 Song 3.m4a").write_bytes(make_m4a_moov_last())
+        result = pack_album(album_dir, tmp_path / "Album.playt", PackOptions(alignment=4096))
+        assert result.error is None
+
+        handle = CartridgeHandle(result.output_path)
+        try:
+            for name in ("Album/Artist - 03 Song 3.m4a", "Album/cover.jpg", "Album/photo.jpg"):
+                info = handle.getinfo(name)
+                member = handle.member(name)
+                assert info is not None and info.compress_type == zipfile.ZIP_STORED
+                assert member is not None and member.data_offset % 4096 == 0
+                # Padding is only written to the local header
+                assert info.extra == b""
+            wav = handle.getinfo("Album/Artist - 01 Song 1.wav")
+            assert wav is not None and wav.compress_type == zipfile.ZIP_DEFLATED
+
+            m4a = handle.zip_file.read("Album/Artist - 03 Song 3.m4a")
+            assert m4a.index(b"moov") < m4a.index(b"mdat")
+            assert handle.zip_file.testzip() is None
+        finally:
+            handle.close()
+
+    def test_reader_loads_packed_album(self, tmp_path: Path) -> None:
+        """A packed cartridge loads from its manifest."""
+        result = pack_album(make_album(tmp_path / "Album"), tmp_path / "Album.playt")
+        reader = PlaytFileCartridgeReader()
+        try:
+            cartridge = reader.read_cartridge(str(result.output_path))
+            assert cartridge is not None
+            album = reader.load_album_from_cartridge(cartridge)
+            assert album is not None
+            assert [song.title for song in album.ordered_songs()] == ["Song 1", "Song 2"]
+            assert all(song.duration_secs for song in album.ordered_songs())
+        finally:
+            reader.cleanup()
+
+    def test_empty_directory_fails(self, tmp_path: Path) -> None:
+        """A directory without audio is reported and nothing is written."""
+        (tmp_path / "Empty").mkdir()
+        result = pack_album(tmp_path / "Empty", tmp_path / "Empty.playt")
+        assert result.error is not None
+        assert not (tmp_path / "Empty.playt").exists()
+
+    def test_pack_albums_in_parallel(self, tmp_path: Path) -> None:
+        """Several albums are packed on a process pool, results in job order."""
+        jobs = [
+            (make_album(tmp_path / name), tmp_path / "out" / f"{name}.playt")
+            for name in ("First", "Second")
+        ]
+        results = pack_albums(jobs, PackOptions(thumbnail_size=None), workers=2)
+        assert [result.output_path for result in results] == [output for _, output in jobs]
+        assert all(result.error is None for result in results)
+        manifest = json.loads(zipfile.ZipFile(jobs[1][1]).read(MANIFEST_NAME))
+        assert manifest["tracks"][0]["member"] == "Second/Artist - 01 Song 1.wav"
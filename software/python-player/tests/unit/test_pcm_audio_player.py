@@ -0,0 +1,637 @@
+"""Unit tests for the in-process PCM playback engine."""
+
+from __future__ import annotations
+
+import io
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Callable, Optional
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from playt_player.infrastructure.audio.crossfade import Crossfade
+from playt_player.infrastructure.audio.output_sink import NullSink, OutputSink, PacedNullSink
+from playt_player.infrastructure.audio.pcm_audio_player import PcmAudioPlayer
+from playt_player.infrastructure.audio.pcm_decoder import (
+    FFmpegDecoder,
+    PcmDecoder,
+    WavDecoder,
+    open_decoder,
+)
+from playt_player.infrastructure.audio.seek_index_cache import SeekIndexCache
+from playt_player.infrastructure.cartridge.archive_member import member_path
+from playt_player.infrastructure.cartridge.handle_cache import CartridgeHandleCache
+from tests import factories
+
+
+class ConstantDecoder(PcmDecoder):
+    """Decoder yielding blocks of a constant value (endless if frames is None)."""
+
+    def __init__(self, value: float = 0.5, frames: Optional[int] = 8192) -> None:
+        self.value = value
+        self.remaining = frames
+        self.closed = False
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        if self.closed or self.remaining == 0:
+            return None
+        count = frames if self.remaining is None else min(frames, self.remaining)
+        if self.remaining is not None:
+            self.remaining -= count
+        return np.full((count, 2), self.value, dtype=np.float32)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class GatedDecoder(PcmDecoder):
+    """Holds back the end of a track until the test releases it."""
+
+    def __init__(self, inner: PcmDecoder, gate: threading.Event) -> None:
+        self.inner = inner
+        self.gate = gate
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        block = self.inner.read(frames)
+        if block is None:
+            self.gate.wait(timeout=2)
+        return block
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class SeekableDecoder(ConstantDecoder):
+    """Endless decoder recording in-place seeks."""
+
+    def __init__(self) -> None:
+        super().__init__(frames=None)
+        self.seeks: list[float] = []
+
+    def seek(self, position_secs: float) -> bool:
+        self.seeks.append(position_secs)
+        return True
+
+
+class PositionDecoder(PcmDecoder):
+    """Endless decoder whose samples hold their frame number; seeks in place."""
+
+    def __init__(self, sample_rate: int) -> None:
+        self.sample_rate = sample_rate
+        self.frame = 0
+        self.lock = threading.Lock()
+        # Set to make the next read wait for it, after setting reading
+        self.gate: Optional[threading.Event] = None
+        self.reading = threading.Event()
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        gate, self.gate = self.gate, None
+        if gate is not None:
+            self.reading.set()
+            gate.wait(timeout=2)
+        with self.lock:
+            block = np.arange(self.frame, self.frame + frames, dtype=np.float32)
+            self.frame += frames
+        return np.repeat(block[:, None], 2, axis=1)
+
+    def seek(self, position_secs: float) -> bool:
+        with self.lock:
+            self.frame = int(position_secs * self.sample_rate)
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class SlowDecoder(ConstantDecoder):
+    """Decoder whose reads take longer than the audio they return after the first few."""
+
+    def __init__(self, delay: float, fast_reads: int = 2) -> None:
+        super().__init__(frames=None)
+        self.delay = delay
+        self.fast_reads = fast_reads
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        if self.fast_reads:
+            self.fast_reads -= 1
+        else:
+            time.sleep(self.delay)
+        return super().read(frames)
+
+
+class RecordingSink(OutputSink):
+    """Sink keeping every block written to it."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.blocks: list[np.ndarray] = []
+        self.delay = delay
+        self.opened = 0
+
+    def open(self, sample_rate: int, channels: int) -> None:
+        self.opened += 1
+
+    def write(self, block: np.ndarray) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+        self.blocks.append(block.copy())
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def frames(self) -> int:
+        return sum(len(block) for block in self.blocks)
+
+
+class StallingSink(RecordingSink):
+    """Sink with a fixed latency that stops accepting writes after a number of blocks."""
+
+    def __init__(self, latency: float, blocks: int) -> None:
+        super().__init__()
+        self._latency = latency
+        self.limit = blocks
+        self.release = threading.Event()
+
+    def write(self, block: np.ndarray) -> None:
+        if len(self.blocks) >= self.limit:
+            self.release.wait(timeout=2)
+        super().write(block)
+
+    @property
+    def latency(self) -> float:
+        return self._latency
+
+
+def wait_until(predicate: Callable[[], bool], timeout: float = 2.0) -> bool:
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+def make_wav(path: Path, sample_rate: int = 8000, width: int = 2) -> Path:
+    """Write a 100-frame mono WAV file whose samples count up from 0."""
+    step = 100 if width == 2 else 1000
+    path.write_bytes(factories.make_wav(100 / sample_rate, sample_rate, width=width, step=step))
+    return path
+
+
+@pytest.fixture
+def decoders() -> list[ConstantDecoder]:
+    """Decoders handed out by the factory, in order."""
+    return []
+
+
+def make_player(
+    decoders: list[ConstantDecoder],
+    sink: Optional[OutputSink] = None,
+    frames: Optional[int] = 8192,
+) -> tuple[PcmAudioPlayer, MagicMock]:
+    """Build a player whose factory hands out ConstantDecoders."""
+
+    def factory(file_path: str, start_secs: float) -> PcmDecoder:
+        decoder = ConstantDecoder(frames=frames)
+        decoders.append(decoder)
+        return decoder
+
+    spy = MagicMock(side_effect=factory)
+    player = PcmAudioPlayer(sink=sink or NullSink(), decoder_factory=spy, sample_rate=8000)
+    return player, spy
+
+
+class TestPcmAudioPlayer:
+    """Tests for PcmAudioPlayer."""
+
+    def test_plays_track_to_the_end(self, decoders: list[ConstantDecoder]) -> None:
+        """Every decoded frame reaches the sink, then the player goes idle."""
+        sink = NullSink()
+        player, _ = make_player(decoders, sink)
+        try:
+            player.play("a.flac")
+            assert wait_until(lambda: player.get_state() == "idle")
+            assert sink.frames_written == 8192
+            assert decoders[0].closed
+        finally:
+            player.close()
+
+    def test_volume_scales_blocks(self, decoders: list[ConstantDecoder]) -> None:
+        """The volume is applied to the PCM instead of restarting playback."""
+        sink = RecordingSink()
+        player, factory = make_player(decoders, sink)
+        try:
+            player.set_volume(0.5)
+            player.play("a.flac")
+            assert wait_until(lambda: player.get_state() == "idle")
+            assert factory.call_count == 1
+            assert all(np.allclose(block, 0.25) for block in sink.blocks)
+        finally:
+            player.close()
+
+    def test_volume_change_ramps_without_restart(self, decoders: list[ConstantDecoder]) -> None:
+        """Changing the volume mid-track ramps the gain; the decoder keeps running."""
+        sink = RecordingSink(delay=0.002)
+        player, factory = make_player(decoders, sink, frames=None)
+        try:
+            player.play("a.flac")
+            assert wait_until(lambda: sink.frames > 0)
+            player.set_volume(0.0)
+            assert wait_until(lambda: len(sink.blocks) > 0 and np.all(sink.blocks[-1] == 0.0))
+            factory.assert_called_once()
+            samples = np.concatenate(sink.blocks)[:, 0]
+            # 40 frames of ramp at 8 kHz: steps of 0.5 / 40
+            assert np.max(np.abs(np.diff(samples))) <= 0.5 / 40 + 1e-6
+        finally:
+            player.close()
+
+    def test_pause_and_resume(self, decoders: list[ConstantDecoder]) -> None:
+        """Pausing stops the output; playing the same file resumes it."""
+        sink = RecordingSink(delay=0.002)
+        player, factory = make_player(decoders, sink, frames=None)
+        try:
+            player.play("a.flac")
+            assert wait_until(lambda: sink.frames > 0)
+            player.pause()
+            assert player.get_state() == "paused"
+            time.sleep(0.02)
+            written = sink.frames
+            time.sleep(0.05)
+            assert sink.frames == written
+
+            player.play("a.flac")
+            assert factory.call_count == 1
+            assert wait_until(lambda: sink.frames > written)
+        finally:
+            player.close()
+
+    def test_seek_swaps_decoder_and_keeps_sink(self, decoders: list[ConstantDecoder]) -> None:
+        """A seek opens a decoder at the new position without reopening the sink."""
+        sink = RecordingSink(delay=0.002)
+        player, factory = make_player(decoders, sink, frames=None)
+        try:
+            player.play("a.flac")
+            player.seek(30.0)
+            factory.assert_called_with("a.flac", 30.0)
+            assert decoders[0].closed
+            position = player.get_position()
+            assert position is not None and position >= 30.0
+            assert sink.opened == 1
+        finally:
+            player.close()
+
+    def test_position_follows_frames_written_less_latency(
+        self, decoders: list[ConstantDecoder]
+    ) -> None:
+        """The position counts frames handed to the sink, not wall-clock time."""
+        sink = StallingSink(latency=0.25, blocks=2)
+        player, _ = make_player(decoders, sink, frames=None)
+        try:
+            player.play("a.flac")
+            assert wait_until(lambda: sink.frames == 2 * 2048)
+            time.sleep(0.3)
+            anchor = player.get_position_anchor()
+            assert anchor is not None
+            position, timestamp = anchor
+            assert timestamp <= time.monotonic()
+            # Two 256 ms blocks written, at most one more block heard since, 250 ms in flight
+            assert position == pytest.approx(0.512 + 0.256 - 0.25)
+            assert player.get_position() == pytest.approx(position)
+        finally:
+            sink.release.set()
+            player.close()
+
+    def test_position_trails_a_real_time_sink_by_its_latency(
+        self, decoders: list[ConstantDecoder]
+    ) -> None:
+        """Against a sink playing in real time the position follows what has been heard."""
+        sink = PacedNullSink(latency=0.3)
+        player, _ = make_player(decoders, sink, frames=None)
+        try:
+            player.play("a.flac")
+            started = time.monotonic()
+            time.sleep(0.6)
+            position = player.get_position()
+            elapsed = time.monotonic() - started
+            # The sink accepted 300 ms more than it has played; none of that is heard yet
+            assert sink.frames_written / 8000 >= elapsed + 0.2
+            assert position == pytest.approx(elapsed, abs=0.05)
+        finally:
+            player.close()
+
+    def test_reports_finished_tracks(self, tmp_path: Path) -> None:
+        """The end of each file is pushed to the callback, including gapless transitions."""
+        first = str(make_wav(tmp_path / "a.wav"))
+        second = str(make_wav(tmp_path / "b.wav"))
+        finished: list[str] = []
+        gate = threading.Event()
+        player = PcmAudioPlayer(
+            sink=RecordingSink(),
+            decoder_factory=lambda path, start: GatedDecoder(open_decoder(path, 8000, 2), gate),
+            sample_rate=8000,
+        )
+        try:
+            assert player.set_track_finished_callback(finished.append)
+            player.play(first)
+            player.queue_next(second)
+            gate.set()
+            assert wait_until(lambda: finished == [first, second], timeout=5)
+            assert player.get_state() == "idle"
+        finally:
+            player.close()
+
+    def test_buffer_is_sized_in_milliseconds(self) -> None:
+        """The buffer capacity follows buffer_ms and fills up ahead of the output."""
+        sink = StallingSink(latency=0.0, blocks=0)
+        player = PcmAudioPlayer(
+            sink=sink,
+            decoder_factory=lambda path, start: ConstantDecoder(frames=None),
+            sample_rate=8000,
+            block_frames=400,
+            buffer_ms=2000,
+        )
+        try:
+            stats = player.get_buffer_stats()
+            assert stats is not None and stats.capacity_ms == 2000 and stats.fill_ms == 0
+            player.play("a.flac")
+            assert wait_until(lambda: player.get_buffer_stats().fill_ms >= 2000 - 50)
+            assert player.get_buffer_stats().refill_latency_ms >= 0
+        finally:
+            sink.release.set()
+            player.close()
+
+    def test_underruns_are_counted(self) -> None:
+        """A decoder slower than real time shows up as underruns and stall time."""
+        player = PcmAudioPlayer(
+            sink=RecordingSink(delay=0.01),
+            decoder_factory=lambda path, start: SlowDecoder(delay=0.05),
+            sample_rate=8000,
+            block_frames=80,
+        )
+        try:
+            player.play("a.flac")
+            assert wait_until(lambda: player.get_buffer_stats().underruns >= 2)
+            stats = player.get_buffer_stats()
+            assert stats.decoder_stall_secs > 0
+            assert stats.slowest_read_ms >= 50
+        finally:
+            player.close()
+
+    def test_stop_releases_decoder(self, decoders: list[ConstantDecoder]) -> None:
+        """Stopping closes the decoder and clears the position."""
+        player, _ = make_player(decoders, RecordingSink(delay=0.002), frames=None)
+        try:
+            player.play("a.flac")
+            player.stop()
+            assert decoders[0].closed
+            assert player.get_state() == "stopped"
+            assert player.get_position() is None
+        finally:
+            player.close()
+
+
+    def test_gapless_splice_is_sample_accurate(self, tmp_path: Path) -> None:
+        """The queued track's first sample directly follows the current track's last."""
+        first = str(make_wav(tmp_path / "a.wav"))
+        second = str(make_wav(tmp_path / "b.wav", width=3))
+        gate = threading.Event()
+
+        def factory(file_path: str, start_secs: float) -> PcmDecoder:
+            decoder = open_decoder(file_path, 8000, 2, start_secs)
+            return GatedDecoder(decoder, gate) if file_path == first else decoder
+
+        sink = RecordingSink()
+        player = PcmAudioPlayer(
+            sink=sink, decoder_factory=factory, sample_rate=8000, block_frames=64
+        )
+        try:
+            player.play(first)
+            player.queue_next(second)
+            gate.set()
+            assert wait_until(lambda: player.get_state() == "idle")
+        finally:
+            player.close()
+
+        expected = [open_decoder(path, 8000, 2).read(1000) for path in (first, second)]
+        assert all(block is not None for block in expected)
+        assert np.array_equal(np.concatenate(sink.blocks), np.concatenate(expected))
+
+    def test_queued_track_becomes_current(self) -> None:
+        """After the splice the player reports the queued file, without a new decoder."""
+        gate = threading.Event()
+        factory = MagicMock(
+            side_effect=[
+                GatedDecoder(ConstantDecoder(frames=4096), gate),
+                ConstantDecoder(frames=None),
+            ]
+        )
+        sink = NullSink()
+        player = PcmAudioPlayer(sink=sink, decoder_factory=factory, sample_rate=8000)
+        try:
+            player.play("a.flac")
+            player.queue_next("b.flac")
+            assert player.get_current_file() == "a.flac"
+            gate.set()
+            assert wait_until(lambda: player.get_current_file() == "b.flac")
+            assert player.get_state() == "playing"
+            assert sink.frames_written >= 4096
+            assert factory.call_count == 2
+        finally:
+            player.close()
+
+    def test_crossfade_overlaps_tracks(self) -> None:
+        """With a crossfade the tail of one track is mixed with the head of the next."""
+        gate = threading.Event()
+        factory = MagicMock(
+            side_effect=[
+                GatedDecoder(ConstantDecoder(value=1.0, frames=5000), gate),
+                ConstantDecoder(value=0.5, frames=3000),
+            ]
+        )
+        sink = RecordingSink()
+        player = PcmAudioPlayer(
+            sink=sink,
+            decoder_factory=factory,
+            sample_rate=8000,
+            block_frames=512,
+            crossfade=Crossfade(1000, "linear"),
+        )
+        try:
+            player.play("a.flac")
+            player.queue_next("b.flac")
+            gate.set()
+            assert wait_until(lambda: player.get_state() == "idle")
+        finally:
+            player.close()
+
+        output = np.concatenate(sink.blocks)[:, 0]
+        assert len(output) == 5000 + 3000 - 1000
+        np.testing.assert_allclose(output[:4000], 1.0)
+        progress = (np.arange(1000) + 0.5) / 1000
+        np.testing.assert_allclose(output[4000:5000], (1 - progress) + 0.5 * progress, rtol=1e-5)
+        np.testing.assert_allclose(output[5000:], 0.5)
+
+    def test_skipping_to_queued_track_reuses_decoder(
+        self, decoders: list[ConstantDecoder]
+    ) -> None:
+        """Playing the queued file starts the decoder opened for it."""
+        player, factory = make_player(decoders, RecordingSink(delay=0.002), frames=None)
+        try:
+            player.play("a.flac")
+            player.queue_next("b.flac")
+            player.play("b.flac")
+            assert factory.call_count == 2
+            assert decoders[0].closed and not decoders[1].closed
+            assert player.get_current_file() == "b.flac"
+        finally:
+            player.close()
+
+    def test_queued_decoder_is_taken_before_the_swap(
+        self, decoders: list[ConstantDecoder]
+    ) -> None:
+        """The decode thread cannot splice the queued decoder while play() switches to it."""
+        player, _ = make_player(decoders, RecordingSink(delay=0.002), frames=None)
+        open_sink = player._open_sink
+        spliceable: list[bool] = []
+
+        def check_queue() -> None:
+            # Between the decision and the swap; the decode thread splices whatever is queued
+            spliceable.append(player._next is not None)
+            open_sink()
+
+        try:
+            player.play("a.flac")
+            player.queue_next("b.flac")
+            with patch.object(player, "_open_sink", check_queue):
+                player.play("b.flac")
+            assert spliceable == [False]
+            assert not decoders[1].closed
+            assert player.get_current_file() == "b.flac"
+        finally:
+            player.close()
+
+    def test_seek_in_place_keeps_decoder(self) -> None:
+        """A decoder that seeks in place is kept; only the buffer is refilled."""
+        decoder = SeekableDecoder()
+        factory = MagicMock(return_value=decoder)
+        player = PcmAudioPlayer(sink=NullSink(), decoder_factory=factory, sample_rate=8000)
+        try:
+            player.play("a.wav")
+            player.seek(30.0)
+            assert decoder.seeks == [30.0]
+            factory.assert_called_once()
+            position = player.get_position()
+            assert position is not None and position >= 30.0
+        finally:
+            player.close()
+
+
+    def test_seek_during_read_starts_at_target(self) -> None:
+        """An in-place seek landing while a block is read still resumes at its target."""
+        decoder = PositionDecoder(8000)
+        gate = decoder.gate = threading.Event()
+        sink = RecordingSink()
+        player = PcmAudioPlayer(
+            sink=sink, decoder_factory=MagicMock(return_value=decoder), sample_rate=8000
+        )
+        try:
+            player.play("a.wav")
+            assert decoder.reading.wait(2)
+            player.seek(1.0)
+            # The read in flight happens after the seek, at the target
+            gate.set()
+            assert wait_until(lambda: sink.frames > 0 and np.any(np.concatenate(sink.blocks)))
+        finally:
+            player.close()
+
+        played = np.concatenate(sink.blocks)[:, 0]
+        assert played[np.flatnonzero(played)[0]] == 8000
+
+
+class TestDecoders:
+    """Tests for decoder selection and in-process WAV decoding."""
+
+    def test_wav_mono_to_stereo(self, tmp_path: Path) -> None:
+        """16-bit mono WAV at the engine rate is read in process and duplicated."""
+        decoder = open_decoder(str(make_wav(tmp_path / "a.wav")), 8000, 2)
+        assert isinstance(decoder, WavDecoder)
+        block = decoder.read(10)
+        assert block is not None and block.shape == (10, 2)
+        assert block[3, 0] == block[3, 1] == pytest.approx(300 / 32768)
+        decoder.close()
+
+    def test_wav_24_bit_with_start_offset(self, tmp_path: Path) -> None:
+        """24-bit samples are widened and the start position is honoured."""
+        path = make_wav(tmp_path / "a.wav", width=3)
+        decoder = open_decoder(str(path), 8000, 2, start_secs=50 / 8000)
+        block = decoder.read(1000)
+        assert block is not None and len(block) == 50
+        assert block[0, 0] == pytest.approx(50 * 1000 / 2**23)
+        assert decoder.read(10) is None
+        decoder.close()
+
+    def test_other_rates_go_through_ffmpeg(self, tmp_path: Path) -> None:
+        """A WAV at another sample rate is resampled by ffmpeg."""
+        path = make_wav(tmp_path / "a.wav", sample_rate=22050)
+        with patch("playt_player.infrastructure.audio.pcm_decoder.subprocess.Popen") as popen:
+            popen.return_value.stdout = io.BytesIO(b"")
+            decoder = open_decoder(str(path), 44100, 2, ffmpeg_path="/usr/bin/ffmpeg")
+        assert isinstance(decoder, FFmpegDecoder)
+        cmd = popen.call_args[0][0]
+        assert cmd[cmd.index("-ar") + 1] == "44100"
+        assert cmd[cmd.index("-f") + 1] == "f32le"
+
+    def test_ffmpeg_decoder_does_not_seek_in_place(self, tmp_path: Path) -> None:
+        """Compressed tracks get a new ffmpeg process on seek; the running one is kept as is."""
+        path = make_wav(tmp_path / "a.wav", sample_rate=22050)
+        with patch("playt_player.infrastructure.audio.pcm_decoder.subprocess.Popen") as popen:
+            popen.return_value.stdout = io.BytesIO(b"")
+            decoder = open_decoder(str(path), 44100, 2, ffmpeg_path="/usr/bin/ffmpeg")
+            assert not decoder.seek(1.0)
+        popen.assert_called_once()
+
+    def test_archive_member_through_given_handles(self, tmp_path: Path) -> None:
+        """Members are opened through the handle cache passed in, not the global one."""
+        playt_path = tmp_path / "album.playt"
+        with zipfile.ZipFile(playt_path, "w") as archive:
+            archive.write(make_wav(tmp_path / "a.wav"), "Album/a.wav")
+        handles, global_handles = CartridgeHandleCache(), CartridgeHandleCache()
+        with patch(
+            "playt_player.infrastructure.cartridge.handle_cache._handle_cache", global_handles
+        ):
+            decoder = open_decoder(
+                member_path(str(playt_path), "Album/a.wav"), 8000, 2, handles=handles
+            )
+        assert isinstance(decoder, WavDecoder)
+        assert (len(handles), len(global_handles)) == (1, 0)
+        decoder.close()
+        handles.clear()
+
+    def test_wav_seek_in_place(self, tmp_path: Path) -> None:
+        """WAV decoders seek by moving the read position."""
+        decoder = open_decoder(str(make_wav(tmp_path / "a.wav")), 8000, 2)
+        assert decoder.seek(20 / 8000)
+        block = decoder.read(1)
+        assert block is not None and block[0, 0] == pytest.approx(2000 / 32768)
+        decoder.close()
+
+    def test_seek_index_feeds_ffmpeg_from_offset(self, tmp_path: Path) -> None:
+        """Seeks into indexed tracks demux from the indexed byte offset."""
+        path = tmp_path / "a.mp3"
+        path.write_bytes((b"\xff\xfb\x90\x40" + b"\x00" * 413) * 200)
+        with patch("playt_player.infrastructure.audio.pcm_decoder.subprocess.Popen") as popen:
+            popen.return_value.stdin = io.BytesIO()
+            popen.return_value.stdout = io.BytesIO(b"")
+            decoder = open_decoder(
+                str(path), 44100, 2, 2.0, "/usr/bin/ffmpeg", seek_indexes=SeekIndexCache()
+            )
+        cmd = popen.call_args[0][0]
+        assert cmd[cmd.index("-i") - 2 : cmd.index("-i") + 2] == ["-f", "mp3", "-i", "pipe:0"]
+        seek = float(cmd[cmd.index("-ss") + 1])
+        assert 0 <= seek < 0.25
+        decoder.close()
@@ -0,0 +1,114 @@
+"""Unit tests for the PlayQueue entity."""
+
+import random
+
+import pytest
+
+from playt_player.domain.entities.play_queue import PlayQueue
+
+
+class SmallQueue(PlayQueue[int]):
+    """Queue with tiny chunks so a few items exercise splits and merges."""
+
+    CHUNK_SIZE = 4
+
+
+class TestPlayQueue:
+    """Tests for PlayQueue."""
+
+    def test_sequence_basics(self) -> None:
+        """The queue behaves like a read-only list of its items."""
+        queue = SmallQueue(range(10))
+        assert len(queue) == 10
+        assert list(queue) == list(range(10))
+        assert queue[0] == 0 and queue[9] == 9 and queue[-1] == 9
+        assert queue[3:7] == [3, 4, 5, 6]
+        assert queue[::4] == [0, 4, 8]
+        assert 5 in queue
+        assert not PlayQueue()
+
+    def test_out_of_range(self) -> None:
+        """Positions outside the queue raise IndexError."""
+        queue = SmallQueue(range(3))
+        with pytest.raises(IndexError):
+            queue[3]
+        with pytest.raises(IndexError):
+            queue.pop(-4)
+        with pytest.raises(IndexError):
+            PlayQueue().pop()
+
+    def test_matches_list_under_random_edits(self) -> None:
+        """Any mix of edits leaves the same items as the same edits on a list."""
+        rng = random.Random(7)
+        queue = SmallQueue(range(50))
+        expected = list(range(50))
+        for step in range(2000):
+            op = rng.randrange(6)
+            if op == 0:
+                queue.append(step)
+                expected.append(step)
+            elif op == 1:
+                index = rng.randint(-len(expected) - 2, len(expected) + 2)
+                queue.insert(index, step)
+                expected.insert(index, step)
+            elif op == 2 and expected:
+                index = rng.randrange(len(expected))
+                assert queue.pop(index) == expected.pop(index)
+            elif op == 3 and expected:
+                assert queue.pop() == expected.pop()
+            elif op == 4 and expected:
+                source = rng.randrange(len(expected))
+                destination = rng.randrange(len(expected))
+                queue.move(source, destination)
+                expected.insert(destination, expected.pop(source))
+            elif expected:
+                index = rng.randrange(len(expected))
+                assert queue[index] == expected[index]
+        assert list(queue) == expected
+        assert [queue[i] for i in range(len(expected))] == expected
+
+    def test_window(self) -> None:
+        """Windows span chunks and stop at the end of the queue."""
+        queue = SmallQueue(range(20))
+        assert queue.window(3, 7) == list(range(3, 10))
+        assert queue.window(17, 10) == [17, 18, 19]
+        assert queue.window(20, 5) == []
+        assert queue.window(5, 0) == []
+
+    def test_around(self) -> None:
+        """around returns the items near a position and where they start."""
+        queue = SmallQueue(range(20))
+        assert queue.around(10, 2, 3) == (8, [8, 9, 10, 11, 12, 13])
+        assert queue.around(1, 5, 1) == (0, [0, 1, 2])
+        assert queue.around(-1, 5, 1) == (0, [0, 1])
+        assert queue.around(19, 1, 5) == (18, [18, 19])
+        assert PlayQueue().around(0, 5, 5) == (0, [])
+
+    def test_version_counts_changes(self) -> None:
+        """Every change bumps the version; reads do not."""
+        queue = SmallQueue(range(5))
+        versions = [queue.version]
+        queue.append(5)
+        versions.append(queue.version)
+        queue.insert(0, -1)
+        versions.append(queue.version)
+        queue.move(0, 3)
+        versions.append(queue.version)
+        queue.pop()
+        versions.append(queue.version)
+        queue.replace([1, 2])
+        versions.append(queue.version)
+        assert versions == sorted(set(versions))
+
+        queue[0], queue.window(0, 2), list(queue)
+        queue.move(1, 1)
+        assert queue.version == versions[-1]
+
+    def test_library_sized_queue(self) -> None:
+        """A 50k item queue supports edits and windows at any position."""
+        queue = PlayQueue(range(50_000))
+        queue.insert(25_000, -1)
+        queue.move(25_000, 0)
+        assert queue[0] == -1
+        assert queue.pop(0) == -1
+        assert queue.around(40_000, 2, 2) == (39_998, [39_998, 39_999, 40_000, 40_001, 40_002])
@@ -0,0 +1,30 @@
+"""Unit tests for PlaybackSnapshot."""
+
+from playt_player.application.playback_snapshot import PlaybackSnapshot
+from playt_player.domain.entities.song import Song
+
+SONG = Song(
+    title="Song",
+    artist="Artist",
+    album="Album",
+    duration_secs=100.0,
+    file_path="/path/to/song.mp3",
+)
+
+
+class TestPlaybackSnapshot:
+    """Tests for PlaybackSnapshot."""
+
+    def test_position_runs_on_while_playing(self) -> None:
+        """While playing, the position advances from the anchor up to the song's end."""
+        snapshot = PlaybackSnapshot(state="playing", song=SONG, position_anchor=(10.0, 100.0))
+        assert snapshot.position(now=100.0) == 10.0
+        assert snapshot.position(now=104.5) == 14.5
+        assert snapshot.position(now=99.0) == 10.0
+        assert snapshot.position(now=1000.0) == 100.0
+
+    def test_position_holds_while_paused(self) -> None:
+        """Paused, the position stays at the anchor; without one there is none."""
+        snapshot = PlaybackSnapshot(state="paused", song=SONG, position_anchor=(10.0, 100.0))
+        assert snapshot.position(now=200.0) == 10.0
+        assert PlaybackSnapshot().position() is None
@@ -1,9 +1,11 @@
 """Unit tests for PlayerService."""
 
+import dataclasses
 from unittest.mock import MagicMock
 
 import pytest
 
+from playt_player.application.playback_snapshot import PlaybackSnapshot
 from playt_player.application.player_service import PlayerService
 from playt_player.domain.entities.album import Album
 from playt_player.domain.entities.song import Song
@@ -111,6 +113,13 @@ class TestPlayerService:
         observer.update.assert_called_with("track_stopped", song)
         assert player_service.get_current_song() is None
 
+    def test_close_releases_audio_player(self, player_service: PlayerService) -> None:
+        """Test that close stops playback and closes the audio player."""
+        player_service.close()
+
+        player_service._audio_player.stop.assert_called()
+        player_service._audio_player.close.assert_called_once()
+
     def test_next(self, player_service: PlayerService) -> None:
         """Test skipping to next track."""
         song1 = Song(
@@ -174,6 +183,49 @@ class TestPlayerService:
         observer.update.assert_called_with("track_started", song1)
         assert player_service.get_current_song() == song1
 
+    def test_get_position_anchor(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """The position anchor comes from the audio player."""
+        mock_audio_player.get_position_anchor.return_value = (12.5, 1000.0)
+        assert player_service.get_position_anchor() == (12.5, 1000.0)
+
+    def test_state_and_song_come_from_snapshot(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """State and song are read from the snapshot; the position stays live."""
+        song = Song(
+            title="Song",
+            artist="Artist",
+            album="Album",
+            duration_secs=100.0,
+            file_path="/path/to/song.mp3",
+        )
+        player_service.load_album(Album(title="Album", artist="Artist", songs=[song]))
+        mock_audio_player.get_state.return_value = "playing"
+        player_service.play()
+
+        mock_audio_player.reset_mock()
+        assert player_service.get_state() == "playing"
+        assert player_service.get_current_song() == song
+        mock_audio_player.get_state.assert_not_called()
+
+        # An underrun holds the heard position back; the audio player knows
+        mock_audio_player.get_position.return_value = 3.0
+        assert player_service.get_position() == 3.0
+
+    def test_set_volume_notifies_clamped_volume(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """Observers and the snapshot get the volume actually applied."""
+        observer = MagicMock(spec=Observer)
+        player_service.attach(observer)
+
+        player_service.set_volume(1.5)
+
+        observer.update.assert_called_with("volume_changed", 1.0)
+        assert player_service.get_snapshot().volume == 1.0
+
     def test_seek(self, player_service: PlayerService) -> None:
         """Test seeking to a position."""
         song = Song(
@@ -203,3 +255,420 @@ class TestPlayerService:
 
 
 
+
+    def test_next_waits_for_track_source(self, player_service: PlayerService) -> None:
+        """Tracks that are still being materialized are waited for before playing."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in (1, 2)
+        ]
+        album = Album(title="Album", artist="Artist", songs=songs)
+        track_source = MagicMock()
+        player_service.load_album(album, track_source)
+
+        player_service.play()
+        player_service.next()
+
+        # Queuing the following song for gapless playback only polls (timeout 0)
+        waits = [
+            call.args[0]
+            for call in track_source.ensure_ready.call_args_list
+            if call.args[1] == PlayerService.TRACK_READY_TIMEOUT
+        ]
+        assert waits == [
+            "/path/to/song1.mp3",
+            "/path/to/song2.mp3",
+        ]
+        player_service._audio_player.play.assert_called_with("/path/to/song2.mp3")
+
+    def test_unavailable_tracks_are_not_played(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """Songs whose file fails to materialize are skipped; a timed-out wait stops."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in (1, 2, 3)
+        ]
+        track_source = MagicMock()
+        failed = {"/path/to/song2.mp3"}
+        track_source.ensure_ready.side_effect = lambda path, timeout: path not in failed
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs), track_source)
+        observer = MagicMock(spec=Observer)
+        player_service.attach(observer)
+
+        player_service.play()
+        player_service.next()
+        assert player_service.get_current_song() == songs[2]
+        played = [call.args[0] for call in mock_audio_player.play.call_args_list]
+        assert played == ["/path/to/song1.mp3", "/path/to/song3.mp3"]
+        observer.update.assert_any_call("track_unavailable", songs[1])
+
+        failed.add("/path/to/song3.mp3")
+        player_service.previous()
+        assert player_service.get_current_song() is None
+        observer.update.assert_called_with("queue_ended", None)
+
+        # A wait that runs out stops instead of trying every later song
+        failed = {"/path/to/song1.mp3", "/path/to/song2.mp3"}
+        player_service.TRACK_READY_TIMEOUT = 0.0
+        mock_audio_player.play.reset_mock()
+        player_service.play()
+        assert player_service.get_current_song() is None
+        mock_audio_player.play.assert_not_called()
+        observer.update.assert_called_with("track_stopped", songs[0])
+
+    def test_queues_next_song_for_gapless_playback(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """The song after the current one is queued; nothing follows the last song."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in (1, 2)
+        ]
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs))
+
+        player_service.play()
+        mock_audio_player.queue_next.assert_called_with("/path/to/song2.mp3")
+        player_service.next()
+        mock_audio_player.queue_next.assert_called_once()
+
+    def test_follows_gapless_transition(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """When the player moves on to the queued song, the service follows without replaying."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in (1, 2, 3)
+        ]
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs))
+        player_service.play()
+        observer = MagicMock(spec=Observer)
+        player_service.attach(observer)
+
+        mock_audio_player.get_state.return_value = "playing"
+        mock_audio_player.get_current_file.return_value = "/path/to/song2.mp3"
+        player_service.check_playback_status()
+
+        assert player_service.get_current_song() == songs[1]
+        mock_audio_player.play.assert_called_once_with("/path/to/song1.mp3")
+        mock_audio_player.queue_next.assert_called_with("/path/to/song3.mp3")
+        assert observer.update.call_args[0] == ("track_started", songs[1])
+
+    def test_prepares_neighbouring_songs(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """The first song is prepared on load, then the next and previous ones on each play."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in (1, 2, 3)
+        ]
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs))
+        mock_audio_player.prepare.assert_called_with(["/path/to/song1.mp3"])
+
+        player_service.play()
+        mock_audio_player.prepare.assert_called_with(["/path/to/song2.mp3"])
+        player_service.next()
+        mock_audio_player.prepare.assert_called_with(["/path/to/song3.mp3", "/path/to/song1.mp3"])
+
+        player_service.load_album(Album(title="Empty", artist="Artist", songs=[]))
+        mock_audio_player.prepare.assert_called_with([])
+
+    def test_registers_for_track_end_events(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """The service asks the audio player to push the end of each track."""
+        mock_audio_player.set_track_finished_callback.assert_called_once_with(
+            player_service.on_track_finished
+        )
+        assert player_service.track_end_events
+
+    def test_track_finished_advances(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """A finished track starts the next one without anyone polling."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in (1, 2)
+        ]
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs))
+        player_service.play()
+        observer = MagicMock(spec=Observer)
+        player_service.attach(observer)
+
+        mock_audio_player.get_state.return_value = "idle"
+        player_service.on_track_finished("/path/to/song1.mp3")
+
+        assert player_service.get_current_song() == songs[1]
+        mock_audio_player.play.assert_called_with("/path/to/song2.mp3")
+        events = [call.args[0] for call in observer.update.call_args_list]
+        assert events == ["track_finished", "track_started"]
+
+    def test_stale_track_finished_is_ignored(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """The end of a song the user already skipped away from changes nothing."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in (1, 2, 3)
+        ]
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs))
+        player_service.play()
+        player_service.next()
+
+        mock_audio_player.get_state.return_value = "idle"
+        player_service.on_track_finished("/path/to/song1.mp3")
+        assert player_service.get_current_song() == songs[1]
+
+    def test_gapless_can_be_disabled(self, mock_audio_player: MagicMock) -> None:
+        """Without gapless playback nothing is queued on the audio player."""
+        player_service = PlayerService(mock_audio_player, gapless=False)
+        song = Song(
+            title="Song",
+            artist="Artist",
+            album="Album",
+            duration_secs=100.0,
+            file_path="/path/to/song.mp3",
+        )
+        player_service.load_album(Album(title="Album", artist="Artist", songs=[song, song]))
+        player_service.play()
+        mock_audio_player.queue_next.assert_not_called()
+
+    def test_queue_edits_keep_current_song(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """Editing the queue keeps the current song and requeues the one after it."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in (1, 2, 3, 4)
+        ]
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs[:3]))
+        player_service.play()
+        player_service.next()
+        version = player_service.get_queue_version()
+
+        player_service.insert_song(0, songs[3])
+        player_service.move_song(0, 3)
+        assert player_service.get_queue() == songs
+        assert player_service.remove_song(2) == songs[2]
+        mock_audio_player.queue_next.assert_called_with("/path/to/song4.mp3")
+        with pytest.raises(ValueError):
+            player_service.remove_song(1)
+
+        assert player_service.get_queue_window(1, 1) == (0, [songs[0], songs[1], songs[3]])
+        assert player_service.get_queue_version() > version
+        player_service.next()
+        assert player_service.get_current_song() == songs[3]
+
+    def test_shuffle(self, player_service: PlayerService, mock_audio_player: MagicMock) -> None:
+        """Shuffle plays every song once from the current one, reproducibly from its seed."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in range(1, 9)
+        ]
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs))
+        player_service.play()
+        player_service.set_shuffle(True, seed=42)
+        order = player_service.get_shuffle()
+        assert order is not None and order.first == 0
+
+        played = [player_service.get_current_song()]
+        for _ in songs[1:]:
+            player_service.next()
+            played.append(player_service.get_current_song())
+            mock_audio_player.play.assert_called_with(played[-1].file_path)
+        assert played[0] == songs[0]
+        assert sorted(played, key=songs.index) == songs
+        assert played != songs
+
+        player_service.previous()
+        assert player_service.get_current_song() == played[-2]
+        player_service.next()
+        player_service.next()
+        assert player_service.get_current_song() is None
+
+        # The same seed and first song restore the same order
+        player_service.set_shuffle(True, seed=order.seed, first=order.first)
+        player_service.play()
+        replayed = [player_service.get_current_song()]
+        for _ in songs[1:]:
+            player_service.next()
+            replayed.append(player_service.get_current_song())
+        assert replayed == played
+
+        player_service.set_shuffle(False)
+        player_service.previous()
+        assert player_service.get_current_song() == songs[songs.index(played[-1]) - 1]
+
+    def test_skip_several_tracks(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """A jump of several tracks only starts the track landed on."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in range(1, 7)
+        ]
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs))
+        player_service.play()
+        mock_audio_player.play.reset_mock()
+
+        player_service.next(4)
+        assert player_service.get_current_song() == songs[4]
+        mock_audio_player.play.assert_called_once_with("/path/to/song5.mp3")
+        player_service.previous(10)
+        assert player_service.get_current_song() == songs[0]
+        player_service.next(10)
+        assert player_service.get_current_song() is None
+
+    def test_play_starts_at_first_shuffled_song(self, player_service: PlayerService) -> None:
+        """With shuffle on before playback, play starts where the shuffled order does."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in range(1, 7)
+        ]
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs))
+        player_service.set_shuffle(True, seed=1, first=3)
+        player_service.play()
+        assert player_service.get_current_song() == songs[3]
+
+    def test_snapshot_follows_changes(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """Every change publishes a new, immutable snapshot that observers already see."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in range(1, 4)
+        ]
+        initial = player_service.get_snapshot()
+        assert initial == PlaybackSnapshot()
+        seen: list[PlaybackSnapshot] = []
+        observer = MagicMock(spec=Observer)
+        observer.update.side_effect = lambda *_: seen.append(player_service.get_snapshot())
+        player_service.attach(observer)
+
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs))
+        mock_audio_player.get_state.return_value = "playing"
+        mock_audio_player.get_position_anchor.return_value = (2.0, 50.0)
+        player_service.play()
+        snapshot = player_service.get_snapshot()
+        assert seen[-1] is snapshot
+        assert snapshot.state == "playing" and snapshot.song == songs[0]
+        assert snapshot.index == 0 and snapshot.queue_length == 3
+        assert snapshot.position(now=53.0) == 5.0
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.state = "paused"  # type: ignore[misc]
+
+        player_service.set_volume(0.5)
+        player_service.enqueue([songs[0]])
+        assert player_service.get_snapshot().volume == 0.5
+        assert player_service.get_snapshot().queue_length == 4
+
+        mock_audio_player.get_state.return_value = "stopped"
+        player_service.stop()
+        stopped = player_service.get_snapshot()
+        assert stopped.song is None and stopped.position() is None
+        versions = [initial.version] + [s.version for s in seen] + [stopped.version]
+        assert versions == sorted(set(versions))
+        # Reading the snapshot never asks the audio player
+        mock_audio_player.reset_mock()
+        player_service.get_snapshot().position()
+        assert not mock_audio_player.method_calls
+
+    def test_shuffled_first_song_is_prepared_and_shown(
+        self, player_service: PlayerService, mock_audio_player: MagicMock
+    ) -> None:
+        """With shuffle on, the song play() starts is the one prepared and shown before it."""
+        songs = [
+            Song(
+                title=f"Song {number}",
+                artist="Artist",
+                album="Album",
+                duration_secs=100.0,
+                file_path=f"/path/to/song{number}.mp3",
+            )
+            for number in range(8)
+        ]
+        player_service.set_shuffle(True, seed=1)
+        player_service.load_album(Album(title="Album", artist="Artist", songs=songs))
+        order = player_service.get_shuffle()
+        assert order is not None and order.first != 0
+        first = order.first
+        mock_audio_player.prepare.assert_called_with([songs[first].file_path])
+        _, window = player_service.get_queue_window(0, 0)
+        assert window == [songs[first]]
+
+        player_service.set_shuffle(True, seed=2, first=5)
+        mock_audio_player.prepare.assert_called_with(["/path/to/song5.mp3"])
+        player_service.play()
+        mock_audio_player.play.assert_called_with("/path/to/song5.mp3")
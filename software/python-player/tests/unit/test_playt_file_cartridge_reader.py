@@ -0,0 +1,172 @@
+"""Unit tests for the .playt file cartridge reader."""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import IO
+from unittest.mock import patch
+
+import pytest
+
+from playt_player.infrastructure.cartridge.handle_cache import CartridgeHandle
+from playt_player.infrastructure.cartridge.lazy_extraction import LazyExtraction
+from playt_player.infrastructure.cartridge.playt_file_cartridge_reader import (
+    PlaytFileCartridgeReader,
+)
+from tests.factories import make_playt
+
+
+class TestDurationProbing:
+    """Tests for the parallel duration probing stage."""
+
+    def test_probe_results_keep_track_order(self) -> None:
+        """Durations line up with the tracks even when probes finish out of order."""
+        reader = PlaytFileCartridgeReader(probe_workers=4)
+        delays = {"a": 0.05, "b": 0.0, "c": 0.02}
+
+        def fake_duration(file_path: str) -> float:
+            time.sleep(delays[file_path])
+            return delays[file_path]
+
+        with patch.object(reader, "_get_duration", side_effect=fake_duration):
+            assert reader._probe_durations(["a", "b", "c"]) == [0.05, 0.0, 0.02]
+
+    def test_probes_run_concurrently(self) -> None:
+        """Several probes are in flight at the same time."""
+        reader = PlaytFileCartridgeReader(probe_workers=3)
+        barrier = threading.Barrier(3, timeout=2)
+
+        def fake_duration(file_path: str) -> float:
+            # Only passes if all three probes run at once
+            barrier.wait()
+            return 1.0
+
+        with patch.object(reader, "_get_duration", side_effect=fake_duration):
+            assert reader._probe_durations(["a", "b", "c"]) == [1.0, 1.0, 1.0]
+
+    def test_timeout_leaves_duration_unknown(self) -> None:
+        """A probe that exceeds the timeout yields None instead of blocking."""
+        reader = PlaytFileCartridgeReader(probe_timeout=0.5)
+        timeout = subprocess.TimeoutExpired(cmd="ffprobe", timeout=0.5)
+        with patch(
+            "playt_player.infrastructure.cartridge.playt_file_cartridge_reader.subprocess.run",
+            side_effect=timeout,
+        ) as mock_run:
+            assert reader._get_duration("/tmp/song.mp3") is None
+        assert mock_run.call_args[1]["timeout"] == 0.5
+
+    def test_invalid_worker_count(self) -> None:
+        """Worker counts below one are rejected."""
+        with pytest.raises(ValueError):
+            PlaytFileCartridgeReader(probe_workers=0)
+
+    def test_load_album_uses_probed_durations(self, tmp_path: Path) -> None:
+        """Probed durations end up on the songs."""
+        playt_path = make_playt(tmp_path / "album.playt")
+        reader = PlaytFileCartridgeReader(probe_workers=2)
+        cartridge = reader.read_cartridge(str(playt_path))
+        assert cartridge is not None
+
+        with patch.object(reader, "_probe_durations", return_value=[1.0, 2.0, 3.0]) as probe:
+            album = reader.load_album_from_cartridge(cartridge)
+
+        assert album is not None
+        assert probe.call_count == 1
+        assert [song.duration_secs for song in album.ordered_songs()] == [1.0, 2.0, 3.0]
+        reader.cleanup()
+
+
+class TestLazyExtraction:
+    """Tests for extracting tracks in the background."""
+
+    def test_album_ready_before_later_tracks(self, tmp_path: Path) -> None:
+        """The album is returned once the first track exists; later ones follow."""
+        playt_path = make_playt(tmp_path / "album.playt")
+        reader = PlaytFileCartridgeReader(probe_workers=1)
+        cartridge = reader.read_cartridge(str(playt_path))
+        assert cartridge is not None
+
+        gate = threading.Event()
+        run = LazyExtraction._run
+
+        def gated_run(extraction: LazyExtraction) -> None:
+            gate.wait(timeout=5)
+            run(extraction)
+
+        with patch.object(LazyExtraction, "_run", gated_run):
+            album = reader.load_album_from_cartridge(cartridge)
+            assert album is not None
+            first, _, last = (song.file_path for song in album.ordered_songs())
+            assert Path(first).is_file()
+            assert not Path(last).exists()
+            assert album.cover_art_path is not None and Path(album.cover_art_path).is_file()
+
+            source = reader.get_track_source(cartridge)
+            assert source is not None
+            gate.set()
+            assert source.ensure_ready(last, timeout=5)
+        assert Path(last).is_file()
+        reader.cleanup()
+
+    def test_requested_track_jumps_the_queue(self, tmp_path: Path) -> None:
+        """A track waited for before the worker reaches it is extracted next."""
+        playt_path = make_playt(tmp_path / "album.playt")
+        names = [f"Album/{number:02d} Artist - Album - Song {number}.mp3" for number in (1, 2, 3)]
+        handle = CartridgeHandle(playt_path)
+        extraction = LazyExtraction(handle, tmp_path / "out", names)
+        assert not extraction.ensure_ready(str(tmp_path / "out" / names[2]), timeout=0)
+
+        order: list[str] = []
+        extract = LazyExtraction._extract
+
+        def recording_extract(self: LazyExtraction, name: str) -> None:
+            order.append(name)
+            extract(self, name)
+
+        with patch.object(LazyExtraction, "_extract", recording_extract):
+            extraction.start()
+            assert extraction.wait(timeout=5)
+        assert order == [names[2], names[0], names[1]]
+        assert extraction.is_complete()
+        assert not list((tmp_path / "out").rglob("*.part"))
+        handle.close()
+
+    def test_cancel_stops_copy_in_progress(self, tmp_path: Path) -> None:
+        """Cancelling waits for the current chunk only, not the rest of a large track."""
+        playt_path = make_playt(tmp_path / "album.playt", tracks=1, track_data=b"\x00" * 65536)
+        name = "Album/01 Artist - Album - Song 1.mp3"
+        handle = CartridgeHandle(playt_path)
+        extraction = LazyExtraction(handle, tmp_path / "out", [name])
+
+        reading = threading.Event()
+        open_member = handle.open
+
+        def slow_open(member: str) -> IO[bytes]:
+            source = open_member(member)
+            read = source.read
+
+            def slow_read(size: int = -1) -> bytes:
+                reading.set()
+                time.sleep(0.05)
+                return read(size)
+
+            source.read = slow_read  # type: ignore[method-assign]
+            return source
+
+        module = "playt_player.infrastructure.cartridge.lazy_extraction"
+        with patch(f"{module}._COPY_CHUNK_SIZE", 1024), patch.object(handle, "open", slow_open):
+            extraction.start()
+            assert reading.wait(timeout=5)
+            started = time.monotonic()
+            extraction.cancel()
+            # 64 chunks would take over 3 s
+            assert time.monotonic() - started < 1.0
+
+        target = tmp_path / "out" / name
+        assert not extraction.ensure_ready(str(target), timeout=0)
+        assert not target.exists()
+        assert not list((tmp_path / "out").rglob("*.part"))
+        handle.close()
@@ -0,0 +1,52 @@
+"""Unit tests for the PCM ring buffer."""
+
+import numpy as np
+
+from playt_player.infrastructure.audio.ring_buffer import PcmRingBuffer
+
+
+def frames(start: int, count: int) -> np.ndarray:
+    """Stereo frames numbered from start."""
+    column = np.arange(start, start + count, dtype=np.float32).reshape(-1, 1)
+    return np.hstack((column, -column))
+
+
+class TestPcmRingBuffer:
+    """Tests for PcmRingBuffer."""
+
+    def test_write_is_limited_to_free_space(self) -> None:
+        """A write larger than the free space is cut short."""
+        ring = PcmRingBuffer(8, 2)
+        assert ring.write(frames(0, 5)) == 5
+        assert ring.write(frames(5, 5)) == 3
+        assert ring.available == 8 and ring.free == 0
+
+    def test_read_wraps_around(self) -> None:
+        """Frames come out in order across the end of the storage."""
+        ring = PcmRingBuffer(8, 2)
+        out = np.zeros((8, 2), dtype=np.float32)
+        ring.write(frames(0, 6))
+        assert ring.read(out[:4]) == 4
+        ring.write(frames(6, 6))
+        assert ring.read(out) == 8
+        np.testing.assert_array_equal(out, frames(4, 8))
+        assert (ring.read_position, ring.write_position) == (12, 12)
+
+    def test_short_read(self) -> None:
+        """Reading more than is available returns what there is."""
+        ring = PcmRingBuffer(8, 2)
+        ring.write(frames(0, 3))
+        out = np.zeros((8, 2), dtype=np.float32)
+        assert ring.read(out) == 3
+        assert ring.read(out) == 0
+
+    def test_clear(self) -> None:
+        """Clearing drops unread frames and restarts the positions."""
+        ring = PcmRingBuffer(8, 2)
+        ring.write(frames(0, 5))
+        ring.clear()
+        assert ring.available == 0 and ring.write_position == 0
+        ring.write(frames(100, 2))
+        out = np.zeros((2, 2), dtype=np.float32)
+        ring.read(out)
+        np.testing.assert_array_equal(out, frames(100, 2))
@@ -0,0 +1,178 @@
+"""Unit tests for per-track seek indexes."""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from playt_player.infrastructure.audio.seek_index_cache import SeekIndexCache
+from playt_player.infrastructure.parsing.seek_index import (
+    MP3_DECODER_DELAY,
+    OPUS_PREROLL_SECS,
+    SeekIndex,
+    SeekPoint,
+    _crc8,
+    build_seek_index,
+)
+
+
+def streaminfo_block(sample_rate: int = 44100, block_size: int = 4096, last: bool = False) -> bytes:
+    """Build a STREAMINFO metadata block."""
+    packed = (sample_rate << 44) | (1 << 41) | (15 << 36) | (sample_rate * 60)
+    payload = (
+        struct.pack(">HH", block_size, block_size)
+        + b"\x00" * 6
+        + struct.pack(">Q", packed)
+        + b"\x00" * 16
+    )
+    return bytes([0x80 if last else 0x00]) + len(payload).to_bytes(3, "big") + payload
+
+
+def flac_frame(number: int, body: bytes = b"\x11" * 200) -> bytes:
+    """Build a fixed-blocking FLAC frame (4096 samples, 44.1 kHz) with a valid header CRC."""
+    header = b"\xff\xf8\xc9\x18" + bytes([number])
+    return header + bytes([_crc8(header)]) + body
+
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, joint stereo: 417-byte frames
+MP3_HEADER = b"\xff\xfb\x90\x40"
+MP3_FRAME_SIZE = 417
+
+
+def make_lame_mp3(frames: int, delay: int = 576, padding: int = 1000) -> bytes:
+    """Build an MP3 whose first frame is an Info frame with a LAME delay/padding field."""
+    info = bytearray(MP3_HEADER + b"\x00" * (MP3_FRAME_SIZE - 4))
+    info[36:40] = b"Info"
+    lame = 36 + 120
+    info[lame : lame + 4] = b"LAME"
+    info[lame + 21 : lame + 24] = bytes([delay >> 4, ((delay & 0xF) << 4) | (padding >> 8), padding & 0xFF])
+    frame = MP3_HEADER + b"\x00" * (MP3_FRAME_SIZE - 4)
+    return bytes(info) + frame * frames
+
+
+def ogg_page(packet: bytes, granule: int, serial: int = 7) -> bytes:
+    """Build an Ogg page holding a single packet (CRC left empty)."""
+    segments = [255] * (len(packet) // 255) + [len(packet) % 255]
+    header = b"OggS\x00" + struct.pack("<BqIII", 0, granule, serial, 0, 0)
+    return header + bytes([len(segments)]) + bytes(segments) + packet
+
+
+def index_of(data: bytes, extension: str) -> SeekIndex:
+    """Build the index of in-memory data, which must be indexable."""
+    index = build_seek_index(io.BytesIO(data), extension)
+    assert index is not None
+    return index
+
+
+class TestSeekIndexBuilders:
+    """Tests for the per-format index builders."""
+
+    def test_wav_byte_math(self) -> None:
+        """WAV offsets are computed from the frame size."""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(8000)
+            wav.writeframes(b"\x00" * 4 * 8000)
+        index = index_of(buffer.getvalue(), ".wav")
+        assert index.container == "wav"
+        assert index.locate(0.5) == SeekPoint(0.5, 44 + 4000 * 4)
+
+    def test_flac_seektable(self) -> None:
+        """FLAC seek points come from SEEKTABLE, relative to the first frame."""
+        points = struct.pack(">QQH", 44100, 1000, 4096) + struct.pack(">QQH", 88200, 2500, 4096)
+        placeholder = struct.pack(">QQH", 0xFFFFFFFFFFFFFFFF, 0, 0)
+        table = points + placeholder
+        seektable = bytes([0x83]) + len(table).to_bytes(3, "big") + table
+        data = b"fLaC" + streaminfo_block() + seektable
+        first_frame = len(data)
+
+        index = index_of(data + b"\x00" * 4000, ".flac")
+        assert index.header_size == first_frame
+        assert index.timestamped
+        assert index.points == (
+            SeekPoint(0.0, first_frame),
+            SeekPoint(1.0, first_frame + 1000),
+            SeekPoint(2.0, first_frame + 2500),
+        )
+        assert index.locate(1.5) == SeekPoint(1.0, first_frame + 1000)
+
+    def test_flac_frame_scan(self) -> None:
+        """Without a seek table frame headers are walked, skipping false syncs."""
+        header = b"fLaC" + streaminfo_block(last=True)
+        # Frame 1's body contains a valid-looking header for the wrong frame number
+        frames = [flac_frame(0), flac_frame(1, flac_frame(9) + b"\x11" * 100)]
+        frames += [flac_frame(number) for number in range(2, 12)]
+        index = index_of(header + b"".join(frames), ".flac")
+
+        offsets = [len(header) + sum(map(len, frames[:number])) for number in range(12)]
+        frame_secs = 4096 / 44100
+        for point in index.points:
+            number = round(point.position_secs / frame_secs)
+            assert point.byte_offset == offsets[number]
+        # One point per POINT_INTERVAL: frames 0, 3, 6 and 9
+        assert [point.byte_offset for point in index.points] == offsets[::3]
+
+    def test_mp3_frames_with_encoder_delay(self) -> None:
+        """MP3 points skip the Info frame and account for the encoder delay."""
+        index = index_of(make_lame_mp3(200), ".mp3")
+        assert index.points[0] == SeekPoint(0.0, 0)
+        skip = 576 + MP3_DECODER_DELAY
+        for point in index.points[1:]:
+            frame = point.byte_offset // MP3_FRAME_SIZE
+            assert point.position_secs == pytest.approx(((frame - 1) * 1152 - skip) / 44100)
+        assert index.duration_secs == pytest.approx((200 * 1152 - 576 - 1000) / 44100)
+
+    def test_ogg_pages(self) -> None:
+        """Ogg points are audio pages, positioned at the previous page's granule."""
+        head = b"OpusHead" + struct.pack("<BBHIhB", 1, 2, 312, 48000, 0, 0)
+        pages = [ogg_page(head, 0), ogg_page(b"OpusTags" + b"\x00" * 8, 0)]
+        header_size = sum(map(len, pages))
+        pages += [ogg_page(b"\x00" * 100, 312 + 48000 * number) for number in range(1, 4)]
+
+        index = index_of(b"".join(pages), ".opus")
+        assert index.header_size == header_size
+        assert index.preroll_secs == OPUS_PREROLL_SECS
+        assert [point.position_secs for point in index.points] == [0.0, 1.0, 2.0]
+        assert index.points[1].byte_offset == header_size + len(pages[2])
+
+    def test_unsupported(self) -> None:
+        """Formats without a builder and broken files have no index."""
+        assert build_seek_index(io.BytesIO(b"\x00" * 100), ".m4a") is None
+        assert build_seek_index(io.BytesIO(b"garbage"), ".flac") is None
+
+
+class TestSeekIndexCache:
+    """Tests for SeekIndexCache."""
+
+    def test_cached_by_identity(self, tmp_path: Path) -> None:
+        """An index is built once per track content and rebuilt when the file changes."""
+        path = tmp_path / "song.mp3"
+        path.write_bytes(make_lame_mp3(50))
+        cache = SeekIndexCache()
+        first = cache.get(str(path))
+        assert first is not None
+
+        with patch(
+            "playt_player.infrastructure.audio.seek_index_cache.build_seek_index"
+        ) as build:
+            assert cache.get(str(path)) is first
+            build.assert_not_called()
+
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            cache.get(str(path))
+            build.assert_called_once()
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Missing files have no index and are not cached."""
+        cache = SeekIndexCache()
+        assert cache.get(str(tmp_path / "missing.flac")) is None
+        assert len(cache) == 0
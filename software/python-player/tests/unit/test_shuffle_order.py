@@ -0,0 +1,67 @@
+"""Unit tests for the ShuffleOrder service."""
+
+import pytest
+
+from playt_player.domain.services.shuffle_order import ShuffleOrder
+
+
+def order_of(shuffle: ShuffleOrder) -> list[int]:
+    """The queue indexes in the order they are played."""
+    return [shuffle.index_at(position) for position in range(shuffle.length)]
+
+
+class TestShuffleOrder:
+    """Tests for ShuffleOrder."""
+
+    @pytest.mark.parametrize("length", [1, 2, 3, 7, 16, 17, 100, 1000])
+    def test_is_a_permutation(self, length: int) -> None:
+        """Every queue index is played exactly once, and position_of inverts index_at."""
+        shuffle = ShuffleOrder(length, seed=1234)
+        order = order_of(shuffle)
+        assert sorted(order) == list(range(length))
+        assert [shuffle.position_of(index) for index in order] == list(range(length))
+
+    def test_reproducible_from_seed(self) -> None:
+        """The same seed gives the same order; another seed gives another one."""
+        assert order_of(ShuffleOrder(50, seed=7)) == order_of(ShuffleOrder(50, seed=7))
+        assert order_of(ShuffleOrder(50, seed=7)) != order_of(ShuffleOrder(50, seed=8))
+        assert order_of(ShuffleOrder(50, seed=7)) != list(range(50))
+
+    def test_starts_at_first(self) -> None:
+        """The order can start at any index and is restored from seed and first."""
+        shuffle = ShuffleOrder(30, seed=99, first=12)
+        assert shuffle.first == 12
+        assert sorted(order_of(shuffle)) == list(range(30))
+        restored = ShuffleOrder(30, seed=shuffle.seed, first=shuffle.first)
+        assert order_of(restored) == order_of(shuffle)
+
+    def test_next_and_previous(self) -> None:
+        """next_index and previous_index walk the order and stop at its ends."""
+        shuffle = ShuffleOrder(10, seed=3)
+        order = order_of(shuffle)
+        assert [shuffle.next_index(index) for index in order] == order[1:] + [None]
+        assert [shuffle.previous_index(index) for index in order] == [None] + order[:-1]
+
+    def test_huge_queue_is_lazy(self) -> None:
+        """A library-sized queue is shuffled without materializing the order."""
+        shuffle = ShuffleOrder(10_000_000, seed=5, first=123_456)
+        following = shuffle.next_index(123_456)
+        assert following is not None and following != 123_456
+        assert shuffle.previous_index(following) == 123_456
+
+    def test_out_of_range(self) -> None:
+        """Positions and indexes outside the queue are rejected."""
+        shuffle = ShuffleOrder(5, seed=0)
+        with pytest.raises(IndexError):
+            shuffle.index_at(5)
+        with pytest.raises(IndexError):
+            shuffle.position_of(-1)
+        with pytest.raises(IndexError):
+            ShuffleOrder(5, seed=0, first=5)
+        with pytest.raises(ValueError):
+            ShuffleOrder(-1, seed=0)
+
+    def test_repr(self) -> None:
+        """The repr shows the seed and first index, also for an empty queue."""
+        assert repr(ShuffleOrder(5, seed=1, first=2)) == "ShuffleOrder(length=5, seed=1, first=2)"
+        assert repr(ShuffleOrder(0, seed=1)) == "ShuffleOrder(length=0, seed=1, first=None)"
@@ -0,0 +1,157 @@
+"""Unit tests for the pure-Python audio header parsers."""
+
+from __future__ import annotations
+
+import io
+import struct
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from playt_player.infrastructure.cartridge.archive_member import member_path
+from playt_player.infrastructure.cartridge.playt_file_cartridge_reader import (
+    PlaytFileCartridgeReader,
+)
+from playt_player.infrastructure.parsing import StreamInfo, read_stream_info
+from tests.factories import make_wav
+
+
+def make_flac(total_samples: int, sample_rate: int = 96000, channels: int = 2) -> bytes:
+    """Build a FLAC header with only a STREAMINFO block."""
+    packed = (sample_rate << 44) | ((channels - 1) << 41) | ((24 - 1) << 36) | total_samples
+    streaminfo = struct.pack(">HH", 4096, 4096) + b"\x00" * 6 + struct.pack(">Q", packed) + b"\x00" * 16
+    return b"fLaC" + bytes([0x80]) + len(streaminfo).to_bytes(3, "big") + streaminfo
+
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, joint stereo: 417-byte frames
+MP3_HEADER = b"\xff\xfb\x90\x40"
+MP3_FRAME_SIZE = 417
+
+
+def make_cbr_mp3(frames: int) -> bytes:
+    """Build a constant bitrate MP3 with an ID3v2 tag in front."""
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+    frame = MP3_HEADER + b"\x00" * (MP3_FRAME_SIZE - 4)
+    return id3 + frame * frames
+
+
+def make_xing_mp3(frames: int) -> bytes:
+    """Build a VBR MP3 whose first frame is a Xing header claiming `frames` frames."""
+    xing = bytearray(MP3_HEADER + b"\x00" * (MP3_FRAME_SIZE - 4))
+    xing[36:48] = b"Xing" + struct.pack(">II", 0x1, frames)
+    frame = MP3_HEADER + b"\x00" * (MP3_FRAME_SIZE - 4)
+    return bytes(xing) + frame * 4
+
+
+def ogg_page(packet: bytes, granule: int, serial: int = 7, header_type: int = 0) -> bytes:
+    """Build an Ogg page holding a single packet (CRC left empty)."""
+    segments = [255] * (len(packet) // 255) + [len(packet) % 255]
+    header = b"OggS\x00" + struct.pack("<BqIII", header_type, granule, serial, 0, 0)
+    return header + bytes([len(segments)]) + bytes(segments) + packet
+
+
+def make_opus(granule: int, pre_skip: int = 312) -> bytes:
+    """Build an Ogg Opus stream with a head page, a data page and a last page."""
+    head = b"OpusHead" + struct.pack("<BBHIhB", 1, 2, pre_skip, 44100, 0, 0)
+    return (
+        ogg_page(head, 0, header_type=0x2)
+        + ogg_page(b"\x00" * 300, granule // 2)
+        + ogg_page(b"\x00" * 100, granule, header_type=0x4)
+    )
+
+
+def atom(atom_type: bytes, payload: bytes) -> bytes:
+    """Build an MP4 atom."""
+    return struct.pack(">I", 8 + len(payload)) + atom_type + payload
+
+
+def make_m4a(duration: int, timescale: int = 1000, moov_first: bool = False) -> bytes:
+    """Build a minimal M4A file with an mvhd and an audio sample entry."""
+    mvhd = atom(b"mvhd", b"\x00" * 12 + struct.pack(">II", timescale, duration) + b"\x00" * 80)
+    hdlr = atom(b"hdlr", b"\x00" * 8 + b"soun" + b"\x00" * 12)
+    entry = atom(
+        b"mp4a",
+        b"\x00" * 6 + struct.pack(">H", 1) + b"\x00" * 8 + struct.pack(">HHHHI", 2, 16, 0, 0, 48000 << 16),
+    )
+    stsd = atom(b"stsd", struct.pack(">II", 0, 1) + entry)
+    trak = atom(b"trak", atom(b"mdia", hdlr + atom(b"minf", atom(b"stbl", stsd))))
+    moov = atom(b"moov", mvhd + trak)
+    ftyp = atom(b"ftyp", b"M4A \x00\x00\x00\x00")
+    mdat = atom(b"mdat", b"\x00" * 1000)
+    return ftyp + (moov + mdat if moov_first else mdat + moov)
+
+
+def parse(data: bytes, extension: str) -> StreamInfo | None:
+    """Run the parser for `extension` on in-memory data."""
+    return read_stream_info(io.BytesIO(data), extension)
+
+
+class TestHeaderParsers:
+    """Tests for the per-format header parsers."""
+
+    def test_wav(self) -> None:
+        """WAV duration comes from the data chunk size and byte rate."""
+        assert parse(make_wav(1.5, 22050, 1), ".wav") == StreamInfo(1.5, 22050, 1)
+
+    def test_flac(self) -> None:
+        """FLAC duration comes from STREAMINFO."""
+        assert parse(make_flac(96000 * 3, 96000, 2), ".flac") == StreamInfo(3.0, 96000, 2)
+
+    def test_mp3_cbr_estimate(self) -> None:
+        """CBR MP3 duration is estimated from the bitrate after the ID3 tag."""
+        info = parse(make_cbr_mp3(100), ".mp3")
+        assert info is not None
+        assert info.duration_secs == pytest.approx(100 * MP3_FRAME_SIZE * 8 / 128000)
+        assert (info.sample_rate, info.channels) == (44100, 2)
+
+    def test_mp3_xing_frame_count(self) -> None:
+        """VBR MP3 duration comes from the Xing frame count."""
+        info = parse(make_xing_mp3(1000), ".mp3")
+        assert info is not None
+        assert info.duration_secs == pytest.approx(1000 * 1152 / 44100)
+
+    def test_opus_last_granule(self) -> None:
+        """Opus duration is the last granule minus pre-skip at 48 kHz."""
+        info = parse(make_opus(48000 * 2 + 312), ".opus")
+        assert info == StreamInfo(2.0, 48000, 2)
+
+    @pytest.mark.parametrize("moov_first", [True, False])
+    def test_mp4_mvhd(self, moov_first: bool) -> None:
+        """MP4 duration comes from mvhd, wherever moov sits."""
+        info = parse(make_m4a(4500, moov_first=moov_first), ".m4a")
+        assert info == StreamInfo(4.5, 48000, 2)
+
+    def test_unknown_or_invalid(self) -> None:
+        """Unknown extensions and garbage yield None."""
+        assert parse(b"\x00" * 100, ".aac") is None
+        assert parse(b"not a flac file", ".flac") is None
+        assert parse(b"RIFF", ".wav") is None
+
+
+class TestReaderUsesHeaders:
+    """Tests for header-first duration lookup in the cartridge reader."""
+
+    def test_header_avoids_ffprobe(self, tmp_path: Path) -> None:
+        """Known formats never spawn ffprobe, also inside archives."""
+        playt_path = tmp_path / "album.playt"
+        with zipfile.ZipFile(playt_path, "w") as zip_ref:
+            zip_ref.writestr("01 Intro.wav", make_wav(2.0), compress_type=zipfile.ZIP_DEFLATED)
+            zip_ref.writestr("02 Outro.flac", make_flac(96000 * 4), compress_type=zipfile.ZIP_STORED)
+
+        reader = PlaytFileCartridgeReader()
+        with patch.object(reader, "_probe_duration") as probe:
+            assert reader._get_duration(member_path(str(playt_path), "01 Intro.wav")) == 2.0
+            assert reader._get_duration(member_path(str(playt_path), "02 Outro.flac")) == 4.0
+        probe.assert_not_called()
+
+    def test_unknown_format_falls_back_to_ffprobe(self, tmp_path: Path) -> None:
+        """Formats without a header parser are probed with ffprobe."""
+        track = tmp_path / "01 Intro.aac"
+        track.write_bytes(b"\xff\xf1" + b"\x00" * 100)
+
+        reader = PlaytFileCartridgeReader()
+        with patch.object(reader, "_probe_duration", return_value=9.0) as probe:
+            assert reader._get_duration(str(track)) == 9.0
+        probe.assert_called_once_with(str(track))
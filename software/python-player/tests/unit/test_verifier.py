@@ -0,0 +1,114 @@
+"""Unit tests for cartridge integrity verification."""
+
+from __future__ import annotations
+
+import os
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from playt_player.infrastructure.cartridge.verifier import (
+    CartridgeVerifier,
+    find_cartridges,
+    verify_cartridges,
+)
+from playt_player.infrastructure.storage import IndexRepository
+from tests import factories
+
+STORED = "Album/01 Song.mp3"
+DEFLATED = "Album/02 Song.wav"
+
+
+def make_playt(path: Path, tag: bytes = b"") -> Path:
+    """Create a .playt archive with one stored and one deflated member."""
+    members = {STORED: bytes(range(256)) * 64, DEFLATED: b"RIFF" + tag + b"\x01\x02" * 4096}
+    return factories.make_playt(path, 0, images=(), members=members, deflated={DEFLATED})
+
+
+def corrupt(path: Path, member: str) -> None:
+    """Flip a byte in the middle of a member's data."""
+    with zipfile.ZipFile(path) as zip_ref:
+        info = zip_ref.getinfo(member)
+    with open(path, "r+b") as fp:
+        fp.seek(info.header_offset + 26)
+        name_length = int.from_bytes(fp.read(2), "little")
+        extra_length = int.from_bytes(fp.read(2), "little")
+        position = info.header_offset + 30 + name_length + extra_length + info.compress_size // 2
+        fp.seek(position)
+        byte = fp.read(1)
+        fp.seek(position)
+        fp.write(bytes([byte[0] ^ 0xFF]))
+
+
+class TestCartridgeVerifier:
+    """Tests for CartridgeVerifier."""
+
+    def test_intact_cartridge(self, tmp_path: Path) -> None:
+        """Every member of an intact cartridge passes and is hashed."""
+        report = CartridgeVerifier().verify(make_playt(tmp_path / "album.playt"))
+        assert report.ok
+        assert [check.name for check in report.members] == [STORED, DEFLATED]
+        assert all(check.sha256 is not None for check in report.members)
+
+    def test_corrupt_stored_member(self, tmp_path: Path) -> None:
+        """A damaged stored member is reported with a CRC mismatch."""
+        playt_path = make_playt(tmp_path / "album.playt")
+        corrupt(playt_path, STORED)
+
+        report = CartridgeVerifier().verify(playt_path)
+        assert not report.ok
+        assert [check.name for check in report.bad_members] == [STORED]
+        assert "CRC mismatch" in (report.bad_members[0].error or "")
+
+    def test_corrupt_deflated_member(self, tmp_path: Path) -> None:
+        """A damaged compressed member is reported."""
+        playt_path = make_playt(tmp_path / "album.playt")
+        corrupt(playt_path, DEFLATED)
+
+        report = CartridgeVerifier(member_workers=1).verify(playt_path)
+        assert [check.name for check in report.bad_members] == [DEFLATED]
+
+    def test_unreadable_archive(self, tmp_path: Path) -> None:
+        """A file that is not a zip archive is reported as a whole."""
+        playt_path = tmp_path / "broken.playt"
+        playt_path.write_bytes(b"not a zip")
+        report = CartridgeVerifier().verify(playt_path)
+        assert not report.ok and report.error is not None
+
+    def test_results_cached_by_fingerprint(self, tmp_path: Path) -> None:
+        """An unchanged cartridge is verified once; a modified one again."""
+        playt_path = make_playt(tmp_path / "album.playt")
+        index = IndexRepository(tmp_path / "index.db")
+        verifier = CartridgeVerifier(index)
+        first = verifier.verify(playt_path)
+        assert not first.cached
+
+        with patch.object(CartridgeVerifier, "_check_member") as check:
+            second = verifier.verify(playt_path)
+        check.assert_not_called()
+        assert second.cached and second.members == first.members
+
+        corrupt(playt_path, STORED)
+        stat = playt_path.stat()
+        os.utime(playt_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        third = verifier.verify(playt_path)
+        assert not third.cached and not third.ok
+        index.close()
+
+
+class TestVerifyCartridges:
+    """Tests for sweeping many cartridges."""
+
+    def test_process_pool_reports_in_order(self, tmp_path: Path) -> None:
+        """Cartridges found in a directory tree are checked on a process pool."""
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
+            # Distinct contents, so no two cartridges share a fingerprint
+            make_playt(tmp_path / name / f"{name}.playt", tag=name.encode())
+        corrupt(tmp_path / "b" / "b.playt", STORED)
+
+        paths = find_cartridges([tmp_path])
+        assert [path.name for path in paths] == ["a.playt", "b.playt", "c.playt"]
+        reports = list(verify_cartridges(paths, tmp_path / "index.db", workers=2))
+        assert [report.path for report in reports] == paths
+        assert [report.ok for report in reports] == [True, False, True]
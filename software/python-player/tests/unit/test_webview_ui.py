@@ -1,10 +1,14 @@
 """Test the WebViewUI behavior and integration with PlayerService."""
 
 import json
+import threading
+import time
 from unittest.mock import MagicMock, patch, call
 
 import pytest
 
+from playt_player.application.command_bus import CommandBus
+from playt_player.application.playback_snapshot import PlaybackSnapshot
 from playt_player.application.player_service import PlayerService
 from playt_player.domain.entities.album import Album
 from playt_player.domain.entities.song import Song
@@ -22,38 +26,91 @@ def mock_logger():
 
 
 @pytest.fixture
-def js_api(mock_player_service, mock_logger):
-    return PlaytJSApi(mock_player_service, mock_logger)
+def command_bus():
+    bus = CommandBus()
+    yield bus
+    bus.close()
+
+
+@pytest.fixture
+def js_api(mock_player_service, mock_logger, command_bus):
+    return PlaytJSApi(mock_player_service, mock_logger, command_bus)
 
 
 class TestPlaytJSApi:
     """Test the JS API bridge."""
 
-    def test_controls_call_service(self, js_api, mock_player_service):
-        """Verify JS commands trigger service methods."""
+    def test_controls_call_service(self, js_api, mock_player_service, command_bus):
+        """Verify JS commands trigger service methods on the command bus."""
         js_api.play()
+        command_bus.join()
         mock_player_service.play.assert_called_once()
 
         js_api.pause()
+        command_bus.join()
         mock_player_service.pause.assert_called_once()
 
         js_api.next()
+        command_bus.join()
         mock_player_service.next.assert_called_once()
 
         js_api.previous()
+        command_bus.join()
         mock_player_service.previous.assert_called_once()
 
         js_api.seek(30.5)
+        command_bus.join()
         mock_player_service.seek.assert_called_once_with(30.5)
 
         js_api.setVolume(0.8)
+        command_bus.join()
         mock_player_service.set_volume.assert_called_once_with(0.8)
 
-    def test_toggle_play(self, js_api, mock_player_service):
+    def test_controls_do_not_wait(self, js_api, mock_player_service, command_bus):
+        """A slow command does not block the JS thread, and failures are logged."""
+        release = threading.Event()
+        mock_player_service.next.side_effect = lambda count=1: release.wait(2)
+        mock_player_service.seek.side_effect = NotImplementedError
+
+        started = time.monotonic()
+        js_api.next()
+        js_api.seek(10)
+        assert time.monotonic() - started < 0.5
+        # The bus is still busy with the slow skip
+        time.sleep(0.05)
+        mock_player_service.seek.assert_not_called()
+        release.set()
+        command_bus.join()
+        mock_player_service.next.assert_called_once_with(1)
+        js_api._logger.error.assert_not_called()
+        assert js_api._logger.warning.called
+
+    def test_load_file_uses_reader_factory(
+        self, mock_player_service, mock_logger, command_bus, tmp_path
+    ):
+        """Picked files are read by a reader from the given factory, one per file."""
+        readers = [MagicMock(), MagicMock()]
+        factory = MagicMock(side_effect=readers)
+        js_api = PlaytJSApi(mock_player_service, mock_logger, command_bus, factory)
+        playt_file = tmp_path / "album.playt"
+        playt_file.write_bytes(b"")
+
+        js_api._load_file(str(playt_file))
+        js_api._load_file(str(playt_file))
+        command_bus.join()
+
+        assert factory.call_count == 2
+        readers[0].read_cartridge.assert_called_once_with(str(playt_file))
+        readers[0].cleanup.assert_called_once()
+        readers[1].read_cartridge.assert_called_once_with(str(playt_file))
+        readers[1].cleanup.assert_not_called()
+
+    def test_toggle_play(self, js_api, mock_player_service, command_bus):
         """Verify togglePlay logic."""
         # If playing -> pause
         mock_player_service.get_state.return_value = "playing"
         js_api.togglePlay()
+        command_bus.join()
         mock_player_service.pause.assert_called_once()
         mock_player_service.play.assert_not_called()
 
@@ -62,6 +119,7 @@ class TestPlaytJSApi:
         # If paused -> play
         mock_player_service.get_state.return_value = "paused"
         js_api.togglePlay()
+        command_bus.join()
         mock_player_service.play.assert_called_once()
         mock_player_service.pause.assert_not_called()
 
@@ -127,8 +185,9 @@ class TestWebViewUI:
             duration_secs=180.0,
             file_path="/tmp/current.mp3",
         )
-        mock_player_service.get_current_song.return_value = song
-        mock_player_service.get_state.return_value = "playing"
+        mock_player_service.get_snapshot.return_value = PlaybackSnapshot(
+            state="playing", song=song, index=0
+        )
 
         # Simulate on_ready callback
         ui._on_ready()
@@ -148,3 +207,43 @@ class TestWebViewUI:
         ]
         assert len(state_calls) > 0
         assert "'playing'" in state_calls[0][0][0]
+
+    @patch("playt_player.interface.gui.webview_ui.webview")
+    def test_progress_only_while_playing(self, mock_webview, mock_player_service):
+        """Progress is polled while a track plays and not at all while idle."""
+        ui = WebViewUI(mock_player_service, "dummy.html")
+        ui._window = MagicMock()
+        ui.PROGRESS_INTERVAL = 0.01
+        ui._running = True
+        mock_player_service.track_end_events = True
+        mock_player_service.get_snapshot.return_value = PlaybackSnapshot(
+            state="playing", position_anchor=(12.0, time.monotonic())
+        )
+        thread = threading.Thread(target=ui._poll_progress, daemon=True)
+        thread.start()
+
+        time.sleep(0.05)
+        mock_player_service.get_snapshot.assert_not_called()
+
+        song = Song(
+            title="Song", artist="Artist", album="Album", duration_secs=1.0, file_path="/a.mp3"
+        )
+        ui.update("track_started", song)
+        time.sleep(0.05)
+        assert mock_player_service.get_snapshot.called
+        assert any(
+            "_emitProgress(12." in c.args[0] for c in ui._window.evaluate_js.call_args_list
+        )
+        mock_player_service.get_position.assert_not_called()
+        mock_player_service.get_state.assert_not_called()
+        mock_player_service.check_playback_status.assert_not_called()
+
+        ui.update("track_stopped", None)
+        time.sleep(0.03)
+        mock_player_service.get_snapshot.reset_mock()
+        time.sleep(0.05)
+        mock_player_service.get_snapshot.assert_not_called()
+
+        ui._running = False
+        ui._playing.set()
+        thread.join(timeout=1)
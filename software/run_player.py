@@ -29,8 +29,10 @@ def run_gui_if_configured():
             import webview
             from playt_player.interface.gui.webview_ui import WebViewUI
             from playt_player.infrastructure.audio.visualization_stub import VisualizationStub
-            from playt_player.interface.cli.player_cli import create_player_service
-            from playt_player.infrastructure.cartridge.playt_file_cartridge_reader import PlaytFileCartridgeReader
+            from playt_player.interface.cli.player_cli import (
+                create_cartridge_reader,
+                create_player_service,
+            )
             from playt_player.application.commands.play_command import PlayCommand
             from pathlib import Path
             import argparse
@@ -49,7 +51,7 @@ def run_gui_if_configured():
             if args.playt_file:
                 playt_path = Path(args.playt_file)
                 if playt_path.exists() and playt_path.suffix.lower() == ".playt":
-                    reader = PlaytFileCartridgeReader()
+                    reader = create_cartridge_reader()
                     cartridge_reader_ref = reader  # Prevent GC
                     
                     print(f"Loading cartridge: {playt_path}")
@@ -57,7 +59,8 @@ def run_gui_if_configured():
                     if cartridge:
                         album = reader.load_album_from_cartridge(cartridge)
                         if album:
-                            service.load_album(album)
+                            # Later tracks are still being extracted; the service waits on them
+                            service.load_album(album, reader.get_track_source(cartridge))
                             if args.auto_play:
                                 service.play()
             